@@ -158,6 +158,14 @@ async def lifespan(app: FastAPI):
     
     # Note: Phoenix tracing already initialized at module load time
     
+    # Load embedding models in the background so the first search is fast
+    try:
+        from ai_dev_orchestrator.knowledge.model_registry import warmup
+        warmup()
+        logger.info("Embedding model warmup started")
+    except Exception as e:
+        logger.error(f"Failed to start embedding model warmup: {e}")
+    
     # Initialize sync service and run backfill
     try:
         archive = ArchiveService()
@@ -286,6 +294,14 @@ class ChatRequest(BaseModel):
     use_rag: bool = Field(True, description="Whether to use RAG context injection")
 
 
+class KnowledgeBatchSearchRequest(BaseModel):
+    """Several knowledge search queries answered in one request."""
+    queries: list[str] = Field(..., min_length=1, max_length=256, description="Search queries")
+    limit: int = Field(5, ge=1, le=50, description="Results per query")
+    min_score: float = Field(0.3, description="Minimum cosine similarity")
+    doc_types: list[str] | None = Field(None, description="Restrict to these document types")
+
+
 class ArtifactSummary(BaseModel):
     """Summary of a workflow artifact."""
     id: str
@@ -488,7 +504,8 @@ async def stream_chat_response(
     
     # Inject RAG context if enabled and there are user messages
     if use_rag and messages:
-        messages = _inject_rag_context(messages)
+        # Retrieval embeds the query; keep it off the event loop
+        messages = await asyncio.to_thread(_inject_rag_context, messages)
     
     # Extract user prompt for trace capture
     user_prompt = ""
@@ -781,13 +798,19 @@ async def health_check():
     }
 
 
+@app.get("/api/knowledge/embedding/metrics")
+async def embedding_metrics():
+    """Queue depth and batch sizes of the request-time embedding workers."""
+    from ai_dev_orchestrator.knowledge.embedding_batcher import batcher_metrics
+    return {"batchers": batcher_metrics()}
+
+
 # =============================================================================
 # Knowledge Search
 # =============================================================================
 
-@app.get("/api/knowledge/search")
-async def search_knowledge(q: str = Query(..., description="Search query")):
-    """Search knowledge base."""
+def _scan_knowledge_files(q: str) -> list[dict]:
+    """Substring search over the workspace's discussion, ADR and plan files."""
     # Simple file-based search for now
     results = []
     
@@ -809,9 +832,61 @@ async def search_knowledge(q: str = Query(..., description="Search query")):
             except Exception:
                 pass
     
-    return {"query": q, "results": results[:20]}
+    return results[:20]
 
 
+@app.get("/api/knowledge/search")
+async def search_knowledge(q: str = Query(..., description="Search query")):
+    """Search knowledge base.
+
+    The substring scan is cached by exact (case-folded) query; document
+    syncs invalidate it and entries expire with ``query_cache``'s TTL.
+    """
+    from backend.services.cache_service import cache_key, query_cache
+
+    key = f"knowledge:files:{cache_key(q.lower())}"
+    results = query_cache.get(key)
+    if results is None:
+        results = await asyncio.to_thread(_scan_knowledge_files, q)
+        query_cache.set(key, results)
+    
+    return {"query": q, "results": results}
+
+
+@app.post("/api/knowledge/search/batch")
+async def search_knowledge_batch(request: KnowledgeBatchSearchRequest):
+    """Semantic search for several queries at once.
+
+    Queries share one embedding call and one pass over the embedding matrix.
+    """
+    from backend.services.knowledge.retrieval import get_retriever
+
+    batches = await asyncio.to_thread(
+        get_retriever().search_semantic_batch,
+        request.queries,
+        request.limit,
+        request.min_score,
+        request.doc_types,
+    )
+    return {
+        "results": [
+            {
+                "query": query,
+                "results": [
+                    {
+                        "doc_id": r.doc_id,
+                        "doc_type": r.doc_type,
+                        "title": r.title,
+                        "snippet": r.content[:200],
+                        "score": r.score,
+                    }
+                    for r in hits
+                ],
+            }
+            for query, hits in zip(request.queries, batches)
+        ]
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
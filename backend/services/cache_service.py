@@ -3,6 +3,7 @@
 Multi-tier caching system for research papers, chat logs, traces, and embeddings.
 Supports:
 - L1: In-memory LRU cache (hot data)
+- L1: Semantic cache keyed by query embedding (near-duplicate queries)
 - L2: SQLite cache (warm data)
 - L3: Optional Redis (distributed)
 
@@ -14,14 +15,19 @@ import json
 import logging
 import sqlite3
 import time
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
 from threading import Lock
 from typing import Any, Callable, Generic, TypeVar, Optional
+import itertools
 import os
 
+import numpy as np
+
+from .vector_search import VectorIndex
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -199,6 +205,9 @@ class SQLiteCache:
             db_path = aikh_dir / "cache.db"
         
         self.db_path = db_path
+        # Hits from get_many, written with the next write instead of per read
+        self._pending_hits: Counter[tuple[str, str]] = Counter()
+        self._hits_lock = Lock()
         self._init_db()
     
     def _init_db(self) -> None:
@@ -273,7 +282,76 @@ class SQLiteCache:
             conn.commit()
         finally:
             conn.close()
-    
+
+    def get_many(self, keys: list[str], namespace: str = "default") -> dict[str, Any]:
+        """Get several items in one query; missing or expired keys are omitted."""
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT key, value, value_type, expires_at
+                FROM cache_entries
+                WHERE namespace = ? AND key IN ({placeholders})
+                """,
+                (namespace, *keys)
+            ).fetchall()
+            now = time.time()
+            found = {
+                row["key"]: self._deserialize(row["value"], row["value_type"])
+                for row in rows
+                if not row["expires_at"] or now <= row["expires_at"]
+            }
+            with self._hits_lock:
+                self._pending_hits.update((namespace, key) for key in found)
+            return found
+        finally:
+            conn.close()
+
+    def _flush_hits(self, conn: sqlite3.Connection) -> None:
+        """Add pending batched hits to hit_count; the caller commits."""
+        with self._hits_lock:
+            pending, self._pending_hits = self._pending_hits, Counter()
+        if pending:
+            conn.executemany(
+                """
+                UPDATE cache_entries SET hit_count = hit_count + ?
+                WHERE key = ? AND namespace = ?
+                """,
+                [(hits, key, namespace) for (namespace, key), hits in pending.items()]
+            )
+
+    def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: Optional[float] = None,
+        namespace: str = "default"
+    ) -> None:
+        """Set several items in one transaction."""
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = []
+        for key, value in items.items():
+            serialized, value_type = self._serialize(value)
+            rows.append((key, serialized, value_type, now, expires_at, len(serialized), namespace))
+
+        conn = self._get_conn()
+        try:
+            self._flush_hits(conn)
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO cache_entries
+                (key, value, value_type, created_at, expires_at, size_bytes, namespace)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
     def invalidate(self, key: str, namespace: str = "default") -> bool:
         """Remove item from cache."""
         conn = self._get_conn()
@@ -304,6 +382,8 @@ class SQLiteCache:
         """Get cache statistics."""
         conn = self._get_conn()
         try:
+            self._flush_hits(conn)
+            conn.commit()
             if namespace:
                 cursor = conn.execute(
                     """
@@ -352,6 +432,111 @@ class SQLiteCache:
         else:
             return json.loads(data.decode("utf-8"))
 
+class SemanticCache(Generic[T]):
+    """Thread-safe LRU cache keyed by query embedding.
+
+    A lookup returns the value cached for the most similar recent query when
+    their cosine similarity reaches ``threshold``, so near-duplicate queries
+    (retries, rephrased follow-ups) share one entry. Cached query vectors
+    live in a small ``VectorIndex`` per namespace; namespaces separate
+    embedding models and result shapes.
+    """
+    
+    def __init__(
+        self,
+        max_items: int = 1000,
+        threshold: float = 0.95,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize an empty cache of at most ``max_items`` entries."""
+        self.max_items = max_items
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        
+        # id -> (namespace, value, expires_at); the index holds the vectors
+        self._entries: OrderedDict[int, tuple[str, T, Optional[float]]] = OrderedDict()
+        self._indices: dict[str, VectorIndex] = {}
+        self._ids = itertools.count()
+        self._lock = Lock()
+        
+        # Stats
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, namespace: str, vector: np.ndarray | list[float]) -> Optional[T]:
+        """Value of the nearest cached query, if within the threshold."""
+        with self._lock:
+            index = self._indices.get(namespace)
+            matches = index.search(vector, k=1, min_score=self.threshold) if index else []
+            if not matches:
+                self.misses += 1
+                return None
+            
+            entry_id = matches[0].id
+            _, value, expires_at = self._entries[entry_id]
+            if expires_at is not None and time.time() > expires_at:
+                self._remove(entry_id)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return value
+    
+    def set(self, namespace: str, vector: np.ndarray | list[float], value: T) -> None:
+        """Cache ``value`` for the query embedded as ``vector``."""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            index = self._indices.get(namespace)
+            if index is None:
+                index = self._indices[namespace] = VectorIndex(
+                    dimension=len(vector), use_gpu=False
+                )
+            
+            # A near-identical query replaces the entry it would hit
+            for match in index.search(vector, k=1, min_score=self.threshold):
+                self._remove(match.id)
+            
+            entry_id = next(self._ids)
+            index.add(entry_id, vector)
+            self._entries[entry_id] = (namespace, value, expires_at)
+            while len(self._entries) > self.max_items:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Remove all entries in namespaces starting with ``prefix``."""
+        with self._lock:
+            ids = [i for i, (ns, _, _) in self._entries.items() if ns.startswith(prefix)]
+            for entry_id in ids:
+                self._remove(entry_id)
+            return len(ids)
+    
+    def clear(self) -> None:
+        """Clear entire cache."""
+        with self._lock:
+            self._entries.clear()
+            self._indices.clear()
+    
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "items": len(self._entries),
+                "namespaces": len(self._indices),
+                "max_items": self.max_items,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0,
+            }
+    
+    def _remove(self, entry_id: int) -> None:
+        """Remove entry and its vector (caller must hold lock)."""
+        namespace, _, _ = self._entries.pop(entry_id)
+        self._indices[namespace].delete(entry_id)
+
 
 # =============================================================================
 # Cache Decorators
@@ -453,6 +638,13 @@ query_cache = LRUCache[list](
     ttl_seconds=300  # 5 minutes
 )
 
+# Near-duplicate query cache (ranked retrieval results)
+semantic_query_cache = SemanticCache[list](
+    max_items=1000,
+    threshold=float(os.getenv("AIKH_SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    ttl_seconds=300  # 5 minutes
+)
+
 # Chat/Trace cache
 trace_cache = LRUCache[dict](
     max_items=500,
@@ -476,6 +668,7 @@ def get_cache_stats() -> dict:
         "research": research_cache.stats(),
         "embedding": embedding_cache.stats(),
         "query": query_cache.stats(),
+        "semantic": semantic_query_cache.stats(),
         "trace": trace_cache.stats(),
         "persistent": persistent_cache.stats(),
     }
@@ -486,4 +679,5 @@ def clear_all_caches() -> None:
     research_cache.clear()
     embedding_cache.clear()
     query_cache.clear()
+    semantic_query_cache.clear()
     trace_cache.clear()
@@ -92,11 +92,13 @@ def search_chatlogs(query: str, limit: int = 20) -> list[dict[str, Any]]:
     conn = get_connection()
     cursor = conn.cursor()
     try:
+        # A chat log ranks by its best-matching turn (or its title)
         cursor.execute("""
-            SELECT cl.*, bm25(chat_fts) as rank
+            SELECT cl.*, MIN(chat_fts.rank) as rank
             FROM chat_fts
-            JOIN chat_logs cl ON cl.id = CAST(chat_fts.chat_log_id AS INTEGER)
+            JOIN chat_logs cl ON cl.id = chat_fts.chat_log_id
             WHERE chat_fts MATCH ?
+            GROUP BY cl.id
             ORDER BY rank
             LIMIT ?
         """, (query, limit))
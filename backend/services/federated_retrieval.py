@@ -0,0 +1,205 @@
+"""Federated retrieval across the AIKH stores.
+
+One query fans out to knowledge.db (hybrid chunk search), research.db
+(paper embeddings), chatlogs.db (chat_fts) and memory.db (memories_fts)
+at once. Each source has its own timeout and the whole call a budget, so
+a slow or missing store costs at most its deadline; its results are
+simply absent. The per-source rankings are then fused with one Reciprocal
+Rank Fusion step, which needs no score calibration between stores.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.services import chatlog_service
+from backend.services.knowledge.retrieval import get_retriever
+
+from ai_dev_orchestrator.knowledge.fanout import gather
+from ai_dev_orchestrator.knowledge.fts import build_match_query
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+DEFAULT_BUDGET = 2.5  # Seconds for a whole federated search
+
+
+@dataclass
+class FederatedHit:
+    """One fused result from any source."""
+    source: str  # knowledge, research, chatlogs, memory
+    source_id: str
+    title: str
+    content: str
+    score: float = 0.0  # Fused RRF score
+    metadata: dict[str, Any] = field(default_factory=dict)
+    item: Any = None  # The source's own result object
+
+
+@dataclass
+class Source:
+    """A searchable store: ``search(query, limit)`` returns ranked hits."""
+    name: str
+    search: Callable[[str, int], list[FederatedHit]]
+    timeout: float = 1.0
+    weight: float = 1.0
+
+
+def search_knowledge(query: str, limit: int) -> list[FederatedHit]:
+    """Hybrid chunk search over knowledge.db."""
+    return [
+        FederatedHit(
+            source="knowledge",
+            source_id=f"{r.doc_id}:{r.chunk_index or 0}",
+            title=r.title,
+            content=r.content,
+            metadata={"doc_id": r.doc_id, "doc_type": r.doc_type},
+            item=r,
+        )
+        for r in get_retriever().search_hybrid(query, limit=limit)
+    ]
+
+
+def search_research(query: str, limit: int) -> list[FederatedHit]:
+    """Semantic paper search over research.db's resident embedding matrix."""
+    from backend.services.gpu_service import get_gpu_service
+
+    return [
+        FederatedHit(
+            source="research",
+            source_id=r.paper_id,
+            title=r.title,
+            content=r.abstract or r.chunk_content or "",
+            metadata={"similarity": r.similarity},
+            item=r,
+        )
+        for r in get_gpu_service().semantic_search_papers(query, top_k=limit)
+    ]
+
+
+def search_chatlogs(query: str, limit: int) -> list[FederatedHit]:
+    """Best-matching chat turns (and log titles) from chat_fts."""
+    match = build_match_query(query)
+    if not match or not chatlog_service.get_db_path().exists():
+        return []
+    conn = chatlog_service.get_connection()
+    try:
+        rows = conn.execute("""
+            SELECT chat_fts.rowid AS row_id, cl.id AS log_id, cl.title,
+                   snippet(chat_fts, 1, '', '', '…', 48) AS excerpt
+            FROM chat_fts
+            JOIN chat_logs cl ON cl.id = chat_fts.chat_log_id
+            WHERE chat_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (match, limit)).fetchall()
+    finally:
+        conn.close()
+    return [
+        FederatedHit(
+            source="chatlogs",
+            source_id=f"{r['log_id']}:{r['row_id']}",
+            title=r["title"] or "",
+            content=r["excerpt"] or r["title"] or "",
+            metadata={"chat_log_id": r["log_id"]},
+        )
+        for r in rows
+    ]
+
+
+def search_memory(query: str, limit: int) -> list[FederatedHit]:
+    """Full-text search over stored memories."""
+    from backend.services.memory import database as memory_db  # Imports the assembler
+
+    return [
+        FederatedHit(
+            source="memory",
+            source_id=m.id,
+            title=m.type.value,
+            content=m.content,
+            metadata={"session_id": m.session_id},
+            item=m,
+        )
+        for m in memory_db.search_memories_fts(query, limit=limit)
+    ]
+
+
+DEFAULT_SOURCES = [
+    Source("knowledge", search_knowledge, timeout=2.0),
+    Source("research", search_research, timeout=2.0),
+    Source("chatlogs", search_chatlogs, timeout=0.5),
+    Source("memory", search_memory, timeout=0.5),
+]
+
+
+def reciprocal_rank_fusion(
+    rankings: dict[str, list[FederatedHit]],
+    weights: dict[str, float] | None = None,
+    k: int = RRF_K,
+) -> list[FederatedHit]:
+    """Fuse per-source rankings into one list ordered by RRF score."""
+    fused: dict[tuple[str, str], FederatedHit] = {}
+    for name, hits in rankings.items():
+        weight = (weights or {}).get(name, 1.0)
+        for rank, hit in enumerate(hits):
+            key = (hit.source, hit.source_id)
+            if key not in fused:
+                hit.score = 0.0
+                fused[key] = hit
+            fused[key].score += weight / (k + rank + 1)
+    return sorted(fused.values(), key=lambda h: h.score, reverse=True)
+
+
+class FederatedRetriever:
+    """Query several stores concurrently and fuse their rankings."""
+
+    def __init__(
+        self,
+        sources: list[Source] | None = None,
+        budget: float = DEFAULT_BUDGET,
+    ):
+        """Initialize with ``sources`` (default: all four AIKH stores).
+
+        Args:
+            sources: Stores to search, by name.
+            budget: Seconds for a whole search; caps every source's timeout.
+        """
+        self.sources = {s.name: s for s in (sources or DEFAULT_SOURCES)}
+        self.budget = budget
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        sources: list[str] | None = None,
+    ) -> list[FederatedHit]:
+        """Search ``sources`` (default all) and return the fused top ``limit``.
+
+        Sources that fail or miss their deadline contribute nothing.
+        """
+        selected = [self.sources[n] for n in (sources or self.sources) if n in self.sources]
+        start = time.monotonic()
+        rankings = gather(
+            {s.name: (lambda s=s: s.search(query, limit)) for s in selected},
+            timeouts={s.name: s.timeout for s in selected},
+            budget=self.budget,
+        )
+        logger.debug(
+            f"Federated search: {sorted(rankings)} of {len(selected)} sources "
+            f"in {(time.monotonic() - start) * 1000:.1f}ms"
+        )
+        weights = {s.name: s.weight for s in selected}
+        return reciprocal_rank_fusion(rankings, weights)[:limit]
+
+
+# Singleton instance
+_federated_retriever: FederatedRetriever | None = None
+
+def get_federated_retriever() -> FederatedRetriever:
+    """Get singleton federated retriever instance."""
+    global _federated_retriever
+    if _federated_retriever is None:
+        _federated_retriever = FederatedRetriever()
+    return _federated_retriever
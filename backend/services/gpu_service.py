@@ -5,6 +5,9 @@ Provides GPU-accelerated operations:
 - Real-time embedding generation
 - Batch embedding on demand
 
+Searches score a resident matrix of ``paper_embeddings_gpu`` vectors (ids and
+vectors only); titles, abstracts and chunk text are read for the final top-k.
+
 Leverages RTX 5090 (31.8GB VRAM) for maximum throughput.
 """
 
@@ -12,12 +15,22 @@ import sqlite3
 import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from contextlib import contextmanager
 
 import numpy as np
 
+from ai_dev_orchestrator.knowledge.embedding_batcher import get_batcher
+from ai_dev_orchestrator.knowledge.fanout import fan_out
+from ai_dev_orchestrator.knowledge.model_registry import get_model
+from ai_dev_orchestrator.knowledge.paper_matrix import PaperSource, get_paper_matrix
+from ai_dev_orchestrator.knowledge.quantization import (
+    quantization_enabled,
+    quantized_table_schema,
+    store_quantized,
+)
+
 # Check for GPU availability
 try:
     import torch
@@ -75,6 +88,7 @@ CREATE TABLE IF NOT EXISTS paper_embeddings_gpu (
 CREATE INDEX IF NOT EXISTS idx_gpu_emb_paper ON paper_embeddings_gpu(paper_id);
 CREATE INDEX IF NOT EXISTS idx_gpu_emb_type ON paper_embeddings_gpu(embedding_type);
 """
+GPU_EMBEDDINGS_SCHEMA += quantized_table_schema("paper_embeddings_gpu")
 
 def init_gpu_tables(db_path: Path = DB_PATH) -> bool:
     """Initialize GPU-specific tables in the research database."""
@@ -117,6 +131,17 @@ class SearchResult:
     chunk_content: Optional[str] = None
 
 
+def gpu_source(embedding_type: str) -> PaperSource:
+    """Rows of ``paper_embeddings_gpu`` with the given ``embedding_type``."""
+    return PaperSource(
+        table="paper_embeddings_gpu",
+        vector_column="embedding",
+        paper_column="t.paper_id",
+        where="t.embedding_type = ?",
+        params=(embedding_type,),
+    )
+
+
 class GPUSearchService:
     """GPU-accelerated semantic search service."""
     
@@ -152,15 +177,12 @@ class GPUSearchService:
             conn.close()
     
     def _load_model(self):
-        """Lazy-load model on GPU."""
+        """Lazy-load model on GPU from the shared model registry."""
         if GPUSearchService._model is None:
             if not SBERT_AVAILABLE:
                 raise ImportError("sentence-transformers not installed")
             
-            GPUSearchService._model = SentenceTransformer(
-                self.model_name, 
-                device=self.device
-            )
+            GPUSearchService._model = get_model(self.model_name, device=self.device)
             
             # Get embedding dimension
             test_emb = GPUSearchService._model.encode(["test"], convert_to_numpy=True)
@@ -179,15 +201,13 @@ class GPUSearchService:
         return np.frombuffer(blob, dtype=np.float32)
     
     def encode_query(self, query: str) -> np.ndarray:
-        """Encode a query string to embedding vector using GPU."""
-        model = self._load_model()
-        embedding = model.encode(
-            [query],
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            show_progress_bar=False
-        )
-        return embedding[0]
+        """Encode a query string to embedding vector using GPU.
+        
+        Concurrent queries are coalesced into one batched encode.
+        """
+        self._load_model()
+        batcher = get_batcher(f"gpu:{self.model_name}:{self.device}", self.encode_batch)
+        return batcher.embed(query)
     
     def encode_batch(self, texts: List[str]) -> np.ndarray:
         """Encode multiple texts to embeddings using GPU batch processing."""
@@ -205,99 +225,137 @@ class GPUSearchService:
         self,
         query: str,
         top_k: int = 10,
-        min_similarity: float = 0.3
+        min_similarity: float = 0.3,
+        query_embedding: Optional[np.ndarray] = None,
+        category: Optional[str] = None
     ) -> List[SearchResult]:
         """
         GPU-accelerated semantic search across papers.
         
-        Uses paper_embeddings_gpu table for fast similarity computation.
+        Scores the resident paper matrix; titles and abstracts are read only
+        for the winning papers. Pass ``query_embedding`` to reuse an already
+        encoded query; ``category`` restricts the scored rows by mask.
         """
-        query_embedding = self.encode_query(query)
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
         
         with self._get_conn() as conn:
-            # Get all paper embeddings
-            cursor = conn.execute("""
-                SELECT e.paper_id, e.embedding, p.title, p.abstract
-                FROM paper_embeddings_gpu e
-                JOIN research_papers p ON e.paper_id = p.id
-                WHERE e.embedding_type = 'paper'
-            """)
+            matrix = get_paper_matrix(conn, gpu_source("paper"))
+            filters = {"category": category} if category else None
             
-            results = []
-            for row in cursor.fetchall():
-                paper_embedding = self.blob_to_vector(row["embedding"])
-                similarity = float(np.dot(query_embedding, paper_embedding))
-                
-                if similarity >= min_similarity:
-                    results.append(SearchResult(
-                        paper_id=row["paper_id"],
-                        title=row["title"],
-                        abstract=row["abstract"],
+            # Embeddings of deleted papers drop out at hydration; widen until
+            # top_k survive or the matrix is exhausted
+            fetch = top_k
+            while True:
+                hits = matrix.top_k(query_embedding, fetch, min_similarity, conn, filters)
+                papers = self._fetch_rows(
+                    conn,
+                    "SELECT id, title, abstract FROM research_papers WHERE id IN ({})",
+                    {paper_id for paper_id, _, _ in hits}
+                )
+                results = [
+                    SearchResult(
+                        paper_id=paper_id,
+                        title=papers[paper_id]["title"],
+                        abstract=papers[paper_id]["abstract"],
                         similarity=similarity
-                    ))
-            
-            # Sort by similarity and return top_k
-            results.sort(key=lambda x: x.similarity, reverse=True)
-            return results[:top_k]
+                    )
+                    for paper_id, _, similarity in hits
+                    if paper_id in papers
+                ]
+                if len(results) >= top_k or len(hits) < fetch:
+                    return results[:top_k]
+                fetch *= 4
     
     def semantic_search_chunks(
         self,
         query: str,
         top_k: int = 10,
-        min_similarity: float = 0.4
+        min_similarity: float = 0.4,
+        query_embedding: Optional[np.ndarray] = None,
+        category: Optional[str] = None,
+        chunk_type: Optional[str] = None
     ) -> List[SearchResult]:
         """
         GPU-accelerated semantic search across chunks.
         
-        More granular search for specific passages.
+        More granular search for specific passages. Only the top-k chunks'
+        text (first 500 characters) and paper titles are read back.
+        ``category`` and ``chunk_type`` restrict the scored rows by mask.
         """
-        query_embedding = self.encode_query(query)
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
         
         with self._get_conn() as conn:
-            # Get all chunk embeddings
-            cursor = conn.execute("""
-                SELECT e.paper_id, e.chunk_id, e.embedding, 
-                       p.title, c.content
-                FROM paper_embeddings_gpu e
-                JOIN research_papers p ON e.paper_id = p.id
-                JOIN paper_chunks c ON e.chunk_id = c.id
-                WHERE e.embedding_type = 'chunk'
-            """)
+            matrix = get_paper_matrix(conn, gpu_source("chunk"))
+            filters = {
+                name: value
+                for name, value in (("category", category), ("chunk_type", chunk_type))
+                if value
+            }
             
-            results = []
-            for row in cursor.fetchall():
-                chunk_embedding = self.blob_to_vector(row["embedding"])
-                similarity = float(np.dot(query_embedding, chunk_embedding))
-                
-                if similarity >= min_similarity:
-                    results.append(SearchResult(
-                        paper_id=row["paper_id"],
-                        title=row["title"],
+            fetch = top_k
+            while True:
+                hits = matrix.top_k(query_embedding, fetch, min_similarity, conn, filters)
+                chunks = self._fetch_rows(
+                    conn,
+                    "SELECT id, substr(content, 1, 500) AS content FROM paper_chunks "
+                    "WHERE id IN ({})",
+                    {chunk_id for _, chunk_id, _ in hits if chunk_id is not None}
+                )
+                papers = self._fetch_rows(
+                    conn,
+                    "SELECT id, title FROM research_papers WHERE id IN ({})",
+                    {paper_id for paper_id, _, _ in hits}
+                )
+                results = [
+                    SearchResult(
+                        paper_id=paper_id,
+                        title=papers[paper_id]["title"],
                         abstract=None,
                         similarity=similarity,
-                        chunk_id=row["chunk_id"],
-                        chunk_content=row["content"][:500] if row["content"] else None
-                    ))
-            
-            # Sort by similarity and return top_k
-            results.sort(key=lambda x: x.similarity, reverse=True)
-            return results[:top_k]
+                        chunk_id=chunk_id,
+                        chunk_content=chunks[chunk_id]["content"] or None
+                    )
+                    for paper_id, chunk_id, similarity in hits
+                    if chunk_id in chunks and paper_id in papers
+                ]
+                if len(results) >= top_k or len(hits) < fetch:
+                    return results[:top_k]
+                fetch *= 4
+    
+    @staticmethod
+    def _fetch_rows(conn: sqlite3.Connection, sql: str, ids: set) -> Dict[Any, sqlite3.Row]:
+        """Run ``sql`` (with an ``IN ({})`` placeholder) for ``ids``, keyed by ``id``."""
+        if not ids:
+            return {}
+        ids = list(ids)
+        rows = conn.execute(sql.format(",".join("?" * len(ids))), ids).fetchall()
+        return {row["id"]: row for row in rows}
     
     def hybrid_search(
         self,
         query: str,
         top_k: int = 10,
         paper_weight: float = 0.4,
-        chunk_weight: float = 0.6
+        chunk_weight: float = 0.6,
+        category: Optional[str] = None
     ) -> List[SearchResult]:
         """
         Hybrid search combining paper-level and chunk-level results.
         
-        Uses GPU for all embedding operations.
+        The query is encoded once; the paper and chunk matrices are then
+        scored concurrently, each leg on its own connection.
         """
-        # Get both paper and chunk results
-        paper_results = self.semantic_search_papers(query, top_k=top_k * 2)
-        chunk_results = self.semantic_search_chunks(query, top_k=top_k * 2)
+        query_embedding = self.encode_query(query)
+        paper_results, chunk_results = fan_out(
+            lambda: self.semantic_search_papers(
+                query, top_k=top_k * 2, query_embedding=query_embedding, category=category
+            ),
+            lambda: self.semantic_search_chunks(
+                query, top_k=top_k * 2, query_embedding=query_embedding, category=category
+            ),
+        )
         
         # Build paper score map
         paper_scores: Dict[str, float] = {}
@@ -361,13 +419,15 @@ class GPUSearchService:
             # Generate embedding on GPU
             embedding = self.encode_query(text)
             
-            # Store
-            conn.execute("""
+            # Store, with its int8 codes in the same transaction
+            row_id = conn.execute("""
                 INSERT OR REPLACE INTO paper_embeddings_gpu
                 (paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim)
                 VALUES (?, NULL, 'paper', ?, ?, ?)
             """, (paper_id, self.model_name, self.vector_to_blob(embedding), 
-                  GPUSearchService._embedding_dim))
+                  GPUSearchService._embedding_dim)).lastrowid
+            if quantization_enabled():
+                store_quantized(conn, "paper_embeddings_gpu", row_id, embedding)
             conn.commit()
             
             return True
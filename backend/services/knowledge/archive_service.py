@@ -6,6 +6,8 @@ GUARDRAIL: No hard deletes - always use archived_at.
 
 import sqlite3
 
+from backend.services.cache_service import query_cache, semantic_query_cache
+from backend.services.knowledge.context_builder import context_cache
 from backend.services.knowledge.database import get_connection
 from contracts.knowledge.archive import Document, DocumentType
 
@@ -35,6 +37,9 @@ class ArchiveService:
                 archived_at = NULL
         """, (doc.id, doc.type.value, doc.title, doc.content, doc.file_path, doc.file_hash))
         self.conn.commit()
+        context_cache.invalidate_document(doc.id, doc.file_hash, f"{doc.title}\n{doc.content}")
+        semantic_query_cache.invalidate_prefix("knowledge:")
+        query_cache.invalidate_prefix("knowledge:files:")
         return True
 
     def get_document(self, doc_id: str) -> Document | None:
@@ -79,6 +84,10 @@ class ArchiveService:
             (doc_id,)
         )
         self.conn.commit()
+        if result.rowcount > 0:
+            context_cache.invalidate_document(doc_id)
+            semantic_query_cache.invalidate_prefix("knowledge:")
+            query_cache.invalidate_prefix("knowledge:files:")
         return result.rowcount > 0
 
     def extract_relationships(self, doc: Document) -> list[tuple[str, str, str]]:
@@ -7,6 +7,9 @@ import re
 from dataclasses import dataclass
 from pathlib import Path
 
+from backend.services.cache_service import semantic_query_cache
+from backend.services.knowledge.context_builder import context_cache
+
 
 @dataclass
 class Chunk:
@@ -153,6 +156,8 @@ class ChunkingService:
                   chunk.start_char, chunk.end_char, chunk.token_count))
 
         conn.commit()
+        context_cache.invalidate_document(doc_id, text=row['content'])
+        semantic_query_cache.invalidate_prefix("knowledge:")
         return len(chunks)
 
     def chunk_and_store(self, conn, doc_id: str, content: str, file_path: str) -> int:
@@ -169,4 +174,6 @@ class ChunkingService:
                   chunk.start_char, chunk.end_char, chunk.token_count))
 
         conn.commit()
+        context_cache.invalidate_document(doc_id, text=content)
+        semantic_query_cache.invalidate_prefix("knowledge:")
         return len(chunks)
@@ -1,14 +1,32 @@
 """Context Builder - SPEC-0043-RA01, RA02, RA03, RA04.
 
 Build RAG context from search results with token budget management.
+
+Built contexts are kept in a bounded, process-wide LRU (``context_cache``).
+Each entry records the version (``file_hash``) of every document its search
+returned, and ``ArchiveService`` reports document writes, so an edit drops
+exactly the entries built from the old version plus those whose query
+terms occur in the new text (which could now match). The TTL remains as a
+backstop for writes that bypass the archive service.
 """
 
+import re
+import threading
 import time
+from bisect import bisect_left
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 from backend.services.knowledge.sanitizer import Sanitizer
 from backend.services.knowledge.search_service import SearchHit, SearchService
 
+from ai_dev_orchestrator.knowledge.fanout import database_path
+
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 300  # 5 minutes
+
+_WORD_RE = re.compile(r"\w+")
+
 
 @dataclass
 class ContextResult:
@@ -19,23 +37,166 @@ class ContextResult:
     cached: bool = False
 
 
+@dataclass
+class _CacheEntry:
+    result: ContextResult
+    created_at: float
+    versions: dict[str, str]  # doc_id -> file_hash the search saw
+    terms: frozenset[str]  # Lower-cased query words
+
+
+class ContextCache:
+    """Bounded LRU of built contexts with per-document invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+    ):
+        """Initialize an empty cache of at most ``max_entries`` contexts."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._by_doc: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by every invalidation
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        """Read before searching and pass to ``set`` to detect racing writes."""
+        return self._generation
+
+    def get(self, key: str) -> ContextResult | None:
+        """Cached result for ``key`` if present and within the TTL."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry.created_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.result
+            if entry:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(
+        self,
+        key: str,
+        result: ContextResult,
+        query: str,
+        versions: dict[str, str],
+        generation: int,
+    ) -> bool:
+        """Cache ``result`` unless a document changed since ``generation``."""
+        with self._lock:
+            if generation != self._generation:
+                return False  # Built from data that has since been invalidated
+            self._remove(key)
+            self._entries[key] = _CacheEntry(
+                result, time.time(), versions, frozenset(_WORD_RE.findall(query.lower()))
+            )
+            for doc_id in versions:
+                self._by_doc.setdefault(doc_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def invalidate_document(
+        self,
+        doc_id: str,
+        version: str | None = None,
+        text: str = "",
+    ) -> int:
+        """Drop entries affected by a write to ``doc_id``.
+
+        Args:
+            doc_id: The written (or archived) document.
+            version: Its new ``file_hash``; entries that already saw this
+                version are kept. None drops every entry that used it.
+            text: Its new title and content; entries whose query words
+                start a word in it are dropped too, as it may now match.
+
+        Returns:
+            Number of entries dropped.
+        """
+        words = sorted(set(_WORD_RE.findall(text.lower())))
+
+        def could_match(terms: frozenset[str]) -> bool:
+            for term in terms:
+                i = bisect_left(words, term)
+                if i < len(words) and words[i].startswith(term):
+                    return True
+            return False
+
+        with self._lock:
+            self._generation += 1
+            stale = {
+                key for key in self._by_doc.get(doc_id, ())
+                if version is None or self._entries[key].versions.get(doc_id) != version
+            }
+            if words:
+                stale.update(k for k, e in self._entries.items() if could_match(e.terms))
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_doc.clear()
+
+    def stats(self) -> dict:
+        """Entry count and hit statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "items": len(self._entries),
+                "max_items": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Remove entry and its document links (caller must hold lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for doc_id in entry.versions:
+            keys = self._by_doc.get(doc_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_doc[doc_id]
+
+
+# Shared by every ContextBuilder so archive writes can invalidate it
+context_cache = ContextCache()
+
+
 class ContextBuilder:
     """Build sanitized RAG context from search results."""
 
     CHARS_PER_TOKEN = 4  # Rough approximation
     DEFAULT_MAX_TOKENS = 4000
-    CACHE_TTL_SECONDS = 300  # 5 minutes
 
     def __init__(
         self,
         search: SearchService,
         sanitizer: Sanitizer | None = None,
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        cache: ContextCache | None = None,
     ):
         self.search = search
         self.sanitizer = sanitizer or Sanitizer()
         self.cache_enabled = cache_enabled
-        self._cache: dict[str, tuple[ContextResult, float]] = {}
+        self._cache = cache or context_cache
+        # Entries are per database; in-memory databases are per connection
+        self._cache_scope = database_path(search.conn) or f"memory:{id(search.conn)}"
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count from text length."""
@@ -64,18 +225,31 @@ class ContextBuilder:
         """Get cached result if valid."""
         if not self.cache_enabled:
             return None
-        if cache_key in self._cache:
-            result, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self.CACHE_TTL_SECONDS:
-                result.cached = True
-                return result
-            del self._cache[cache_key]
-        return None
-
-    def _set_cached(self, cache_key: str, result: ContextResult):
-        """Cache a result."""
-        if self.cache_enabled:
-            self._cache[cache_key] = (result, time.time())
+        result = self._cache.get(cache_key)
+        if result:
+            result.cached = True
+        return result
+
+    def _set_cached(
+        self,
+        cache_key: str,
+        query: str,
+        result: ContextResult,
+        results: list[SearchHit],
+        generation: int,
+    ):
+        """Cache a result with the versions of the documents it was built from."""
+        if not self.cache_enabled:
+            return
+        doc_ids = sorted({hit.doc_id for hit in results})
+        placeholders = ",".join("?" * len(doc_ids))
+        versions = {
+            row[0]: row[1]
+            for row in self.search.conn.execute(
+                f"SELECT id, file_hash FROM documents WHERE id IN ({placeholders})", doc_ids
+            )
+        }
+        self._cache.set(cache_key, result, query, versions, generation)
 
     def build_context(
         self,
@@ -91,10 +265,11 @@ class ContextBuilder:
         4. Return with source attribution
         """
         # Check cache
-        cache_key = f"{query}:{max_tokens}:{top_k}"
+        cache_key = f"{self._cache_scope}:{query}:{max_tokens}:{top_k}"
         cached = self._get_cached(cache_key)
         if cached:
             return cached
+        generation = self._cache.generation
 
         # Search for relevant content
         results = self.search.hybrid_search(query, query_vector=None, top_k=top_k)
@@ -141,9 +316,9 @@ class ContextBuilder:
             cached=False
         )
 
-        self._set_cached(cache_key, result)
+        self._set_cached(cache_key, query, result, results, generation)
         return result
 
     def clear_cache(self):
-        """Clear the context cache."""
+        """Clear the context cache (shared by all builders by default)."""
         self._cache.clear()
@@ -7,6 +7,8 @@ import os
 import sqlite3
 from pathlib import Path
 
+from ai_dev_orchestrator.knowledge.fts import apply_schema
+
 WORKSPACE_ROOT = Path(os.getenv("WORKSPACE_ROOT", "."))
 DB_PATH = WORKSPACE_ROOT / ".workspace" / "knowledge.db"
 
@@ -71,21 +73,39 @@ CREATE TABLE IF NOT EXISTS llm_calls (
 
 -- FTS5 virtual table for full-text search (SPEC-0043-SE01)
 CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
-    title, content, doc_id UNINDEXED, content='documents', content_rowid='rowid'
+    title, content, content='documents', content_rowid='rowid'
 );
 
 -- Triggers for FTS sync
 CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+
+-- Chunk-level FTS5 index, the same unit as vector search
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    content, content='chunks', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE OF content ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
 END;
 
 -- Updated_at trigger
@@ -114,6 +134,5 @@ def get_connection() -> sqlite3.Connection:
 def init_database() -> sqlite3.Connection:
     """Initialize database with schema."""
     conn = get_connection()
-    conn.executescript(SCHEMA)
-    conn.commit()
+    apply_schema(conn, SCHEMA)
     return conn
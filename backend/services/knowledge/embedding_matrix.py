@@ -0,0 +1,279 @@
+"""Embedding Matrix - SPEC-0043-SE02.
+
+Process-resident float32 matrix of chunk embeddings for vector search.
+
+The matrix is loaded once per database and refreshed incrementally from a
+high-water mark on ``embeddings.id``; a query is a single matrix-vector
+product followed by an ``argpartition`` top-k. Refreshes skip the database
+entirely while ``PRAGMA data_version`` shows no commits.
+
+Each row also records its document, so ``doc_type`` and ``archived`` filters
+resolve to a boolean row mask and only matching rows are scored. A matrix
+bound to a model identity loads only that model's rows, so vectors from
+different embedding backends are never scored together.
+
+With ``AIKH_VECTOR_QUANTIZATION=int8`` the matrix holds int8 codes read from
+the ``embeddings_q8`` companion table (a quarter of the memory and load I/O)
+and re-ranks its shortlist against the float32 ``embeddings.vector`` BLOBs.
+Codes are written at embedding time; rows that have none yet are quantized
+in memory, so loading never writes to the database. The loading, refresh
+and scoring machinery is shared with the paper matrices through
+:class:`ResidentMatrix`.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from ai_dev_orchestrator.knowledge.fanout import database_path
+from ai_dev_orchestrator.knowledge.resident_matrix import ResidentMatrix
+
+
+@dataclass
+class MatrixHit:
+    """Top-k candidate from the embedding matrix."""
+    embedding_id: int
+    chunk_id: int
+    score: float
+
+
+class EmbeddingMatrix(ResidentMatrix):
+    """Resident, incrementally refreshed matrix of normalized embeddings."""
+
+    FILTER_FIELDS = ("doc_type", "archived")
+    ROW_COLUMNS = {
+        "_chunk_ids": np.int64,
+        "_doc_codes": np.int32,  # Row -> document code, -1 if none
+    }
+
+    def __init__(self, quantized: bool | None = None, model: str | None = None):
+        """Initialize an empty matrix; rows load on :meth:`refresh`."""
+        self.model = model  # Only load rows with this embeddings.model; None loads all
+        super().__init__("embeddings", "vector", quantized)
+
+    def _reset(self):
+        """Drop all loaded rows."""
+        super()._reset()
+        self._doc_codes_by_id: dict[str, int] = {}
+        self._doc_ids: list[str] = []
+        self._doc_types: list[str | None] = []
+        self._archived_docs: frozenset[str] = frozenset()
+
+    def _doc_code(self, doc_id: str | None, doc_type: str | None) -> int:
+        """Dense code for a document, registering it on first sight."""
+        if doc_id is None:
+            return -1
+        code = self._doc_codes_by_id.get(doc_id)
+        if code is None:
+            code = self._doc_codes_by_id[doc_id] = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._doc_types.append(doc_type)
+        return code
+
+    def _usable(self, row: tuple) -> bool:
+        """Rows ``(id, chunk_id, doc_id, doc_type, model, vector)`` of the bound model."""
+        return self.model is None or row[4] == self.model
+
+    def _store_columns(self, rows: list[tuple], span: slice):
+        """Record each row's chunk id and document code."""
+        self._chunk_ids[span] = [r[1] for r in rows]
+        self._doc_codes[span] = [self._doc_code(r[2], r[3]) for r in rows]
+
+    def _refresh_metadata(self, conn: sqlite3.Connection):
+        """Re-read document types and the archived set; drop masks if either moved."""
+        documents = conn.execute(
+            "SELECT id, type, archived_at IS NOT NULL FROM documents"
+        ).fetchall()
+        archived = frozenset(doc_id for doc_id, _, is_archived in documents if is_archived)
+        types = {doc_id: doc_type for doc_id, doc_type, _ in documents}
+        doc_types = [types.get(d, t) for d, t in zip(self._doc_ids, self._doc_types)]
+        if archived != self._archived_docs or doc_types != self._doc_types:
+            self._archived_docs = archived
+            self._doc_types = doc_types
+            self._mask_cache.clear()
+
+    def _rows_since(self, conn: sqlite3.Connection, high_water: int) -> sqlite3.Cursor:
+        """Embedding rows ``(id, chunk_id, doc_id, doc_type, model, vector)``."""
+        vector, join = self._vector_select(conn, "e")
+        return conn.execute(f"""
+            SELECT e.id, e.chunk_id, d.id, d.type, e.model, {vector} FROM embeddings e
+            {join}
+            LEFT JOIN chunks c ON c.id = e.chunk_id
+            LEFT JOIN documents d ON d.id = c.doc_id
+            WHERE e.id > ? ORDER BY e.id
+        """, (high_water,))
+
+    def top_k(
+        self,
+        query_vector: list[float] | np.ndarray,
+        k: int,
+        min_score: float | None = None,
+        conn: sqlite3.Connection | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[MatrixHit]:
+        """Return the ``k`` best-scoring rows by cosine similarity.
+
+        In quantized mode, pass ``conn`` to re-rank the int8 shortlist with
+        the stored float32 vectors; without it scores are approximate.
+        ``filters`` restricts rows by ``doc_type`` (a type or list of types)
+        and/or ``archived`` (bool).
+        """
+        return self.top_k_batch([query_vector], k, min_score, conn, filters)[0]
+
+    def top_k_batch(
+        self,
+        query_vectors: list[list[float]] | np.ndarray,
+        k: int,
+        min_score: float | None = None,
+        conn: sqlite3.Connection | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[MatrixHit]]:
+        """Top-k rows for each of several queries.
+
+        Queries are scored ``QUERY_BLOCK`` at a time with one matrix-matrix
+        product, so the matrix is streamed once per block rather than once
+        per query. With ``filters`` (see :meth:`top_k`) only matching rows
+        are gathered and scored.
+        """
+        if not len(query_vectors):
+            return []
+        snapshot, tops, columns = self._rank(query_vectors, k, min_score, conn, filters)
+        embedding_ids, chunk_ids = snapshot["_row_ids"], snapshot["_chunk_ids"]
+        return [
+            [
+                MatrixHit(
+                    embedding_id=int(embedding_ids[i]),
+                    chunk_id=int(chunk_ids[i]),
+                    score=float(column[i]),
+                )
+                for i in top
+            ]
+            for top, column in zip(tops, columns)
+        ]
+
+    def _mask_key(self, filters: dict[str, Any]) -> tuple:
+        """``(doc_types, archived)`` with doc types as a sorted tuple."""
+        return (self._filter_values(filters.get("doc_type")), filters.get("archived"))
+
+    def _build_mask(self, key: tuple) -> np.ndarray:
+        """Row mask for ``doc_type``/``archived`` filters.
+
+        Filters are evaluated once per document and gathered to rows through
+        the row -> document codes.
+        """
+        doc_types, archived = key
+        # One slot per document plus a trailing slot for code -1 (no document)
+        allowed = np.ones(len(self._doc_ids) + 1, dtype=bool)
+        allowed[-1] = doc_types is None and archived is None
+        if doc_types is not None:
+            allowed[:-1] &= np.fromiter(
+                (t in doc_types for t in self._doc_types), dtype=bool, count=len(self._doc_ids)
+            )
+        if archived is not None:
+            allowed[:-1] &= np.fromiter(
+                (d in self._archived_docs for d in self._doc_ids),
+                dtype=bool, count=len(self._doc_ids),
+            ) == archived
+        return allowed[self._doc_codes[:self._size]]
+
+    def search_chunks(
+        self,
+        conn: sqlite3.Connection,
+        query_vector: list[float] | np.ndarray,
+        k: int,
+        min_score: float | None = None,
+        doc_types: list[str] | None = None,
+    ) -> list[tuple[MatrixHit, sqlite3.Row]]:
+        """Top-k active chunks, hydrated with chunk and document columns.
+
+        Archived documents are masked out before scoring, optionally along
+        with every ``doc_type`` not in ``doc_types``. Only the winning rows
+        are joined against ``chunks``/``documents``; the join re-checks
+        ``archived_at``, and the fetch is widened if that drops candidates.
+        """
+        return self.search_chunks_batch(conn, [query_vector], k, min_score, doc_types)[0]
+
+    def search_chunks_batch(
+        self,
+        conn: sqlite3.Connection,
+        query_vectors: list[list[float]] | np.ndarray,
+        k: int,
+        min_score: float | None = None,
+        doc_types: list[str] | None = None,
+    ) -> list[list[tuple[MatrixHit, sqlite3.Row]]]:
+        """``search_chunks`` for several queries, hydrating their union once."""
+        if not len(query_vectors):
+            return []
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        filters: dict[str, Any] = {"archived": False}
+        if doc_types is not None:
+            filters["doc_type"] = list(doc_types)
+
+        results: list[list[tuple[MatrixHit, sqlite3.Row]]] = [[] for _ in range(len(queries))]
+        rows: dict[int, sqlite3.Row] = {}
+        checked: set[int] = set()
+        pending = list(range(len(queries)))
+        fetch = max(k * 2, k + 8)
+        while pending:
+            batches = self.top_k_batch(
+                queries[pending], fetch, min_score, conn=conn, filters=filters
+            )
+            wanted = {h.chunk_id for hits in batches for h in hits} - checked
+            rows.update(self._hydrate(conn, sorted(wanted)))
+            checked |= wanted
+
+            short = []
+            for qi, hits in zip(pending, batches):
+                found = [(h, rows[h.chunk_id]) for h in hits if h.chunk_id in rows]
+                if len(found) >= k or len(hits) < fetch:
+                    results[qi] = found[:k]
+                else:
+                    short.append(qi)
+            pending = short
+            fetch *= 4
+        return results
+
+    def _hydrate(self, conn: sqlite3.Connection, chunk_ids: list[int]) -> dict[int, sqlite3.Row]:
+        """Chunk and document columns for active chunks, keyed by chunk id."""
+        by_chunk = {}
+        for start in range(0, len(chunk_ids), self.HYDRATE_BATCH):
+            batch = chunk_ids[start:start + self.HYDRATE_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(f"""
+                SELECT
+                    c.id as chunk_id, c.content as chunk_content, c.chunk_index,
+                    d.id as doc_id, d.type as doc_type, d.title
+                FROM chunks c
+                JOIN documents d ON d.id = c.doc_id
+                WHERE c.id IN ({placeholders}) AND d.archived_at IS NULL
+            """, batch).fetchall()
+            by_chunk.update((r['chunk_id'], r) for r in rows)
+        return by_chunk
+
+
+_matrices: dict[tuple[str, str | None], EmbeddingMatrix] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_embedding_matrix(conn: sqlite3.Connection, model: str | None = None) -> EmbeddingMatrix:
+    """Get the refreshed process-wide embedding matrix for a database.
+
+    ``model`` restricts the matrix to embeddings from that backend identity.
+    In-memory databases are private to their connection, so their matrix is
+    built per call and never cached.
+    """
+    path = database_path(conn)
+    if path is None:
+        matrix = EmbeddingMatrix(model=model)
+        matrix.refresh(conn)
+        return matrix
+    key = (path, model)
+    with _matrices_lock:
+        matrix = _matrices.get(key)
+        if matrix is None:
+            matrix = _matrices[key] = EmbeddingMatrix(model=model)
+    matrix.refresh(conn)
+    return matrix
@@ -8,9 +8,18 @@ Implements:
 Per user request: Levels 1+2 are default, with LLM re-ranking as UI toggle.
 """
 
+import hashlib
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+from ai_dev_orchestrator.knowledge.fanout import gather
+from pydantic import BaseModel
+
+from backend.services.cache_service import SQLiteCache, persistent_cache
 from backend.services.knowledge.database import get_connection
 from backend.services.knowledge.sanitizer import Sanitizer
 from backend.services.knowledge.search_service import SearchHit, SearchService
@@ -66,6 +75,32 @@ def enhance_query(query: str, artifact_type: str | None = None) -> str:
 # Level 2: LLM Re-ranking
 # =============================================================================
 
+RERANK_BATCH_SIZE = 5  # Candidates scored per LLM call
+RERANK_BUDGET_SECONDS = float(os.getenv("AIKH_RERANK_BUDGET", "8.0"))
+RERANK_CACHE_NAMESPACE = "rerank"
+RERANK_CACHE_TTL = 7 * 86400  # 1 week
+RERANK_SYSTEM_PROMPT = "You are a document relevance scorer for a software development project."
+RERANK_WORKERS = int(os.getenv("AIKH_RERANK_WORKERS", "4"))
+
+_rerank_executor: ThreadPoolExecutor | None = None
+_rerank_executor_lock = threading.Lock()
+
+
+def get_rerank_executor() -> ThreadPoolExecutor:
+    """Pool for LLM rerank calls, separate from the retrieval pool.
+
+    LLM batches run for seconds and keep running after the budget drops
+    them, so on the shared pool they would starve retrieval legs.
+    """
+    global _rerank_executor
+    with _rerank_executor_lock:
+        if _rerank_executor is None:
+            _rerank_executor = ThreadPoolExecutor(
+                max_workers=RERANK_WORKERS, thread_name_prefix="rerank"
+            )
+        return _rerank_executor
+
+
 @dataclass
 class RankedResult:
     """Result with LLM-assigned relevance score."""
@@ -74,92 +109,160 @@ class RankedResult:
     relevance_reason: str
 
 
+class ScoredDoc(BaseModel):
+    """LLM relevance rating for one candidate."""
+    index: int
+    score: float  # 0-10
+    reason: str
+
+
+class ReRankResponse(BaseModel):
+    """LLM relevance ratings for a batch of candidates."""
+    rankings: list[ScoredDoc]
+
+
+def _rerank_key(query_hash: str, hit: SearchHit, model: str) -> str:
+    """Cache key for one (query, chunk content, model) score."""
+    content_hash = hashlib.sha256(f"{hit.title}\n{hit.snippet}".encode()).hexdigest()[:16]
+    return f"{model}:{query_hash}:{content_hash}"
+
+
+def _score_batch(
+    query: str,
+    batch: list[tuple[str, SearchHit]],
+    cache: SQLiteCache,
+) -> dict[str, dict]:
+    """Score one batch with the LLM and persist the scores.
+
+    Scores are written here rather than by the caller, so a batch that
+    finishes after the rerank budget still warms the cache.
+
+    Returns:
+        ``{cache_key: {"score", "reason"}}`` for every candidate in the batch;
+        candidates the LLM left out score 0 and are not cached.
+    """
+    from backend.services.llm_service import generate_structured
+
+    candidate_text = "\n".join([
+        f"[{i}] {h.title}: {h.snippet[:200]}..."
+        for i, (_, h) in enumerate(batch)
+    ])
+
+    prompt = f"""Rate each document's relevance to this query: "{query}"
+
+Documents:
+{candidate_text}
+
+For each document, provide:
+- index: The document number [0-{len(batch)-1}]
+- score: Relevance score from 0 (irrelevant) to 10 (highly relevant)
+- reason: Brief explanation of relevance
+
+Rate every document."""
+
+    response = generate_structured(
+        prompt=prompt,
+        schema=ReRankResponse,
+        system_prompt=RERANK_SYSTEM_PROMPT,
+    )
+    if not response.success or not response.data:
+        raise RuntimeError(response.error or "empty re-ranking response")
+
+    rated = {}
+    for r in response.data.get("rankings", []):
+        idx = r.get("index", -1)
+        if 0 <= idx < len(batch):
+            rated[batch[idx][0]] = {"score": r.get("score", 0), "reason": r.get("reason", "")}
+    if rated:
+        cache.set_many(rated, ttl=RERANK_CACHE_TTL, namespace=RERANK_CACHE_NAMESPACE)
+
+    unrated = {"score": 0.0, "reason": "Not rated"}
+    return {key: rated.get(key, unrated) for key, _ in batch}
+
+
 def rerank_with_llm(
     query: str,
     candidates: list[SearchHit],
     top_k: int = 5,
+    budget: float = RERANK_BUDGET_SECONDS,
+    batch_size: int = RERANK_BATCH_SIZE,
 ) -> list[RankedResult]:
     """Use LLM to re-rank search results by relevance.
-    
+
+    Scores are cached persistently per (query, chunk content, model), so
+    only unseen candidates go to the LLM, in batches of ``batch_size``
+    scored in parallel. If any batch fails or the whole rerank takes longer
+    than ``budget`` seconds, the first-stage order is kept.
+
     Args:
         query: Original search query.
         candidates: List of search hits to re-rank.
         top_k: Number of top results to return.
-        
+        budget: Seconds the LLM batches may take together.
+        batch_size: Candidates per LLM call.
+
     Returns:
         List of RankedResult with LLM-assigned scores.
     """
     if not candidates:
         return []
 
-    try:
-        from pydantic import BaseModel
-
-        from backend.services.llm_service import generate_structured, is_available
-
-        if not is_available():
-            logger.warning("LLM not available for re-ranking, using original order")
-            return [
-                RankedResult(hit=h, relevance_score=h.score, relevance_reason="Original score")
-                for h in candidates[:top_k]
-            ]
-
-        # Build candidate list for LLM
-        candidate_text = "\n".join([
-            f"[{i}] {h.title}: {h.snippet[:200]}..."
-            for i, h in enumerate(candidates)
-        ])
-
-        class ScoredDoc(BaseModel):
-            index: int
-            score: float  # 0-10
-            reason: str
-
-        class ReRankResponse(BaseModel):
-            rankings: list[ScoredDoc]
-
-        prompt = f"""Rate each document's relevance to this query: "{query}"
-
-Documents:
-{candidate_text}
-
-For each document, provide:
-- index: The document number [0-{len(candidates)-1}]
-- score: Relevance score from 0 (irrelevant) to 10 (highly relevant)
-- reason: Brief explanation of relevance
-
-Return the top {top_k} most relevant documents."""
+    fallback = [
+        RankedResult(hit=h, relevance_score=h.score, relevance_reason="Original score")
+        for h in candidates[:top_k]
+    ]
 
-        response = generate_structured(
-            prompt=prompt,
-            schema=ReRankResponse,
-            system_prompt="You are a document relevance scorer for a software development project.",
-        )
+    try:
+        from backend.services.llm_service import get_current_model, is_available
+
+        query_hash = hashlib.sha256(query.encode()).hexdigest()[:16]
+        model = get_current_model()
+        keys = [_rerank_key(query_hash, h, model) for h in candidates]
+        cache = persistent_cache
+        scores = cache.get_many(keys, namespace=RERANK_CACHE_NAMESPACE)
+        pending = list({k: h for k, h in zip(keys, candidates) if k not in scores}.items())
+
+        if pending:
+            if not is_available():
+                logger.warning("LLM not available for re-ranking, using original order")
+                return fallback
+
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            start = time.monotonic()
+            legs = {
+                str(i): (lambda b=b: _score_batch(query, b, cache))
+                for i, b in enumerate(batches)
+            }
+            scored = gather(legs, budget=budget, executor=get_rerank_executor())
+            if len(scored) < len(batches):
+                logger.warning(
+                    f"LLM re-ranking: {len(batches) - len(scored)} of {len(batches)} batches "
+                    f"failed or missed the {budget}s budget, using original order"
+                )
+                return fallback
+            for batch_scores in scored.values():
+                scores.update(batch_scores)
+            logger.debug(
+                f"LLM re-ranking: {len(pending)} of {len(candidates)} candidates scored in "
+                f"{len(batches)} batches in {(time.monotonic() - start) * 1000:.1f}ms"
+            )
 
-        if response.success and response.data:
-            rankings = response.data.get("rankings", [])
-            # Sort by score descending
-            rankings.sort(key=lambda x: x.get("score", 0), reverse=True)
-
-            results = []
-            for r in rankings[:top_k]:
-                idx = r.get("index", 0)
-                if 0 <= idx < len(candidates):
-                    results.append(RankedResult(
-                        hit=candidates[idx],
-                        relevance_score=r.get("score", 0),
-                        relevance_reason=r.get("reason", ""),
-                    ))
-            return results
+        # Stable sort: ties keep the first-stage order
+        order = sorted(range(len(candidates)), key=lambda i: scores[keys[i]]["score"], reverse=True)
+        return [
+            RankedResult(
+                hit=candidates[i],
+                relevance_score=scores[keys[i]]["score"],
+                relevance_reason=scores[keys[i]]["reason"],
+            )
+            for i in order[:top_k]
+        ]
 
     except Exception as e:
         logger.warning(f"LLM re-ranking failed: {e}, using original order")
 
     # Fallback to original order
-    return [
-        RankedResult(hit=h, relevance_score=h.score, relevance_reason="Original score")
-        for h in candidates[:top_k]
-    ]
+    return fallback
 
 
 # =============================================================================
@@ -251,6 +354,7 @@ class EnhancedRAGConfig:
     top_k: int = 5                      # Final context count
     max_tokens: int = 3000              # Token budget for context
     graph_hops: int = 1                 # Relationship hops
+    rerank_budget: float = RERANK_BUDGET_SECONDS  # Seconds before keeping first-stage order
 
 
 @dataclass
@@ -324,7 +428,9 @@ class EnhancedRAGBuilder:
         # Level 2: LLM Re-ranking
         reranked = False
         if config.use_llm_reranking:
-            ranked = rerank_with_llm(query, candidates, top_k=config.top_k)
+            ranked = rerank_with_llm(
+                query, candidates, top_k=config.top_k, budget=config.rerank_budget
+            )
             if ranked:
                 candidates = [r.hit for r in ranked]
                 reranked = True
@@ -38,15 +38,17 @@ if LANGCHAIN_AVAILABLE:
             """Retrieve relevant documents for query."""
             # Generate query embedding if service available
             query_vector = None
+            model = None
             if self.use_embeddings and self.embedding_service:
                 result = self.embedding_service.embed(query)
-                query_vector = result.vector
+                query_vector, model = result.vector, result.model
 
             # Search using hybrid search
             results = self.search_service.hybrid_search(
                 query,
                 query_vector=query_vector,
-                top_k=self.top_k
+                top_k=self.top_k,
+                model=model,
             )
 
             # Convert to Langchain Document format
@@ -6,7 +6,13 @@ Provides semantic search and full-text search for knowledge injection into chat.
 import sqlite3
 from dataclasses import dataclass
 
+import numpy as np
+from ai_dev_orchestrator.knowledge.fanout import submit
+from ai_dev_orchestrator.knowledge.fts import search_chunks
+
+from ..cache_service import semantic_query_cache
 from .database import get_connection
+from .embedding_matrix import get_embedding_matrix
 from .embedding_service import EmbeddingService
 
 
@@ -21,16 +27,6 @@ class RetrievalResult:
     chunk_index: int | None = None
 
 
-def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    dot = sum(a * b for a, b in zip(vec1, vec2))
-    norm1 = sum(a * a for a in vec1) ** 0.5
-    norm2 = sum(b * b for b in vec2) ** 0.5
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
-    return dot / (norm1 * norm2)
-
-
 class KnowledgeRetriever:
     """Retrieve relevant context from knowledge base."""
 
@@ -48,43 +44,61 @@ class KnowledgeRetriever:
         query: str,
         limit: int = 5,
         min_score: float = 0.3,
+        doc_types: list[str] | None = None,
+        query_vector: np.ndarray | None = None,
     ) -> list[RetrievalResult]:
-        """Semantic search using embeddings."""
+        """Semantic search using embeddings (``query_vector`` if already embedded)."""
+        query_vectors = None if query_vector is None else [query_vector]
+        return self.search_semantic_batch(
+            [query], limit, min_score, doc_types, query_vectors=query_vectors
+        )[0]
+
+    def search_semantic_batch(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        min_score: float = 0.3,
+        doc_types: list[str] | None = None,
+        query_vectors: list[np.ndarray] | None = None,
+    ) -> list[list[RetrievalResult]]:
+        """Semantic search for several queries.
+
+        All queries are embedded in one ``encode`` call (unless
+        ``query_vectors`` are given) and scored against the embedding
+        matrix together, restricted to ``doc_types`` when given.
+        """
+        if not queries:
+            return []
         try:
-            query_embedding = self.embedding_service.embed(query)
-            query_vec = query_embedding.vector
+            if query_vectors is not None:
+                query_vecs = query_vectors
+            elif len(queries) == 1:
+                # Micro-batched with other requests' single queries
+                query_vecs = [self.embedding_service.embed(queries[0]).vector]
+            else:
+                query_vecs = self.embedding_service.encode(queries, cache=False)
         except Exception:
-            return []
+            return [[] for _ in queries]
 
         conn = get_connection()
         try:
-            rows = conn.execute("""
-                SELECT 
-                    e.vector, e.chunk_id,
-                    c.content as chunk_content, c.chunk_index,
-                    d.id as doc_id, d.type as doc_type, d.title
-                FROM embeddings e
-                JOIN chunks c ON c.id = e.chunk_id
-                JOIN documents d ON d.id = c.doc_id
-                WHERE d.archived_at IS NULL
-            """).fetchall()
-
-            results = []
-            for row in rows:
-                stored_vec = self.embedding_service.blob_to_vector(row['vector'])
-                score = cosine_similarity(query_vec, stored_vec)
-                if score >= min_score:
-                    results.append(RetrievalResult(
+            matrix = get_embedding_matrix(conn, self.embedding_service.model_name)
+            return [
+                [
+                    RetrievalResult(
                         doc_id=row['doc_id'],
                         doc_type=row['doc_type'],
                         title=row['title'],
                         content=row['chunk_content'],
-                        score=score,
+                        score=hit.score,
                         chunk_index=row['chunk_index'],
-                    ))
-
-            results.sort(key=lambda x: x.score, reverse=True)
-            return results[:limit]
+                    )
+                    for hit, row in hits
+                ]
+                for hits in matrix.search_chunks_batch(
+                    conn, query_vecs, limit, min_score, doc_types
+                )
+            ]
         finally:
             conn.close()
 
@@ -93,29 +107,19 @@ class KnowledgeRetriever:
         query: str,
         limit: int = 5,
     ) -> list[RetrievalResult]:
-        """Full-text search using FTS5."""
+        """Chunk-level full-text search using FTS5."""
         conn = get_connection()
         try:
-            rows = conn.execute("""
-                SELECT 
-                    d.id as doc_id, d.type as doc_type, d.title, 
-                    d.content, bm25(content_fts) as score
-                FROM content_fts f
-                JOIN documents d ON d.id = f.doc_id
-                WHERE content_fts MATCH ? AND d.archived_at IS NULL
-                ORDER BY score
-                LIMIT ?
-            """, (query, limit)).fetchall()
-
             return [
                 RetrievalResult(
-                    doc_id=row['doc_id'],
-                    doc_type=row['doc_type'],
-                    title=row['title'],
-                    content=row['content'][:1000],  # Truncate for context
-                    score=abs(row['score']),  # BM25 returns negative
+                    doc_id=m.doc_id,
+                    doc_type=m.doc_type,
+                    title=m.title,
+                    content=m.content,
+                    score=m.score,
+                    chunk_index=m.chunk_index,
                 )
-                for row in rows
+                for m in search_chunks(conn, query, limit)
             ]
         except sqlite3.OperationalError:
             return []
@@ -127,34 +131,58 @@ class KnowledgeRetriever:
         query: str,
         limit: int = 5,
         semantic_weight: float = 0.7,
+        query_vector: np.ndarray | None = None,
     ) -> list[RetrievalResult]:
-        """Hybrid search combining semantic and full-text."""
-        semantic_results = self.search_semantic(query, limit=limit * 2)
-        fts_results = self.search_fulltext(query, limit=limit * 2)
-
-        # Merge and dedupe by doc_id
-        seen: dict[str, RetrievalResult] = {}
-        
-        for r in semantic_results:
-            key = f"{r.doc_id}:{r.chunk_index or 0}"
-            if key not in seen:
-                r.score *= semantic_weight
-                seen[key] = r
-            else:
-                seen[key].score += r.score * semantic_weight
-
-        for r in fts_results:
-            key = f"{r.doc_id}:0"
-            if key not in seen:
-                r.score *= (1 - semantic_weight)
-                seen[key] = r
-            else:
-                seen[key].score += r.score * (1 - semantic_weight)
-
-        results = list(seen.values())
+        """Hybrid search combining semantic and full-text with Reciprocal Rank Fusion.
+
+        The legs score on different scales (cosine vs. negated BM25), so
+        chunks are fused by rank as in ``SearchService.hybrid_search``:
+        ``score = sum(weight / (k + rank))`` with k=60, weighting the
+        semantic leg by ``semantic_weight``. The full-text leg runs on the
+        retrieval pool while this thread embeds the query (once, unless
+        ``query_vector`` is given) and scores it.
+        """
+        k = 60  # RRF constant
+        fts_future = submit(self.search_fulltext, query, limit=limit * 2)
+        semantic_results = self.search_semantic(
+            query, limit=limit * 2, query_vector=query_vector
+        )
+        fts_results = fts_future.result()
+
+        # Both legs return chunks ranked best first; fuse by chunk
+        fused: dict[str, RetrievalResult] = {}
+        for results, weight in (
+            (semantic_results, semantic_weight),
+            (fts_results, 1 - semantic_weight),
+        ):
+            for rank, r in enumerate(results):
+                key = f"{r.doc_id}:{r.chunk_index or 0}"
+                if key not in fused:
+                    r.score = 0.0
+                    fused[key] = r
+                fused[key].score += weight / (k + rank + 1)
+
+        results = list(fused.values())
         results.sort(key=lambda x: x.score, reverse=True)
         return results[:limit]
 
+    def search_hybrid_cached(self, query: str, limit: int = 5) -> list[RetrievalResult]:
+        """``search_hybrid`` behind the semantic query cache.
+
+        A query whose embedding is close enough to a recent query's reuses
+        that query's ranked results; the embedding is computed once either way.
+        """
+        try:
+            query_vector = self.embedding_service.embed(query).vector
+        except Exception:
+            return self.search_hybrid(query, limit=limit)
+        namespace = f"knowledge:hybrid:{self.embedding_service.model_name}:{limit}"
+        results = semantic_query_cache.get(namespace, query_vector)
+        if results is None:
+            results = self.search_hybrid(query, limit=limit, query_vector=query_vector)
+            semantic_query_cache.set(namespace, query_vector, results)
+        return list(results)
+
 
 def get_knowledge_context(query: str, max_tokens: int = 2000) -> str:
     """Get formatted knowledge context for chat injection.
@@ -166,8 +194,7 @@ def get_knowledge_context(query: str, max_tokens: int = 2000) -> str:
     Returns:
         Formatted context string to inject into system prompt
     """
-    retriever = KnowledgeRetriever()
-    results = retriever.search_hybrid(query, limit=5)
+    results = get_retriever().search_hybrid_cached(query, limit=5)
     
     if not results:
         return ""
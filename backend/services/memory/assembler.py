@@ -10,6 +10,8 @@ import time
 from datetime import datetime
 from typing import Optional
 
+from backend.services.federated_retrieval import get_federated_retriever
+
 from .models import (
     Memory, MemorySession, MemoryType, MessageRole,
     AssembledContext, ContextSection, ContextSectionType,
@@ -211,17 +213,32 @@ class ContextAssembler:
         return candidates
     
     def _get_rag_candidates(self, query: str, session_id: str) -> list[Memory]:
-        """Get RAG results from configured sources."""
+        """Get RAG results from configured sources.
+
+        Memories and the configured stores are searched concurrently, each
+        under its own deadline, and fused into one ranking.
+        """
+        retriever = get_federated_retriever()
+        sources = ["memory"] + [s for s in self.options.rag_sources if s in retriever.sources]
+        hits = retriever.search(query, limit=self.options.max_rag_results * 2, sources=sources)
+
         results = []
+        for hit in hits:
+            if hit.source == "memory":
+                # Don't include if it's from current session (already in history)
+                if hit.item.session_id != session_id:
+                    results.append(hit.item)
+                continue
+            content = f"[{hit.source}] {hit.title}\n{hit.content}"
+            results.append(Memory(
+                type=MemoryType.RAG_RESULT,
+                role=MessageRole.SYSTEM,
+                content=content,
+                tokens=estimate_tokens(content),
+                priority=MemoryPriority.MEDIUM,
+                metadata={"source": hit.source, "source_id": hit.source_id, "score": hit.score},
+            ))
         
-        # Search memories via FTS
-        fts_results = db.search_memories_fts(query, limit=self.options.max_rag_results)
-        for mem in fts_results:
-            # Don't include if it's from current session (already in history)
-            if mem.session_id != session_id:
-                results.append(mem)
-        
-        # TODO: Add research paper search integration
         # TODO: Add trace search integration
         # TODO: Add code chunk search integration
         
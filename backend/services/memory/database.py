@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from .models import (
     Memory, MemorySession, MemoryType, MessageRole,
     AssembledContext, ContextSection, ContextSectionType, DebugInfo,
@@ -285,8 +287,7 @@ def add_memory(memory: Memory) -> Memory:
     try:
         embedding_blob = None
         if memory.embedding:
-            import struct
-            embedding_blob = struct.pack(f'{len(memory.embedding)}f', *memory.embedding)
+            embedding_blob = np.asarray(memory.embedding, dtype=np.float32).tobytes()
         
         conn.execute(
             """INSERT INTO memories
@@ -708,10 +709,8 @@ def _row_to_memory(row) -> Memory:
     """Convert database row to Memory."""
     embedding = None
     if row["embedding"]:
-        import struct
-        blob = row["embedding"]
-        count = len(blob) // 4
-        embedding = list(struct.unpack(f'{count}f', blob))
+        # Memory.embedding is a pydantic list[float] for the API
+        embedding = np.frombuffer(row["embedding"], dtype=np.float32).tolist()
     
     return Memory(
         id=row["id"],
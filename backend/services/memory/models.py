@@ -131,7 +131,7 @@ class AssemblyOptions(BaseModel):
     """Options for context assembly."""
     role: str = "assistant"
     history_limit: int = 50
-    rag_sources: list[str] = Field(default_factory=lambda: ["research", "traces", "code"])
+    rag_sources: list[str] = Field(default_factory=lambda: ["knowledge", "research", "chatlogs"])
     include_summary: bool = True
     include_related_traces: bool = True
     max_rag_results: int = 5
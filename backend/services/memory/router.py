@@ -3,6 +3,7 @@
 FastAPI endpoints for the conversation memory system.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
@@ -212,8 +213,10 @@ async def assemble_context_endpoint(request: AssembleContextRequest):
         # Default based on model (can be enhanced with model registry lookup)
         token_budget = 100000
     
-    # Assemble context
-    context = assemble_context(
+    # Assemble context off the event loop: the RAG fan-out encodes queries
+    # and waits on its search legs
+    context = await asyncio.to_thread(
+        assemble_context,
         session_id=request.session_id,
         user_message=request.user_message,
         model_id=request.model_id,
@@ -12,6 +12,7 @@ from .cache_service import (
     clear_all_caches,
     research_cache,
     query_cache,
+    semantic_query_cache,
     embedding_cache,
     trace_cache,
     persistent_cache,
@@ -44,7 +45,7 @@ async def get_cache_statistics():
 
 @router.post("/cache/clear")
 async def clear_caches(
-    cache_name: Optional[str] = Query(None, description="Specific cache to clear (research, query, embedding, trace, all)")
+    cache_name: Optional[str] = Query(None, description="Specific cache to clear (research, query, semantic, embedding, trace, all)")
 ):
     """Clear caches to free memory."""
     if cache_name == "all" or cache_name is None:
@@ -54,6 +55,7 @@ async def clear_caches(
     cache_map = {
         "research": research_cache,
         "query": query_cache,
+        "semantic": semantic_query_cache,
         "embedding": embedding_cache,
         "trace": trace_cache,
     }
@@ -113,7 +115,7 @@ async def rebuild_vector_index(
         return {"error": f"Index not found: {index_name}"}
     
     index.build()
-    return {"index": index_name, "rebuilt": True, "vectors": len(index._vectors)}
+    return {"index": index_name, "rebuilt": True, "vectors": len(index)}
 
 
 @router.post("/vectors/save")
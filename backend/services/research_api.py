@@ -14,6 +14,7 @@ from fastapi import FastAPI, APIRouter, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import asyncio
 import sys
 from pathlib import Path
 
@@ -25,6 +26,8 @@ try:
 except ImportError:
     ResearchEnhancedOrganizer = None
 
+from backend.services.research_autocomplete import AutocompleteIndex
+
 # GPU-accelerated service
 try:
     from backend.services.gpu_service import get_gpu_service, GPUSearchService, init_gpu_tables
@@ -65,6 +68,16 @@ def get_organizer() -> ResearchEnhancedOrganizer:
     return _organizer
 
 
+# Lazy-loaded autocomplete index over the organizer's database
+_autocomplete_index = None
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    global _autocomplete_index
+    if _autocomplete_index is None:
+        _autocomplete_index = AutocompleteIndex(get_organizer()._get_conn)
+    return _autocomplete_index
+
+
 # === Models ===
 
 class SearchResult(BaseModel):
@@ -232,6 +245,8 @@ async def process_downloads(max_downloads: int = Query(5, ge=1, le=20)):
     """Trigger download of queued papers."""
     org = get_organizer()
     downloaded = org.process_download_queue(max_downloads)
+    if downloaded:
+        get_autocomplete_index().refresh(force=True)
     return {"downloaded": downloaded}
 
 
@@ -414,59 +429,13 @@ async def autocomplete(
     type: Optional[str] = Query(None, description="Filter: paper, concept, author"),
     limit: int = Query(10, ge=1, le=50)
 ):
-    """Fast autocomplete for papers, concepts, and authors."""
-    org = get_organizer()
-    results = []
-    prefix_lower = prefix.lower()
-    
-    with org._get_conn() as conn:
-        # Search papers by title
-        if type is None or type == "paper":
-            cursor = conn.execute("""
-                SELECT id, title, arxiv_id FROM research_papers
-                WHERE LOWER(title) LIKE ? LIMIT ?
-            """, (f"%{prefix_lower}%", limit))
-            for row in cursor.fetchall():
-                results.append(AutocompleteResult(
-                    value=row["id"],
-                    type="paper",
-                    display=row["title"][:60] + ("..." if len(row["title"] or "") > 60 else ""),
-                    metadata={"arxiv_id": row["arxiv_id"]}
-                ))
-        
-        # Search concepts
-        if type is None or type == "concept":
-            cursor = conn.execute("""
-                SELECT normalized_concept, concept_type, SUM(frequency) as freq
-                FROM extracted_concepts
-                WHERE normalized_concept LIKE ?
-                GROUP BY normalized_concept
-                ORDER BY freq DESC LIMIT ?
-            """, (f"%{prefix_lower}%", limit))
-            for row in cursor.fetchall():
-                results.append(AutocompleteResult(
-                    value=row["normalized_concept"],
-                    type="concept",
-                    display=f"{row['normalized_concept']} ({row['concept_type']})",
-                    metadata={"frequency": row["freq"], "concept_type": row["concept_type"]}
-                ))
-        
-        # Search authors (from paper metadata)
-        if type is None or type == "author":
-            cursor = conn.execute("""
-                SELECT DISTINCT authors FROM research_papers
-                WHERE LOWER(authors) LIKE ? LIMIT ?
-            """, (f"%{prefix_lower}%", limit))
-            for row in cursor.fetchall():
-                if row["authors"]:
-                    results.append(AutocompleteResult(
-                        value=row["authors"],
-                        type="author",
-                        display=row["authors"][:60] + ("..." if len(row["authors"]) > 60 else ""),
-                        metadata=None
-                    ))
-    
-    return results[:limit]
+    """Fast autocomplete for papers, concepts, and authors.
+
+    Served from an in-memory prefix index that picks up newly ingested
+    papers and concepts incrementally.
+    """
+    index = get_autocomplete_index()
+    return [AutocompleteResult(**r) for r in index.search(prefix, type, limit)]
 
 
 @router.get("/api/aikh/papers/{paper_id}/bibtex")
@@ -570,6 +539,8 @@ class GPUSearchRequest(BaseModel):
     top_k: int = 10
     search_type: str = "hybrid"  # paper, chunk, hybrid
     min_similarity: float = 0.3
+    category: Optional[str] = None
+    chunk_type: Optional[str] = None  # chunk search only
 
 
 class GPUSearchResult(BaseModel):
@@ -593,22 +564,31 @@ async def gpu_search(request: GPUSearchRequest):
     
     gpu = get_gpu_service()
     
+    # Encoding and scoring block; run them off the event loop so concurrent
+    # queries can share an encode batch
     if request.search_type == "paper":
-        results = gpu.semantic_search_papers(
+        results = await asyncio.to_thread(
+            gpu.semantic_search_papers,
             request.query, 
             top_k=request.top_k,
-            min_similarity=request.min_similarity
+            min_similarity=request.min_similarity,
+            category=request.category
         )
     elif request.search_type == "chunk":
-        results = gpu.semantic_search_chunks(
+        results = await asyncio.to_thread(
+            gpu.semantic_search_chunks,
             request.query,
             top_k=request.top_k,
-            min_similarity=request.min_similarity
+            min_similarity=request.min_similarity,
+            category=request.category,
+            chunk_type=request.chunk_type
         )
     else:  # hybrid
-        results = gpu.hybrid_search(
+        results = await asyncio.to_thread(
+            gpu.hybrid_search,
             request.query,
-            top_k=request.top_k
+            top_k=request.top_k,
+            category=request.category
         )
     
     return [
@@ -650,6 +630,7 @@ async def embed_paper(paper_id: str):
     success = gpu.embed_new_paper(paper_id)
     
     if success:
+        get_autocomplete_index().refresh(force=True)
         return {"status": "embedded", "paper_id": paper_id}
     else:
         raise HTTPException(404, "Paper not found or could not be embedded")
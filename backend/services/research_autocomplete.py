@@ -0,0 +1,324 @@
+"""In-memory prefix index for research autocomplete.
+
+``/api/aikh/autocomplete`` is called on every keystroke. Rather than running
+``LIKE '%prefix%'`` scans over research.db per call, paper titles, extracted
+concepts and authors are held in sorted key arrays and searched with
+``bisect``: every word start of a name is a key, so "att" finds
+"Attention Is All You Need" and "all y" finds it too.
+
+The index is refreshed incrementally: new ``research_papers`` rows are
+found by rowid high-water mark and new ``extracted_concepts`` rows by id,
+and only the concepts they touch are re-aggregated. A paper re-ingested
+under a new rowid is re-keyed under its new title and authors. Refreshes
+are throttled to one per ``refresh_interval`` seconds, and
+``refresh(force=True)`` can be called right after an in-process ingest. A
+shrinking paper table (deletes) triggers a full rebuild; concept row counts
+or frequency totals that no longer match the database (deletes, updated
+frequencies) trigger a full re-aggregation of concepts.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from typing import Any
+
+MAX_KEY_CHARS = 80
+MAX_SCAN = 2000  # Keys examined per lookup before ranking
+DEFAULT_REFRESH_INTERVAL = 5.0
+
+_WORD_START_RE = re.compile(r"\w+")
+_AUTHOR_SPLIT_RE = re.compile(r"\s*(?:,|;|\band\b)\s*")
+
+
+def word_start_keys(text: str) -> list[str]:
+    """Lower-cased suffixes of ``text`` starting at each word."""
+    lowered = text.lower()
+    keys = {lowered[m.start():m.start() + MAX_KEY_CHARS] for m in _WORD_START_RE.finditer(lowered)}
+    return sorted(keys)
+
+
+def split_authors(authors: str | None) -> list[str]:
+    """Author names from a JSON array or a comma/``and`` separated string."""
+    if not authors:
+        return []
+    try:
+        parsed = json.loads(authors)
+    except ValueError:
+        parsed = None
+    names = parsed if isinstance(parsed, list) else _AUTHOR_SPLIT_RE.split(authors)
+    return [str(n).strip() for n in names if str(n).strip()]
+
+
+class PrefixIndex:
+    """Sorted ``(key, item)`` pairs searched with bisect."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys: list[tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        """Number of ``(key, item)`` pairs."""
+        return len(self._keys)
+
+    def build(self, items: dict[str, str]) -> None:
+        """Replace the contents with ``{item: text}``."""
+        self._keys = sorted((key, item) for item, text in items.items()
+                            for key in word_start_keys(text))
+
+    def add(self, item: str, text: str) -> None:
+        """Index one more item."""
+        for key in word_start_keys(text):
+            insort(self._keys, (key, item))
+
+    def remove(self, item: str, text: str) -> None:
+        """Drop the keys ``add(item, text)`` created."""
+        for key in word_start_keys(text):
+            i = bisect_left(self._keys, (key, item))
+            if i < len(self._keys) and self._keys[i] == (key, item):
+                del self._keys[i]
+
+    def search(self, prefix: str, max_scan: int = MAX_SCAN) -> list[str]:
+        """Distinct items with a key starting with ``prefix``, in key order."""
+        prefix = prefix.lower()
+        items: dict[str, None] = {}
+        i = bisect_left(self._keys, (prefix, ""))
+        end = min(len(self._keys), i + max_scan)
+        while i < end and self._keys[i][0].startswith(prefix):
+            items.setdefault(self._keys[i][1])
+            i += 1
+        return list(items)
+
+
+class AutocompleteIndex:
+    """Papers, concepts and authors from research.db, kept in memory."""
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        """Initialize an empty index; the first lookup builds it.
+
+        Args:
+            connect: Returns a new research.db connection with Row factory.
+            refresh_interval: Minimum seconds between change checks.
+        """
+        self.connect = connect
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._built = False
+        self._papers: dict[str, tuple[str, str | None]] = {}
+        self._paper_authors: dict[str, list[str]] = {}
+        self._concepts: dict[str, tuple[str, int]] = {}
+        self._concept_rows: dict[str, int] = {}
+        self._concept_totals = (0, 0)  # (rows, frequency) across _concepts
+        self._authors: dict[str, int] = {}
+        self._paper_index = PrefixIndex()
+        self._concept_index = PrefixIndex()
+        self._author_index = PrefixIndex()
+        self._paper_mark = (0, 0)  # (max rowid, count)
+        self._concept_mark = 0  # max id
+
+    def refresh(self, force: bool = False) -> None:
+        """Pick up papers and concepts added since the last refresh."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._built and now - self._checked_at < self.refresh_interval:
+                return
+            self._checked_at = now
+            conn = self.connect()
+            try:
+                if not self._built:
+                    self._rebuild(conn)
+                else:
+                    self._refresh_papers(conn)
+                    self._refresh_concepts(conn)
+            finally:
+                conn.close()
+
+    def _rebuild(self, conn: sqlite3.Connection) -> None:
+        self._papers, self._paper_authors, self._authors = {}, {}, {}
+        self._paper_mark, self._concept_mark = (0, 0), 0
+        for paper_id, title, arxiv_id, authors in self._new_papers(conn):
+            self._papers[paper_id] = (title, arxiv_id)
+            self._paper_authors[paper_id] = names = split_authors(authors)
+            for name in names:
+                self._authors[name] = self._authors.get(name, 0) + 1
+        self._paper_index.build({pid: title for pid, (title, _) in self._papers.items()})
+        self._author_index.build({name: name for name in self._authors})
+
+        self._concept_mark, _ = self._new_concepts(conn)
+        self._reaggregate_concepts(conn)
+        self._built = True
+
+    def _new_papers(self, conn: sqlite3.Connection) -> list[tuple]:
+        """Papers past the rowid mark; advances the mark."""
+        max_rowid, count = conn.execute(
+            "SELECT COALESCE(MAX(rowid), 0), COUNT(*) FROM research_papers"
+        ).fetchone()
+        rows = conn.execute(
+            "SELECT id, title, arxiv_id, authors FROM research_papers WHERE rowid > ?",
+            (self._paper_mark[0],),
+        ).fetchall()
+        self._paper_mark = (max_rowid, count)
+        return [tuple(r) for r in rows if r[1]]
+
+    def _refresh_papers(self, conn: sqlite3.Connection) -> None:
+        max_rowid, count = conn.execute(
+            "SELECT COALESCE(MAX(rowid), 0), COUNT(*) FROM research_papers"
+        ).fetchone()
+        if count < self._paper_mark[1] or max_rowid < self._paper_mark[0]:
+            self._rebuild(conn)  # Papers were deleted
+            return
+        if max_rowid == self._paper_mark[0]:
+            return
+        for paper_id, title, arxiv_id, authors in self._new_papers(conn):
+            if paper_id in self._papers:  # Re-ingested under a new rowid
+                self._remove_paper(paper_id)
+            self._paper_index.add(paper_id, title)
+            self._papers[paper_id] = (title, arxiv_id)
+            self._paper_authors[paper_id] = names = split_authors(authors)
+            for name in names:
+                if name not in self._authors:
+                    self._author_index.add(name, name)
+                self._authors[name] = self._authors.get(name, 0) + 1
+
+    def _remove_paper(self, paper_id: str) -> None:
+        """Drop a paper's title keys and its author counts."""
+        title, _ = self._papers.pop(paper_id)
+        self._paper_index.remove(paper_id, title)
+        for name in self._paper_authors.pop(paper_id, []):
+            self._authors[name] -= 1
+            if not self._authors[name]:
+                del self._authors[name]
+                self._author_index.remove(name, name)
+
+    def _new_concepts(self, conn: sqlite3.Connection) -> tuple[int, set[str]]:
+        """(max id, normalized names) of concept rows past the id mark."""
+        try:
+            rows = conn.execute(
+                "SELECT id, normalized_concept FROM extracted_concepts WHERE id > ?",
+                (self._concept_mark,),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return self._concept_mark, set()  # Concept extraction never ran
+        mark = max((r[0] for r in rows), default=self._concept_mark)
+        return mark, {r[1] for r in rows if r[1]}
+
+    def _aggregate_concepts(
+        self, conn: sqlite3.Connection, names: set[str] | None
+    ) -> dict[str, tuple[str, int, int]]:
+        """``{name: (concept_type, total frequency, rows)}`` for ``names`` (None: all)."""
+        if names is not None and not names:
+            return {}
+        where, params = "normalized_concept != ''", []
+        if names is not None:
+            params = sorted(names)
+            where = f"normalized_concept IN ({','.join('?' * len(params))})"
+        try:
+            rows = conn.execute(f"""
+                SELECT normalized_concept, concept_type, SUM(frequency) as freq, COUNT(*)
+                FROM extracted_concepts
+                WHERE {where}
+                GROUP BY normalized_concept
+            """, params).fetchall()
+        except sqlite3.OperationalError:
+            return {}  # Concept extraction never ran
+        return {r[0]: (r[1], r[2] or 0, r[3]) for r in rows}
+
+    def _database_concept_totals(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        """(rows, frequency) over all named concepts in the database."""
+        try:
+            rows, freq = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(frequency), 0) FROM extracted_concepts "
+                "WHERE normalized_concept != ''"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return 0, 0
+        return rows, freq
+
+    def _reaggregate_concepts(self, conn: sqlite3.Connection) -> None:
+        """Rebuild every concept aggregate and the concept index."""
+        aggregates = self._aggregate_concepts(conn, None)
+        self._concepts = {name: (ctype, freq) for name, (ctype, freq, _) in aggregates.items()}
+        self._concept_rows = {name: rows for name, (_, _, rows) in aggregates.items()}
+        self._concept_totals = (
+            sum(self._concept_rows.values()),
+            sum(freq for _, freq in self._concepts.values()),
+        )
+        self._concept_index.build({name: name for name in self._concepts})
+
+    def _refresh_concepts(self, conn: sqlite3.Connection) -> None:
+        # INSERT OR REPLACE gives replaced rows new ids, so touched concepts
+        # are re-aggregated rather than incremented
+        self._concept_mark, names = self._new_concepts(conn)
+        rows, freq = self._concept_totals
+        for name, (ctype, new_freq, new_rows) in self._aggregate_concepts(conn, names).items():
+            if name in self._concepts:
+                rows -= self._concept_rows[name]
+                freq -= self._concepts[name][1]
+            else:
+                self._concept_index.add(name, name)
+            self._concepts[name] = (ctype, new_freq)
+            self._concept_rows[name] = new_rows
+            rows, freq = rows + new_rows, freq + new_freq
+        self._concept_totals = (rows, freq)
+
+        # Deletes and in-place frequency updates leave no new ids; they show
+        # up as totals that no longer match
+        if self._database_concept_totals(conn) != self._concept_totals:
+            self._reaggregate_concepts(conn)
+
+    def search(self, prefix: str, kind: str | None = None, limit: int = 10) -> list[dict[str, Any]]:
+        """Suggestions for ``prefix``, papers then concepts then authors.
+
+        Args:
+            prefix: Typed text, matched against word starts.
+            kind: Only ``paper``, ``concept`` or ``author`` suggestions.
+            limit: Maximum suggestions.
+
+        Returns:
+            Dicts with ``value``, ``type``, ``display`` and ``metadata``.
+        """
+        self.refresh()
+        with self._lock:
+            return self._search(prefix, kind, limit)
+
+    def _search(self, prefix: str, kind: str | None, limit: int) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        if kind is None or kind == "paper":
+            for paper_id in self._paper_index.search(prefix)[:limit]:
+                title, arxiv_id = self._papers[paper_id]
+                results.append({
+                    "value": paper_id,
+                    "type": "paper",
+                    "display": title[:60] + ("..." if len(title) > 60 else ""),
+                    "metadata": {"arxiv_id": arxiv_id},
+                })
+        if kind is None or kind == "concept":
+            names = self._concept_index.search(prefix)
+            names.sort(key=lambda n: self._concepts[n][1], reverse=True)
+            for name in names[:limit]:
+                concept_type, freq = self._concepts[name]
+                results.append({
+                    "value": name,
+                    "type": "concept",
+                    "display": f"{name} ({concept_type})",
+                    "metadata": {"frequency": freq, "concept_type": concept_type},
+                })
+        if kind is None or kind == "author":
+            names = self._author_index.search(prefix)
+            names.sort(key=lambda n: self._authors[n], reverse=True)
+            for name in names[:limit]:
+                results.append({
+                    "value": name,
+                    "type": "author",
+                    "display": name[:60] + ("..." if len(name) > 60 else ""),
+                    "metadata": {"papers": self._authors[name]},
+                })
+        return results[:limit]
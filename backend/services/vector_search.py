@@ -3,12 +3,16 @@
 High-performance vector similarity search with:
 - NumPy vectorized operations (CPU baseline)
 - Optional FAISS GPU acceleration
+- Pure-NumPy IVF approximate search when FAISS is absent
+- Optional int8 scalar quantization with float32 rerank
+- Metadata filters evaluated as precomputed boolean masks
 - Pre-built index for fast retrieval
 - Batch processing for efficiency
 
 Applies to: research papers, chat logs, P2RE traces
 """
 
+import json
 import logging
 import numpy as np
 from dataclasses import dataclass
@@ -16,9 +20,18 @@ from pathlib import Path
 from typing import Any, Optional
 import struct
 import os
+import threading
+
+from ai_dev_orchestrator.knowledge.quantization import int8_scores, quantize_int8
 
 logger = logging.getLogger(__name__)
 
+# On-disk index layout: fixed-size header followed by raw float32 rows
+INDEX_MAGIC = b"VIDX"
+INDEX_FORMAT_VERSION = 1
+HEADER_FORMAT = "<4sHIQ8s8s64s"  # magic, version, dim, count, metric, type, model
+HEADER_SIZE = 128
+
 # Optional FAISS import for GPU acceleration
 try:
     import faiss
@@ -43,8 +56,163 @@ class VectorSearchResult:
     metadata: dict | None = None
 
 
+@dataclass
+class IVFLists:
+    """Inverted lists for the NumPy IVF index.
+
+    Main-segment rows are stored sorted by list, so list ``i`` is the
+    contiguous row range ``offsets[i]:offsets[i + 1]``.
+    """
+    centroids: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, metric: str) -> np.ndarray:
+    """Nearest centroid per row, computed in blocks to bound memory."""
+    out = np.empty(len(vectors), dtype=np.int64)
+    c_norms = (centroids ** 2).sum(axis=1) if metric == "l2" else None
+    for start in range(0, len(vectors), 16384):
+        block = np.asarray(vectors[start:start + 16384], dtype=np.float32)
+        sims = block @ centroids.T
+        if c_norms is not None:
+            sims = 2 * sims - c_norms  # argmax of this == argmin L2 distance
+        out[start:start + len(block)] = sims.argmax(axis=1)
+    return out
+
+
+def train_kmeans(
+    vectors: np.ndarray,
+    nlist: int,
+    metric: str = "cosine",
+    iterations: int = 20,
+    max_train_points: int = 256,
+    seed: int = 0,
+) -> np.ndarray:
+    """Train IVF centroids with Lloyd's k-means in NumPy.
+
+    Trains on at most ``max_train_points * nlist`` sampled rows (the same cap
+    FAISS uses). Centroids are re-normalized for cosine/ip so assignment is
+    by maximum inner product (spherical k-means).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample = vectors
+    if n > max_train_points * nlist:
+        sample = vectors[np.sort(rng.choice(n, max_train_points * nlist, replace=False))]
+    sample = np.asarray(sample, dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids, metric)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = counts == 0
+        order = np.argsort(labels, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[~empty]
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+        centroids[~empty] = sums / counts[~empty, None]
+        # Re-seed empty lists from random points
+        if empty.any():
+            centroids[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        if metric != "l2":
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            centroids /= norms
+    return centroids
+
+
+Masks = dict[str, dict[Any, np.ndarray]]  # field -> value -> row mask
+Segment = tuple[list[Any], np.ndarray, list[dict[str, Any] | None]]  # ids, vectors, metadata
+
+
+def _values(value: Any) -> tuple:
+    """Metadata or filter values as a tuple; lists, tuples and sets are multi-valued."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return (value,)
+
+
+def build_masks(metadata: list[dict[str, Any] | None]) -> Masks:
+    """One boolean row mask per (field, value) present in ``metadata``."""
+    masks: Masks = {}
+    for row, meta in enumerate(metadata):
+        for field, value in (meta or {}).items():
+            field_masks = masks.setdefault(field, {})
+            for v in _values(value):
+                mask = field_masks.get(v)
+                if mask is None:
+                    mask = field_masks[v] = np.zeros(len(metadata), dtype=bool)
+                mask[row] = True
+    return masks
+
+
+def filter_mask(masks: Masks, filters: dict[str, Any], n: int) -> np.ndarray:
+    """Rows matching every field in ``filters`` (any of a field's values)."""
+    mask = np.ones(n, dtype=bool)
+    for field, wanted in filters.items():
+        field_masks = masks.get(field, {})
+        matched = np.zeros(n, dtype=bool)
+        for v in _values(wanted):
+            if v in field_masks:
+                matched |= field_masks[v]
+        mask &= matched
+    return mask
+
+
+def matches_filters(metadata: dict[str, Any] | None, filters: dict[str, Any]) -> bool:
+    """Row-at-a-time equivalent of :func:`filter_mask` for the delta segment."""
+    metadata = metadata or {}
+    return all(
+        field in metadata and not set(_values(metadata[field])).isdisjoint(_values(wanted))
+        for field, wanted in filters.items()
+    )
+
+
+def _take_masks(masks: Masks, rows: np.ndarray) -> Masks:
+    """Masks restricted to (or reordered by) ``rows``, dropping empty ones."""
+    taken: Masks = {}
+    for field, field_masks in masks.items():
+        for value, mask in field_masks.items():
+            mask = np.asarray(mask[rows])
+            if mask.any():
+                taken.setdefault(field, {})[value] = mask
+    return taken
+
+
+def _concat_masks(first: Masks, n_first: int, second: Masks, n_second: int) -> Masks:
+    """Masks for the rows of ``first`` followed by the rows of ``second``."""
+    merged: Masks = {}
+    for field in set(first) | set(second):
+        a, b = first.get(field, {}), second.get(field, {})
+        for value in set(a) | set(b):
+            merged.setdefault(field, {})[value] = np.concatenate([
+                a[value] if value in a else np.zeros(n_first, dtype=bool),
+                b[value] if value in b else np.zeros(n_second, dtype=bool),
+            ])
+    return merged
+
+
 class VectorIndex:
-    """High-performance vector index with optional GPU acceleration."""
+    """High-performance vector index with optional GPU acceleration.
+
+    The index is log-structured: a read-only *main* segment (FAISS or NumPy)
+    plus a small mutable *delta* segment. ``add``/``add_batch`` append to the
+    delta and ``delete`` tombstones rows in the main segment, so writes never
+    invalidate the main segment. Queries merge both segments; once the delta
+    grows past ``delta_threshold`` (or the tombstones past
+    ``tombstone_threshold``) a background compaction folds them into a
+    freshly built main segment.
+
+    Vectors may carry a metadata dict (``{"doc_type": "adr", "category":
+    ["cs.IR", "cs.LG"]}``). The main segment keeps one boolean mask per
+    (field, value), so ``search(..., filters=...)`` scores only matching
+    rows instead of over-fetching and post-filtering.
+    """
+    
+    QUERY_BLOCK = 64  # Queries scored per matrix product in search_batch
     
     def __init__(
         self,
@@ -52,241 +220,834 @@ class VectorIndex:
         use_gpu: bool = True,
         index_type: str = "flat",  # flat, ivf, hnsw
         metric: str = "cosine",  # cosine, l2, ip
+        model_version: str | None = None,
+        delta_threshold: int = 10_000,
+        tombstone_threshold: int = 1_000,  # Each one widens every main-segment fetch
+        nprobe: int = 8,  # IVF lists scanned per query
+        quantize: bool = False,  # Score int8 codes, rerank with float32
+        rerank_factor: int = 4,
     ):
         self.dimension = dimension
         self.use_gpu = use_gpu and FAISS_GPU_AVAILABLE
         self.index_type = index_type
         self.metric = metric
+        self.model_version = model_version  # Embedding model the vectors came from
+        self.delta_threshold = delta_threshold
+        self.tombstone_threshold = tombstone_threshold
+        self.nprobe = nprobe
+        self.quantize = quantize and metric in ("cosine", "ip")
+        self.rerank_factor = rerank_factor
         
+        # Main segment
         self.index = None
+        self._numpy_vectors: np.ndarray | None = None
+        self._ivf: IVFLists | None = None  # NumPy IVF lists over _numpy_vectors
+        self._q8: tuple[np.ndarray, np.ndarray] | None = None  # int8 codes, scales
+        self._masks: Masks = {}  # Metadata masks over main-segment rows
         self.id_map: dict[int, Any] = {}  # FAISS index -> original ID
-        self._vectors: list[np.ndarray] = []
+        self._id_array: np.ndarray | None = None  # Memory-mapped IDs from load()
+        self._main_size = 0
+        self._main_id_set: set | None = None
         self._built = False
         
+        # Delta segment (authoritative for the IDs it holds)
+        self._vectors: list[np.ndarray] = []
+        self._delta_ids: list[Any] = []
+        self._delta_meta: list[dict[str, Any] | None] = []
+        self._delta_pos: dict[Any, int] = {}
+        self._delta_snapshot: Segment | None = None
+        
+        # IDs hidden in the main segment; copy-on-write so searches can read
+        # them without holding the lock
+        self._tombstones: frozenset = frozenset()
+        
+        # Compaction state
+        self._lock = threading.RLock()
+        self._compaction: threading.Thread | None = None
+        self._frozen: Segment | None = None
+        self._late_tombstones: frozenset | None = None
+        
         logger.info(f"VectorIndex: dim={dimension}, gpu={self.use_gpu}, type={index_type}")
     
-    def add(self, id: Any, vector: list[float] | np.ndarray) -> None:
-        """Add vector to index (batch build later)."""
-        if isinstance(vector, list):
-            vector = np.array(vector, dtype=np.float32)
-        
-        self.id_map[len(self._vectors)] = id
-        self._vectors.append(vector)
-        self._built = False
+    def __len__(self) -> int:
+        """Number of live vectors across all segments."""
+        with self._lock:
+            frozen = len(self._frozen[0]) if self._frozen else 0
+            return self._main_size + frozen + len(self._delta_ids) - len(self._tombstones)
     
-    def add_batch(self, ids: list[Any], vectors: np.ndarray) -> None:
-        """Add batch of vectors."""
-        for i, (id_, vec) in enumerate(zip(ids, vectors)):
-            self.id_map[len(self._vectors)] = id_
-            self._vectors.append(vec.astype(np.float32))
-        self._built = False
+    @property
+    def delta_size(self) -> int:
+        """Number of vectors waiting in the delta segment."""
+        return len(self._delta_ids)
     
-    def build(self) -> None:
-        """Build the search index."""
-        if not self._vectors:
-            logger.warning("No vectors to build index from")
-            return
-        
-        vectors = np.vstack(self._vectors).astype(np.float32)
-        
-        # Normalize for cosine similarity
+    def _prepare(self, vector: list[float] | np.ndarray) -> np.ndarray:
+        """Convert to float32, normalizing for cosine similarity."""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
         if self.metric == "cosine":
-            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-            norms[norms == 0] = 1  # Avoid division by zero
-            vectors = vectors / norms
-        
-        if FAISS_AVAILABLE:
-            self._build_faiss(vectors)
-        else:
-            self._build_numpy(vectors)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+        return vector
+    
+    def _main_ids(self) -> set:
+        """IDs present in the main segment (built lazily)."""
+        if self._main_id_set is None:
+            self._main_id_set = {self._id_for(i) for i in range(self._main_size)}
+        return self._main_id_set
+    
+    def _tombstone(self, id: Any) -> None:
+        """Hide ``id`` in the main (and frozen) segments."""
+        self._tombstones = self._tombstones | {id}
+        if self._late_tombstones is not None:
+            self._late_tombstones = self._late_tombstones | {id}
+    
+    def _remove_from_delta(self, id: Any) -> bool:
+        """Swap-remove ``id`` from the delta segment."""
+        pos = self._delta_pos.pop(id, None)
+        if pos is None:
+            return False
+        last = len(self._delta_ids) - 1
+        if pos != last:
+            self._delta_ids[pos] = self._delta_ids[last]
+            self._vectors[pos] = self._vectors[last]
+            self._delta_meta[pos] = self._delta_meta[last]
+            self._delta_pos[self._delta_ids[pos]] = pos
+        self._delta_ids.pop()
+        self._vectors.pop()
+        self._delta_meta.pop()
+        self._delta_snapshot = None
+        return True
+    
+    def _shadows_older_copy(self, id: Any) -> bool:
+        """Whether ``id`` may exist in the main or frozen segment."""
+        if self._frozen is not None and id in self._frozen[0]:
+            return True
+        return self._main_size > 0 and id in self._main_ids()
+    
+    def add(
+        self,
+        id: Any,
+        vector: list[float] | np.ndarray,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Add (or replace) a vector; it is searchable immediately."""
+        self.add_batch([id], [vector], [metadata])
+    
+    def add_batch(
+        self,
+        ids: list[Any],
+        vectors: np.ndarray,
+        metadata: list[dict[str, Any] | None] | None = None,
+    ) -> None:
+        """Add batch of vectors, optionally with one metadata dict per vector."""
+        if metadata is None:
+            metadata = [None] * len(ids)
+        with self._lock:
+            for id_, vec, meta in zip(ids, vectors, metadata):
+                self._remove_from_delta(id_)
+                if self._shadows_older_copy(id_):
+                    self._tombstone(id_)
+                self._delta_pos[id_] = len(self._delta_ids)
+                self._delta_ids.append(id_)
+                self._vectors.append(self._prepare(vec))
+                self._delta_meta.append(meta)
+            self._delta_snapshot = None
+        self._maybe_compact()
+    
+    def delete(self, id: Any) -> bool:
+        """Delete a vector by ID.
+
+        Returns:
+            True if the ID was present in any segment.
+        """
+        with self._lock:
+            found = self._remove_from_delta(id)
+            if id not in self._tombstones and self._shadows_older_copy(id):
+                self._tombstone(id)
+                found = True
+        self._maybe_compact()
+        return found
+    
+    def _maybe_compact(self) -> None:
+        """Start a background compaction once the delta or tombstones are large enough."""
+        if self._built and (
+            len(self._delta_ids) >= self.delta_threshold
+            or len(self._tombstones) >= self.tombstone_threshold
+        ):
+            self.compact(background=True)
+    
+    def compact(self, background: bool = False) -> None:
+        """Fold the delta segment and tombstones into a new main segment.
+
+        Args:
+            background: Build the new main segment on a worker thread. Reads
+                and writes continue against the old segments until the new
+                one is swapped in.
+        """
+        with self._lock:
+            running = self._compaction
+            if background and running is None:
+                self._compaction = threading.Thread(
+                    target=self._compact, name="vector-index-compaction", daemon=True
+                )
+                self._compaction.start()
+            if background:
+                return
+        if running is not None:
+            running.join()
+        self._compact()
+    
+    def _compact(self) -> None:
+        """Compaction worker."""
+        try:
+            with self._lock:
+                # Freeze the delta; new writes go to a fresh delta segment
+                frozen_ids = list(self._delta_ids)
+                frozen_vectors = (
+                    np.vstack(self._vectors).astype(np.float32)
+                    if self._vectors else np.empty((0, self.dimension), dtype=np.float32)
+                )
+                frozen_meta = list(self._delta_meta)
+                self._frozen = (frozen_ids, frozen_vectors, frozen_meta)
+                self._vectors, self._delta_ids, self._delta_pos = [], [], {}
+                self._delta_meta = []
+                self._delta_snapshot = None
+                tombstones = self._tombstones
+                self._late_tombstones = frozenset()
+                main_vectors = self._main_matrix()
+                main_ids = [self._id_for(i) for i in range(self._main_size)]
+                main_masks = self._masks
+            
+            keep = [i for i, id_ in enumerate(main_ids) if id_ not in tombstones]
+            ids = [main_ids[i] for i in keep] + frozen_ids
+            blocks = [frozen_vectors]
+            if len(keep):
+                blocks.insert(0, np.asarray(main_vectors[keep], dtype=np.float32))
+            vectors = np.vstack(blocks) if ids else None
+            masks = _concat_masks(
+                _take_masks(main_masks, np.asarray(keep, dtype=np.int64)), len(keep),
+                build_masks(frozen_meta), len(frozen_ids),
+            )
+            
+            index = self._build_faiss(vectors) if FAISS_AVAILABLE and ids else None
+            ivf = None
+            if index is None and ids and self.index_type == "ivf":
+                order, ivf = self._build_ivf(vectors)
+                if ivf is not None:
+                    vectors = np.ascontiguousarray(vectors[order])
+                    ids = [ids[i] for i in order]
+                    masks = _take_masks(masks, order)
+            q8 = quantize_int8(vectors) if index is None and ids and self.quantize else None
+            
+            with self._lock:
+                self.index = index
+                self._numpy_vectors = vectors if index is None else None
+                self._ivf = ivf
+                self._q8 = q8
+                self._masks = masks
+                self.id_map = dict(enumerate(ids))
+                self._id_array = None
+                self._main_size = len(ids)
+                self._main_id_set = None
+                self._tombstones = self._late_tombstones
+                self._late_tombstones = None
+                self._frozen = None
+                self._built = True
+            
+            if not ids:
+                logger.warning("No vectors to build index from")
+            else:
+                logger.info(f"Built index with {len(ids)} vectors")
+        finally:
+            with self._lock:
+                if self._compaction is threading.current_thread():
+                    self._compaction = None
+    
+    def _main_matrix(self) -> np.ndarray:
+        """Normalized vectors of the main segment."""
+        if self._numpy_vectors is not None:
+            return self._numpy_vectors
+        if self.index is not None and self._main_size:
+            index = self.index
+            if self.use_gpu:
+                index = faiss.index_gpu_to_cpu(index)
+            if hasattr(index, "make_direct_map"):
+                index.make_direct_map()
+            return index.reconstruct_n(0, self._main_size)
+        return np.empty((0, self.dimension), dtype=np.float32)
+    
+    def build(self) -> None:
+        """Build the search index (synchronous compaction)."""
+        self.compact(background=False)
+    
+    def _build_ivf(self, vectors: np.ndarray) -> tuple[np.ndarray | None, IVFLists | None]:
+        """Train IVF lists over ``vectors``.
+
+        Used when FAISS is unavailable. Returns the row order that makes each
+        list contiguous, plus the lists; corpora too small to cluster
+        meaningfully stay flat and get ``(None, None)``.
+        """
+        n = len(vectors)
+        nlist = min(int(np.sqrt(n)), 4096)
+        if nlist < 2 or n < 8 * nlist:
+            return None, None
         
-        self._built = True
-        logger.info(f"Built index with {len(self._vectors)} vectors")
+        centroids = train_kmeans(vectors, nlist, self.metric)
+        labels = _assign(vectors, centroids, self.metric)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+        return order, IVFLists(centroids=centroids, offsets=offsets)
     
-    def _build_faiss(self, vectors: np.ndarray) -> None:
+    def _build_faiss(self, vectors: np.ndarray):
         """Build FAISS index."""
         n = len(vectors)
         
-        if self.index_type == "flat":
-            if self.metric == "cosine" or self.metric == "ip":
-                self.index = faiss.IndexFlatIP(self.dimension)
-            else:
-                self.index = faiss.IndexFlatL2(self.dimension)
-        
-        elif self.index_type == "ivf":
+        if self.index_type == "ivf":
             nlist = min(int(np.sqrt(n)), 100)  # Number of clusters
             if self.metric == "cosine" or self.metric == "ip":
                 quantizer = faiss.IndexFlatIP(self.dimension)
-                self.index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+                index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT)
             else:
                 quantizer = faiss.IndexFlatL2(self.dimension)
-                self.index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist)
-            self.index.train(vectors)
+                index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist)
+            index.train(vectors)
+            index.nprobe = self.nprobe
         
         elif self.index_type == "hnsw":
-            self.index = faiss.IndexHNSWFlat(self.dimension, 32)
+            index = faiss.IndexHNSWFlat(self.dimension, 32)
+            if self.metric == "cosine" or self.metric == "ip":
+                index.metric_type = faiss.METRIC_INNER_PRODUCT
+        
+        else:
             if self.metric == "cosine" or self.metric == "ip":
-                self.index.metric_type = faiss.METRIC_INNER_PRODUCT
+                index = faiss.IndexFlatIP(self.dimension)
+            else:
+                index = faiss.IndexFlatL2(self.dimension)
         
         # Move to GPU if available
         if self.use_gpu and FAISS_GPU_AVAILABLE:
             try:
                 res = faiss.StandardGpuResources()
-                self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
+                index = faiss.index_cpu_to_gpu(res, 0, index)
                 logger.info("FAISS index moved to GPU")
             except Exception as e:
                 logger.warning(f"Failed to move index to GPU: {e}")
         
-        self.index.add(vectors)
+        index.add(vectors)
+        return index
     
-    def _build_numpy(self, vectors: np.ndarray) -> None:
-        """Build NumPy-based index (CPU fallback)."""
-        self._numpy_vectors = vectors
+    def _score(self, vectors: np.ndarray, query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Score a block of vectors, returning (scores, distances).
+
+        ``query`` is one vector of shape (d,) or a batch of shape (q, d);
+        a batch yields arrays of shape (n, q).
+        """
+        if self.metric == "l2":
+            if query.ndim == 1:
+                distances = ((vectors - query) ** 2).sum(axis=1)
+            else:
+                # ||v - q||^2 expanded so the batch is one matrix product
+                distances = (
+                    np.einsum("ij,ij->i", vectors, vectors)[:, None]
+                    - 2 * (vectors @ query.T)
+                    + np.einsum("ij,ij->i", query, query)
+                )
+                np.maximum(distances, 0, out=distances)
+            return 1 / (1 + distances), distances
+        similarities = vectors @ query.T
+        return similarities, 1 - similarities
     
     def search(
         self,
         query: list[float] | np.ndarray,
         k: int = 10,
         min_score: float = 0.0,
+        filters: dict[str, Any] | None = None,
     ) -> list[VectorSearchResult]:
-        """Search for similar vectors."""
+        """Search for similar vectors across the main and delta segments.
+
+        Args:
+            query: Query vector.
+            k: Number of results.
+            min_score: Minimum score to return.
+            filters: Metadata constraints, e.g. ``{"doc_type": ["adr", "spec"],
+                "archived": False}``. Every field must match; a list matches
+                any of its values.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(query, k, min_score, filters)[0]
+    
+    def search_batch(
+        self,
+        queries: list[list[float]] | np.ndarray,
+        k: int = 10,
+        min_score: float = 0.0,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Search several queries in one pass over each segment.
+
+        Flat NumPy segments are scored with a single matrix-matrix product
+        and FAISS receives all queries in one call. IVF and int8 main
+        segments still probe per query, since each query visits its own
+        lists or shortlist. ``filters`` (see :meth:`search`) restrict every
+        segment before scoring.
+
+        Returns:
+            One result list per query, in input order.
+        """
+        if not len(queries):
+            return []
         if not self._built:
             self.build()
         
-        if isinstance(query, list):
-            query = np.array(query, dtype=np.float32)
+        queries = np.stack([self._prepare(q) for q in queries])
         
-        # Normalize query for cosine
-        if self.metric == "cosine":
-            norm = np.linalg.norm(query)
-            if norm > 0:
-                query = query / norm
+        with self._lock:
+            index, main_vectors, ivf = self.index, self._numpy_vectors, self._ivf
+            q8 = self._q8
+            main_ids = (self.id_map, self._id_array)
+            main_size, masks = self._main_size, self._masks
+            tombstones, late = self._tombstones, self._late_tombstones or frozenset()
+            frozen = self._frozen
+            delta = self._delta_matrix()
+        
+        mask = filter_mask(masks, filters, main_size) if filters else None
         
-        if FAISS_AVAILABLE and self.index is not None:
-            return self._search_faiss(query, k, min_score)
+        # Over-fetch from the main segment to make up for tombstoned rows
+        fetch = k + len(tombstones)
+        if mask is not None and not mask.any():
+            candidates = [[] for _ in queries]
+        elif index is not None:
+            candidates = self._search_faiss(index, main_ids, queries, fetch, mask)
+        elif ivf is not None or q8 is not None:
+            candidates = [
+                self._search_numpy(main_vectors, main_ids, q, fetch, ivf, q8, mask)
+                for q in queries
+            ]
         else:
-            return self._search_numpy(query, k, min_score)
+            candidates = self._search_numpy_batch(main_vectors, main_ids, queries, fetch, mask)
+        
+        results = [
+            [r for r in hits if r.id not in tombstones and r.score >= min_score]
+            for hits in candidates
+        ]
+        for segment, hidden in ((frozen, late), (delta, frozenset())):
+            if segment is None or not len(segment[0]):
+                continue
+            ids, vectors, metadata = segment
+            scores, distances = self._score(vectors, queries)
+            if filters:
+                allowed = np.fromiter(
+                    (matches_filters(m, filters) for m in metadata), dtype=bool, count=len(ids)
+                )
+                scores = np.where(allowed[:, None], scores, -np.inf)
+            for j, hits in enumerate(results):
+                for idx in self._top_indices(scores[:, j], k + len(hidden)):
+                    score = float(scores[idx, j])
+                    if score >= min_score and ids[idx] not in hidden:
+                        hits.append(VectorSearchResult(
+                            id=ids[idx], score=score, distance=float(distances[idx, j]),
+                        ))
+        
+        for hits in results:
+            hits.sort(key=lambda r: r.score, reverse=True)
+            del hits[k:]
+        return results
+    
+    def _delta_matrix(self) -> Segment | None:
+        """Stacked view of the delta segment, cached until the next write."""
+        if not self._delta_ids:
+            return None
+        if self._delta_snapshot is None:
+            self._delta_snapshot = (
+                list(self._delta_ids), np.vstack(self._vectors), list(self._delta_meta)
+            )
+        return self._delta_snapshot
+    
+    @staticmethod
+    def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the ``k`` largest scores, best first."""
+        if k < len(scores):
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(scores[top])[::-1]]
     
     def _search_faiss(
         self,
-        query: np.ndarray,
+        index,
+        ids: tuple[dict[int, Any], np.ndarray | None],
+        queries: np.ndarray,
         k: int,
-        min_score: float,
-    ) -> list[VectorSearchResult]:
-        """Search using FAISS."""
-        query = query.reshape(1, -1)
-        distances, indices = self.index.search(query, k)
+        mask: np.ndarray | None = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Search the main segment using FAISS, one result list per query.
+
+        A ``mask`` is passed to FAISS as an ID selector so only matching rows
+        are scored. Indices that reject selectors (GPU) fall back to an
+        over-fetch that is filtered afterwards.
+        """
+        queries = np.atleast_2d(queries)
+        if mask is None:
+            distances, indices = index.search(queries, k)
+        else:
+            selector = faiss.IDSelectorBatch(np.flatnonzero(mask).astype(np.int64))
+            if hasattr(index, "nprobe"):
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+            else:
+                params = faiss.SearchParameters(sel=selector)
+            try:
+                distances, indices = index.search(queries, k, params=params)
+            except RuntimeError:
+                fetch = min(index.ntotal, k * int(np.ceil(len(mask) / mask.sum())))
+                distances, indices = index.search(queries, fetch)
+                indices = np.where(mask[np.maximum(indices, 0)], indices, -1)
         
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < 0:
-                continue
-            
-            score = float(dist) if self.metric in ("cosine", "ip") else 1 / (1 + float(dist))
-            
-            if score >= min_score:
-                results.append(VectorSearchResult(
-                    id=self.id_map.get(idx, idx),
+        for row_distances, row_indices in zip(distances, indices):
+            hits = []
+            for dist, idx in zip(row_distances, row_indices):
+                if idx < 0:
+                    continue
+                
+                score = float(dist) if self.metric in ("cosine", "ip") else 1 / (1 + float(dist))
+                hits.append(VectorSearchResult(
+                    id=self._lookup_id(ids, int(idx)),
                     score=score,
                     distance=float(dist),
                 ))
+            results.append(hits)
         
         return results
     
     def _search_numpy(
         self,
+        vectors: np.ndarray | None,
+        ids: tuple[dict[int, Any], np.ndarray | None],
         query: np.ndarray,
         k: int,
-        min_score: float,
+        ivf: IVFLists | None = None,
+        q8: tuple[np.ndarray, np.ndarray] | None = None,
+        mask: np.ndarray | None = None,
     ) -> list[VectorSearchResult]:
-        """Search using NumPy (CPU fallback)."""
-        if not hasattr(self, '_numpy_vectors'):
+        """Search the main segment using NumPy (CPU fallback).
+
+        With IVF lists, only the ``nprobe`` lists whose centroids score best
+        against the query are scanned. A metadata ``mask`` narrows the rows
+        before anything is scored. With int8 codes, candidates are scored
+        on the codes and only a ``k * rerank_factor`` shortlist is re-scored
+        with the float32 rows.
+        """
+        if vectors is None or not len(vectors):
             return []
         
+        rows = None
+        if ivf is not None and self.nprobe < ivf.nlist:
+            centroid_scores, _ = self._score(ivf.centroids, query)
+            probe = self._top_indices(centroid_scores, self.nprobe)
+            rows = np.concatenate([
+                np.arange(ivf.offsets[i], ivf.offsets[i + 1]) for i in probe
+            ])
+        
+        if mask is not None:
+            rows = np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+        
+        if q8 is not None:
+            codes, scales = q8
+            if rows is not None:
+                codes, scales = codes[rows], scales[rows]
+            shortlist = self._top_indices(
+                int8_scores(codes, scales, query), k * self.rerank_factor
+            )
+            rows = shortlist if rows is None else rows[shortlist]
+        
+        if rows is not None:
+            vectors = vectors[rows]
+        
         # Batch cosine similarity (vectorized)
-        similarities = self._numpy_vectors @ query
+        scores, distances = self._score(vectors, query)
         
-        # Get top-k indices
-        top_k_idx = np.argsort(similarities)[::-1][:k]
+        return [
+            VectorSearchResult(
+                id=self._lookup_id(ids, int(idx if rows is None else rows[idx])),
+                score=float(scores[idx]),
+                distance=float(distances[idx]),
+            )
+            for idx in self._top_indices(scores, k)
+        ]
+    
+    def _search_numpy_batch(
+        self,
+        vectors: np.ndarray | None,
+        ids: tuple[dict[int, Any], np.ndarray | None],
+        queries: np.ndarray,
+        k: int,
+        mask: np.ndarray | None = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Exact search of a flat main segment for a block of queries.
+
+        Queries are scored ``QUERY_BLOCK`` at a time so the score matrix
+        stays bounded at ``rows x QUERY_BLOCK``. With a ``mask`` only the
+        matching rows are gathered and scored.
+        """
+        if vectors is None or not len(vectors):
+            return [[] for _ in range(len(queries))]
         
-        results = []
-        for idx in top_k_idx:
-            score = float(similarities[idx])
-            if score >= min_score:
-                results.append(VectorSearchResult(
-                    id=self.id_map.get(idx, idx),
-                    score=score,
-                    distance=1 - score,
-                ))
+        rows = None
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            vectors = vectors[rows]
         
+        results = []
+        for start in range(0, len(queries), self.QUERY_BLOCK):
+            scores, distances = self._score(vectors, queries[start:start + self.QUERY_BLOCK])
+            if k < len(vectors):
+                top = np.argpartition(scores, -k, axis=0)[-k:]
+            else:
+                top = np.broadcast_to(np.arange(len(vectors))[:, None], scores.shape)
+            for j in range(scores.shape[1]):
+                column = top[:, j]
+                column = column[np.argsort(scores[column, j])[::-1]]
+                results.append([
+                    VectorSearchResult(
+                        id=self._lookup_id(ids, int(idx if rows is None else rows[idx])),
+                        score=float(scores[idx, j]),
+                        distance=float(distances[idx, j]),
+                    )
+                    for idx in column
+                ])
         return results
     
+    def _id_for(self, idx: int) -> Any:
+        """Map an internal row number back to the caller's ID."""
+        return self._lookup_id((self.id_map, self._id_array), idx)
+
+    @staticmethod
+    def _lookup_id(ids: tuple[dict[int, Any], np.ndarray | None], idx: int) -> Any:
+        """Resolve a main-segment row against an ``(id_map, id_array)`` pair."""
+        id_map, id_array = ids
+        if idx in id_map:
+            return id_map[idx]
+        if id_array is not None and 0 <= idx < len(id_array):
+            return id_array[idx].item()
+        return idx
+
     def save(self, path: Path) -> None:
-        """Save index to disk."""
+        """Save index to disk.
+
+        Writes a binary header + vector file (``.vec``) and a binary ID array
+        (``.ids``) that :meth:`load` memory-maps. FAISS indices additionally
+        write the FAISS index itself at ``path``. Files are written to a
+        temporary name and renamed, so workers that already mapped the old
+        files keep a consistent view.
+        """
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save id_map
-        import json
-        with open(path.with_suffix('.json'), 'w') as f:
-            json.dump({str(k): v for k, v in self.id_map.items()}, f)
-        
-        if FAISS_AVAILABLE and self.index is not None:
+
+        # Persist a single compacted segment
+        if self._vectors or self._tombstones or not self._built:
+            self.build()
+
+        n = self._main_size
+        ids = [self._id_for(i) for i in range(n)]
+        if all(isinstance(i, (int, np.integer)) for i in ids):
+            id_array = np.asarray(ids, dtype=np.int64)
+        else:
+            id_array = np.asarray([str(i) for i in ids], dtype=np.str_)
+
+        vectors = self._numpy_vectors
+        use_faiss = FAISS_AVAILABLE and self.index is not None
+
+        header = struct.pack(
+            HEADER_FORMAT,
+            INDEX_MAGIC,
+            INDEX_FORMAT_VERSION,
+            self.dimension,
+            n,
+            self.metric.encode(),
+            self.index_type.encode(),
+            (self.model_version or "").encode()[:64],
+        )
+
+        tmp = path.with_suffix('.vec.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE, b'\0'))
+            if vectors is not None and not use_faiss:
+                np.ascontiguousarray(vectors, dtype=np.float32).tofile(f)
+        os.replace(tmp, path.with_suffix('.vec'))
+
+        tmp = path.with_suffix('.ids.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, id_array)
+        os.replace(tmp, path.with_suffix('.ids'))
+
+        # Drop side files a previous save may have left for another layout
+        for suffix in ('.ivf', '.q8', '.q8s', '.masks'):
+            path.with_suffix(suffix).unlink(missing_ok=True)
+
+        if self._ivf is not None and not use_faiss:
+            tmp = path.with_suffix('.ivf.tmp')
+            with open(tmp, 'wb') as f:
+                np.savez(f, centroids=self._ivf.centroids, offsets=self._ivf.offsets)
+            os.replace(tmp, path.with_suffix('.ivf'))
+
+        if self._q8 is not None and not use_faiss:
+            for suffix, array in (('.q8', self._q8[0]), ('.q8s', self._q8[1])):
+                tmp = path.with_suffix(suffix + '.tmp')
+                with open(tmp, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp, path.with_suffix(suffix))
+
+        if self._masks:
+            keys = [[field, value] for field, values in self._masks.items() for value in values]
+            bits = np.packbits(np.stack([self._masks[f][v] for f, v in keys]), axis=1)
+            tmp = path.with_suffix('.masks.tmp')
+            with open(tmp, 'wb') as f:
+                np.savez(f, keys=np.array(json.dumps(keys)), bits=bits)
+            os.replace(tmp, path.with_suffix('.masks'))
+
+        if use_faiss:
             # Convert GPU index to CPU for saving
             if self.use_gpu:
                 cpu_index = faiss.index_gpu_to_cpu(self.index)
                 faiss.write_index(cpu_index, str(path))
             else:
                 faiss.write_index(self.index, str(path))
-        else:
-            np.save(path.with_suffix('.npy'), self._numpy_vectors)
-        
+
         logger.info(f"Saved index to {path}")
-    
+
     def load(self, path: Path) -> bool:
-        """Load index from disk."""
+        """Load index from disk.
+
+        Vectors and IDs are memory-mapped read-only, so opening is constant
+        time and workers share the page cache. Indices written in the older
+        JSON + ``.npy`` layout are still readable.
+        """
         path = Path(path)
-        
+        vec_path = path.with_suffix('.vec')
+        if not vec_path.exists():
+            return self._load_legacy(path)
+
+        with open(vec_path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            logger.warning(f"Truncated index header: {vec_path}")
+            return False
+        magic, version, dimension, count, metric, index_type, model_version = struct.unpack(
+            HEADER_FORMAT, raw[:struct.calcsize(HEADER_FORMAT)]
+        )
+        if magic != INDEX_MAGIC or version > INDEX_FORMAT_VERSION:
+            logger.warning(f"Unrecognized index format: {vec_path}")
+            return False
+
+        model_version = model_version.rstrip(b'\0').decode() or None
+        if self.model_version and model_version != self.model_version:
+            logger.warning(
+                f"Index {path} built with model {model_version!r}, "
+                f"expected {self.model_version!r} - not loading"
+            )
+            return False
+
+        self.clear()
+        self.dimension = dimension
+        self.metric = metric.rstrip(b'\0').decode()
+        self.index_type = index_type.rstrip(b'\0').decode()
+        self.model_version = model_version
+        self._id_array = np.load(path.with_suffix('.ids'), mmap_mode='r')
+        masks_path = path.with_suffix('.masks')
+        if masks_path.exists():
+            with np.load(masks_path) as stored:
+                keys = json.loads(stored['keys'].item())
+                bits = np.unpackbits(stored['bits'], axis=1, count=count).astype(bool)
+            for (field, value), mask in zip(keys, bits):
+                self._masks.setdefault(field, {})[value] = mask
+
+        if FAISS_AVAILABLE and path.exists():
+            self._load_faiss(path)
+            return True
+
+        if vec_path.stat().st_size < HEADER_SIZE + count * dimension * 4:
+            logger.warning(f"Index {vec_path} has no vector payload")
+            return False
+
+        self._numpy_vectors = np.memmap(
+            vec_path, dtype=np.float32, mode='r',
+            offset=HEADER_SIZE, shape=(count, dimension),
+        )
+        ivf_path = path.with_suffix('.ivf')
+        if self.index_type == "ivf" and ivf_path.exists():
+            with np.load(ivf_path) as lists:
+                self._ivf = IVFLists(centroids=lists['centroids'], offsets=lists['offsets'])
+        if path.with_suffix('.q8').exists():
+            self._q8 = (
+                np.load(path.with_suffix('.q8'), mmap_mode='r'),
+                np.load(path.with_suffix('.q8s'), mmap_mode='r'),
+            )
+            self.quantize = True
+        self._main_size = count
+        self._built = True
+        logger.info(f"Memory-mapped index {vec_path} ({count} vectors)")
+        return True
+
+    def _load_faiss(self, path: Path) -> None:
+        """Read a FAISS index, moving it to the GPU when available."""
+        self.index = faiss.read_index(str(path))
+        if hasattr(self.index, "nprobe"):
+            self.index.nprobe = self.nprobe
+
+        if self.use_gpu and FAISS_GPU_AVAILABLE:
+            try:
+                res = faiss.StandardGpuResources()
+                self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
+            except:
+                pass
+
+        self._main_size = self.index.ntotal
+        self._built = True
+        logger.info(f"Loaded FAISS index from {path}")
+
+    def _load_legacy(self, path: Path) -> bool:
+        """Load the JSON id_map + ``.npy`` layout used before ``.vec``."""
+        self.clear()
+
         # Load id_map
-        import json
         map_path = path.with_suffix('.json')
         if map_path.exists():
             with open(map_path) as f:
                 self.id_map = {int(k): v for k, v in json.load(f).items()}
-        
-        if FAISS_AVAILABLE:
-            faiss_path = path
-            if faiss_path.exists():
-                self.index = faiss.read_index(str(faiss_path))
-                
-                if self.use_gpu and FAISS_GPU_AVAILABLE:
-                    try:
-                        res = faiss.StandardGpuResources()
-                        self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
-                    except:
-                        pass
-                
-                self._built = True
-                logger.info(f"Loaded FAISS index from {path}")
-                return True
-        
+
+        if FAISS_AVAILABLE and path.exists():
+            self._load_faiss(path)
+            return True
+
         npy_path = path.with_suffix('.npy')
         if npy_path.exists():
-            self._numpy_vectors = np.load(npy_path)
+            self._numpy_vectors = np.load(npy_path, mmap_mode='r')
+            self._main_size = len(self._numpy_vectors)
             self._built = True
             logger.info(f"Loaded NumPy index from {npy_path}")
             return True
-        
+
         return False
-    
+
     def clear(self) -> None:
         """Clear the index."""
-        self.index = None
-        self.id_map.clear()
-        self._vectors.clear()
-        self._built = False
-        if hasattr(self, '_numpy_vectors'):
-            del self._numpy_vectors
+        with self._lock:
+            self.index = None
+            self._numpy_vectors = None
+            self._ivf = None
+            self._q8 = None
+            self._masks = {}
+            self.id_map = {}
+            self._id_array = None
+            self._main_size = 0
+            self._main_id_set = None
+            self._vectors, self._delta_ids, self._delta_pos = [], [], {}
+            self._delta_meta = []
+            self._delta_snapshot = None
+            self._tombstones = frozenset()
+            self._built = False
 
 
 class VectorSearchService:
@@ -307,20 +1068,35 @@ class VectorSearchService:
         name: str,
         dimension: int = 384,
         use_gpu: bool = True,
+        model_version: str | None = None,
     ) -> VectorIndex:
         """Get existing index or create new one."""
         if name not in self.indices:
-            index = VectorIndex(dimension=dimension, use_gpu=use_gpu)
+            index = VectorIndex(
+                dimension=dimension, use_gpu=use_gpu, model_version=model_version
+            )
             
             # Try to load from disk
-            index_path = self.index_dir / f"{name}.index"
-            if index_path.exists():
-                index.load(index_path)
+            index.load(self.index_dir / f"{name}.index")
             
             self.indices[name] = index
         
         return self.indices[name]
     
+    def search_batch(
+        self,
+        name: str,
+        queries: list[list[float]] | np.ndarray,
+        k: int = 10,
+        min_score: float = 0.0,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Search a named index with several queries at once."""
+        index = self.indices.get(name)
+        if index is None:
+            return [[] for _ in range(len(queries))]
+        return index.search_batch(queries, k, min_score, filters)
+    
     def save_all(self) -> None:
         """Save all indices to disk."""
         for name, index in self.indices.items():
@@ -334,7 +1110,8 @@ class VectorSearchService:
             "gpu_available": FAISS_GPU_AVAILABLE,
             "indices": {
                 name: {
-                    "vectors": len(idx._vectors) if hasattr(idx, '_vectors') else 0,
+                    "vectors": len(idx),
+                    "delta": idx.delta_size,
                     "built": idx._built,
                     "gpu": idx.use_gpu,
                 }
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Latency of knowledge-archive full-text search as the corpus grows.
+
+Compares the previous ``LIKE '%q%'`` scan over ``documents`` with the
+ranked FTS5 query used by ``SearchService.fts_search`` on a synthetic
+corpus built in a temporary database with the real knowledge schema.
+
+Usage:
+    python scripts/benchmark_fts_search.py [--sizes 2000 10000 50000] [--repeat 20]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_dev_orchestrator.knowledge.database import SCHEMA  # noqa: E402
+from ai_dev_orchestrator.knowledge.fts import search_documents  # noqa: E402
+
+VOCABULARY = (
+    "sqlite index vector search embedding chunk archive document retrieval ranking "
+    "latency cache query token model batch gpu thread schema migration trigger "
+    "context prompt session agent workflow spec adr plan discussion review "
+    "pipeline fusion reciprocal rank snippet phrase prefix parser budget"
+).split()
+FILLER_WORDS = 30_000
+QUERIES = ["vector search", "migration", '"reciprocal rank" fusion', "embed*", "gpu batch latency"]
+
+
+def build_corpus(conn: sqlite3.Connection, n: int, words_per_doc: int) -> None:
+    """Insert ``n`` documents: a few topic words over Zipf-distributed filler."""
+    rng = random.Random(0)
+    filler = [f"w{i}" for i in range(FILLER_WORDS)]
+    weights = [1 / (i + 1) for i in range(FILLER_WORDS)]
+    rows = []
+    for i in range(n):
+        topics = rng.sample(VOCABULARY, 3)
+        words = rng.choices(filler, weights, k=words_per_doc) + topics * 3
+        rng.shuffle(words)
+        title = " ".join(topics + words[:3])
+        rows.append((f"DOC-{i}", "spec", title, " ".join(words), f"/doc/{i}.md"))
+    conn.executemany(
+        "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+        "VALUES (?, ?, ?, ?, ?, 'h')",
+        rows,
+    )
+    conn.commit()
+
+
+def like_scan(conn: sqlite3.Connection, query: str, top_k: int) -> list:
+    """Previous approach: unindexed substring match, constant score."""
+    pattern = f"%{query}%"
+    return conn.execute("""
+        SELECT id, title, substr(content, 1, 200), type, 1.0
+        FROM documents
+        WHERE archived_at IS NULL AND (title LIKE ? OR content LIKE ?)
+        LIMIT ?
+    """, (pattern, pattern, top_k)).fetchall()
+
+
+def measure(fn, conn, top_k: int, repeat: int) -> tuple[float, float, int]:
+    """Return (median ms, p95 ms, mean hits) over every query."""
+    timings, hits = [], []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            hits.append(len(fn(conn, query, top_k)))
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return (
+        statistics.median(timings),
+        timings[int(len(timings) * 0.95) - 1],
+        round(statistics.mean(hits)),
+    )
+
+
+def main():
+    """Run the LIKE vs FTS5 benchmark over each corpus size."""
+    parser = argparse.ArgumentParser(description="LIKE scan vs ranked FTS5 latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 10_000, 50_000],
+                        help="Numbers of documents")
+    parser.add_argument("--words", type=int, default=300, help="Vocabulary words per document")
+    parser.add_argument("--top-k", type=int, default=20, help="Results per query")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the query set")
+
+    args = parser.parse_args()
+
+    print(f"{'N':>8}{'mode':>8}{'median ms':>11}{'p95 ms':>9}{'hits':>6}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(Path(tmpdir) / "knowledge.db")
+            conn.executescript(SCHEMA)
+            build_corpus(conn, n, args.words)
+            for name, fn in [("like", like_scan), ("fts5", search_documents)]:
+                median, p95, hits = measure(fn, conn, args.top_k, args.repeat)
+                print(f"{n:>8,}{name:>8}{median:>11.2f}{p95:>9.2f}{hits:>6}")
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Peak memory and runtime of the paper similarity join as N grows.
+
+Compares the dense approach (full N x N similarity matrix, then a per-row
+argsort) with the blocked top-k join used by
+``ResearchSmartOrganizer.compute_paper_similarities``. Peak memory is
+measured with tracemalloc, which sees NumPy allocations.
+
+Usage:
+    python scripts/benchmark_similarity_join.py [--sizes 2000 8000 20000] [--dim 768]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from research_smart_organizer import blocked_top_k_similarities  # noqa: E402
+
+
+def dense_top_k(embeddings: np.ndarray, top_k: int, min_similarity: float) -> int:
+    """Previous approach: materialize every pairwise similarity."""
+    vectors = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    similarities = vectors @ vectors.T
+    links = 0
+    for i in range(len(vectors)):
+        scores = similarities[i].copy()
+        scores[i] = -1
+        top = np.argsort(scores)[-top_k:][::-1]
+        links += int((scores[top] >= min_similarity).sum())
+    return links
+
+
+def blocked_top_k(embeddings: np.ndarray, top_k: int, min_similarity: float) -> int:
+    """Blocked join; counts links instead of writing them."""
+    return sum(1 for _ in blocked_top_k_similarities(embeddings, top_k, min_similarity))
+
+
+def measure(fn, *args) -> tuple[int, float, float]:
+    """Return (result, seconds, peak MiB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    """Run the similarity join benchmark over each corpus size."""
+    parser = argparse.ArgumentParser(description="Similarity join memory/runtime benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 8_000, 20_000],
+                        help="Numbers of papers")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    parser.add_argument("--top-k", type=int, default=5, help="Neighbours per paper")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Minimum similarity")
+    parser.add_argument("--max-dense", type=int, default=20_000,
+                        help="Skip the dense run above this N")
+
+    args = parser.parse_args()
+
+    print(f"{'N':>8}{'mode':>10}{'links':>10}{'seconds':>10}{'peak MiB':>11}")
+    for n in args.sizes:
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((n, args.dim)).astype(np.float32)
+        embeddings[:, :8] += 4 * rng.standard_normal((n, 8)).astype(np.float32)
+
+        modes = [("blocked", blocked_top_k)]
+        if n <= args.max_dense:
+            modes.insert(0, ("dense", dense_top_k))
+        for name, fn in modes:
+            links, seconds, peak = measure(fn, embeddings, args.top_k, args.threshold)
+            print(f"{n:>8,}{name:>10}{links:>10,}{seconds:>10.2f}{peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
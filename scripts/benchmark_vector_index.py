@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Recall vs. latency benchmark for VectorIndex on synthetic corpora.
+
+Compares exact (flat) search with the IVF index type across a sweep of
+nprobe values. Runs without FAISS, which exercises the pure-NumPy IVF;
+pass --faiss to benchmark the FAISS backend when it is installed.
+
+Usage:
+    python scripts/benchmark_vector_index.py [--sizes 10000 100000] [--dim 768]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import vector_search  # noqa: E402
+from backend.services.vector_search import VectorIndex  # noqa: E402
+
+
+def make_corpus(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Gaussian blobs around random centers, like topic-clustered embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def run_queries(index: VectorIndex, queries: np.ndarray, k: int) -> tuple[list[set], float]:
+    """Return result ID sets and mean latency in milliseconds."""
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append({r.id for r in index.search(q, k=k)})
+    elapsed = time.perf_counter() - start
+    return results, elapsed * 1000 / len(queries)
+
+
+def benchmark(n: int, dim: int, k: int, num_queries: int, nprobes: list[int]) -> None:
+    """Benchmark one corpus size."""
+    corpus = make_corpus(n, dim, clusters=max(16, int(np.sqrt(n) / 2)))
+    rng = np.random.default_rng(1)
+    queries = corpus[rng.choice(n, num_queries, replace=False)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+    ids = list(range(n))
+
+    flat = VectorIndex(dimension=dim, use_gpu=False)
+    flat.add_batch(ids, corpus)
+    flat.build()
+    truth, flat_ms = run_queries(flat, queries, k)
+
+    ivf = VectorIndex(dimension=dim, use_gpu=False, index_type="ivf")
+    ivf.add_batch(ids, corpus)
+    start = time.perf_counter()
+    ivf.build()
+    build_s = time.perf_counter() - start
+    nlist = ivf._ivf.nlist if ivf._ivf is not None else getattr(ivf.index, "nlist", 0)
+
+    print(f"\nN={n:,}  dim={dim}  nlist={nlist}  IVF build {build_s:.1f}s")
+    print(f"  {'mode':<14}{'recall@' + str(k):>10}{'ms/query':>12}{'speedup':>10}")
+    print(f"  {'flat':<14}{1.0:>10.3f}{flat_ms:>12.2f}{1.0:>10.1f}")
+
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe
+        if ivf.index is not None and hasattr(ivf.index, "nprobe"):
+            ivf.index.nprobe = nprobe
+        found, ivf_ms = run_queries(ivf, queries, k)
+        recall = sum(len(t & f) for t, f in zip(truth, found)) / (k * len(queries))
+        label = f"ivf/{nprobe}"
+        print(f"  {label:<14}{recall:>10.3f}{ivf_ms:>12.2f}{flat_ms / ivf_ms:>10.1f}")
+
+
+def main():
+    """Run the flat vs IVF benchmark over each index size."""
+    parser = argparse.ArgumentParser(description="VectorIndex recall/latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000],
+                        help="Corpus sizes to benchmark")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per corpus")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32],
+                        help="nprobe values to sweep")
+    parser.add_argument("--faiss", action="store_true",
+                        help="Use FAISS when installed (default: pure NumPy)")
+
+    args = parser.parse_args()
+
+    if not args.faiss:
+        vector_search.FAISS_AVAILABLE = False
+    print(f"Backend: {'FAISS' if vector_search.FAISS_AVAILABLE else 'NumPy'}")
+
+    for n in args.sizes:
+        benchmark(n, args.dim, args.k, args.queries, args.nprobe)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,13 +21,17 @@ import argparse
 import os
 import re
 import sqlite3
-import struct
+import sys
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 import numpy as np
 
+# Share loaded models with the rest of the process
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 # Try to import sentence-transformers for embedding generation
 try:
     from sentence_transformers import SentenceTransformer
@@ -50,6 +54,10 @@ KNOWLEDGE_DB = WORKSPACE_ROOT / ".workspace" / "knowledge.db"
 # Semantic similarity threshold for creating links
 DEFAULT_SIMILARITY_THRESHOLD = 0.65
 
+# Semantic links kept per source entity, and rows scored per matrix product
+DEFAULT_SEMANTIC_TOP_K = 10
+SEMANTIC_BLOCK_ROWS = 512
+
 # Key concepts for AI/ML domain
 AI_CONCEPTS = {
     'llm': ['large language model', 'llm', 'gpt', 'transformer', 'language model'],
@@ -112,9 +120,8 @@ def load_embedding(blob: bytes) -> np.ndarray:
     """Load embedding from SQLite blob."""
     if blob is None:
         return None
-    # Assuming float32 embeddings
-    n_floats = len(blob) // 4
-    return np.array(struct.unpack(f'{n_floats}f', blob))
+    # Assuming float32 embeddings; a zero-copy view over the blob
+    return np.frombuffer(blob, dtype=np.float32)
 
 
 # =============================================================================
@@ -282,6 +289,37 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     return np.dot(a, b) / (norm_a * norm_b)
 
 
+def normalized_matrix(vectors: list[np.ndarray]) -> np.ndarray:
+    """Stack vectors into a float32 matrix of unit-length rows."""
+    matrix = np.vstack(vectors).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_similarity_join(
+    a: np.ndarray,
+    b: np.ndarray,
+    threshold: float,
+    top_k: int,
+    block_rows: int = SEMANTIC_BLOCK_ROWS
+):
+    """Yield ``(i, j, similarity)`` for the top-k rows of ``b`` per row of ``a``.
+
+    Both matrices must hold unit-length rows. ``a`` is processed in blocks, so
+    only a ``block_rows x len(b)`` slice of the similarity matrix is live.
+    """
+    k = min(top_k, len(b))
+    if k <= 0:
+        return
+    for start in range(0, len(a), block_rows):
+        scores = a[start:start + block_rows] @ b.T
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        for r, c in zip(*np.nonzero(top_scores >= threshold)):
+            yield start + int(r), int(top[r, c]), float(top_scores[r, c])
+
+
 def jaccard_similarity(set_a: set, set_b: set) -> float:
     """Compute Jaccard similarity between two sets."""
     if not set_a or not set_b:
@@ -484,7 +522,7 @@ def generate_embeddings(entities: list[Entity], model_name: str = 'all-mpnet-bas
     print(f"    Generating embeddings for {len(to_embed)} entities...")
     
     try:
-        model = SentenceTransformer(model_name)
+        model = get_model(model_name)
         
         # Prepare texts - use title + truncated content
         texts = []
@@ -507,9 +545,15 @@ def generate_embeddings(entities: list[Entity], model_name: str = 'all-mpnet-bas
 
 def find_semantic_links(
     entities: list[Entity],
-    threshold: float = 0.65
+    threshold: float = 0.65,
+    top_k: int = DEFAULT_SEMANTIC_TOP_K
 ) -> list[CrossLink]:
-    """Find links based on embedding similarity."""
+    """Find links based on embedding similarity.
+
+    Each database's embeddings are stacked into a normalized matrix and
+    joined against every other database with blocked matrix products. An
+    entity keeps at most ``top_k`` links per target database.
+    """
     links = []
     
     # Generate embeddings for entities that don't have them
@@ -524,35 +568,36 @@ def find_semantic_links(
     if len(embedded) < 2:
         return links
     
-    # For efficiency, compare across databases only
+    # For efficiency, compare across databases only. Embeddings from
+    # different models (dimensions) are never comparable.
     by_db = defaultdict(list)
     for e in embedded:
-        by_db[e.db].append(e)
+        by_db[(e.db, len(e.embedding))].append(e)
+    matrices = {key: normalized_matrix([e.embedding for e in group]) for key, group in by_db.items()}
     
     comparisons = 0
-    for db_a in by_db:
-        for db_b in by_db:
-            if db_a >= db_b:  # Skip same-db and already compared pairs
+    for (db_a, dim_a), group_a in by_db.items():
+        for (db_b, dim_b), group_b in by_db.items():
+            if db_a >= db_b or dim_a != dim_b:  # Skip same-db and already compared pairs
                 continue
             
-            for entity_a in by_db[db_a]:
-                for entity_b in by_db[db_b]:
-                    comparisons += 1
-                    similarity = cosine_similarity(entity_a.embedding, entity_b.embedding)
-                    
-                    if similarity >= threshold:
-                        links.append(CrossLink(
-                            source_db=entity_a.db,
-                            source_id=entity_a.id,
-                            source_type=entity_a.type,
-                            target_db=entity_b.db,
-                            target_id=entity_b.id,
-                            target_type=entity_b.type,
-                            link_type='semantically_similar',
-                            confidence=float(similarity),
-                            context=f"Embedding similarity: {similarity:.3f}",
-                            evidence=[f"Cosine similarity: {similarity:.3f}"]
-                        ))
+            comparisons += len(group_a) * len(group_b)
+            for i, j, similarity in top_k_similarity_join(
+                matrices[(db_a, dim_a)], matrices[(db_b, dim_b)], threshold, top_k
+            ):
+                entity_a, entity_b = group_a[i], group_b[j]
+                links.append(CrossLink(
+                    source_db=entity_a.db,
+                    source_id=entity_a.id,
+                    source_type=entity_a.type,
+                    target_db=entity_b.db,
+                    target_id=entity_b.id,
+                    target_type=entity_b.type,
+                    link_type='semantically_similar',
+                    confidence=similarity,
+                    context=f"Embedding similarity: {similarity:.3f}",
+                    evidence=[f"Cosine similarity: {similarity:.3f}"]
+                ))
     
     print(f"    Performed {comparisons} comparisons")
     return links
@@ -605,23 +650,35 @@ def save_links(links: list[CrossLink], clear_existing: bool = False):
         if clear_existing:
             conn.execute("DELETE FROM cross_links")
         
-        saved = 0
-        for link in links:
-            try:
-                conn.execute("""
-                    INSERT OR REPLACE INTO cross_links
-                    (source_db, source_id, source_type, target_db, target_id,
-                     target_type, link_type, confidence, context, evidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    link.source_db, link.source_id, link.source_type,
-                    link.target_db, link.target_id, link.target_type,
-                    link.link_type, link.confidence, link.context,
-                    '|'.join(link.evidence) if link.evidence else None
-                ))
-                saved += 1
-            except Exception as e:
-                print(f"  Error saving link: {e}")
+        rows = [
+            (
+                link.source_db, link.source_id, link.source_type,
+                link.target_db, link.target_id, link.target_type,
+                link.link_type, link.confidence, link.context,
+                '|'.join(link.evidence) if link.evidence else None
+            )
+            for link in links
+        ]
+        sql = """
+            INSERT OR REPLACE INTO cross_links
+            (source_db, source_id, source_type, target_db, target_id,
+             target_type, link_type, confidence, context, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        
+        try:
+            conn.executemany(sql, rows)
+            saved = len(rows)
+        except sqlite3.Error as e:
+            # Fall back to row-by-row so one bad link doesn't drop the batch
+            print(f"  Bulk insert failed ({e}), retrying link by link")
+            saved = 0
+            for row in rows:
+                try:
+                    conn.execute(sql, row)
+                    saved += 1
+                except Exception as e:
+                    print(f"  Error saving link: {e}")
         
         conn.commit()
     
@@ -674,6 +731,8 @@ def main():
     parser.add_argument('--rebuild', action='store_true', help='Clear and rebuild all links')
     parser.add_argument('--threshold', type=float, default=DEFAULT_SIMILARITY_THRESHOLD,
                         help=f'Similarity threshold (default: {DEFAULT_SIMILARITY_THRESHOLD})')
+    parser.add_argument('--semantic-top-k', type=int, default=DEFAULT_SEMANTIC_TOP_K,
+                        help=f'Semantic links per entity and database (default: {DEFAULT_SEMANTIC_TOP_K})')
     args = parser.parse_args()
     
     print("=" * 70)
@@ -730,7 +789,9 @@ def main():
     
     # Strategy 3: Semantic similarity (if embeddings available)
     print("\n📊 Strategy 3: Semantic Similarity...")
-    semantic_links = find_semantic_links(all_entities, threshold=args.threshold)
+    semantic_links = find_semantic_links(
+        all_entities, threshold=args.threshold, top_k=args.semantic_top_k
+    )
     print(f"  Found {len(semantic_links)} semantic links")
     all_links.extend(semantic_links)
     
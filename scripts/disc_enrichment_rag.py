@@ -32,7 +32,6 @@ import json
 import os
 import re
 import sqlite3
-import struct
 import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -46,6 +45,9 @@ import numpy as np
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ai_dev_orchestrator.knowledge.fanout import gather, thread_connection  # noqa: E402
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 try:
     from sentence_transformers import SentenceTransformer
     EMBEDDER_AVAILABLE = True
@@ -78,6 +80,7 @@ CHAT_LOGS_DIR = WORKSPACE_ROOT / ".chat_logs"
 # Similarity thresholds
 DEFAULT_SEMANTIC_THRESHOLD = 0.55  # Lower = more results, higher = stricter
 DEFAULT_TOP_K = 15  # Max results per source
+DEFAULT_SOURCE_TIMEOUT = 120.0  # Seconds for all sources of one DISC
 
 # Key concepts to look for in DISC documents
 AICM_CONCEPTS = {
@@ -169,25 +172,27 @@ def get_device() -> str:
 # =============================================================================
 
 def get_connection(db_path: Path) -> Optional[sqlite3.Connection]:
-    """Get database connection if database exists."""
+    """Get the calling thread's connection to a database if it exists.
+    
+    Search legs run on retrieval pool threads, and a leg dropped by
+    ``gather`` keeps running, so connections are never shared across
+    threads.
+    """
     if not db_path.exists():
         return None
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return thread_connection(str(db_path))
 
 
 def load_embedding_blob(blob: bytes) -> np.ndarray:
     """Load embedding from SQLite blob."""
     if blob is None:
         return None
-    n_floats = len(blob) // 4
-    return np.array(struct.unpack(f'{n_floats}f', blob))
+    return np.frombuffer(blob, dtype=np.float32)
 
 
 def embedding_to_blob(embedding: np.ndarray) -> bytes:
     """Convert numpy embedding to SQLite blob."""
-    return struct.pack(f'{len(embedding)}f', *embedding.tolist())
+    return np.asarray(embedding, dtype=np.float32).tobytes()
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -197,6 +202,30 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8))
 
 
+def embedding_scores(blobs: List[bytes],
+                     query_embeddings: List[np.ndarray]) -> Tuple[List[int], np.ndarray]:
+    """Cosine similarity of stored embeddings against a batch of queries.
+    
+    Stored vectors are decoded and normalized once, then scored against every
+    query with a single matrix product.
+    
+    Returns:
+        (indices of blobs whose dimension matches the queries,
+         scores of shape (len(indices), len(query_embeddings)))
+    """
+    queries = np.asarray(query_embeddings, dtype=np.float32)
+    dim = queries.shape[1]
+    keep = [i for i, blob in enumerate(blobs) if blob and len(blob) == dim * 4]
+    if not keep:
+        return [], np.empty((0, len(queries)), dtype=np.float32)
+    
+    matrix = np.frombuffer(b''.join(blobs[i] for i in keep), dtype=np.float32)
+    matrix = matrix.reshape(len(keep), dim)
+    matrix = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8)
+    queries = queries / (np.linalg.norm(queries, axis=1, keepdims=True) + 1e-8)
+    return keep, matrix @ queries.T
+
+
 # =============================================================================
 # DISC Document Parser
 # =============================================================================
@@ -312,7 +341,7 @@ class EmbeddingModel:
     def _load_model(self):
         if self._model is None and EMBEDDER_AVAILABLE:
             print(f"📦 Loading embedding model on {self.device}...")
-            self._model = SentenceTransformer(self.MODEL_NAME, device=self.device)
+            self._model = get_model(self.MODEL_NAME, device=self.device)
             print("✅ Model loaded")
     
     def embed(self, text: str) -> np.ndarray:
@@ -334,7 +363,26 @@ class EmbeddingModel:
 # Database Searchers
 # =============================================================================
 
-class ResearchDBSearcher:
+class DatabaseSearcher:
+    """Base for searchers over one AIKH database."""
+
+    def __init__(self, embedding_model: EmbeddingModel, db_path: Path):
+        """Search ``db_path``; it may not exist yet."""
+        self.model = embedding_model
+        self.db_path = db_path
+
+    @property
+    def available(self) -> bool:
+        """Whether the database exists."""
+        return self.db_path.exists()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """The calling thread's connection, or None if the database is missing."""
+        return get_connection(self.db_path)
+
+
+class ResearchDBSearcher(DatabaseSearcher):
     """Search research.db for relevant papers using multi-signal matching.
     
     Matching Signals (all contribute to final score):
@@ -346,8 +394,7 @@ class ResearchDBSearcher:
     """
     
     def __init__(self, embedding_model: EmbeddingModel):
-        self.model = embedding_model
-        self.conn = get_connection(RESEARCH_DB)
+        super().__init__(embedding_model, RESEARCH_DB)
     
     def _compute_keyword_score(self, paper_keywords: str, query_keywords: List[str]) -> float:
         """Compute keyword overlap score between paper and query."""
@@ -396,11 +443,17 @@ class ResearchDBSearcher:
         - 10% venue relevance (conference prestige)
         - 5% author chain (academic provenance)
         """
-        if self.conn is None:
-            return []
+        return self.search_batch([query], [query_embedding], threshold, top_k)[0]
+    
+    def search_batch(self, queries: List[str], query_embeddings: List[np.ndarray],
+                     threshold: float, top_k: int) -> List[List[EvidenceItem]]:
+        """Multi-signal search for several queries at once.
         
-        results = []
-        query_terms = [t for t in query.lower().split() if len(t) > 2]
+        Papers and their embeddings are read once and the semantic signal for
+        all queries comes from one matrix product.
+        """
+        if self.conn is None:
+            return [[] for _ in queries]
         
         # Load all papers with full metadata
         try:
@@ -411,7 +464,7 @@ class ResearchDBSearcher:
                 FROM research_papers p
             """).fetchall()
         except sqlite3.OperationalError:
-            return []
+            return [[] for _ in queries]
         
         # Load paper-level embeddings from summary table
         paper_embeddings = {}
@@ -420,9 +473,7 @@ class ResearchDBSearcher:
                 SELECT paper_id, vector FROM paper_summary_embeddings
                 WHERE vector IS NOT NULL
             """):
-                emb = load_embedding_blob(row['vector'])
-                if emb is not None:
-                    paper_embeddings[row['paper_id']] = emb
+                paper_embeddings[row['paper_id']] = row['vector']
         except sqlite3.OperationalError:
             pass
         
@@ -436,22 +487,31 @@ class ResearchDBSearcher:
                     WHERE e.vector IS NOT NULL
                     GROUP BY c.paper_id
                 """):
-                    emb = load_embedding_blob(row['vector'])
-                    if emb is not None:
-                        paper_embeddings[row['paper_id']] = emb
+                    paper_embeddings[row['paper_id']] = row['vector']
             except sqlite3.OperationalError:
                 pass
         
-        for paper in papers:
+        # Semantic scores for every (paper, query) pair
+        semantic = np.zeros((len(papers), len(queries)), dtype=np.float32)
+        if paper_embeddings and all(e is not None for e in query_embeddings):
+            blobs = [paper_embeddings.get(paper['id']) for paper in papers]
+            rows, scores = embedding_scores(blobs, query_embeddings)
+            semantic[rows] = scores
+        
+        return [
+            self._rank_papers(papers, semantic[:, j], query, threshold, top_k)
+            for j, query in enumerate(queries)
+        ]
+    
+    def _rank_papers(self, papers: List[sqlite3.Row], semantic_scores: np.ndarray,
+                     query: str, threshold: float, top_k: int) -> List[EvidenceItem]:
+        """Combine semantic scores with the metadata signals for one query."""
+        results = []
+        query_terms = [t for t in query.lower().split() if len(t) > 2]
+        
+        for paper, semantic_score in zip(papers, semantic_scores.tolist()):
             paper_id = paper['id']
             
-            # 1. Semantic similarity (50% weight)
-            semantic_score = 0.0
-            if query_embedding is not None and paper_id in paper_embeddings:
-                db_emb = paper_embeddings[paper_id]
-                if len(db_emb) == len(query_embedding):
-                    semantic_score = cosine_similarity(query_embedding, db_emb)
-            
             # 2. Keyword overlap (20% weight)
             keyword_score = self._compute_keyword_score(paper['keywords'], query_terms)
             
@@ -521,113 +581,129 @@ class ResearchDBSearcher:
         return unique_results[:top_k]
 
 
-class ChatlogsDBSearcher:
+def _dedupe_top_k(results: List[EvidenceItem], top_k: int) -> List[EvidenceItem]:
+    """Best-scoring item per source ID, best first."""
+    seen = set()
+    unique_results = []
+    for r in sorted(results, key=lambda x: x.similarity_score, reverse=True):
+        if r.source_id not in seen:
+            seen.add(r.source_id)
+            unique_results.append(r)
+    return unique_results[:top_k]
+
+
+class ChatlogsDBSearcher(DatabaseSearcher):
     """Search chatlogs.db for relevant conversations."""
     
     def __init__(self, embedding_model: EmbeddingModel):
-        self.model = embedding_model
-        self.conn = get_connection(CHATLOGS_DB)
+        super().__init__(embedding_model, CHATLOGS_DB)
     
     def search(self, query: str, query_embedding: np.ndarray,
                threshold: float, top_k: int) -> List[EvidenceItem]:
         """Search chat turns by semantic similarity and keywords."""
+        return self.search_batch([query], [query_embedding], threshold, top_k)[0]
+    
+    def search_batch(self, queries: List[str], query_embeddings: List[np.ndarray],
+                     threshold: float, top_k: int) -> List[List[EvidenceItem]]:
+        """Search chat turns for several queries with one embedding scan."""
         if self.conn is None:
-            return []
+            return [[] for _ in queries]
         
-        results = []
+        results: List[List[EvidenceItem]] = [[] for _ in queries]
         
         # Try semantic search using embeddings
-        if query_embedding is not None:
+        if all(e is not None for e in query_embeddings):
             try:
-                for row in self.conn.execute("""
+                rows = self.conn.execute("""
                     SELECT e.id, e.turn_id, e.chat_log_id, e.embedding,
                            t.content, t.role, l.title, l.filename
                     FROM chat_embeddings e
                     LEFT JOIN chat_turns t ON e.turn_id = t.id
                     JOIN chat_logs l ON e.chat_log_id = l.id
                     WHERE e.embedding IS NOT NULL
-                """):
-                    if row['embedding']:
-                        db_embedding = load_embedding_blob(row['embedding'])
-                        if db_embedding is not None and len(db_embedding) == len(query_embedding):
-                            sim = cosine_similarity(query_embedding, db_embedding)
-                            if sim >= threshold:
-                                content = row['content'] or f"Chat log: {row['title'] or row['filename']}"
-                                results.append(EvidenceItem(
-                                    source_db='chatlogs',
-                                    source_id=str(row['turn_id'] or row['chat_log_id']),
-                                    source_type='chat_turn' if row['turn_id'] else 'chat_log',
-                                    title=row['title'] or row['filename'] or 'Chat',
-                                    snippet=content[:300],
-                                    similarity_score=sim,
-                                    match_type='semantic',
-                                    metadata={'role': row['role']}
-                                ))
+                """).fetchall()
+                keep, scores = embedding_scores([r['embedding'] for r in rows], query_embeddings)
+                for i, j in zip(*np.nonzero(scores >= threshold)):
+                    row = rows[keep[i]]
+                    content = row['content'] or f"Chat log: {row['title'] or row['filename']}"
+                    results[j].append(EvidenceItem(
+                        source_db='chatlogs',
+                        source_id=str(row['turn_id'] or row['chat_log_id']),
+                        source_type='chat_turn' if row['turn_id'] else 'chat_log',
+                        title=row['title'] or row['filename'] or 'Chat',
+                        snippet=content[:300],
+                        similarity_score=float(scores[i, j]),
+                        match_type='semantic',
+                        metadata={'role': row['role']}
+                    ))
             except sqlite3.OperationalError:
                 pass
         
         # Fallback to keyword search
-        if not results:
-            try:
-                keywords = query.lower().split()[:5]
-                for kw in keywords:
-                    if len(kw) < 3:
-                        continue
-                    for row in self.conn.execute("""
-                        SELECT t.id, t.content, t.role, l.title, l.filename
-                        FROM chat_turns t
-                        JOIN chat_logs l ON t.chat_log_id = l.id
-                        WHERE t.content LIKE ?
-                        LIMIT 10
-                    """, (f'%{kw}%',)):
-                        content_lower = row['content'].lower()
-                        match_count = sum(1 for k in keywords if k in content_lower)
-                        score = match_count / len(keywords) if keywords else 0
-                        
-                        if score >= 0.3:
-                            results.append(EvidenceItem(
-                                source_db='chatlogs',
-                                source_id=str(row['id']),
-                                source_type='chat_turn',
-                                title=row['title'] or row['filename'] or 'Chat',
-                                snippet=row['content'][:300],
-                                similarity_score=score,
-                                match_type='lexical',
-                                metadata={'role': row['role']}
-                            ))
-            except sqlite3.OperationalError:
-                pass
-        
-        # Dedupe and sort
-        seen = set()
-        unique_results = []
-        for r in sorted(results, key=lambda x: x.similarity_score, reverse=True):
-            if r.source_id not in seen:
-                seen.add(r.source_id)
-                unique_results.append(r)
+        for query, query_results in zip(queries, results):
+            if not query_results:
+                query_results.extend(self._keyword_search(query))
         
-        return unique_results[:top_k]
+        return [_dedupe_top_k(r, top_k) for r in results]
+    
+    def _keyword_search(self, query: str) -> List[EvidenceItem]:
+        """Match chat turns on the first query keywords."""
+        results = []
+        try:
+            keywords = query.lower().split()[:5]
+            for kw in keywords:
+                if len(kw) < 3:
+                    continue
+                for row in self.conn.execute("""
+                    SELECT t.id, t.content, t.role, l.title, l.filename
+                    FROM chat_turns t
+                    JOIN chat_logs l ON t.chat_log_id = l.id
+                    WHERE t.content LIKE ?
+                    LIMIT 10
+                """, (f'%{kw}%',)):
+                    content_lower = row['content'].lower()
+                    match_count = sum(1 for k in keywords if k in content_lower)
+                    score = match_count / len(keywords) if keywords else 0
+                    
+                    if score >= 0.3:
+                        results.append(EvidenceItem(
+                            source_db='chatlogs',
+                            source_id=str(row['id']),
+                            source_type='chat_turn',
+                            title=row['title'] or row['filename'] or 'Chat',
+                            snippet=row['content'][:300],
+                            similarity_score=score,
+                            match_type='lexical',
+                            metadata={'role': row['role']}
+                        ))
+        except sqlite3.OperationalError:
+            pass
+        return results
 
 
-class ArtifactsDBSearcher:
+class ArtifactsDBSearcher(DatabaseSearcher):
     """Search artifacts.db for relevant documents."""
     
     def __init__(self, embedding_model: EmbeddingModel):
-        self.model = embedding_model
-        self.conn = get_connection(ARTIFACTS_DB)
+        super().__init__(embedding_model, ARTIFACTS_DB)
     
     def search(self, query: str, query_embedding: np.ndarray,
                threshold: float, top_k: int) -> List[EvidenceItem]:
         """Search artifacts by semantic similarity."""
+        return self.search_batch([query], [query_embedding], threshold, top_k)[0]
+    
+    def search_batch(self, queries: List[str], query_embeddings: List[np.ndarray],
+                     threshold: float, top_k: int) -> List[List[EvidenceItem]]:
+        """Search live and archived artifacts for several queries at once."""
         if self.conn is None:
-            return []
+            return [[] for _ in queries]
         
-        results = []
+        results: List[List[EvidenceItem]] = [[] for _ in queries]
         
-        # Try semantic search on chunk embeddings
-        if query_embedding is not None:
+        if all(e is not None for e in query_embeddings):
+            # Try semantic search on chunk embeddings
             try:
-                for row in self.conn.execute("""
+                rows = self.conn.execute("""
                     SELECT c.id as chunk_id, c.content as chunk_content,
                            d.id, d.title, d.type, d.file_path,
                            e.vector
@@ -636,29 +712,26 @@ class ArtifactsDBSearcher:
                     JOIN documents d ON c.doc_id = d.id
                     WHERE d.archived_at IS NULL
                     AND e.vector IS NOT NULL
-                """):
-                    if row['vector']:
-                        db_embedding = load_embedding_blob(row['vector'])
-                        if db_embedding is not None and len(db_embedding) == len(query_embedding):
-                            sim = cosine_similarity(query_embedding, db_embedding)
-                            if sim >= threshold:
-                                results.append(EvidenceItem(
-                                    source_db='artifacts',
-                                    source_id=row['id'],
-                                    source_type=row['type'],
-                                    title=row['title'],
-                                    snippet=row['chunk_content'][:300] if row['chunk_content'] else '',
-                                    similarity_score=sim,
-                                    match_type='semantic',
-                                    metadata={'file_path': row['file_path']}
-                                ))
+                """).fetchall()
+                keep, scores = embedding_scores([r['vector'] for r in rows], query_embeddings)
+                for i, j in zip(*np.nonzero(scores >= threshold)):
+                    row = rows[keep[i]]
+                    results[j].append(EvidenceItem(
+                        source_db='artifacts',
+                        source_id=row['id'],
+                        source_type=row['type'],
+                        title=row['title'],
+                        snippet=row['chunk_content'][:300] if row['chunk_content'] else '',
+                        similarity_score=float(scores[i, j]),
+                        match_type='semantic',
+                        metadata={'file_path': row['file_path']}
+                    ))
             except sqlite3.OperationalError:
                 pass
-        
-        # Also search archived artifacts
-        if query_embedding is not None:
+            
+            # Also search archived artifacts
             try:
-                for row in self.conn.execute("""
+                rows = self.conn.execute("""
                     SELECT c.id as chunk_id, c.content as chunk_content,
                            a.id, a.title, a.original_type, a.archive_path,
                            e.vector
@@ -666,57 +739,55 @@ class ArtifactsDBSearcher:
                     JOIN archived_chunks c ON e.chunk_id = c.id
                     JOIN archived_artifacts a ON c.artifact_id = a.id
                     WHERE e.vector IS NOT NULL
-                """):
-                    if row['vector']:
-                        db_embedding = load_embedding_blob(row['vector'])
-                        if db_embedding is not None and len(db_embedding) == len(query_embedding):
-                            sim = cosine_similarity(query_embedding, db_embedding)
-                            if sim >= threshold:
-                                results.append(EvidenceItem(
-                                    source_db='artifacts',
-                                    source_id=row['id'],
-                                    source_type=f"archived_{row['original_type']}",
-                                    title=f"[Archived] {row['title']}",
-                                    snippet=row['chunk_content'][:300] if row['chunk_content'] else '',
-                                    similarity_score=sim,
-                                    match_type='semantic',
-                                    metadata={'file_path': row['archive_path']}
-                                ))
-            except sqlite3.OperationalError:
-                pass
-        
-        # Fallback to FTS
-        if not results:
-            try:
-                for row in self.conn.execute("""
-                    SELECT d.id, d.title, d.type, d.content, d.file_path
-                    FROM documents d
-                    WHERE d.archived_at IS NULL
-                    AND (d.title LIKE ? OR d.content LIKE ?)
-                    LIMIT 10
-                """, (f'%{query[:50]}%', f'%{query[:50]}%')):
-                    results.append(EvidenceItem(
+                """).fetchall()
+                keep, scores = embedding_scores([r['vector'] for r in rows], query_embeddings)
+                for i, j in zip(*np.nonzero(scores >= threshold)):
+                    row = rows[keep[i]]
+                    results[j].append(EvidenceItem(
                         source_db='artifacts',
                         source_id=row['id'],
-                        source_type=row['type'],
-                        title=row['title'],
-                        snippet=row['content'][:300] if row['content'] else '',
-                        similarity_score=0.4,
-                        match_type='lexical',
-                        metadata={'file_path': row['file_path']}
+                        source_type=f"archived_{row['original_type']}",
+                        title=f"[Archived] {row['title']}",
+                        snippet=row['chunk_content'][:300] if row['chunk_content'] else '',
+                        similarity_score=float(scores[i, j]),
+                        match_type='semantic',
+                        metadata={'file_path': row['archive_path']}
                     ))
             except sqlite3.OperationalError:
                 pass
         
-        # Dedupe by document ID
-        seen = set()
-        unique_results = []
-        for r in sorted(results, key=lambda x: x.similarity_score, reverse=True):
-            if r.source_id not in seen:
-                seen.add(r.source_id)
-                unique_results.append(r)
+        # Fallback to FTS
+        for query, query_results in zip(queries, results):
+            if not query_results:
+                query_results.extend(self._lexical_search(query))
         
-        return unique_results[:top_k]
+        # Dedupe by document ID
+        return [_dedupe_top_k(r, top_k) for r in results]
+    
+    def _lexical_search(self, query: str) -> List[EvidenceItem]:
+        """Match live documents on a LIKE over title and content."""
+        results = []
+        try:
+            for row in self.conn.execute("""
+                SELECT d.id, d.title, d.type, d.content, d.file_path
+                FROM documents d
+                WHERE d.archived_at IS NULL
+                AND (d.title LIKE ? OR d.content LIKE ?)
+                LIMIT 10
+            """, (f'%{query[:50]}%', f'%{query[:50]}%')):
+                results.append(EvidenceItem(
+                    source_db='artifacts',
+                    source_id=row['id'],
+                    source_type=row['type'],
+                    title=row['title'],
+                    snippet=row['content'][:300] if row['content'] else '',
+                    similarity_score=0.4,
+                    match_type='lexical',
+                    metadata={'file_path': row['file_path']}
+                ))
+        except sqlite3.OperationalError:
+            pass
+        return results
 
 
 class WorkspaceSearcher:
@@ -789,9 +860,11 @@ class DISCEnrichmentEngine:
     """Main engine for enriching DISC documents with contextual provenance."""
     
     def __init__(self, threshold: float = DEFAULT_SEMANTIC_THRESHOLD, 
-                 top_k: int = DEFAULT_TOP_K):
+                 top_k: int = DEFAULT_TOP_K,
+                 source_timeout: float = DEFAULT_SOURCE_TIMEOUT):
         self.threshold = threshold
         self.top_k = top_k
+        self.source_timeout = source_timeout
         self.device = get_device()
         self.embedding_model = EmbeddingModel(self.device)
         
@@ -815,48 +888,39 @@ class DISCEnrichmentEngine:
         all_evidence: List[EvidenceItem] = []
         sources_searched = []
         
-        # Embed the main content for semantic search
-        main_text = f"{disc.title} {disc.frontmatter.get('delegation_scope', '')} {disc.sections.get('summary', '')[:500]}"
-        main_embedding = self.embedding_model.embed(main_text)
-        
-        # Search each database
-        for query in queries[:3]:  # Limit queries to avoid too many results
-            query_embedding = self.embedding_model.embed(query)
-            
-            # Research papers
-            if self.research_searcher.conn:
-                sources_searched.append('research.db')
-                results = self.research_searcher.search(
-                    query, query_embedding, self.threshold, self.top_k
-                )
-                all_evidence.extend(results)
-                print(f"  📚 Research: {len(results)} matches")
-            
-            # Chat logs
-            if self.chatlogs_searcher.conn:
-                sources_searched.append('chatlogs.db')
-                results = self.chatlogs_searcher.search(
-                    query, query_embedding, self.threshold, self.top_k
-                )
-                all_evidence.extend(results)
-                print(f"  💬 Chatlogs: {len(results)} matches")
-            
-            # Artifacts
-            if self.artifacts_searcher.conn:
-                sources_searched.append('artifacts.db')
-                results = self.artifacts_searcher.search(
-                    query, query_embedding, self.threshold, self.top_k
-                )
-                all_evidence.extend(results)
-                print(f"  📁 Artifacts: {len(results)} matches")
+        # Embed all search queries in one model call
+        search_queries = queries[:3]  # Limit queries to avoid too many results
+        query_embeddings = list(self.embedding_model.embed_batch(search_queries))
         
-        # Workspace files
-        sources_searched.append('workspace')
-        ws_results = self.workspace_searcher.search(
+        # Search all sources concurrently, each database once for all queries
+        searchers = [
+            (self.research_searcher, 'research.db', '📚 Research'),
+            (self.chatlogs_searcher, 'chatlogs.db', '💬 Chatlogs'),
+            (self.artifacts_searcher, 'artifacts.db', '📁 Artifacts'),
+        ]
+        legs = {
+            db_name: (lambda s=searcher: s.search_batch(
+                search_queries, query_embeddings, self.threshold, self.top_k
+            ))
+            for searcher, db_name, _ in searchers
+            if searcher.available
+        }
+        legs['workspace'] = lambda: [self.workspace_searcher.search(
             disc.title, disc.key_concepts, self.top_k
-        )
-        all_evidence.extend(ws_results)
-        print(f"  📂 Workspace: {len(ws_results)} matches")
+        )]
+        batches_by_source = gather(legs, budget=self.source_timeout)
+        
+        labels = [(db_name, label) for _, db_name, label in searchers]
+        for db_name, label in labels + [('workspace', '📂 Workspace')]:
+            if db_name not in legs:
+                continue
+            sources_searched.append(db_name)
+            if db_name not in batches_by_source:
+                print(f"  {label}: timed out or failed")
+                continue
+            for results in batches_by_source[db_name]:
+                all_evidence.extend(results)
+                print(f"  {label}: {len(results)} matches")
         
         # Deduplicate evidence
         seen = set()
@@ -983,6 +1047,8 @@ def main():
                         help=f"Similarity threshold (default: {DEFAULT_SEMANTIC_THRESHOLD})")
     parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
                         help=f"Max results per source (default: {DEFAULT_TOP_K})")
+    parser.add_argument('--source-timeout', type=float, default=DEFAULT_SOURCE_TIMEOUT,
+                        help=f"Seconds to wait for all sources (default: {DEFAULT_SOURCE_TIMEOUT})")
     parser.add_argument('--dry-run', action='store_true', 
                         help="Show results without modifying files")
     parser.add_argument('--output-dir', type=Path, default=None,
@@ -1025,7 +1091,8 @@ def main():
     print(f"  Artifacts DB: {'✅' if ARTIFACTS_DB.exists() else '❌'} {ARTIFACTS_DB}")
     
     # Initialize engine
-    engine = DISCEnrichmentEngine(threshold=args.threshold, top_k=args.top_k)
+    engine = DISCEnrichmentEngine(threshold=args.threshold, top_k=args.top_k,
+                                  source_timeout=args.source_timeout)
     
     # Process each DISC
     all_records = []
@@ -16,12 +16,17 @@ import sqlite3
 import struct
 import sys
 import time
-from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import numpy as np
 
+# Share loaded models with the rest of the process
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from ai_dev_orchestrator.knowledge.backfill import backfill_embeddings  # noqa: E402
+from ai_dev_orchestrator.knowledge.embedding_cache import cached_encode  # noqa: E402
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 # Check for GPU availability
 try:
     import torch
@@ -77,15 +82,6 @@ CREATE INDEX IF NOT EXISTS idx_gpu_emb_type ON paper_embeddings_gpu(embedding_ty
 """
 
 
-@dataclass
-class EmbeddingTask:
-    """Single embedding task."""
-    id: str
-    text: str
-    task_type: str  # 'paper' or 'chunk'
-    chunk_id: Optional[int] = None
-
-
 class GPUBatchEmbedder:
     """GPU-accelerated batch embedding generator."""
     
@@ -142,7 +138,7 @@ class GPUBatchEmbedder:
             print(f"📦 Loading model: {self.model_name}")
             print(f"   Device: {self.device}")
             
-            self.model = SentenceTransformer(self.model_name, device=self.device)
+            self.model = get_model(self.model_name, device=self.device)
             
             # Get embedding dimension
             test_emb = self.model.encode(["test"], convert_to_numpy=True)
@@ -161,180 +157,177 @@ class GPUBatchEmbedder:
         """Convert SQLite BLOB to numpy vector."""
         return np.frombuffer(blob, dtype=np.float32)
     
-    def get_papers_without_embeddings(self) -> List[EmbeddingTask]:
-        """Get papers that need embeddings."""
+    def count_pending_papers(self) -> int:
+        """Count papers that need embeddings."""
         with self._get_conn() as conn:
-            cursor = conn.execute("""
-                SELECT p.id, p.title, p.abstract
-                FROM research_papers p
-                LEFT JOIN paper_embeddings_gpu e 
+            return conn.execute("""
+                SELECT COUNT(*) FROM research_papers p
+                LEFT JOIN paper_embeddings_gpu e
                     ON p.id = e.paper_id AND e.embedding_type = 'paper'
                 WHERE e.id IS NULL
-            """)
-            
-            tasks = []
-            for row in cursor.fetchall():
-                text_parts = [row["title"] or ""]
-                if row["abstract"]:
-                    text_parts.append(row["abstract"])
-                # Get first chunk content if available
-                chunk_row = conn.execute(
-                    "SELECT content FROM paper_chunks WHERE paper_id = ? ORDER BY chunk_index LIMIT 1",
-                    (row["id"],)
-                ).fetchone()
-                if chunk_row:
-                    text_parts.append(chunk_row["content"][:2000])
-                
-                text = " ".join(text_parts)
-                if text.strip():
-                    tasks.append(EmbeddingTask(
-                        id=row["id"],
-                        text=text,
-                        task_type="paper"
-                    ))
-            
-            return tasks
+            """).fetchone()[0]
     
-    def get_chunks_without_embeddings(self) -> List[EmbeddingTask]:
-        """Get chunks that need embeddings."""
+    def count_pending_chunks(self) -> int:
+        """Count chunks that need embeddings."""
         with self._get_conn() as conn:
-            cursor = conn.execute("""
-                SELECT c.id as chunk_id, c.paper_id, c.content
-                FROM paper_chunks c
-                LEFT JOIN paper_embeddings_gpu e 
-                    ON c.paper_id = e.paper_id 
-                    AND c.id = e.chunk_id 
+            return conn.execute("""
+                SELECT COUNT(*) FROM paper_chunks c
+                LEFT JOIN paper_embeddings_gpu e
+                    ON c.paper_id = e.paper_id
+                    AND c.id = e.chunk_id
                     AND e.embedding_type = 'chunk'
                 WHERE e.paper_id IS NULL
                   AND LENGTH(c.content) > 50
-            """)
-            
-            tasks = []
-            for row in cursor.fetchall():
-                tasks.append(EmbeddingTask(
-                    id=row["paper_id"],
-                    text=row["content"],
-                    task_type="chunk",
-                    chunk_id=row["chunk_id"]
-                ))
-            
-            return tasks
+            """).fetchone()[0]
     
     def embed_batch(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for a batch of texts using GPU."""
+        """Generate embeddings for a batch of texts using GPU.
+        
+        Texts already in the shared embedding cache are not re-encoded.
+        """
         model = self._load_model()
         
         # Use show_progress_bar=False for cleaner output in batches
-        embeddings = model.encode(
-            texts,
+        return cached_encode(self.model_name, texts, lambda misses: model.encode(
+            misses,
             batch_size=self.batch_size,
             convert_to_numpy=True,
             normalize_embeddings=True,
             show_progress_bar=False
-        )
+        ))
+    
+    def _progress(self, unit: str, every: int = 1):
+        """Progress callback printing throughput every ``every`` batches."""
+        start_time = time.time()
+        batches = [0]
+        
+        def report(completed: int, total: Optional[int]):
+            batches[0] += 1
+            if batches[0] % every == 0 or completed == total:
+                elapsed = time.time() - start_time
+                rate = completed / elapsed if elapsed > 0 else 0
+                print(f"   Batch {batches[0]}: {completed}/{total} ({rate:.1f} {unit}/sec)")
         
-        return embeddings
+        return report
     
     def process_papers(self) -> Tuple[int, float]:
         """Process all papers without embeddings.
         
+        Papers are streamed in keyset windows and written per batch; an
+        interrupted run resumes from its checkpoint.
+        
         Returns:
             Tuple of (count, elapsed_time_seconds)
         """
-        tasks = self.get_papers_without_embeddings()
-        if not tasks:
+        pending = self.count_pending_papers()
+        if not pending:
             print("✅ All papers already have GPU embeddings")
             return 0, 0.0
         
-        print(f"📊 Processing {len(tasks)} papers...")
-        start_time = time.time()
-        
-        # Process in batches
-        total_batches = (len(tasks) - 1) // self.batch_size + 1
-        processed = 0
+        print(f"📊 Processing {pending} papers...")
         
-        for batch_idx in range(0, len(tasks), self.batch_size):
-            batch_tasks = tasks[batch_idx:batch_idx + self.batch_size]
-            batch_num = batch_idx // self.batch_size + 1
-            
-            # Generate embeddings
-            texts = [t.text for t in batch_tasks]
-            embeddings = self.embed_batch(texts)
-            
-            # Store embeddings
-            with self._get_conn() as conn:
-                for task, embedding in zip(batch_tasks, embeddings):
-                    conn.execute("""
-                        INSERT OR REPLACE INTO paper_embeddings_gpu
-                        (paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim)
-                        VALUES (?, NULL, 'paper', ?, ?, ?)
-                    """, (task.id, self.model_name, self.vector_to_blob(embedding), self.embedding_dim))
-                conn.commit()
-            
-            processed += len(batch_tasks)
-            elapsed = time.time() - start_time
-            rate = processed / elapsed if elapsed > 0 else 0
-            print(f"   Batch {batch_num}/{total_batches}: {processed}/{len(tasks)} "
-                  f"({rate:.1f} papers/sec)")
+        # Paper text: title, abstract and the start of the first chunk
+        with self._get_conn() as conn:
+            stats = backfill_embeddings(
+                conn,
+                job="gpu_papers",
+                select_sql="""
+                    SELECT id, text FROM (
+                        SELECT p.id, TRIM(
+                            COALESCE(p.title, '') || ' ' || COALESCE(p.abstract, '') || ' ' ||
+                            COALESCE(SUBSTR((
+                                SELECT content FROM paper_chunks
+                                WHERE paper_id = p.id ORDER BY chunk_index LIMIT 1
+                            ), 1, 2000), '')
+                        ) AS text
+                        FROM research_papers p
+                        LEFT JOIN paper_embeddings_gpu e
+                            ON p.id = e.paper_id AND e.embedding_type = 'paper'
+                        WHERE e.id IS NULL AND p.id > :after
+                    )
+                    WHERE text != ''
+                    ORDER BY id LIMIT :limit
+                """,
+                insert_sql="""
+                    INSERT OR REPLACE INTO paper_embeddings_gpu
+                    (paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim)
+                    VALUES (?, NULL, 'paper', ?, ?, ?)
+                """,
+                encode_fn=self.embed_batch,
+                row_params=lambda row, vec: (
+                    row[0], self.model_name, self.vector_to_blob(vec), len(vec)
+                ),
+                start_key="",
+                batch_size=self.batch_size,
+                progress_callback=self._progress("papers"),
+                total=pending,
+                quantize_table="paper_embeddings_gpu",
+                quantize_column="embedding",
+            )
         
-        elapsed = time.time() - start_time
-        print(f"✅ Processed {processed} papers in {elapsed:.1f}s "
-              f"({processed/elapsed:.1f} papers/sec)")
+        elapsed = stats.seconds
+        print(f"✅ Processed {stats.embedded} papers in {elapsed:.1f}s "
+              f"({stats.embedded/elapsed if elapsed else 0:.1f} papers/sec)")
         
-        return processed, elapsed
+        return stats.embedded, elapsed
     
     def process_chunks(self) -> Tuple[int, float]:
         """Process all chunks without embeddings.
         
+        Chunks are streamed in keyset windows, length-bucketed into batches
+        and written per batch; an interrupted run resumes from its checkpoint.
+        
         Returns:
             Tuple of (count, elapsed_time_seconds)
         """
-        tasks = self.get_chunks_without_embeddings()
-        if not tasks:
+        pending = self.count_pending_chunks()
+        if not pending:
             print("✅ All chunks already have GPU embeddings")
             return 0, 0.0
         
-        print(f"📊 Processing {len(tasks)} chunks...")
-        start_time = time.time()
+        print(f"📊 Processing {pending} chunks...")
         
         # Process in larger batches for chunks (they're smaller)
         chunk_batch_size = self.batch_size * 2
-        total_batches = (len(tasks) - 1) // chunk_batch_size + 1
-        processed = 0
         
-        for batch_idx in range(0, len(tasks), chunk_batch_size):
-            batch_tasks = tasks[batch_idx:batch_idx + chunk_batch_size]
-            batch_num = batch_idx // chunk_batch_size + 1
-            
-            # Generate embeddings
-            texts = [t.text for t in batch_tasks]
-            embeddings = self.embed_batch(texts)
-            
-            # Store embeddings
-            with self._get_conn() as conn:
-                for task, embedding in zip(batch_tasks, embeddings):
-                    conn.execute("""
-                        INSERT OR REPLACE INTO paper_embeddings_gpu
-                        (paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim)
-                        VALUES (?, ?, 'chunk', ?, ?, ?)
-                    """, (task.id, task.chunk_id, self.model_name, 
-                          self.vector_to_blob(embedding), self.embedding_dim))
-                conn.commit()
-            
-            processed += len(batch_tasks)
-            elapsed = time.time() - start_time
-            rate = processed / elapsed if elapsed > 0 else 0
-            
-            # Print less frequently for chunks
-            if batch_num % 5 == 0 or batch_num == total_batches:
-                print(f"   Batch {batch_num}/{total_batches}: {processed}/{len(tasks)} "
-                      f"({rate:.1f} chunks/sec)")
+        with self._get_conn() as conn:
+            stats = backfill_embeddings(
+                conn,
+                job="gpu_chunks",
+                select_sql="""
+                    SELECT c.id, c.content, c.paper_id
+                    FROM paper_chunks c
+                    LEFT JOIN paper_embeddings_gpu e
+                        ON c.paper_id = e.paper_id
+                        AND c.id = e.chunk_id
+                        AND e.embedding_type = 'chunk'
+                    WHERE e.paper_id IS NULL
+                      AND LENGTH(c.content) > 50
+                      AND c.id > :after
+                    ORDER BY c.id LIMIT :limit
+                """,
+                insert_sql="""
+                    INSERT OR REPLACE INTO paper_embeddings_gpu
+                    (paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim)
+                    VALUES (?, ?, 'chunk', ?, ?, ?)
+                """,
+                encode_fn=self.embed_batch,
+                row_params=lambda row, vec: (
+                    row[2], row[0], self.model_name, self.vector_to_blob(vec), len(vec)
+                ),
+                batch_size=chunk_batch_size,
+                # Print less frequently for chunks
+                progress_callback=self._progress("chunks", every=5),
+                total=pending,
+                quantize_table="paper_embeddings_gpu",
+                quantize_column="embedding",
+            )
         
-        elapsed = time.time() - start_time
-        print(f"✅ Processed {processed} chunks in {elapsed:.1f}s "
-              f"({processed/elapsed:.1f} chunks/sec)")
+        elapsed = stats.seconds
+        print(f"✅ Processed {stats.embedded} chunks in {elapsed:.1f}s "
+              f"({stats.embedded/elapsed if elapsed else 0:.1f} chunks/sec)")
         
-        return processed, elapsed
+        return stats.embedded, elapsed
     
     def get_stats(self) -> dict:
         """Get embedding statistics."""
@@ -86,21 +86,39 @@ CREATE TABLE IF NOT EXISTS llm_calls (
 
 -- FTS5 virtual table for full-text search
 CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
-    title, content, doc_id UNINDEXED, content='documents', content_rowid='rowid'
+    title, content, content='documents', content_rowid='rowid'
 );
 
 -- Triggers for FTS sync
 CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+
+-- Chunk-level FTS5 index, the same unit as vector search
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    content, content='chunks', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE OF content ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
 END;
 
 -- Indexes
@@ -168,14 +186,43 @@ CREATE TABLE IF NOT EXISTS chat_embeddings (
     created_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 
--- FTS5 full-text search
+-- FTS5 full-text search, maintained by triggers: one row per turn
+-- (rowid = turn id) and one title row per chat log (rowid = -chat_log_id)
 CREATE VIRTUAL TABLE IF NOT EXISTS chat_fts USING fts5(
-    content, filename, title,
-    content='chat_turns',
-    content_rowid='id',
+    title,
+    content,
+    chat_log_id UNINDEXED,
     tokenize='porter'
 );
 
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_ai AFTER INSERT ON chat_logs BEGIN
+    INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+    VALUES (-new.id, COALESCE(new.title, ''), '', new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_au AFTER UPDATE OF title ON chat_logs BEGIN
+    UPDATE chat_fts SET title = COALESCE(new.title, '') WHERE rowid = -new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_ad AFTER DELETE ON chat_logs BEGIN
+    DELETE FROM chat_fts WHERE rowid = -old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_ai AFTER INSERT ON chat_turns BEGIN
+    INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+    VALUES (new.id, '', new.content, new.chat_log_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_au AFTER UPDATE OF content, chat_log_id ON chat_turns
+BEGIN
+    UPDATE chat_fts SET content = new.content, chat_log_id = new.chat_log_id
+    WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_ad AFTER DELETE ON chat_turns BEGIN
+    DELETE FROM chat_fts WHERE rowid = old.id;
+END;
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_chat_turns_log ON chat_turns(chat_log_id);
 CREATE INDEX IF NOT EXISTS idx_chat_file_refs_log ON chat_file_refs(chat_log_id);
@@ -330,6 +377,48 @@ CREATE INDEX IF NOT EXISTS idx_files_paper ON paper_files(paper_id);
 """
 
 
+EXTERNAL_CONTENT_FTS = ("content_fts", "chunks_fts")
+CHAT_FTS_COLUMNS = ["title", "content", "chat_log_id"]
+CHAT_FTS_TRIGGERS = (
+    "chat_logs_fts_ai", "chat_logs_fts_au", "chat_logs_fts_ad",
+    "chat_turns_fts_ai", "chat_turns_fts_au", "chat_turns_fts_ad",
+)
+
+
+def fts_tables(conn: sqlite3.Connection) -> set:
+    """Names of the FTS virtual tables in a database."""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'"
+    )
+    return {row[0] for row in rows}
+
+
+def drop_stale_chat_fts(conn: sqlite3.Connection) -> None:
+    """Drop a chat_fts (and its triggers) left by an older layout.
+
+    Older chatlogs databases carry an external-content index over chat_turns
+    without a chat_log_id column, which the triggers write to.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(chat_fts)")]
+    if not columns or columns == CHAT_FTS_COLUMNS:
+        return
+    for trigger in CHAT_FTS_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE chat_fts")
+
+
+def populate_chat_fts(conn: sqlite3.Connection) -> None:
+    """Fill a new chat_fts from existing chat logs and turns."""
+    conn.execute("""
+        INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+        SELECT -id, COALESCE(title, ''), '', id FROM chat_logs
+    """)
+    conn.execute("""
+        INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+        SELECT id, '', content, chat_log_id FROM chat_turns
+    """)
+
+
 def init_db(db_path: Path, schema: str, name: str) -> int:
     """Initialize a database with the given schema."""
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -338,7 +427,15 @@ def init_db(db_path: Path, schema: str, name: str) -> int:
         conn = sqlite3.connect(db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("PRAGMA journal_mode = WAL")
+        drop_stale_chat_fts(conn)
+        existing_fts = fts_tables(conn)
         conn.executescript(schema)
+        created_fts = fts_tables(conn) - existing_fts
+        if "chat_fts" in created_fts:
+            populate_chat_fts(conn)
+        for table in created_fts & set(EXTERNAL_CONTENT_FTS):
+            # A new index over rows that already exist starts out empty
+            conn.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
         conn.commit()
         
         cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
@@ -24,7 +24,6 @@ import json
 import os
 import re
 import sqlite3
-import struct
 import sys
 from dataclasses import dataclass
 from datetime import datetime
@@ -35,6 +34,10 @@ import time
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ai_dev_orchestrator.knowledge.backfill import backfill_embeddings  # noqa: E402
+from ai_dev_orchestrator.knowledge.embedding_cache import cached_encode  # noqa: E402
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 try:
     from sentence_transformers import SentenceTransformer
     EMBEDDER_AVAILABLE = True
@@ -115,46 +118,80 @@ class EmbeddingGenerator:
     def _load_model(self):
         if self._model is None and EMBEDDER_AVAILABLE:
             print(f"📦 Loading {EMBEDDING_MODEL} on {self.device}...")
-            self._model = SentenceTransformer(EMBEDDING_MODEL, device=self.device)
+            self._model = get_model(EMBEDDING_MODEL, device=self.device)
             print("✅ Model loaded")
     
-    def embed_batch(self, texts: List[str], show_progress: bool = True) -> List[bytes]:
-        """Generate embeddings and return as blobs."""
+    @property
+    def available(self) -> bool:
+        """Whether the embedding model could be loaded."""
         self._load_model()
-        if self._model is None:
-            return [None] * len(texts)
-        
-        # Process in batches
-        all_blobs = []
-        total = len(texts)
-        
-        for i in range(0, total, BATCH_SIZE):
-            batch = texts[i:i + BATCH_SIZE]
-            vectors = self._model.encode(batch, normalize_embeddings=True, show_progress_bar=False)
-            
-            for vec in vectors:
-                blob = struct.pack(f'{len(vec)}f', *vec.tolist())
-                all_blobs.append(blob)
-            
-            if show_progress and total > BATCH_SIZE:
-                progress = min(i + BATCH_SIZE, total)
-                print(f"  Embedded {progress}/{total} ({progress*100//total}%)")
+        return self._model is not None
+    
+    def encode(self, texts: List[str]):
+        """Generate embeddings as an (n, d) float32 array.
         
-        return all_blobs
+        Texts already in the shared embedding cache are not re-encoded.
+        """
+        self._load_model()
+        return cached_encode(self._model_name, texts, self._encode)
     
     def embed_single(self, text: str) -> bytes:
         """Generate embedding for single text."""
         self._load_model()
         if self._model is None:
             return None
-        vec = self._model.encode(text, normalize_embeddings=True)
-        return struct.pack(f'{len(vec)}f', *vec.tolist())
+        return cached_encode(self._model_name, [text], self._encode)[0].tobytes()
+    
+    def _encode(self, texts: List[str]):
+        return self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
 
 
 # =============================================================================
 # Database Connections
 # =============================================================================
 
+def backfill(
+    conn: sqlite3.Connection,
+    embedder: EmbeddingGenerator,
+    job: str,
+    select_sql: str,
+    insert_sql: str,
+    row_params,
+    start_key: Any = 0,
+    show_progress: bool = True,
+    quantize_table: Optional[str] = None,
+) -> int:
+    """Stream pending rows through the embedder in length-bucketed batches.
+    
+    ``select_sql`` returns ``(key, text, ...)`` rows with ``key > :after``
+    ordered by key, limited to ``:limit``. Batches are committed as they
+    finish and an interrupted job resumes from its checkpoint. Rows written
+    to ``quantize_table`` get int8 codes when quantization is enabled.
+    
+    Returns:
+        Number of rows embedded.
+    """
+    if not embedder.available:
+        return 0
+    
+    batches = 0
+    
+    def report(completed: int, total: Optional[int]):
+        nonlocal batches
+        batches += 1
+        if show_progress and batches % 10 == 0:
+            print(f"  Embedded {completed}")
+    
+    stats = backfill_embeddings(
+        conn, job, select_sql, insert_sql, embedder.encode, row_params,
+        start_key=start_key, batch_size=BATCH_SIZE, progress_callback=report,
+        quantize_table=quantize_table,
+    )
+    if stats.resumed_from is not None:
+        print(f"  Resumed {job} after {stats.resumed_from}")
+    return stats.embedded
+
+
 def get_connection(db_path: Path) -> sqlite3.Connection:
     """Get database connection."""
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -334,27 +371,24 @@ def refresh_artifacts_db(embedder: EmbeddingGenerator):
     # Generate embeddings for chunks without embeddings
     print("\n🔮 Generating embeddings for chunks...")
     
-    rows = conn.execute("""
-        SELECT c.id, c.content FROM chunks c
-        LEFT JOIN embeddings e ON e.chunk_id = c.id
-        WHERE e.id IS NULL
-    """).fetchall()
+    embedded = backfill(
+        conn, embedder, "artifact_chunks",
+        select_sql="""
+            SELECT c.id, c.content FROM chunks c
+            LEFT JOIN embeddings e ON e.chunk_id = c.id
+            WHERE e.id IS NULL AND c.id > :after
+            ORDER BY c.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO embeddings (chunk_id, vector, model, dimensions)
+            VALUES (?, ?, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[0], vec.tobytes(), EMBEDDING_MODEL, len(vec)),
+        quantize_table="embeddings",
+    )
     
-    if rows:
-        texts = [r['content'] for r in rows]
-        chunk_ids = [r['id'] for r in rows]
-        
-        blobs = embedder.embed_batch(texts)
-        
-        for chunk_id, blob in zip(chunk_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO embeddings (chunk_id, vector, model, dimensions)
-                    VALUES (?, ?, ?, ?)
-                """, (chunk_id, blob, EMBEDDING_MODEL, 768))
-        
-        conn.commit()
-        print(f"✅ Generated {len(rows)} embeddings")
+    if embedded:
+        print(f"✅ Generated {embedded} embeddings")
     else:
         print("✅ All chunks already have embeddings")
     
@@ -445,27 +479,24 @@ def refresh_archived_artifacts(conn: sqlite3.Connection, embedder: EmbeddingGene
     conn.commit()
     
     # Generate embeddings for archived chunks
-    rows = conn.execute("""
-        SELECT c.id, c.content FROM archived_chunks c
-        LEFT JOIN archived_embeddings e ON e.chunk_id = c.id
-        WHERE e.id IS NULL
-    """).fetchall()
-    
-    if rows:
-        texts = [r['content'] for r in rows]
-        chunk_ids = [r['id'] for r in rows]
-        
-        blobs = embedder.embed_batch(texts, show_progress=False)
-        
-        for chunk_id, blob in zip(chunk_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO archived_embeddings (chunk_id, vector, model)
-                    VALUES (?, ?, ?)
-                """, (chunk_id, blob, EMBEDDING_MODEL))
-        
-        conn.commit()
-        print(f"  ✅ Generated {len(rows)} archived embeddings")
+    embedded = backfill(
+        conn, embedder, "archived_chunks",
+        select_sql="""
+            SELECT c.id, c.content FROM archived_chunks c
+            LEFT JOIN archived_embeddings e ON e.chunk_id = c.id
+            WHERE e.id IS NULL AND c.id > :after
+            ORDER BY c.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO archived_embeddings (chunk_id, vector, model)
+            VALUES (?, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[0], vec.tobytes(), EMBEDDING_MODEL),
+        show_progress=False,
+    )
+    
+    if embedded:
+        print(f"  ✅ Generated {embedded} archived embeddings")
 
 
 # =============================================================================
@@ -496,74 +527,58 @@ def refresh_chatlogs_db(embedder: EmbeddingGenerator):
     
     # Get turns without embeddings
     # We'll embed each turn individually for granular search
-    rows = conn.execute("""
-        SELECT t.id, t.content, t.role, l.title
-        FROM chat_turns t
-        JOIN chat_logs l ON t.chat_log_id = l.id
-        LEFT JOIN chat_embeddings e ON e.turn_id = t.id
-        WHERE e.id IS NULL
-        AND LENGTH(t.content) > 50  -- Skip very short messages
-    """).fetchall()
-    
-    print(f"🔮 Generating embeddings for {len(rows)} turns...")
-    
-    if rows:
-        texts = [f"{r['role']}: {r['content'][:2000]}" for r in rows]  # Truncate long content
-        turn_ids = [r['id'] for r in rows]
-        chat_log_ids = [conn.execute(
-            "SELECT chat_log_id FROM chat_turns WHERE id = ?", (tid,)
-        ).fetchone()['chat_log_id'] for tid in turn_ids]
-        
-        blobs = embedder.embed_batch(texts)
-        
-        embedded_count = 0
-        for turn_id, chat_log_id, blob in zip(turn_ids, chat_log_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO chat_embeddings (chat_log_id, turn_id, embedding, embedding_model)
-                    VALUES (?, ?, ?, ?)
-                """, (chat_log_id, turn_id, blob, EMBEDDING_MODEL))
-                embedded_count += 1
-        
-        conn.commit()
-        print(f"✅ Generated {embedded_count} embeddings")
+    print("🔮 Generating turn embeddings...")
+    
+    embedded = backfill(
+        conn, embedder, "chat_turns",
+        select_sql="""
+            SELECT t.id, t.role || ': ' || SUBSTR(t.content, 1, 2000), t.chat_log_id
+            FROM chat_turns t
+            LEFT JOIN chat_embeddings e ON e.turn_id = t.id
+            WHERE e.id IS NULL
+            AND LENGTH(t.content) > 50  -- Skip very short messages
+            AND t.id > :after
+            ORDER BY t.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO chat_embeddings (chat_log_id, turn_id, embedding, embedding_model)
+            VALUES (?, ?, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[2], row[0], vec.tobytes(), EMBEDDING_MODEL),
+    )
+    
+    if embedded:
+        print(f"✅ Generated {embedded} embeddings")
     else:
         print("✅ All turns already have embeddings")
     
     # Also create log-level embeddings (summary of each chat)
     print("\n📝 Generating log-level summary embeddings...")
     
-    logs_without_summary = conn.execute("""
-        SELECT l.id, l.title, l.filename,
-               GROUP_CONCAT(t.content, ' ') as all_content
-        FROM chat_logs l
-        JOIN chat_turns t ON t.chat_log_id = l.id
-        LEFT JOIN chat_embeddings e ON e.chat_log_id = l.id AND e.turn_id IS NULL
-        WHERE e.id IS NULL
-        GROUP BY l.id
-    """).fetchall()
-    
-    if logs_without_summary:
-        texts = []
-        log_ids = []
-        
-        for row in logs_without_summary:
-            # Create summary text
-            summary = f"Chat: {row['title'] or row['filename']}\n{row['all_content'][:3000]}"
-            texts.append(summary)
-            log_ids.append(row['id'])
-        
-        blobs = embedder.embed_batch(texts, show_progress=False)
-        
-        for log_id, blob in zip(log_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO chat_embeddings (chat_log_id, turn_id, embedding, embedding_model)
-                    VALUES (?, NULL, ?, ?)
-                """, (log_id, blob, EMBEDDING_MODEL))
-        
-        conn.commit()
-        print(f"✅ Generated {len(logs_without_summary)} log-level embeddings")
+    # Summary text: chat title, then the start of the conversation
+    embedded = backfill(
+        conn, embedder, "chat_logs",
+        select_sql="""
+            SELECT l.id,
+                   'Chat: ' || COALESCE(NULLIF(l.title, ''), l.filename) || char(10) ||
+                   SUBSTR(GROUP_CONCAT(t.content, ' '), 1, 3000)
+            FROM chat_logs l
+            JOIN chat_turns t ON t.chat_log_id = l.id
+            LEFT JOIN chat_embeddings e ON e.chat_log_id = l.id AND e.turn_id IS NULL
+            WHERE e.id IS NULL AND l.id > :after
+            GROUP BY l.id
+            ORDER BY l.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO chat_embeddings (chat_log_id, turn_id, embedding, embedding_model)
+            VALUES (?, NULL, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[0], vec.tobytes(), EMBEDDING_MODEL),
+        show_progress=False,
+    )
+    
+    if embedded:
+        print(f"✅ Generated {embedded} log-level embeddings")
     else:
         print("✅ All logs already have summary embeddings")
     
@@ -597,34 +612,30 @@ def refresh_research_db(embedder: EmbeddingGenerator):
     print(f"📊 Current state: {stats['papers']} papers, {stats['chunks']} chunks, {stats['embeddings']} embeddings")
     
     # Get chunks without embeddings
-    rows = conn.execute("""
-        SELECT c.id, c.content, p.title
-        FROM paper_chunks c
-        JOIN research_papers p ON c.paper_id = p.id
-        LEFT JOIN paper_embeddings e ON e.chunk_id = c.id
-        WHERE e.id IS NULL
-        AND LENGTH(c.content) > 50
-    """).fetchall()
-    
-    print(f"🔮 Generating embeddings for {len(rows)} chunks...")
-    
-    if rows:
-        texts = [r['content'][:2000] for r in rows]  # Truncate if needed
-        chunk_ids = [r['id'] for r in rows]
-        
-        blobs = embedder.embed_batch(texts)
-        
-        embedded_count = 0
-        for chunk_id, blob in zip(chunk_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO paper_embeddings (chunk_id, vector, model, dimensions)
-                    VALUES (?, ?, ?, ?)
-                """, (chunk_id, blob, EMBEDDING_MODEL, 768))
-                embedded_count += 1
-        
-        conn.commit()
-        print(f"✅ Generated {embedded_count} embeddings")
+    print("🔮 Generating chunk embeddings...")
+    
+    embedded = backfill(
+        conn, embedder, "paper_chunks",
+        select_sql="""
+            SELECT c.id, SUBSTR(c.content, 1, 2000)  -- Truncate if needed
+            FROM paper_chunks c
+            JOIN research_papers p ON c.paper_id = p.id
+            LEFT JOIN paper_embeddings e ON e.chunk_id = c.id
+            WHERE e.id IS NULL
+            AND LENGTH(c.content) > 50
+            AND c.id > :after
+            ORDER BY c.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO paper_embeddings (chunk_id, vector, model, dimensions)
+            VALUES (?, ?, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[0], vec.tobytes(), EMBEDDING_MODEL, len(vec)),
+        quantize_table="paper_embeddings",
+    )
+    
+    if embedded:
+        print(f"✅ Generated {embedded} embeddings")
     else:
         print("✅ All chunks already have embeddings")
     
@@ -644,33 +655,28 @@ def refresh_research_db(embedder: EmbeddingGenerator):
     """)
     conn.commit()
     
-    papers_without_summary = conn.execute("""
-        SELECT p.id, p.title, p.abstract, p.keywords
-        FROM research_papers p
-        LEFT JOIN paper_summary_embeddings e ON e.paper_id = p.id
-        WHERE e.id IS NULL
-    """).fetchall()
+    embedded = backfill(
+        conn, embedder, "paper_summaries",
+        select_sql="""
+            SELECT p.id, SUBSTR(
+                COALESCE(p.title, '') || ' ' || COALESCE(p.abstract, '') || ' ' ||
+                COALESCE(p.keywords, ''), 1, 3000)
+            FROM research_papers p
+            LEFT JOIN paper_summary_embeddings e ON e.paper_id = p.id
+            WHERE e.id IS NULL AND p.id > :after
+            ORDER BY p.id LIMIT :limit
+        """,
+        insert_sql="""
+            INSERT INTO paper_summary_embeddings (paper_id, vector, model)
+            VALUES (?, ?, ?)
+        """,
+        row_params=lambda row, vec: (row[0], vec.tobytes(), EMBEDDING_MODEL),
+        start_key="",
+        show_progress=False,
+    )
     
-    if papers_without_summary:
-        texts = []
-        paper_ids = []
-        
-        for row in papers_without_summary:
-            summary = f"{row['title']} {row['abstract'] or ''} {row['keywords'] or ''}"
-            texts.append(summary[:3000])
-            paper_ids.append(row['id'])
-        
-        blobs = embedder.embed_batch(texts, show_progress=False)
-        
-        for paper_id, blob in zip(paper_ids, blobs):
-            if blob:
-                conn.execute("""
-                    INSERT INTO paper_summary_embeddings (paper_id, vector, model)
-                    VALUES (?, ?, ?)
-                """, (paper_id, blob, EMBEDDING_MODEL))
-        
-        conn.commit()
-        print(f"✅ Generated {len(papers_without_summary)} paper-level embeddings")
+    if embedded:
+        print(f"✅ Generated {embedded} paper-level embeddings")
     else:
         print("✅ All papers already have summary embeddings")
     
@@ -27,6 +27,10 @@ import urllib.request
 import xml.etree.ElementTree as ET
 import numpy as np
 
+# Share loaded models with the rest of the process
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 try:
     from sentence_transformers import SentenceTransformer
     SBERT_AVAILABLE = True
@@ -115,7 +119,7 @@ class ResearchEnhancedOrganizer:
     def _load_model(self):
         if self.model is None and SBERT_AVAILABLE:
             print(f"📦 Loading {self.embedding_model_name}...")
-            self.model = SentenceTransformer(self.embedding_model_name, device=self.device)
+            self.model = get_model(self.embedding_model_name, device=self.device)
         return self.model
 
     # === 1. CONCEPT EXTRACTION ===
@@ -20,13 +20,18 @@ GPU Acceleration:
 import sqlite3
 import json
 import hashlib
+import sys
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 from collections import defaultdict
 import numpy as np
 
+# Share loaded models with the rest of the process
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from ai_dev_orchestrator.knowledge.model_registry import get_model  # noqa: E402
+
 # Conditional imports for ML components
 try:
     import torch
@@ -287,6 +292,58 @@ class Concept:
     context: str = ""
 
 
+# =============================================================================
+# SIMILARITY JOIN
+# =============================================================================
+
+SIMILARITY_BLOCK_ROWS = 256
+
+
+def blocked_top_k_similarities(
+    embeddings: np.ndarray,
+    top_k: int = 5,
+    min_similarity: float = 0.3,
+    block_rows: int = SIMILARITY_BLOCK_ROWS
+) -> Iterator[Tuple[int, int, float]]:
+    """Top-k cosine neighbours of every row, one row block at a time.
+
+    Only a ``block_rows x N`` slice of the similarity matrix exists at any
+    moment, so peak memory grows linearly with N instead of quadratically.
+
+    Args:
+        embeddings: Array of shape (N, d); rows need not be normalized.
+        top_k: Neighbours kept per row (self excluded).
+        min_similarity: Neighbours below this cosine similarity are dropped.
+        block_rows: Rows scored per matrix product.
+
+    Yields:
+        ``(row, neighbour, similarity)`` per row, best neighbour first.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+    n = len(vectors)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return
+
+    for start in range(0, n, block_rows):
+        block = vectors[start:start + block_rows]
+        scores = block @ vectors.T
+        rows = np.arange(len(block))
+        scores[rows, start + rows] = -np.inf  # Exclude self
+
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for r, c in zip(*np.nonzero(top_scores >= min_similarity)):
+            yield start + int(r), int(top[r, c]), float(top_scores[r, c])
+
+
 # =============================================================================
 # SMART ORGANIZER CLASS
 # =============================================================================
@@ -328,7 +385,7 @@ class ResearchSmartOrganizer:
             if not SBERT_AVAILABLE:
                 raise ImportError("sentence-transformers not installed. Run: pip install sentence-transformers")
             print(f"📦 Loading embedding model: {self.embedding_model_name}")
-            self.model = SentenceTransformer(self.embedding_model_name, device=self.device)
+            self.model = get_model(self.embedding_model_name, device=self.device)
             print(f"   Model loaded on {self.device}")
         return self.model
     
@@ -662,7 +719,11 @@ class ResearchSmartOrganizer:
         top_k: int = 5,
         min_similarity: float = 0.3
     ) -> int:
-        """Compute and store paper-to-paper similarities."""
+        """Compute and store paper-to-paper similarities.
+
+        Uses a blocked similarity join, so memory stays O(N) in the number
+        of papers; links are written with ``executemany``.
+        """
         paper_ids, embeddings = self.get_all_embeddings()
         
         if len(paper_ids) < 2:
@@ -671,29 +732,18 @@ class ResearchSmartOrganizer:
         
         print(f"📊 Computing similarities between {len(paper_ids)} papers...")
         
-        # Compute pairwise cosine similarities
-        similarities = cosine_similarity(embeddings)
-        
-        links_created = 0
+        links = [
+            (paper_ids[i], paper_ids[j], score, score)
+            for i, j, score in blocked_top_k_similarities(embeddings, top_k, min_similarity)
+        ]
         with self._get_conn() as conn:
-            for i, source_id in enumerate(paper_ids):
-                # Get top-k similar papers (excluding self)
-                sim_scores = similarities[i].copy()
-                sim_scores[i] = -1  # Exclude self
-                
-                top_indices = np.argsort(sim_scores)[-top_k:][::-1]
-                
-                for j in top_indices:
-                    if sim_scores[j] >= min_similarity:
-                        target_id = paper_ids[j]
-                        conn.execute("""
-                            INSERT OR REPLACE INTO paper_links
-                            (source_paper_id, target_paper_id, link_type, similarity_score, confidence)
-                            VALUES (?, ?, 'similar', ?, ?)
-                        """, (source_id, target_id, float(sim_scores[j]), float(sim_scores[j])))
-                        links_created += 1
-            
+            conn.executemany("""
+                INSERT OR REPLACE INTO paper_links
+                (source_paper_id, target_paper_id, link_type, similarity_score, confidence)
+                VALUES (?, ?, 'similar', ?, ?)
+            """, links)
             conn.commit()
+        links_created = len(links)
         
         print(f"✅ Created {links_created} similarity links")
         return links_created
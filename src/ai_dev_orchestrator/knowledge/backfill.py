@@ -0,0 +1,170 @@
+"""Streaming embedding backfill engine.
+
+Shared by ``EmbeddingService.embed_all_chunks``, ``scripts/gpu_batch_embedder.py``
+and ``scripts/refresh_aikh_databases.py``:
+
+- Pending rows are read in keyset-paginated windows (``key > :after ORDER BY
+  key LIMIT :limit``), so memory is bounded by the window, not the backlog,
+  and no read cursor stays open across writes.
+- Each window is sorted by text length and cut into batches, so every batch
+  holds similar-length texts and the model pads little.
+- Each batch is written with ``executemany`` in one transaction, together
+  with the job's checkpoint (the last key of the last finished window).
+- An interrupted run resumes after its checkpoint; rows of the unfinished
+  window that were already written are skipped by the caller's anti-join.
+  A run that completes clears its checkpoint.
+- With ``quantize_table`` and ``AIKH_VECTOR_QUANTIZATION=int8``, each
+  batch's int8 codes are written in the same transaction, so searches
+  never have to quantize.
+"""
+
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .quantization import quantization_enabled, quantize_since, sync_quantized
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_WINDOW = 2048
+
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    job TEXT PRIMARY KEY,
+    last_key,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+"""
+
+
+@dataclass
+class BackfillStats:
+    """Outcome of one backfill run."""
+    embedded: int = 0
+    batches: int = 0
+    windows: int = 0
+    resumed_from: Any = None
+    seconds: float = 0.0
+
+
+def get_checkpoint(conn: sqlite3.Connection, job: str) -> tuple[Any, int] | None:
+    """``(last_key, rows_done)`` for an interrupted job, or None."""
+    conn.execute(CHECKPOINT_SCHEMA)
+    row = conn.execute(
+        "SELECT last_key, rows_done FROM backfill_checkpoints WHERE job = ?", (job,)
+    ).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def clear_checkpoint(conn: sqlite3.Connection, job: str) -> None:
+    """Forget a job's checkpoint so the next run starts from the beginning."""
+    conn.execute(CHECKPOINT_SCHEMA)
+    conn.execute("DELETE FROM backfill_checkpoints WHERE job = ?", (job,))
+    conn.commit()
+
+
+def length_batches(rows: list, batch_size: int, text_index: int = 1) -> list[list]:
+    """Sort rows by text length and cut them into batches."""
+    ordered = sorted(rows, key=lambda r: len(r[text_index] or ""))
+    return [ordered[i:i + batch_size] for i in range(0, len(ordered), batch_size)]
+
+
+def backfill_embeddings(
+    conn: sqlite3.Connection,
+    job: str,
+    select_sql: str,
+    insert_sql: str,
+    encode_fn: Callable[[list[str]], Any],
+    row_params: Callable[[Any, np.ndarray], tuple],
+    start_key: Any = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    window: int = DEFAULT_WINDOW,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    total: int | None = None,
+    params: dict[str, Any] | None = None,
+    quantize_table: str | None = None,
+    quantize_column: str = "vector",
+) -> BackfillStats:
+    """Embed every pending row selected by ``select_sql``.
+
+    Args:
+        conn: Connection to the database being backfilled.
+        job: Checkpoint name, unique per database and target table.
+        select_sql: Query for pending rows with named parameters ``:after``
+            and ``:limit``. Column 0 is a unique, orderable key and column 1
+            the text to embed; it must return rows with ``key > :after``
+            ordered by key and exclude rows that already have embeddings.
+        insert_sql: Statement run with ``executemany`` for each batch.
+        encode_fn: Encodes a list of texts to an (n, d) array.
+        row_params: Builds the ``insert_sql`` parameters from a pending
+            row and its vector.
+        start_key: Key below every real key (``0`` for ids, ``''`` for text).
+        batch_size: Texts per encode call.
+        window: Pending rows read and length-sorted at a time.
+        progress_callback: Optional callback(completed, total).
+        total: Pending row count passed to ``progress_callback``.
+        params: Extra named parameters for ``select_sql``.
+        quantize_table: Embeddings table ``insert_sql`` writes to; when
+            quantization is enabled its ``_q8`` codes are kept current.
+        quantize_column: Float32 BLOB column of ``quantize_table``.
+
+    Returns:
+        BackfillStats for the run.
+    """
+    started = time.perf_counter()
+    stats = BackfillStats()
+    checkpoint = get_checkpoint(conn, job)
+    after = start_key
+    if checkpoint is not None:
+        after, stats.resumed_from = checkpoint[0], checkpoint[0]
+    quantized_through = None
+    if quantize_table and quantization_enabled():
+        # Codes for rows embedded before quantization was turned on
+        sync_quantized(conn, quantize_table, quantize_column)
+        quantized_through = conn.execute(
+            f"SELECT COALESCE(MAX(id), 0) FROM {quantize_table}"
+        ).fetchone()[0]
+
+    while True:
+        query_params = {**(params or {}), "after": after, "limit": window}
+        rows = conn.execute(select_sql, query_params).fetchall()
+        if not rows:
+            break
+        stats.windows += 1
+        window_end = rows[-1][0]
+        batches = length_batches(rows, batch_size)
+
+        for i, batch in enumerate(batches):
+            vectors = np.asarray(encode_fn([r[1] or "" for r in batch]), dtype=np.float32)
+            insert_params = [row_params(row, vec) for row, vec in zip(batch, vectors)]
+            with conn:  # One transaction per batch
+                conn.executemany(insert_sql, insert_params)
+                if quantized_through is not None:
+                    quantized_through = quantize_since(
+                        conn, quantize_table, quantized_through, quantize_column
+                    )
+                if i == len(batches) - 1:
+                    conn.execute("""
+                        INSERT INTO backfill_checkpoints (job, last_key, rows_done)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(job) DO UPDATE SET
+                            last_key = excluded.last_key,
+                            rows_done = backfill_checkpoints.rows_done + excluded.rows_done,
+                            updated_at = datetime('now')
+                    """, (job, window_end, len(rows)))
+            stats.embedded += len(batch)
+            stats.batches += 1
+            if progress_callback:
+                progress_callback(stats.embedded, total)
+
+        after = window_end
+        if len(rows) < window:
+            break
+
+    clear_checkpoint(conn, job)
+    stats.seconds = time.perf_counter() - started
+    return stats
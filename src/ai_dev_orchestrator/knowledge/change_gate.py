@@ -0,0 +1,52 @@
+"""Cheap "has this database changed?" checks for resident matrices.
+
+Resident matrices (knowledge chunks, paper embeddings) refresh on every
+query. Their full checks (row counts, archived sets, categories) scan whole
+tables, so :class:`ChangeGate` lets a refresh return before touching them:
+
+- On the connection used for the last full check, ``PRAGMA data_version``
+  moves when another connection commits and ``total_changes`` when this one
+  writes; if neither moved, nothing changed.
+- A different connection that has written nothing reuses a full check
+  younger than ``interval`` seconds (request-scoped connections would
+  otherwise never take the fast path).
+"""
+
+import sqlite3
+import time
+
+Version = tuple[int, int]
+
+DEFAULT_INTERVAL = 1.0  # Seconds another connection's commits may go unseen
+
+
+class ChangeGate:
+    """Remembers the last full check and skips checks that cannot find anything."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        """Initialize with no check recorded, so the first refresh always runs."""
+        self.interval = interval
+        self._conn: sqlite3.Connection | None = None
+        self._version: Version | None = None
+        self._checked_at = -float("inf")
+
+    @staticmethod
+    def version(conn: sqlite3.Connection) -> Version:
+        """``(data_version, total_changes)`` of ``conn``; read it before checking."""
+        return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+    def unchanged(self, conn: sqlite3.Connection, version: Version) -> bool:
+        """Whether a full check on ``conn`` can be skipped."""
+        if conn is self._conn:
+            return version == self._version
+        return conn.total_changes == 0 and time.monotonic() - self._checked_at < self.interval
+
+    def checked(self, conn: sqlite3.Connection, version: Version) -> None:
+        """Record a completed full check made at ``version``."""
+        self._conn, self._version = conn, version
+        self._checked_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Force the next refresh to run its full check."""
+        self._conn, self._version = None, None
+        self._checked_at = -float("inf")
@@ -22,6 +22,51 @@ from .aikh_config import CHATLOGS_DB_PATH, get_aikh_home
 LEGACY_LOCAL_PATH = Path("/home/mycahya/coding/ChatLogs/chathistory.db")
 DOCKER_DB_PATH = Path("/chatlogs/chathistory.db")
 
+# FTS5 index kept current by triggers: one row per turn (rowid = turn id)
+# and one title row per chat log (rowid = -chat_log_id)
+CHAT_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chat_fts USING fts5(
+    title,
+    content,
+    chat_log_id UNINDEXED,
+    tokenize='porter'
+);
+
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_ai AFTER INSERT ON chat_logs BEGIN
+    INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+    VALUES (-new.id, COALESCE(new.title, ''), '', new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_au AFTER UPDATE OF title ON chat_logs BEGIN
+    UPDATE chat_fts SET title = COALESCE(new.title, '') WHERE rowid = -new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_logs_fts_ad AFTER DELETE ON chat_logs BEGIN
+    DELETE FROM chat_fts WHERE rowid = -old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_ai AFTER INSERT ON chat_turns BEGIN
+    INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+    VALUES (new.id, '', new.content, new.chat_log_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_au AFTER UPDATE OF content, chat_log_id ON chat_turns
+BEGIN
+    UPDATE chat_fts SET content = new.content, chat_log_id = new.chat_log_id
+    WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_turns_fts_ad AFTER DELETE ON chat_turns BEGIN
+    DELETE FROM chat_fts WHERE rowid = old.id;
+END;
+"""
+
+CHAT_FTS_COLUMNS = ["title", "content", "chat_log_id"]
+CHAT_FTS_TRIGGERS = (
+    "chat_logs_fts_ai", "chat_logs_fts_au", "chat_logs_fts_ad",
+    "chat_turns_fts_ai", "chat_turns_fts_au", "chat_turns_fts_ad",
+)
+
 
 def get_db_path() -> Path:
     """Get the chat log database path.
@@ -124,14 +169,8 @@ def init_database() -> None:
         )
     """)
 
-    # FTS5 full-text search on chat content (standalone table, not contentless)
-    cursor.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS chat_fts USING fts5(
-            title,
-            content,
-            tokenize='porter'
-        )
-    """)
+    # FTS5 full-text search on chat content, maintained by triggers
+    _migrate_fts_index(conn)
 
     # Indexes
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_logs_filename ON chat_logs(filename)")
@@ -250,36 +289,48 @@ def insert_command(chat_log_id: int, turn_id: int | None, command: str, was_acce
     conn.close()
 
 
-def update_fts_index() -> None:
-    """Rebuild the FTS index from chat_logs table."""
-    conn = get_connection()
-    cursor = conn.cursor()
+def _migrate_fts_index(conn: sqlite3.Connection) -> None:
+    """Create chat_fts and its triggers, replacing any index of an older layout.
 
-    # Drop and recreate to ensure clean state
-    cursor.execute("DROP TABLE IF EXISTS chat_fts")
-    cursor.execute("""
-        CREATE VIRTUAL TABLE chat_fts USING fts5(
-            chat_log_id,
-            title,
-            content,
-            tokenize='porter'
-        )
+    Older databases carry either the rebuild-everything index or an
+    external-content index over chat_turns; neither has the columns the
+    triggers write, so inserts would fail. Those are dropped, recreated and
+    repopulated. A current index is left as is.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(chat_fts)")]
+    has_triggers = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'chat_turns_fts_ai'"
+    ).fetchone()
+    if columns == CHAT_FTS_COLUMNS and has_triggers:
+        return
+    for trigger in CHAT_FTS_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS chat_fts")
+    conn.executescript(CHAT_FTS_SCHEMA)
+    _populate_fts_index(conn)
+
+
+def _populate_fts_index(conn: sqlite3.Connection) -> None:
+    """Fill an empty chat_fts from chat_logs and chat_turns."""
+    conn.execute("""
+        INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+        SELECT -id, COALESCE(title, ''), '', id FROM chat_logs
     """)
-
-    # Get all turns content grouped by chat_log
-    cursor.execute("""
-        SELECT cl.id, cl.title, GROUP_CONCAT(ct.content, ' ') as all_content
-        FROM chat_logs cl
-        LEFT JOIN chat_turns ct ON ct.chat_log_id = cl.id
-        GROUP BY cl.id
+    conn.execute("""
+        INSERT INTO chat_fts(rowid, title, content, chat_log_id)
+        SELECT id, '', content, chat_log_id FROM chat_turns
     """)
 
-    for row in cursor.fetchall():
-        cursor.execute(
-            "INSERT INTO chat_fts(chat_log_id, title, content) VALUES (?, ?, ?)",
-            (str(row["id"]), row["title"] or "", row["all_content"] or "")
-        )
 
+def rebuild_fts_index() -> None:
+    """Rebuild chat_fts from scratch.
+
+    Not needed in normal operation: triggers on chat_logs and chat_turns keep
+    the index current as logs are ingested. Use to repair a damaged index.
+    """
+    conn = get_connection()
+    conn.execute("DELETE FROM chat_fts")
+    _populate_fts_index(conn)
     conn.commit()
     conn.close()
 
@@ -289,11 +340,13 @@ def search_chatlogs(query: str, limit: int = 20) -> list[dict[str, Any]]:
     conn = get_connection()
     cursor = conn.cursor()
 
+    # A chat log ranks by its best-matching turn (or its title)
     cursor.execute("""
-        SELECT cl.*, bm25(chat_fts) as rank
+        SELECT cl.*, MIN(chat_fts.rank) as rank
         FROM chat_fts
-        JOIN chat_logs cl ON cl.id = CAST(chat_fts.chat_log_id AS INTEGER)
+        JOIN chat_logs cl ON cl.id = chat_fts.chat_log_id
         WHERE chat_fts MATCH ?
+        GROUP BY cl.id
         ORDER BY rank
         LIMIT ?
     """, (query, limit))
@@ -16,7 +16,6 @@ from .chatlog_database import (
     insert_chat_turn,
     insert_command,
     insert_file_ref,
-    update_fts_index,
     get_stats,
 )
 
@@ -226,10 +225,6 @@ def ingest_all_chatlogs(chatlog_dir: Path | None = None) -> dict:
             results["errors"].append({"file": md_file.name, "error": str(e)})
             print(f"  ✗ {md_file.name}: {e}")
 
-    # Rebuild FTS index
-    print("Rebuilding FTS index...")
-    update_fts_index()
-
     # Get final stats
     stats = get_stats()
     results.update(stats)
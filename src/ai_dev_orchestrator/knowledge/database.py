@@ -16,6 +16,7 @@ import sqlite3
 from pathlib import Path
 
 from .aikh_config import get_database_path, ARTIFACTS_DB_PATH
+from .fts import apply_schema
 
 # Legacy support - prefer AIKH path, fallback to workspace
 WORKSPACE_DIR = Path(os.getenv("AI_DEV_WORKSPACE", ".workspace"))
@@ -82,21 +83,39 @@ CREATE TABLE IF NOT EXISTS llm_calls (
 
 -- FTS5 virtual table for full-text search
 CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
-    title, content, doc_id UNINDEXED, content='documents', content_rowid='rowid'
+    title, content, content='documents', content_rowid='rowid'
 );
 
 -- Triggers for FTS sync
 CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
 END;
 
 CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
-    INSERT INTO content_fts(content_fts, rowid, title, content, doc_id) VALUES ('delete', old.rowid, old.title, old.content, old.id);
-    INSERT INTO content_fts(rowid, title, content, doc_id) VALUES (new.rowid, new.title, new.content, new.id);
+    INSERT INTO content_fts(content_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO content_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+
+-- Chunk-level FTS5 index, the same unit as vector search
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    content, content='chunks', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE OF content ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO chunks_fts(rowid, content) VALUES (new.id, new.content);
 END;
 
 -- Updated_at trigger
@@ -203,6 +222,5 @@ def init_database(db_path: Path | None = None) -> sqlite3.Connection:
         Initialized database connection.
     """
     conn = get_connection(db_path)
-    conn.executescript(SCHEMA)
-    conn.commit()
+    apply_schema(conn, SCHEMA)
     return conn
@@ -0,0 +1,213 @@
+"""Embedding Backends - pluggable text encoders.
+
+An :class:`EmbeddingBackend` turns texts into normalized float32 vectors and
+reports its identity and dimensions. The identity is what gets written to
+``embeddings.model``, keys the embedding cache and the request batchers,
+and selects matrix rows at query time, so vectors from different backends
+are never scored against each other.
+
+Backends:
+
+- ``sentence-transformers[:model]`` - PyTorch sentence encoder (default,
+  ``all-mpnet-base-v2`` falling back to ``all-MiniLM-L6-v2`` on MemoryError).
+- ``onnx[:model]`` - the same encoder exported to ONNX Runtime; identity
+  ``<model>+onnx``.
+- ``hashing[:dims]`` - deterministic feature-hashing vectorizer with no
+  model download, for tests, benchmarks and CI-class machines; identity
+  ``hashing-<dims>``.
+
+Select one with ``AIKH_EMBEDDING_BACKEND`` (e.g. ``hashing:384``).
+"""
+
+import hashlib
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import numpy as np
+
+from .model_registry import get_model
+
+DEFAULT_BACKEND = "sentence-transformers"
+PRIMARY_MODEL = "all-mpnet-base-v2"  # 768 dims
+FALLBACK_MODEL = "all-MiniLM-L6-v2"  # 384 dims
+DEFAULT_HASHING_DIMENSIONS = 384
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingBackend(ABC):
+    """Encoder interface used by ``EmbeddingService``."""
+
+    # Whether vectors are worth storing in the embedding cache
+    cacheable = True
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Model identity stored alongside every vector."""
+        ...
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> int:
+        """Length of the vectors this backend produces."""
+        ...
+
+    def load(self) -> None:
+        """Load model weights ahead of the first encode (no-op by default)."""
+
+    @abstractmethod
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts to an L2-normalized float32 array of shape (n, dimensions)."""
+        ...
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """sentence-transformers encoder loaded through the model registry.
+
+    On MemoryError the ``fallback`` model is loaded instead and the backend's
+    identity becomes that model's name.
+    """
+
+    def __init__(
+        self,
+        model_name: str = PRIMARY_MODEL,
+        fallback: str | None = None,
+        batch_size: int = 32,
+        inference_backend: str = "torch",
+        device: str | None = None,
+    ):
+        """Configure the encoder; weights load lazily on first use."""
+        self.model_name = model_name
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.inference_backend = inference_backend
+        self.device = device
+        self.model = None
+
+    @property
+    def name(self) -> str:
+        """Model name, suffixed with the inference backend unless torch."""
+        self.load()
+        if self.inference_backend == "torch":
+            return self.model_name
+        return f"{self.model_name}+{self.inference_backend}"
+
+    @property
+    def dimensions(self) -> int:
+        """Embedding size reported by the loaded model."""
+        self.load()
+        return self.model.get_sentence_embedding_dimension()
+
+    def load(self) -> None:
+        """Load the model from the registry, falling back on MemoryError."""
+        if self.model is not None:
+            return
+        try:
+            self.model = get_model(self.model_name, self.device, self.inference_backend)
+        except MemoryError:
+            if not self.fallback:
+                raise
+            self.model_name, self.fallback = self.fallback, None
+            self.model = get_model(self.model_name, self.device, self.inference_backend)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode with the loaded model, L2-normalized."""
+        self.load()
+        return np.asarray(
+            self.model.encode(texts, normalize_embeddings=True, batch_size=self.batch_size),
+            dtype=np.float32,
+        )
+
+
+@lru_cache(maxsize=65536)
+def _hashed_feature(feature: str, dimensions: int) -> tuple[int, float]:
+    """Bucket and sign for one feature."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    digest = int.from_bytes(digest, "little")
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingBackend(EmbeddingBackend):
+    """Deterministic signed feature hashing of word unigrams and bigrams.
+
+    Texts sharing words get similar vectors, which is enough to exercise
+    indexing, filtering and ranking code without a model. Output depends
+    only on the text and ``dimensions``.
+    """
+
+    cacheable = False  # Cheaper to recompute than to look up
+
+    def __init__(self, dimensions: int = DEFAULT_HASHING_DIMENSIONS):
+        """Hash features into ``dimensions`` buckets."""
+        self._dimensions = dimensions
+
+    @property
+    def name(self) -> str:
+        """``hashing-<dimensions>``."""
+        return f"hashing-{self._dimensions}"
+
+    @property
+    def dimensions(self) -> int:
+        """Number of hash buckets."""
+        return self._dimensions
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Hash each text's unigrams and bigrams, L2-normalized."""
+        vectors = np.zeros((len(texts), self._dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                index, sign = _hashed_feature(feature, self._dimensions)
+                vectors[row, index] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def create_backend(spec: str, batch_size: int = 32) -> EmbeddingBackend:
+    """Build a backend from a ``kind[:argument]`` spec.
+
+    Args:
+        spec: ``sentence-transformers[:model]``, ``onnx[:model]`` or
+            ``hashing[:dims]``.
+        batch_size: Encoder batch size for model-backed backends.
+
+    Returns:
+        A new backend instance.
+
+    Raises:
+        ValueError: If the backend kind is unknown.
+    """
+    kind, _, argument = spec.strip().partition(":")
+    if kind == "sentence-transformers":
+        if argument:
+            return SentenceTransformerBackend(argument, batch_size=batch_size)
+        return SentenceTransformerBackend(PRIMARY_MODEL, FALLBACK_MODEL, batch_size)
+    if kind == "onnx":
+        return SentenceTransformerBackend(
+            argument or PRIMARY_MODEL, batch_size=batch_size, inference_backend="onnx"
+        )
+    if kind == "hashing":
+        return HashingBackend(int(argument) if argument else DEFAULT_HASHING_DIMENSIONS)
+    raise ValueError(
+        f"Unknown embedding backend {kind!r}; expected sentence-transformers, onnx or hashing"
+    )
+
+
+_backends: dict[tuple[str, int], EmbeddingBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(spec: str | None = None, batch_size: int = 32) -> EmbeddingBackend:
+    """Get the process-wide backend for ``spec`` (default ``AIKH_EMBEDDING_BACKEND``)."""
+    spec = spec or os.getenv("AIKH_EMBEDDING_BACKEND", DEFAULT_BACKEND)
+    with _backends_lock:
+        backend = _backends.get((spec, batch_size))
+        if backend is None:
+            backend = _backends[(spec, batch_size)] = create_backend(spec, batch_size)
+        return backend
@@ -0,0 +1,163 @@
+"""Micro-batching embedding worker for request-time encodes.
+
+Query embeddings arrive one string at a time from concurrent HTTP handlers.
+Encoding each on its own serializes requests on the model and forgoes its
+batching throughput. An :class:`EmbeddingBatcher` queues single-text
+requests, coalesces whatever arrives within a short window (or until
+``max_batch`` texts are waiting) into one ``encode`` call on a worker
+thread, and resolves each caller's future with its row.
+
+Callers block on :meth:`EmbeddingBatcher.embed` from worker threads, or
+``await`` :meth:`EmbeddingBatcher.embed_async` from the event loop.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+import numpy as np
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+class EmbeddingBatcher:
+    """Coalesces single-text embedding requests into batched encodes."""
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], Any],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        name: str = "embedding-batcher",
+    ):
+        """Initialize the batcher.
+
+        Args:
+            encode_fn: Encodes a list of texts to an (n, d) array.
+            max_batch: Largest batch handed to ``encode_fn``.
+            max_wait_ms: How long the first queued request waits for company.
+            name: Worker thread name.
+        """
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._requests = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+        self._last_batch = 0
+        self._encode_seconds = 0.0
+
+    def submit(self, text: str) -> Future:
+        """Queue ``text``; the future resolves to its float32 vector."""
+        future: Future = Future()
+        self._queue.put((text, future))
+        self._ensure_worker()
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        """Blocking embed of one text through the batch queue."""
+        return self.submit(text).result()
+
+    async def embed_async(self, text: str) -> np.ndarray:
+        """Embed one text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        """Block for one request, then gather more until full or the window closes."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Skip requests whose callers already gave up
+            batch = [(text, f) for text, f in batch if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                vectors = np.asarray(self.encode_fn([text for text, _ in batch]), dtype=np.float32)
+                if vectors.ndim != 2 or len(vectors) != len(batch):
+                    # Rows can't be matched to callers; fail them all rather than hang some
+                    raise ValueError(
+                        f"encode_fn returned shape {vectors.shape} for {len(batch)} texts"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                with self._lock:
+                    self._requests += len(batch)
+                    self._batches += 1
+                    self._last_batch = len(batch)
+                    self._max_batch_seen = max(self._max_batch_seen, len(batch))
+                    self._encode_seconds += time.perf_counter() - start
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def metrics(self) -> dict[str, Any]:
+        """Queue depth and batch-size counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": (
+                    round(self._requests / self._batches, 2) if self._batches else 0.0
+                ),
+                "max_batch_size": self._max_batch_seen,
+                "last_batch_size": self._last_batch,
+                "avg_encode_ms": (
+                    round(self._encode_seconds * 1000 / self._batches, 2) if self._batches else 0.0
+                ),
+            }
+
+
+_batchers: dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(key: str, encode_fn: Callable[[list[str]], Any]) -> EmbeddingBatcher:
+    """Process-wide batcher for ``key`` (typically the model name).
+
+    ``encode_fn`` is only used when the batcher is first created, so every
+    caller for a key shares one queue and one worker.
+    """
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = EmbeddingBatcher(encode_fn, name=f"embed-{key}")
+        return batcher
+
+
+def batcher_metrics() -> dict[str, dict[str, Any]]:
+    """Metrics for every batcher, keyed by batcher key."""
+    with _batchers_lock:
+        batchers = dict(_batchers)
+    return {key: b.metrics() for key, b in batchers.items()}
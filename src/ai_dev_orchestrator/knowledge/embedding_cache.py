@@ -0,0 +1,242 @@
+"""Content-addressed embedding cache.
+
+Computed vectors are stored once per (model name, SHA-256 of the normalized
+text) in a SQLite database under AIKH_HOME, shared by the knowledge and
+research stores and the embedding scripts. Re-syncing an unchanged document,
+re-chunking, or ingesting text already embedded elsewhere then reads the
+vector back instead of running the model again.
+
+Text is normalized (Unicode NFC, whitespace collapsed) only to compute the
+key; misses are encoded from the caller's original text. Vectors are stored
+as float32 exactly as the model returned them (callers encode with
+``normalize_embeddings=True``).
+
+The cache holds at most ``AIKH_EMBEDDING_CACHE_MAX_ENTRIES`` vectors; past
+that the least recently used tenth is evicted. Query embeds do not go
+through it (see ``EmbeddingService.embed``). Set ``AIKH_EMBEDDING_CACHE=off``
+to bypass the cache.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from .aikh_config import AIKH_HOME
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_PATH = Path(
+    os.getenv("AIKH_EMBEDDING_CACHE_PATH", str(AIKH_HOME / "embedding_cache.db"))
+)
+MAX_ENTRIES = int(os.getenv("AIKH_EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+EVICT_FRACTION = 0.1  # Share of max_entries freed per eviction, so evictions stay rare
+LOOKUP_BATCH = 500  # Stay under SQLite's bound-parameter limit
+
+EMBEDDING_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    dimensions INTEGER NOT NULL,
+    created_at TEXT DEFAULT (datetime('now')),
+    used_at INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID;
+"""
+
+EMBEDDING_CACHE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_used ON embedding_cache(used_at);
+"""
+
+
+def cache_enabled() -> bool:
+    """Whether the cache is on (disable with ``AIKH_EMBEDDING_CACHE=off``)."""
+    return os.getenv("AIKH_EMBEDDING_CACHE", "on").lower() not in ("off", "0", "false")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed vector store keyed by (model, text hash), LRU-bounded."""
+
+    def __init__(self, db_path: Path = EMBEDDING_CACHE_PATH, max_entries: int = MAX_ENTRIES):
+        """Open (creating if needed) the cache database at ``db_path``."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(EMBEDDING_CACHE_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embedding_cache)")}
+        if "used_at" not in columns:
+            # Caches created before the size bound
+            self._conn.execute(
+                "ALTER TABLE embedding_cache ADD COLUMN used_at INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.executescript(EMBEDDING_CACHE_INDEXES)
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for the given text hashes, keyed by hash."""
+        found: dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        now = int(time.time())
+        with self._lock:
+            for start in range(0, len(unique), LOOKUP_BATCH):
+                batch = unique[start:start + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embedding_cache "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                if rows:
+                    # Recency for LRU eviction
+                    self._conn.execute(
+                        "UPDATE embedding_cache SET used_at = ? "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [now, model, *batch],
+                    )
+            if found:
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        """Store vectors for the given text hashes."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(model, text_hash, vector, dimensions, used_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model, key, vec.tobytes(), len(vec), now)
+                    for key, vec in zip(hashes, vectors)
+                ],
+            )
+            # Approximate: replaced rows and other processes' writes are
+            # reconciled by the exact count taken before evicting
+            self._entries += len(hashes)
+            if self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used rows down to 90% of ``max_entries``.
+
+        Caller holds the lock.
+        """
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        excess = self._entries - int(self.max_entries * (1 - EVICT_FRACTION))
+        if self._entries <= self.max_entries or excess <= 0:
+            return
+        deleted = self._conn.execute(
+            "DELETE FROM embedding_cache WHERE (model, text_hash) IN ("
+            "SELECT model, text_hash FROM embedding_cache ORDER BY used_at LIMIT ?)",
+            (excess,),
+        ).rowcount
+        self._entries -= deleted
+        self.evictions += deleted
+
+    def encode(
+        self,
+        model: str,
+        texts: Sequence[str],
+        encode_fn: Callable[[list[str]], np.ndarray],
+    ) -> np.ndarray:
+        """Vectors for ``texts``, running ``encode_fn`` only on uncached texts.
+
+        Duplicate texts within the call are encoded once.
+
+        Args:
+            model: Model name the vectors belong to.
+            texts: Texts to embed.
+            encode_fn: Encodes a list of texts to an (n, d) array.
+
+        Returns:
+            float32 array of shape (len(texts), d).
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        hashes = [text_hash(t) for t in texts]
+        found = self.get_many(model, hashes)
+
+        missing: dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            encoded = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            self.put_many(model, list(missing), encoded)
+            found.update(zip(missing, encoded))
+        return np.vstack([found[key] for key in hashes])
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters for this process and the stored row count."""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": rows,
+            "max_entries": self.max_entries,
+        }
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+        return _cache
+
+
+def cached_encode(
+    model: str,
+    texts: Sequence[str],
+    encode_fn: Callable[[list[str]], np.ndarray],
+) -> np.ndarray:
+    """Encode ``texts`` through the shared cache.
+
+    Falls back to encoding directly when the cache is disabled or its
+    database cannot be opened.
+    """
+    if cache_enabled():
+        try:
+            cache = get_embedding_cache()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Embedding cache unavailable, encoding directly: {e}")
+        else:
+            return cache.encode(model, texts, encode_fn)
+    return np.asarray(encode_fn(list(texts)), dtype=np.float32)
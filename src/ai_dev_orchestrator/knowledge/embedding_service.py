@@ -1,28 +1,39 @@
 """Embedding Service - Vector embedding generation.
 
 Provides embedding generation with:
-- Dual-mode support (local sentence-transformers)
+- Pluggable encoder backends (sentence-transformers, ONNX, hashing)
 - Auto-fallback to smaller model on memory errors
 - Batch processing with progress callbacks
 - Resume-capable embedding of all chunks
 """
 
 import os
-import struct
 from dataclasses import dataclass
 from typing import Callable
 
+import numpy as np
+
+from .backfill import backfill_embeddings
+from .embedding_backends import (
+    FALLBACK_MODEL,
+    PRIMARY_MODEL,
+    EmbeddingBackend,
+    get_backend,
+)
+from .embedding_batcher import get_batcher
+from .embedding_cache import cached_encode
+
 
 @dataclass
 class EmbeddingResult:
     """Result of embedding operation.
     
     Attributes:
-        vector: The embedding vector.
+        vector: The embedding vector (float32).
         model: Model used to generate embedding.
         dimensions: Number of dimensions in the vector.
     """
-    vector: list[float]
+    vector: np.ndarray
     model: str
     dimensions: int
 
@@ -30,44 +41,39 @@ class EmbeddingResult:
 class EmbeddingService:
     """Embedding generation with fallback support.
     
-    Uses sentence-transformers for local embedding generation.
-    Automatically falls back to smaller model on memory errors.
+    Encodes through an :class:`EmbeddingBackend` chosen by the ``backend``
+    argument or ``AIKH_EMBEDDING_BACKEND`` (sentence-transformers by default,
+    falling back to a smaller model on memory errors). The backend's identity
+    is recorded with every vector, so stores built with different backends
+    are never mixed.
     """
 
-    PRIMARY_MODEL = 'all-mpnet-base-v2'  # 768 dims
-    FALLBACK_MODEL = 'all-MiniLM-L6-v2'  # 384 dims
+    PRIMARY_MODEL = PRIMARY_MODEL  # 768 dims
+    FALLBACK_MODEL = FALLBACK_MODEL  # 384 dims
 
-    def __init__(self, batch_size: int = 32):
+    def __init__(self, batch_size: int = 32, backend: EmbeddingBackend | str | None = None):
         """Initialize embedding service.
         
         Args:
             batch_size: Batch size for batch embedding operations.
+            backend: Backend instance or spec such as ``"hashing:384"``;
+                defaults to ``AIKH_EMBEDDING_BACKEND``.
         """
         self.batch_size = batch_size
-        self._model = None
-        self._model_name: str | None = None
+        if not isinstance(backend, EmbeddingBackend):
+            backend = get_backend(backend, batch_size)
+        self.backend = backend
         self._mode = os.getenv('KNOWLEDGE_EMBEDDING_MODE', 'local')
 
-    def _load_model(self, model_name: str):
-        """Lazy load model with fallback on MemoryError."""
-        if self._model_name == model_name:
-            return
-
-        try:
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(model_name)
-            self._model_name = model_name
-        except MemoryError:
-            if model_name == self.PRIMARY_MODEL:
-                # Auto-fallback to smaller model
-                self._load_model(self.FALLBACK_MODEL)
-            else:
-                raise
-        except ImportError:
-            raise ImportError(
-                "sentence-transformers required. Install with: "
-                "pip install sentence-transformers"
-            )
+    @property
+    def model_name(self) -> str:
+        """Identity of the backend producing this service's vectors."""
+        return self.backend.name
+
+    @property
+    def dimensions(self) -> int:
+        """Vector length of the backend."""
+        return self.backend.dimensions
 
     def embed(self, text: str) -> EmbeddingResult:
         """Generate embedding for single text.
@@ -78,11 +84,12 @@ class EmbeddingService:
         Returns:
             EmbeddingResult with vector and metadata.
         """
-        self._load_model(self.PRIMARY_MODEL)
-        vec = self._model.encode(text, normalize_embeddings=True)
+        # Single texts (queries) share a micro-batch with concurrent callers
+        # and skip the persistent cache, which one-off queries would only grow
+        vec = get_batcher(self.model_name, self.backend.encode).embed(text)
         return EmbeddingResult(
-            vector=vec.tolist(),
-            model=self._model_name,
+            vector=vec,
+            model=self.model_name,
             dimensions=len(vec)
         )
 
@@ -95,23 +102,34 @@ class EmbeddingService:
         Returns:
             List of EmbeddingResult objects.
         """
-        self._load_model(self.PRIMARY_MODEL)
-        vectors = self._model.encode(
-            texts, 
-            normalize_embeddings=True, 
-            batch_size=self.batch_size
-        )
+        vectors = self.encode(texts)
         return [
             EmbeddingResult(
-                vector=v.tolist(), 
-                model=self._model_name, 
+                vector=v, 
+                model=self.model_name, 
                 dimensions=len(v)
             )
             for v in vectors
         ]
 
+    def encode(self, texts: list[str], cache: bool = True) -> np.ndarray:
+        """Embed texts as one float32 array of shape (len(texts), dimensions).
+        
+        Cached vectors are reused; nothing is converted to Python lists.
+        
+        Args:
+            texts: List of texts to embed.
+            cache: Use the persistent embedding cache (off for queries).
+            
+        Returns:
+            Row-aligned embedding matrix.
+        """
+        if not (cache and self.backend.cacheable):
+            return self.backend.encode(texts)
+        return cached_encode(self.model_name, texts, self.backend.encode)
+
     @staticmethod
-    def vector_to_blob(vector: list[float]) -> bytes:
+    def vector_to_blob(vector: np.ndarray | list[float]) -> bytes:
         """Serialize vector to BLOB for SQLite storage.
         
         Args:
@@ -120,20 +138,19 @@ class EmbeddingService:
         Returns:
             Bytes representation for SQLite BLOB storage.
         """
-        return struct.pack(f'{len(vector)}f', *vector)
+        return np.asarray(vector, dtype=np.float32).tobytes()
 
     @staticmethod
-    def blob_to_vector(blob: bytes) -> list[float]:
+    def blob_to_vector(blob: bytes) -> np.ndarray:
         """Deserialize vector from BLOB.
         
         Args:
             blob: Bytes from SQLite BLOB.
             
         Returns:
-            Embedding vector as list of floats.
+            Read-only float32 view over the BLOB bytes.
         """
-        count = len(blob) // 4
-        return list(struct.unpack(f'{count}f', blob))
+        return np.frombuffer(blob, dtype=np.float32)
 
     def embed_all_chunks(
         self,
@@ -142,7 +159,8 @@ class EmbeddingService:
     ) -> int:
         """Embed all chunks without embeddings (resume-capable).
 
-        Batch processing with progress callback.
+        Chunks stream through the shared backfill engine: length-bucketed
+        batches, one transaction per batch, and a checkpoint to resume from.
         
         Args:
             conn: Database connection.
@@ -151,35 +169,32 @@ class EmbeddingService:
         Returns:
             Number of chunks embedded.
         """
-        # Find unembedded chunks
-        rows = conn.execute("""
-            SELECT c.id, c.content FROM chunks c
-            LEFT JOIN embeddings e ON e.chunk_id = c.id
+        total = conn.execute("""
+            SELECT COUNT(*) FROM chunks c
+            LEFT JOIN embeddings e ON e.chunk_id = c.id AND e.model = :model
             WHERE e.chunk_id IS NULL
-        """).fetchall()
-
-        if not rows:
+        """, {"model": self.model_name}).fetchone()[0]
+        if not total:
             return 0
 
-        self._load_model(self.PRIMARY_MODEL)
-        total = len(rows)
-        embedded = 0
-
-        for i in range(0, total, self.batch_size):
-            batch = rows[i:i + self.batch_size]
-            texts = [r['content'] for r in batch]
-            vectors = self._model.encode(texts, normalize_embeddings=True)
-
-            for row, vec in zip(batch, vectors):
-                conn.execute(
-                    "INSERT INTO embeddings (chunk_id, vector, model, dimensions) VALUES (?,?,?,?)",
-                    (row['id'], self.vector_to_blob(vec.tolist()), self._model_name, len(vec))
-                )
-                embedded += 1
-
-            conn.commit()  # Commit each batch for resume capability
-
-            if progress_callback:
-                progress_callback(embedded, total)
-
-        return embedded
+        stats = backfill_embeddings(
+            conn,
+            job=f"embeddings:{self.model_name}",
+            select_sql="""
+                SELECT c.id, c.content FROM chunks c
+                LEFT JOIN embeddings e ON e.chunk_id = c.id AND e.model = :model
+                WHERE e.chunk_id IS NULL AND c.id > :after
+                ORDER BY c.id LIMIT :limit
+            """,
+            insert_sql=(
+                "INSERT INTO embeddings (chunk_id, vector, model, dimensions) VALUES (?,?,?,?)"
+            ),
+            encode_fn=self.encode,
+            row_params=lambda row, vec: (row[0], vec.tobytes(), self.model_name, len(vec)),
+            batch_size=self.batch_size,
+            progress_callback=progress_callback,
+            total=total,
+            params={"model": self.model_name},
+            quantize_table="embeddings",
+        )
+        return stats.embedded
@@ -0,0 +1,131 @@
+"""Concurrent fan-out of retrieval legs.
+
+Hybrid retrieval runs independent legs (full-text, vector, paper vs chunk
+matrices) whose latencies add up when run one after another. ``fan_out``
+runs them on a shared worker pool, with the first leg on the calling
+thread, so a request costs roughly its slowest leg.
+
+``gather`` runs named legs with per-leg deadlines (federated retrieval
+across stores); a leg that misses its deadline is dropped, so one slow
+store bounds latency instead of dominating it. Slow non-retrieval work
+(LLM calls) passes its own ``executor`` so it cannot occupy the retrieval
+workers.
+
+SQLite connections cannot cross threads, so a leg that runs on a worker
+opens its database through :func:`thread_connection`, which keeps one
+connection per database file per worker thread.
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("AIKH_RETRIEVAL_WORKERS", "8"))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+_THREAD_PREFIX = "retrieval"
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for retrieval legs."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_WORKERS, thread_name_prefix=_THREAD_PREFIX
+            )
+        return _executor
+
+
+def submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Run ``fn`` on the retrieval pool.
+
+    Called from a pool worker (a leg that fans out again), ``fn`` runs
+    inline instead, so nested legs cannot deadlock a saturated pool.
+    """
+    if not threading.current_thread().name.startswith(_THREAD_PREFIX):
+        return get_executor().submit(fn, *args, **kwargs)
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def fan_out(*legs: Callable[[], Any]) -> list[Any]:
+    """Run ``legs`` concurrently and return their results in order.
+
+    The first leg runs on the calling thread (typically the one holding a
+    connection or model), the rest on the pool. Exceptions propagate.
+    """
+    futures = [submit(leg) for leg in legs[1:]]
+    first = legs[0]()
+    return [first, *(f.result() for f in futures)]
+
+
+def gather(
+    legs: dict[str, Callable[[], Any]],
+    timeouts: dict[str, float] | None = None,
+    budget: float | None = None,
+    executor: ThreadPoolExecutor | None = None,
+) -> dict[str, Any]:
+    """Run named legs on the pool and collect those done by their deadline.
+
+    Args:
+        legs: ``{name: callable}``; all start at once.
+        timeouts: Seconds each leg may take, by name (default unbounded).
+        budget: Seconds for the whole call; caps every leg's timeout.
+        executor: Pool to run the legs on instead of the retrieval pool.
+
+    Returns:
+        ``{name: result}`` for legs that finished in time. Legs that fail
+        or time out are logged and left out; a late leg is cancelled if it
+        has not started, otherwise its result is discarded.
+    """
+    start = time.monotonic()
+    run = submit if executor is None else executor.submit
+    futures = {name: run(leg) for name, leg in legs.items()}
+    cap = math.inf if budget is None else budget
+    deadlines = {name: start + min((timeouts or {}).get(name, math.inf), cap) for name in legs}
+    results: dict[str, Any] = {}
+    for name in sorted(futures, key=deadlines.__getitem__):
+        remaining = deadlines[name] - time.monotonic()
+        try:
+            results[name] = futures[name].result(
+                timeout=None if math.isinf(remaining) else max(remaining, 0.0)
+            )
+        except TimeoutError:
+            futures[name].cancel()
+            logger.warning(f"Retrieval leg '{name}' missed its deadline")
+        except Exception as e:
+            logger.warning(f"Retrieval leg '{name}' failed: {e}")
+    return results
+
+
+def database_path(conn: sqlite3.Connection) -> str | None:
+    """File backing ``conn``'s main database, or None for in-memory ones."""
+    for _, name, path in conn.execute("PRAGMA database_list").fetchall():
+        if name == "main":
+            return path or None
+    return None
+
+
+def thread_connection(db_path: str) -> sqlite3.Connection:
+    """This thread's read connection to ``db_path`` (Row factory, WAL-friendly)."""
+    connections = _local.__dict__.setdefault("connections", {})
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = sqlite3.connect(db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+    return conn
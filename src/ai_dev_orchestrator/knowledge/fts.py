@@ -0,0 +1,221 @@
+"""Ranked FTS5 search over the knowledge archive.
+
+Two external-content FTS5 indexes are kept current by triggers:
+``content_fts`` over ``documents(title, content)`` and ``chunks_fts`` over
+``chunks(content)``. The chunk index returns the same unit as vector
+search (chunk ids), so hybrid retrieval fuses both legs without
+hydrating whole documents. This module turns free-form user input into a
+safe MATCH expression and runs the ranked queries shared by both
+``SearchService`` implementations and ``KnowledgeRetriever``:
+
+- Bare words become quoted terms, so FTS5 operators (``AND``, ``NEAR``,
+  ``col:``, ``^``, parentheses) in user input are matched literally and can
+  never raise a syntax error.
+- ``"double quoted"`` text is a phrase; a trailing ``*`` makes a prefix term.
+- Terms are OR-ed and ranked with bm25 (title hits weigh more than body
+  hits), so documents matching more and rarer terms come first.
+- Snippets come from ``snippet()`` with matches wrapped in ``**``.
+"""
+
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+SNIPPET_TOKENS = 24
+MAX_TERMS = 32
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD_RE = re.compile(r"\w+")
+
+# Index name -> content table, rebuilt when the index is new or legacy
+FTS_INDEXES = {"content_fts": "documents", "chunks_fts": "chunks"}
+
+# Legacy schema declared a ``doc_id`` column that ``documents`` does not have,
+# which breaks snippet()/highlight() on the external-content table
+_LEGACY_FTS_OBJECTS = """
+DROP TRIGGER IF EXISTS documents_ai;
+DROP TRIGGER IF EXISTS documents_ad;
+DROP TRIGGER IF EXISTS documents_au;
+DROP TABLE IF EXISTS content_fts;
+"""
+
+
+def build_match_query(text: str, max_terms: int = MAX_TERMS) -> str:
+    """Build a safe FTS5 MATCH expression from user input.
+
+    Args:
+        text: Raw query, e.g. ``sqlite "vector search" embed*``.
+        max_terms: Cap on terms, bounding the cost of very long queries.
+
+    Returns:
+        An OR of quoted terms, phrases and prefixes, or ``""`` when the
+        input has no searchable words.
+    """
+    terms: list[str] = []
+    for match in _QUERY_TOKEN_RE.finditer(text):
+        phrase, bare = match.groups()
+        words = _WORD_RE.findall(phrase if phrase is not None else bare)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        if bare is not None and bare.endswith("*"):
+            term += "*"
+        if term not in terms:
+            terms.append(term)
+        if len(terms) >= max_terms:
+            break
+    return " OR ".join(terms)
+
+
+@dataclass
+class ChunkMatch:
+    """One chunk-level full-text hit."""
+    chunk_id: int
+    doc_id: str
+    chunk_index: int
+    title: str
+    doc_type: str
+    content: str
+    snippet: str
+    score: float
+
+
+def apply_schema(conn: sqlite3.Connection, schema: str) -> list[str]:
+    """Run the knowledge ``schema`` and populate FTS indexes it created.
+
+    Indexes that did not exist yet (or used the legacy ``doc_id`` column)
+    are rebuilt from their content tables, so databases that predate an
+    index become searchable without re-ingesting.
+
+    Args:
+        conn: Knowledge database connection.
+        schema: The knowledge ``SCHEMA`` script that declares the indexes.
+
+    Returns:
+        Names of the indexes that were rebuilt.
+    """
+    stale = []
+    for index in FTS_INDEXES:
+        columns = [r[1] for r in conn.execute(f"PRAGMA table_info({index})").fetchall()]
+        if "doc_id" in columns:
+            conn.executescript(_LEGACY_FTS_OBJECTS)
+        if not columns or "doc_id" in columns:
+            stale.append(index)
+    conn.executescript(schema)
+    for index in stale:
+        conn.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+    conn.commit()
+    if stale:
+        logger.info(f"Rebuilt FTS indexes: {', '.join(stale)}")
+    return stale
+
+
+def search_documents(conn: sqlite3.Connection, query: str, top_k: int = 10) -> list[tuple]:
+    """Ranked full-text search over live documents.
+
+    Args:
+        conn: Knowledge database connection.
+        query: Raw user query (see :func:`build_match_query`).
+        top_k: Maximum results to return.
+
+    Returns:
+        ``(doc_id, title, snippet, doc_type, score)`` tuples, best first;
+        ``score`` is the negated bm25 rank, so higher is better. Databases
+        whose index is missing or legacy fall back to an unranked scan.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    try:
+        rows = conn.execute(f"""
+            SELECT
+                d.id,
+                d.title,
+                snippet(content_fts, 1, '**', '**', '…', {SNIPPET_TOKENS}),
+                d.type,
+                -bm25(content_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS score
+            FROM content_fts
+            JOIN documents d ON d.rowid = content_fts.rowid
+            WHERE content_fts MATCH ?
+              AND d.archived_at IS NULL
+            ORDER BY score DESC
+            LIMIT ?
+        """, (match, top_k)).fetchall()
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS search unavailable ({e}); falling back to a LIKE scan")
+        return _scan_documents(conn, query, top_k)
+    return [tuple(r) for r in rows]
+
+
+def _scan_documents(conn: sqlite3.Connection, query: str, top_k: int) -> list[tuple]:
+    """Unindexed substring match, used only when ``content_fts`` is unusable."""
+    pattern = f"%{query}%"
+    rows = conn.execute("""
+        SELECT id, title, substr(content, 1, 200), type, 0.0
+        FROM documents
+        WHERE archived_at IS NULL
+          AND (title LIKE ? OR content LIKE ?)
+        LIMIT ?
+    """, (pattern, pattern, top_k)).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def search_chunks(
+    conn: sqlite3.Connection,
+    query: str,
+    top_k: int = 10,
+    doc_types: list[str] | None = None,
+) -> list[ChunkMatch]:
+    """Ranked full-text search over chunks of live documents.
+
+    Args:
+        conn: Knowledge database connection.
+        query: Raw user query (see :func:`build_match_query`).
+        top_k: Maximum results to return.
+        doc_types: Only return chunks of these document types.
+
+    Returns:
+        ChunkMatch results, best first. Databases without ``chunks_fts``
+        fall back to an unranked scan.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    type_filter, type_params = "", []
+    if doc_types is not None:
+        type_filter = f"AND d.type IN ({', '.join('?' * len(doc_types))})"
+        type_params = list(doc_types)
+    try:
+        rows = conn.execute(f"""
+            SELECT
+                c.id, c.doc_id, c.chunk_index, d.title, d.type, c.content,
+                snippet(chunks_fts, 0, '**', '**', '…', {SNIPPET_TOKENS}),
+                -bm25(chunks_fts) AS score
+            FROM chunks_fts
+            JOIN chunks c ON c.id = chunks_fts.rowid
+            JOIN documents d ON d.id = c.doc_id
+            WHERE chunks_fts MATCH ?
+              AND d.archived_at IS NULL
+              {type_filter}
+            ORDER BY score DESC
+            LIMIT ?
+        """, [match, *type_params, top_k]).fetchall()
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Chunk FTS unavailable ({e}); falling back to a LIKE scan")
+        rows = conn.execute(f"""
+            SELECT
+                c.id, c.doc_id, c.chunk_index, d.title, d.type, c.content,
+                substr(c.content, 1, 200), 0.0
+            FROM chunks c
+            JOIN documents d ON d.id = c.doc_id
+            WHERE c.content LIKE ?
+              AND d.archived_at IS NULL
+              {type_filter}
+            LIMIT ?
+        """, [f"%{query}%", *type_params, top_k]).fetchall()
+    return [ChunkMatch(*r) for r in rows]
@@ -0,0 +1,117 @@
+"""Embedding Model Registry - one loaded model per process.
+
+Every sentence-transformers model is loaded through :func:`get_model`, so
+the knowledge and research embedding services, the GPU search service and
+the script embedders share a single instance of each (model, device)
+instead of each loading their own copy.
+
+:func:`warmup` loads models in a background thread at application startup
+so the first search does not pay the multi-second load.
+"""
+
+import logging
+import os
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated models loaded by warmup(); empty disables warmup
+WARMUP_MODELS = os.getenv("AIKH_WARMUP_MODELS", "all-mpnet-base-v2")
+
+_models: dict[tuple[str, str | None], Any] = {}
+_load_locks: dict[tuple[str, str | None], threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def default_device() -> str | None:
+    """Device sentence-transformers would pick, so explicit and implicit requests share a key."""
+    try:
+        import torch
+    except ImportError:
+        return None
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def get_model(model_name: str, device: str | None = None, backend: str = "torch") -> Any:
+    """Return the shared SentenceTransformer for ``model_name`` on ``device``.
+
+    The first caller loads the model; concurrent callers for the same key
+    wait for that load instead of starting their own.
+
+    Args:
+        model_name: sentence-transformers model name.
+        device: Torch device; ``None`` uses the default device.
+        backend: sentence-transformers inference backend (``"torch"`` or
+            ``"onnx"``); non-torch models are registered as ``name+backend``.
+
+    Returns:
+        Loaded SentenceTransformer instance.
+
+    Raises:
+        ImportError: If sentence-transformers is not installed.
+    """
+    name = model_name if backend == "torch" else f"{model_name}+{backend}"
+    key = (name, device or default_device())
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _load_locks.setdefault(key, threading.Lock())
+    with lock:
+        model = _models.get(key)
+        if model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers required. Install with: "
+                    "pip install sentence-transformers"
+                )
+            logger.info(f"Loading embedding model {name} on {key[1] or 'default device'}")
+            kwargs = {} if backend == "torch" else {"backend": backend}
+            model = _models[key] = SentenceTransformer(model_name, device=key[1], **kwargs)
+    return model
+
+
+def is_loaded(model_name: str, device: str | None = None) -> bool:
+    """Whether ``model_name`` is already resident on ``device``."""
+    return (model_name, device or default_device()) in _models
+
+
+def loaded_models() -> list[tuple[str, str | None]]:
+    """(model, device) pairs currently held by the registry."""
+    return list(_models)
+
+
+def warmup(model_names: list[str] | None = None, device: str | None = None) -> threading.Thread:
+    """Load models in a daemon thread.
+
+    Failures (missing package, no memory) are logged; callers fall back to
+    loading on first use.
+
+    Args:
+        model_names: Models to load; defaults to ``AIKH_WARMUP_MODELS``.
+        device: Torch device; ``None`` uses the default device.
+
+    Returns:
+        The started thread.
+    """
+    if model_names is None:
+        model_names = [m.strip() for m in WARMUP_MODELS.split(",") if m.strip()]
+
+    def _run():
+        for name in model_names:
+            try:
+                get_model(name, device)
+            except Exception as e:
+                logger.warning(f"Embedding model warmup failed for {name}: {e}")
+
+    thread = threading.Thread(target=_run, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,195 @@
+"""Resident matrix of research paper embeddings with category/chunk-type masks.
+
+Backs both ``ResearchRAGService.search_papers_semantic`` (``paper_embeddings``)
+and ``GPUSearchService`` (``paper_embeddings_gpu``). The matrix holds only
+row, paper and chunk ids and normalized vectors; loading, refresh, int8
+codes and re-ranking are those of :class:`ResidentMatrix`.
+
+Filters on paper ``category`` and ``chunk_type`` resolve to boolean row
+masks kept with the matrix: categories are evaluated once per paper and
+gathered to rows through per-row paper codes, chunk types through per-row
+type codes. Category assignments are re-read whenever the database changes;
+a chunk's type is fixed for its id (re-chunking writes new chunk rows and
+embeddings).
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .fanout import database_path
+from .resident_matrix import ResidentMatrix
+
+
+@dataclass(frozen=True)
+class PaperSource:
+    """Which rows of which embeddings table a :class:`PaperMatrix` holds.
+
+    SQL fragments see the table as ``t`` and ``paper_chunks`` as ``pc``
+    (left-joined on ``t.chunk_id``).
+    """
+    table: str  # paper_embeddings or paper_embeddings_gpu
+    vector_column: str  # float32 BLOB column
+    paper_column: str  # Expression for the row's paper id
+    where: str = "1"
+    params: tuple = ()
+
+
+class PaperMatrix(ResidentMatrix):
+    """Resident, incrementally refreshed matrix of paper/chunk embeddings."""
+
+    FILTER_FIELDS = ("category", "chunk_type")
+    ROW_COLUMNS = {
+        "_chunk_ids": np.int64,  # -1 for paper-level rows
+        "_paper_codes": np.int32,
+        "_type_codes": np.int32,  # -1 for rows without a chunk type
+    }
+
+    def __init__(self, source: PaperSource, quantized: bool | None = None):
+        """Initialize an empty matrix over ``source``; rows load on :meth:`refresh`."""
+        self.source = source
+        super().__init__(source.table, source.vector_column, quantized)
+
+    def _reset(self):
+        """Drop all loaded rows."""
+        super()._reset()
+        self._paper_ids: list[str] = []  # Paper code -> paper id
+        self._paper_codes_by_id: dict[str, int] = {}
+        self._chunk_types: dict[str, int] = {}  # Chunk type -> code
+        self._categories: dict[str, frozenset[str]] = {}
+
+    def _paper_code(self, paper_id: str) -> int:
+        """Dense code for a paper, registering it on first sight."""
+        code = self._paper_codes_by_id.get(paper_id)
+        if code is None:
+            code = self._paper_codes_by_id[paper_id] = len(self._paper_ids)
+            self._paper_ids.append(paper_id)
+        return code
+
+    def _type_code(self, chunk_type: str | None) -> int:
+        """Dense code for a chunk type, or -1 for none."""
+        if chunk_type is None:
+            return -1
+        return self._chunk_types.setdefault(chunk_type, len(self._chunk_types))
+
+    def _usable(self, row: tuple) -> bool:
+        """Rows ``(id, paper_id, chunk_id, chunk_type, vector)`` need a paper."""
+        return row[1] is not None
+
+    def _store_columns(self, rows: list[tuple], span: slice):
+        """Record each row's chunk id, paper code and chunk type code."""
+        self._chunk_ids[span] = [-1 if r[2] is None else r[2] for r in rows]
+        self._paper_codes[span] = [self._paper_code(r[1]) for r in rows]
+        self._type_codes[span] = [self._type_code(r[3]) for r in rows]
+
+    def _row_count(self, conn: sqlite3.Connection) -> int:
+        """Number of source rows."""
+        source = self.source
+        return conn.execute(f"""
+            SELECT COUNT(*) FROM {source.table} t
+            LEFT JOIN paper_chunks pc ON pc.id = t.chunk_id
+            WHERE {source.where}
+        """, source.params).fetchone()[0]
+
+    def _refresh_metadata(self, conn: sqlite3.Connection):
+        """Re-read paper categories; drop masks if they moved."""
+        categories: dict[str, set[str]] = {}
+        for paper_id, category in conn.execute(
+            "SELECT paper_id, category FROM paper_categories"
+        ):
+            categories.setdefault(paper_id, set()).add(category)
+        frozen = {paper_id: frozenset(cats) for paper_id, cats in categories.items()}
+        if frozen != self._categories:
+            self._categories = frozen
+            self._mask_cache.clear()
+
+    def _rows_since(self, conn: sqlite3.Connection, high_water: int) -> sqlite3.Cursor:
+        """Source rows ``(id, paper_id, chunk_id, chunk_type, vector)`` past ``high_water``."""
+        source = self.source
+        vector, join = self._vector_select(conn, "t")
+        return conn.execute(f"""
+            SELECT t.id, {source.paper_column}, t.chunk_id, pc.chunk_type, {vector}
+            FROM {source.table} t
+            LEFT JOIN paper_chunks pc ON pc.id = t.chunk_id
+            {join}
+            WHERE {source.where} AND t.id > ? ORDER BY t.id
+        """, (*source.params, high_water))
+
+    def _search_context(self) -> dict[str, Any]:
+        """The paper code -> id list, append-only and replaced wholesale on reset."""
+        return {"paper_ids": self._paper_ids}
+
+    def top_k(
+        self,
+        query_vector: list[float] | np.ndarray,
+        k: int,
+        min_similarity: float = -1.0,
+        conn: sqlite3.Connection | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[tuple[str, int | None, float]]:
+        """Return ``(paper_id, chunk_id, similarity)`` for the ``k`` best rows.
+
+        ``filters`` restricts rows by paper ``category`` and/or ``chunk_type``
+        (a value or list of values). In quantized mode, pass ``conn`` to
+        re-rank the int8 shortlist with the stored float32 vectors; without
+        it similarities are approximate.
+        """
+        snapshot, (top,), (scores,) = self._rank(
+            [query_vector], k, min_similarity, conn, filters
+        )
+        chunk_ids, paper_codes = snapshot["_chunk_ids"], snapshot["_paper_codes"]
+        return [
+            (
+                snapshot["paper_ids"][paper_codes[i]],
+                None if chunk_ids[i] < 0 else int(chunk_ids[i]),
+                float(scores[i]),
+            )
+            for i in top
+        ]
+
+    def _build_mask(self, key: tuple) -> np.ndarray:
+        """Row mask for ``(categories, chunk_types)``; either may be None."""
+        categories, chunk_types = key
+        mask = np.ones(self._size, dtype=bool)
+        if categories is not None:
+            wanted = set(categories)
+            allowed = np.fromiter(
+                (bool(self._categories.get(p, frozenset()) & wanted) for p in self._paper_ids),
+                dtype=bool, count=len(self._paper_ids),
+            )
+            mask &= allowed[self._paper_codes[:self._size]]
+        if chunk_types is not None:
+            # One slot per chunk type plus a trailing slot for code -1 (none)
+            allowed = np.zeros(len(self._chunk_types) + 1, dtype=bool)
+            for chunk_type in chunk_types:
+                if chunk_type in self._chunk_types:
+                    allowed[self._chunk_types[chunk_type]] = True
+            mask &= allowed[self._type_codes[:self._size]]
+        return mask
+
+
+_matrices: dict[tuple[str, PaperSource], PaperMatrix] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_paper_matrix(conn: sqlite3.Connection, source: PaperSource) -> PaperMatrix:
+    """Get the refreshed process-wide matrix for a database and source.
+
+    In-memory databases are private to their connection, so their matrix is
+    built per call and never cached.
+    """
+    path = database_path(conn)
+    if path is None:
+        matrix = PaperMatrix(source)
+        matrix.refresh(conn)
+        return matrix
+    key = (path, source)
+    with _matrices_lock:
+        matrix = _matrices.get(key)
+        if matrix is None:
+            matrix = _matrices[key] = PaperMatrix(source)
+    matrix.refresh(conn)
+    return matrix
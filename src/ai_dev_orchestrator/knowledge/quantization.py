@@ -0,0 +1,183 @@
+"""Scalar int8 quantization for stored embeddings.
+
+Each vector is stored as a float32 scale followed by int8 codes
+(``x ~= scale * codes``, ``scale = max|x| / 127``). At 768 dimensions a code
+blob is 772 bytes instead of 3 KB, so scans read and score about 4x less
+data. Quantized scores only pick a shortlist; the shortlist is re-ranked
+with the original float32 vectors.
+
+Codes live in a companion ``<table>_q8`` table keyed by the embedding row
+id, so scanning them never touches the float32 BLOB pages of the base table.
+They are written with the embeddings (``store_quantized``, or
+``backfill_embeddings(quantize_table=...)``); searches only read them.
+``sync_quantized`` backfills codes for rows embedded before quantization
+was turned on.
+"""
+
+import os
+import sqlite3
+
+import numpy as np
+
+QUANTIZATION_MODE = os.getenv("AIKH_VECTOR_QUANTIZATION", "none").lower()
+SCALE_BYTES = 4
+SCORE_BLOCK_ROWS = 8192
+FETCH_ROWS = 4096
+
+
+def quantization_enabled() -> bool:
+    """Whether int8 storage/scoring is turned on (``AIKH_VECTOR_QUANTIZATION=int8``)."""
+    return QUANTIZATION_MODE == "int8"
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Quantize rows to int8 with a per-row scale.
+
+    Args:
+        vectors: Array of shape (n, d) or (d,).
+
+    Returns:
+        Tuple of (int8 codes with the input's shape, float32 scales of shape (n,)).
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Reconstruct approximate float32 rows from codes and scales."""
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def int8_scores(codes: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Approximate dot products of every row with ``query``.
+
+    Rows are widened to float32 one block at a time, so the float copy never
+    exceeds ``SCORE_BLOCK_ROWS`` rows.
+
+    Args:
+        codes: int8 array of shape (n, d).
+        scales: float32 array of shape (n,).
+        query: float32 query of shape (d,), or a batch of shape (q, d).
+
+    Returns:
+        float32 scores of shape (n,), or (n, q) for a batch.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    scores = np.empty((len(codes),) + query.shape[:-1], dtype=np.float32)
+    for start in range(0, len(codes), SCORE_BLOCK_ROWS):
+        block = codes[start:start + SCORE_BLOCK_ROWS]
+        scores[start:start + len(block)] = block.astype(np.float32) @ query.T
+    return scores * (scales if scores.ndim == 1 else scales[:, None])
+
+
+def codes_to_blob(codes: np.ndarray, scale: float) -> bytes:
+    """Serialize one quantized vector as ``float32 scale || int8 codes``."""
+    return np.float32(scale).tobytes() + np.asarray(codes, dtype=np.int8).tobytes()
+
+
+def blobs_to_codes(blobs: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """Decode equally sized code blobs into (codes, scales) without copying per row."""
+    raw = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), -1)
+    scales = raw[:, :SCALE_BYTES].copy().view(np.float32).ravel()
+    codes = raw[:, SCALE_BYTES:].view(np.int8)
+    return codes, scales
+
+
+def quantized_table_schema(table: str) -> str:
+    """DDL for the ``<table>_q8`` companion table and its delete trigger."""
+    return f"""
+CREATE TABLE IF NOT EXISTS {table}_q8 (
+    id INTEGER PRIMARY KEY,
+    codes BLOB NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS {table}_q8_ad AFTER DELETE ON {table} BEGIN
+    DELETE FROM {table}_q8 WHERE id = old.id;
+END;
+"""
+
+
+def has_quantized_table(conn: sqlite3.Connection, table: str) -> bool:
+    """Whether ``<table>_q8`` exists (search paths never create it)."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_q8",)
+    ).fetchone() is not None
+
+
+def row_codes(codes: bytes | None, vector: bytes | None) -> bytes:
+    """Stored codes for a row, or codes quantized in memory from its float32 BLOB."""
+    if codes is not None:
+        return codes
+    q, scales = quantize_int8(np.frombuffer(vector, dtype=np.float32))
+    return codes_to_blob(q[0], scales[0])
+
+
+def quantize_since(
+    conn: sqlite3.Connection,
+    table: str,
+    since_id: int = 0,
+    vector_column: str = "vector",
+) -> int:
+    """Write codes for rows with ``id > since_id`` that have none.
+
+    Runs inside the caller's transaction (no commit), so codes can be
+    written together with the embeddings they encode.
+
+    Returns:
+        Largest ``id`` quantized, or ``since_id`` if there was none.
+    """
+    cursor = conn.execute(f"""
+        SELECT t.id, t.{vector_column} FROM {table} t
+        LEFT JOIN {table}_q8 q ON q.id = t.id
+        WHERE q.id IS NULL AND t.id > ?
+        ORDER BY t.id
+    """, (since_id,))
+
+    high = since_id
+    while True:
+        rows = cursor.fetchmany(FETCH_ROWS)
+        if not rows:
+            break
+        updates = [(row[0], row_codes(None, row[1])) for row in rows]
+        conn.executemany(f"INSERT OR REPLACE INTO {table}_q8 (id, codes) VALUES (?, ?)", updates)
+        high = rows[-1][0]
+    return high
+
+
+def sync_quantized(
+    conn: sqlite3.Connection,
+    table: str,
+    vector_column: str = "vector",
+    since_id: int = 0,
+) -> int:
+    """Backfill codes for rows of ``table`` that have none yet.
+
+    A write/backfill-time operation (it creates the code table and commits);
+    search paths only read codes.
+
+    Args:
+        conn: Database connection.
+        table: Base embeddings table (``embeddings``, ``paper_embeddings``...).
+        vector_column: Column holding the float32 BLOB.
+        since_id: Only consider rows with ``id > since_id``.
+
+    Returns:
+        Number of rows quantized.
+    """
+    conn.executescript(quantized_table_schema(table))
+    before = conn.total_changes
+    quantize_since(conn, table, since_id, vector_column)
+    conn.commit()
+    return conn.total_changes - before
+
+
+def store_quantized(conn: sqlite3.Connection, table: str, row_id: int, vector: np.ndarray) -> None:
+    """Write the codes for a single freshly inserted embedding row."""
+    codes, scales = quantize_int8(vector)
+    conn.execute(
+        f"INSERT OR REPLACE INTO {table}_q8 (id, codes) VALUES (?, ?)",
+        (row_id, codes_to_blob(codes[0], scales[0])),
+    )
@@ -25,6 +25,7 @@ import json
 from datetime import datetime
 
 from .aikh_config import RESEARCH_DB_PATH as AIKH_RESEARCH_PATH
+from .quantization import quantized_table_schema
 
 # Legacy support - prefer AIKH path
 WORKSPACE_DIR = Path(os.getenv("AI_DEV_WORKSPACE", ".workspace"))
@@ -206,6 +207,9 @@ CREATE INDEX IF NOT EXISTS idx_images_plot ON paper_images(is_plot);
 CREATE INDEX IF NOT EXISTS idx_images_type ON paper_images(plot_type);
 """
 
+# int8 codes for paper_embeddings (AIKH_VECTOR_QUANTIZATION=int8)
+RESEARCH_SCHEMA += quantized_table_schema("paper_embeddings")
+
 
 @dataclass
 class ResearchPaperRecord:
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
 # Add scripts directory to path for PDF converter
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "scripts"))
 
@@ -27,6 +29,7 @@ from .research_database import (
     classify_image_as_plot
 )
 from .embedding_service import EmbeddingService
+from .quantization import quantization_enabled, store_quantized
 from .chunking_service import ChunkingService
 
 logger = logging.getLogger(__name__)
@@ -202,19 +205,17 @@ class ResearchPaperIngestion:
         logger.info(f"Created {len(chunks)} chunks for paper {paper_id}")
         
         # Insert chunks into research database
-        for i, chunk in enumerate(chunks):
-            chunk_id = self._insert_paper_chunk(
+        chunk_ids = [
+            self._insert_paper_chunk(
                 paper_id, i, chunk.content, 
                 chunk.start_char, chunk.end_char, chunk.token_count
             )
-            
-            # Generate and store embedding (unless skipped)
-            if not self.skip_embeddings:
-                try:
-                    embedding_result = self.embedding_service.embed(chunk.content)
-                    self._insert_paper_embedding(chunk_id, embedding_result.vector)
-                except Exception as e:
-                    logger.error(f"Failed to generate embedding for chunk {chunk_id}: {e}")
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        # Generate and store embeddings (unless skipped)
+        if not self.skip_embeddings:
+            self._embed_paper_chunks(chunk_ids, [chunk.content for chunk in chunks])
         
         # Process abstract separately if available
         abstract = paper_dict.get("metadata", {}).get("abstract")
@@ -242,19 +243,39 @@ class ResearchPaperIngestion:
             chunk_overlap=100
         )
         
-        for i, chunk in enumerate(section_chunks):
-            chunk_id = self._insert_paper_chunk(
+        chunk_ids = [
+            self._insert_paper_chunk(
                 paper_id, f"{section_name}_{i}", chunk.content,
                 chunk.start_char, chunk.end_char, chunk.token_count,
                 chunk_type=section_name.lower()
             )
-            
-            if not self.skip_embeddings:
-                try:
-                    embedding_result = self.embedding_service.embed(chunk.content)
-                    self._insert_paper_embedding(chunk_id, embedding_result.vector)
-                except Exception as e:
-                    logger.error(f"Failed to generate embedding for {section_name} chunk: {e}")
+            for i, chunk in enumerate(section_chunks)
+        ]
+        
+        if not self.skip_embeddings:
+            self._embed_paper_chunks(chunk_ids, [chunk.content for chunk in section_chunks])
+    
+    def _embed_paper_chunks(self, chunk_ids: List[int], contents: List[str]) -> None:
+        """Embed chunks in one batch and store their vectors.
+        
+        The embedding service consults the shared embedding cache, so text
+        already embedded (a re-ingested paper, a section repeated in the body)
+        is not encoded again.
+        
+        Args:
+            chunk_ids: Chunk IDs, aligned with ``contents``.
+            contents: Chunk texts.
+        """
+        if not chunk_ids:
+            return
+        try:
+            vectors = self.embedding_service.encode(contents)
+        except Exception as e:
+            logger.error(
+                f"Failed to generate embeddings for chunks {chunk_ids[0]}..{chunk_ids[-1]}: {e}"
+            )
+            return
+        self._insert_paper_embeddings(chunk_ids, vectors)
     
     def _insert_paper_chunk(self, 
                            paper_id: str, 
@@ -289,22 +310,24 @@ class ResearchPaperIngestion:
         self.research_conn.commit()
         return cursor.lastrowid
     
-    def _insert_paper_embedding(self, chunk_id: int, embedding: List[float]) -> None:
-        """Insert embedding for a paper chunk.
+    def _insert_paper_embeddings(self, chunk_ids: List[int], vectors: np.ndarray) -> None:
+        """Insert embeddings for paper chunks in one transaction.
         
         Args:
-            chunk_id: Chunk ID.
-            embedding: Embedding vector.
+            chunk_ids: Chunk IDs, aligned with the rows of ``vectors``.
+            vectors: float32 embedding matrix.
         """
-        # Convert embedding to blob
-        embedding_blob = self.embedding_service.vector_to_blob(embedding)
-        
-        self.research_conn.execute("""
-            INSERT OR REPLACE INTO paper_embeddings (
-                chunk_id, vector, model, dimensions
-            ) VALUES (?, ?, ?, ?)
-        """, (chunk_id, embedding_blob, 
-              self.embedding_service._model_name or "unknown", len(embedding)))
+        model = self.embedding_service.model_name
+        quantize = quantization_enabled()
+        for chunk_id, vector in zip(chunk_ids, vectors):
+            cursor = self.research_conn.execute("""
+                INSERT OR REPLACE INTO paper_embeddings (
+                    chunk_id, vector, model, dimensions
+                ) VALUES (?, ?, ?, ?)
+            """, (chunk_id, vector.tobytes(), model, len(vector)))
+            
+            if quantize:
+                store_quantized(self.research_conn, "paper_embeddings", cursor.lastrowid, vector)
         
         self.research_conn.commit()
     
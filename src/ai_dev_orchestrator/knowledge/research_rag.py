@@ -13,6 +13,7 @@ import logging
 from .research_database import get_research_connection, search_research_papers
 from .search_service import SearchHit
 from .embedding_service import EmbeddingService
+from .paper_matrix import PaperSource, get_paper_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -73,69 +74,84 @@ class ResearchRAGService:
         try:
             # Generate query embedding
             query_embedding = self.embedding_service.embed(query).vector
-            query_blob = self.embedding_service.vector_to_blob(query_embedding)
             
-            # Build SQL query for semantic search
-            base_query = """
-                SELECT 
-                    p.id, p.title, p.authors, p.abstract, p.arxiv_id, p.doi, 
-                    p.venue, p.publication_date,
-                    pc.content as chunk_content, pc.chunk_type,
-                    pe.vector as embedding_blob
-                FROM research_papers p
-                JOIN paper_chunks pc ON p.id = pc.paper_id
-                JOIN paper_embeddings pe ON pc.id = pe.chunk_id
-            """
-            
-            params = []
-            
-            if category_filter:
-                base_query += """
-                    JOIN paper_categories pcat ON p.id = pcat.paper_id
-                    WHERE pcat.category = ?
-                """
-                params.append(category_filter)
-            
-            cursor = self.research_conn.execute(base_query, params)
-            results = []
-            
-            for row in cursor.fetchall():
-                # Calculate cosine similarity
-                chunk_embedding = self.embedding_service.blob_to_vector(row['embedding_blob'])
-                similarity = self._cosine_similarity(query_embedding, chunk_embedding)
-                
-                if similarity >= min_score:
-                    # Parse authors JSON
-                    import json
-                    authors = json.loads(row['authors'] or '[]')
-                    
-                    # Get categories for this paper
-                    categories = self._get_paper_categories(row['id'])
-                    
-                    hit = ResearchSearchHit(
-                        paper_id=row['id'],
-                        title=row['title'],
-                        authors=authors,
-                        abstract=row['abstract'],
-                        arxiv_id=row['arxiv_id'],
-                        doi=row['doi'],
-                        venue=row['venue'],
-                        chunk_content=row['chunk_content'],
-                        chunk_type=row['chunk_type'],
-                        score=similarity,
-                        publication_date=row['publication_date'],
-                        categories=categories
-                    )
-                    results.append(hit)
-            
-            # Sort by score and limit
-            results.sort(key=lambda x: x.score, reverse=True)
-            return results[:limit]
+            # Score the resident matrix of this backend's vectors; the
+            # category filter is a row mask, so only matching chunks are scored
+            source = PaperSource(
+                table="paper_embeddings",
+                vector_column="vector",
+                paper_column="pc.paper_id",
+                where="t.model = ?",
+                params=(self.embedding_service.model_name,),
+            )
+            matrix = get_paper_matrix(self.research_conn, source)
+            filters = {"category": category_filter} if category_filter else None
+            
+            # Chunks of deleted papers drop out at hydration; widen until
+            # limit survive or the matrix is exhausted
+            fetch = limit
+            while True:
+                hits = matrix.top_k(
+                    query_embedding, fetch, min_score, self.research_conn, filters
+                )
+                results = self._hydrate_chunk_hits(hits)
+                if len(results) >= limit or len(hits) < fetch:
+                    return results[:limit]
+                fetch *= 4
             
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
             return []
     
+    def _hydrate_chunk_hits(self,
+                            hits: List[Tuple[str, Optional[int], float]]
+                            ) -> List[ResearchSearchHit]:
+        """Build search hits for ``(paper_id, chunk_id, score)`` matrix hits.
+        
+        Args:
+            hits: Matrix hits, best first.
+            
+        Returns:
+            Research search hits in the same order, minus deleted chunks.
+        """
+        import json
+        
+        scores = {chunk_id: score for _, chunk_id, score in hits if chunk_id is not None}
+        if not scores:
+            return []
+        
+        placeholders = ",".join("?" * len(scores))
+        cursor = self.research_conn.execute(f"""
+            SELECT 
+                pc.id as chunk_id,
+                p.id, p.title, p.authors, p.abstract, p.arxiv_id, p.doi, 
+                p.venue, p.publication_date,
+                pc.content as chunk_content, pc.chunk_type
+            FROM paper_chunks pc
+            JOIN research_papers p ON p.id = pc.paper_id
+            WHERE pc.id IN ({placeholders})
+        """, list(scores))
+        
+        results = [
+            ResearchSearchHit(
+                paper_id=row['id'],
+                title=row['title'],
+                authors=json.loads(row['authors'] or '[]'),
+                abstract=row['abstract'],
+                arxiv_id=row['arxiv_id'],
+                doi=row['doi'],
+                venue=row['venue'],
+                chunk_content=row['chunk_content'],
+                chunk_type=row['chunk_type'],
+                score=scores[row['chunk_id']],
+                publication_date=row['publication_date'],
+                categories=self._get_paper_categories(row['id'])
+            )
+            for row in cursor.fetchall()
+        ]
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results
+    
     def search_papers_fulltext(self, 
                               query: str, 
                               limit: int = 10,
@@ -354,31 +370,27 @@ class ResearchRAGService:
         
         return context
     
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors.
+    @staticmethod
+    def _cosine_scores(query_embedding: np.ndarray, blobs: List[bytes]) -> np.ndarray:
+        """Cosine similarity of a query against float32 embedding BLOBs.
+        
+        The BLOBs are viewed as one (n, d) matrix, so scoring is a single
+        matrix-vector product rather than a Python loop per chunk.
         
         Args:
-            vec1: First vector.
-            vec2: Second vector.
+            query_embedding: Query vector.
+            blobs: Stored embedding BLOBs of the query's dimension.
             
         Returns:
-            Cosine similarity score.
+            Array of n similarity scores.
         """
-        try:
-            v1 = np.array(vec1)
-            v2 = np.array(vec2)
-            
-            dot_product = np.dot(v1, v2)
-            norm1 = np.linalg.norm(v1)
-            norm2 = np.linalg.norm(v2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return float(dot_product / (norm1 * norm2))
-            
-        except Exception:
-            return 0.0
+        if not blobs:
+            return np.empty(0, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = np.inf
+        return matrix @ query / norms
     
     def _get_paper_categories(self, paper_id: str) -> List[str]:
         """Get categories for a paper.
@@ -415,15 +427,15 @@ class ResearchRAGService:
             cursor = self.research_conn.execute("""
                 SELECT pc.content, pc.chunk_type, pe.vector
                 FROM paper_chunks pc
-                JOIN paper_embeddings pe ON pc.id = pe.chunk_id
+                JOIN paper_embeddings pe ON pc.id = pe.chunk_id AND pe.model = ?
                 WHERE pc.paper_id = ?
-            """, (paper_id,))
+            """, (self.embedding_service.model_name, paper_id))
+            
+            rows = cursor.fetchall()
+            scores = self._cosine_scores(query_embedding, [row['vector'] for row in rows])
             
             chunks_with_scores = []
-            for row in cursor.fetchall():
-                chunk_embedding = self.embedding_service.blob_to_vector(row['vector'])
-                similarity = self._cosine_similarity(query_embedding, chunk_embedding)
-                
+            for row, similarity in zip(rows, scores.tolist()):
                 chunks_with_scores.append({
                     'content': row['content'],
                     'chunk_type': row['chunk_type'],
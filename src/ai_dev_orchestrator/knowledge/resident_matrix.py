@@ -0,0 +1,360 @@
+"""Base class for process-resident embedding matrices.
+
+A resident matrix holds row ids, per-row filter codes and normalized vectors
+of one embeddings table, so a search is a matrix product and an
+``argpartition`` instead of a SQL scan. Rows are loaded incrementally from a
+high-water mark on the table's ``id``; a row count mismatch (deletes,
+``INSERT OR REPLACE``) triggers a full reload, and nothing is read while the
+:class:`ChangeGate` rules out a change.
+
+Filters resolve to boolean row masks, cached until rows are appended or the
+metadata behind them changes, and only rows passing the mask are scored.
+
+With ``AIKH_VECTOR_QUANTIZATION=int8`` the matrix holds int8 codes from the
+``<table>_q8`` companion table (rows without codes are quantized in memory,
+so loading never writes) and re-ranks its shortlist against the float32
+BLOBs.
+
+Subclasses describe their table through :meth:`_rows_since` (rows laid out
+as ``(id, *metadata, vector)``), :meth:`_store_columns` and the filter hooks.
+"""
+
+import sqlite3
+import threading
+from typing import Any
+
+import numpy as np
+
+from .change_gate import ChangeGate
+from .quantization import (
+    SCALE_BYTES,
+    blobs_to_codes,
+    has_quantized_table,
+    int8_scores,
+    quantization_enabled,
+    row_codes,
+)
+
+
+class ResidentMatrix:
+    """Resident, incrementally refreshed matrix of normalized embeddings."""
+
+    INITIAL_CAPACITY = 1024
+    FETCH_ROWS = 4096
+    HYDRATE_BATCH = 500  # Stay under SQLite's bound-parameter limit
+    RERANK_FACTOR = 4  # int8 shortlist size as a multiple of k
+    QUERY_BLOCK = 64  # Queries scored per matrix-matrix product
+    FILTER_FIELDS: tuple[str, ...] = ()
+    ROW_COLUMNS: dict[str, type] = {}  # Per-row array attribute -> dtype
+
+    def __init__(self, table: str, vector_column: str, quantized: bool | None = None):
+        """Initialize an empty matrix over ``table``; rows load on :meth:`refresh`."""
+        self.table = table
+        self.vector_column = vector_column  # float32 BLOB column
+        self.quantized = quantization_enabled() if quantized is None else quantized
+        self._dtype = np.int8 if self.quantized else np.float32
+        self._lock = threading.Lock()
+        self._gate = ChangeGate()
+        self._reset()
+
+    def _reset(self):
+        """Drop all loaded rows."""
+        self.dimensions: int | None = None
+        self._vectors = np.empty((0, 0), dtype=self._dtype)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._row_ids = np.empty(0, dtype=np.int64)
+        for name, dtype in self.ROW_COLUMNS.items():
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self._mask_cache: dict[tuple, np.ndarray] = {}
+        self._size = 0
+        self._rows_seen = 0
+        self._high_water = 0
+
+    def __len__(self) -> int:
+        """Number of loaded rows."""
+        return self._size
+
+    @property
+    def high_water_mark(self) -> int:
+        """Largest row id loaded so far."""
+        return self._high_water
+
+    def _ensure_capacity(self, extra: int):
+        """Grow backing arrays geometrically so appends stay amortized O(1)."""
+        needed = self._size + extra
+        capacity = len(self._row_ids)
+        if needed <= capacity:
+            return
+        new_capacity = max(self.INITIAL_CAPACITY, capacity * 2, needed)
+        vectors = np.empty((new_capacity, self.dimensions), dtype=self._dtype)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        for name in ("_scales", "_row_ids", *self.ROW_COLUMNS):
+            old = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def _blob_dimensions(self, blob: bytes) -> int:
+        """Vector dimension encoded by a float32 or int8-code BLOB."""
+        return len(blob) - SCALE_BYTES if self.quantized else len(blob) // 4
+
+    def _append(self, rows: list[sqlite3.Row | tuple]):
+        """Append rows ``(id, *metadata, vector)``.
+
+        In quantized mode the vector is two columns: int8 codes, and the
+        float32 BLOB of rows without codes. Each row's scale is folded with
+        its norm so scores are cosine similarities.
+        """
+        if self.quantized:
+            rows = [(*r[:-2], row_codes(r[-2], r[-1])) for r in rows]
+        usable = [r for r in rows if self._usable(r)]
+        if self.dimensions is None and usable:
+            self.dimensions = self._blob_dimensions(usable[0][-1])
+            self._vectors = np.empty((0, self.dimensions), dtype=self._dtype)
+
+        # Rows from a different model/dimension can never match the query
+        usable = [r for r in usable if self._blob_dimensions(r[-1]) == self.dimensions]
+        if usable:
+            if self.quantized:
+                block, _ = blobs_to_codes([r[-1] for r in usable])
+                norms = np.linalg.norm(block.astype(np.float32), axis=1)
+                norms[norms == 0] = 1.0
+                scales = 1.0 / norms
+            else:
+                block = np.frombuffer(b"".join(r[-1] for r in usable), dtype=np.float32)
+                block = block.reshape(len(usable), self.dimensions)
+                norms = np.linalg.norm(block, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                block = block / norms
+                scales = 1.0
+            self._ensure_capacity(len(usable))
+            end = self._size + len(usable)
+            self._vectors[self._size:end] = block
+            self._scales[self._size:end] = scales
+            self._row_ids[self._size:end] = [r[0] for r in usable]
+            self._store_columns(usable, slice(self._size, end))
+            self._size = end
+            self._mask_cache.clear()
+
+        self._rows_seen += len(rows)
+        self._high_water = max(self._high_water, rows[-1][0])
+
+    def _usable(self, row: tuple) -> bool:
+        """Whether a loaded row belongs in the matrix (it still counts as seen)."""
+        return True
+
+    def _store_columns(self, rows: list[tuple], span: slice):
+        """Write the per-row ``ROW_COLUMNS`` of appended ``rows`` at ``span``."""
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """Load rows added since the last refresh; returns rows loaded.
+
+        Deleted rows cannot be seen through the high-water mark, so the row
+        count is compared with the rows seen and any mismatch triggers a full
+        reload. Filter metadata is re-read too. None of this runs unless the
+        :class:`ChangeGate` sees a possible change.
+        """
+        with self._lock:
+            version = self._gate.version(conn)
+            if self._gate.unchanged(conn, version):
+                return 0
+            loaded = self._load_since(conn, self._high_water)
+            if self._row_count(conn) != self._rows_seen:
+                self._reset()
+                loaded = self._load_since(conn, 0)
+            self._refresh_metadata(conn)
+            self._gate.checked(conn, version)
+            return loaded
+
+    def _row_count(self, conn: sqlite3.Connection) -> int:
+        """Number of rows :meth:`_rows_since` returns from zero."""
+        return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _refresh_metadata(self, conn: sqlite3.Connection):
+        """Re-read filter metadata that can change without new rows."""
+
+    def _vector_select(self, conn: sqlite3.Connection, alias: str) -> tuple[str, str]:
+        """Trailing vector column(s) and companion-table join for a row query."""
+        column = f"{alias}.{self.vector_column}"
+        if self.quantized and has_quantized_table(conn, self.table):
+            # The float32 BLOB is only read for rows still missing codes
+            return (
+                f"q.codes, CASE WHEN q.id IS NULL THEN {column} END",
+                f"LEFT JOIN {self.table}_q8 q ON q.id = {alias}.id",
+            )
+        if self.quantized:
+            return f"NULL, {column}", ""
+        return column, ""
+
+    def _rows_since(self, conn: sqlite3.Connection, high_water: int) -> sqlite3.Cursor:
+        """Cursor over rows with ``id > high_water`` in id order."""
+        raise NotImplementedError
+
+    def _load_since(self, conn: sqlite3.Connection, high_water: int) -> int:
+        """Append every row with ``id > high_water``."""
+        cursor = self._rows_since(conn, high_water)
+        loaded = 0
+        while True:
+            rows = cursor.fetchmany(self.FETCH_ROWS)
+            if not rows:
+                break
+            self._append(rows)
+            loaded += len(rows)
+        return loaded
+
+    def _search_context(self) -> dict[str, Any]:
+        """Non-row state a search reads alongside the row arrays (under the lock)."""
+        return {}
+
+    def _rank(
+        self,
+        query_vectors: list[list[float]] | np.ndarray,
+        k: int,
+        min_score: float | None = None,
+        conn: sqlite3.Connection | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> tuple[dict[str, Any], list[np.ndarray], list[np.ndarray]]:
+        """Score queries against the (masked) rows.
+
+        Returns a snapshot of the row arrays (keyed by attribute name, plus
+        :meth:`_search_context`), and per query the snapshot positions of
+        its best rows (best first) and its score column. Queries are scored
+        ``QUERY_BLOCK`` at a time; in quantized mode, pass ``conn`` to
+        re-rank the int8 shortlists with the float32 vectors.
+        """
+        with self._lock:
+            size = self._size
+            snapshot = {
+                name: getattr(self, name)[:size]
+                for name in ("_vectors", "_scales", "_row_ids", *self.ROW_COLUMNS)
+            }
+            mask = self._row_mask(filters) if filters else None
+            context = self._search_context()
+
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            snapshot = {name: column[rows] for name, column in snapshot.items()}
+            size = len(rows)
+        vectors, scales = snapshot["_vectors"], snapshot["_scales"]
+        snapshot.update(context)
+
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        if size == 0 or k <= 0 or queries.shape[1] != vectors.shape[1]:
+            none = [np.empty(0, dtype=np.int64)] * len(queries)
+            return snapshot, none, [np.empty(0, dtype=np.float32)] * len(queries)
+
+        norms = np.linalg.norm(queries, axis=1)
+        usable = norms > 0
+        queries = queries / np.where(usable, norms, 1.0)[:, None]
+
+        rerank = self.quantized and conn is not None
+        fetch = k * self.RERANK_FACTOR if rerank else k
+        tops, columns = [], []
+        for start in range(0, len(queries), self.QUERY_BLOCK):
+            block = queries[start:start + self.QUERY_BLOCK]
+            if self.quantized:
+                scores = int8_scores(vectors, scales, block)
+            else:
+                scores = vectors @ block.T
+            for j in range(len(block)):
+                columns.append(scores[:, j])
+                tops.append(self._top_indices(scores[:, j], fetch))
+
+        if rerank:
+            tops, columns = self._rerank(conn, tops, columns, snapshot["_row_ids"], queries, k)
+
+        ranked = []
+        for top, column, usable_query in zip(tops, columns, usable):
+            if not usable_query:
+                top = top[:0]
+            elif min_score is not None:
+                top = top[column[top] >= min_score]
+            ranked.append(top)
+        return snapshot, ranked, columns
+
+    @staticmethod
+    def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the ``k`` largest scores, best first."""
+        if k < len(scores):
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(scores[top])[::-1]]
+
+    def _rerank(
+        self,
+        conn: sqlite3.Connection,
+        tops: list[np.ndarray],
+        columns: list[np.ndarray],
+        row_ids: np.ndarray,
+        queries: np.ndarray,
+        k: int,
+    ) -> tuple[list[np.ndarray], list[np.ndarray]]:
+        """Re-score int8 shortlists with float32 vectors, read in one pass.
+
+        Rows deleted since the last refresh score ``-inf`` and are dropped.
+        """
+        shortlisted = np.unique(np.concatenate([row_ids[top] for top in tops]))
+        exact = self._float_vectors(conn, shortlisted)
+        reranked_tops, reranked_columns = [], []
+        for top, column, query in zip(tops, columns, queries):
+            column = column.copy()
+            column[top] = [
+                exact[r] @ query if r in exact else -np.inf for r in row_ids[top].tolist()
+            ]
+            top = top[np.argsort(column[top])[::-1]][:k]
+            reranked_tops.append(top[np.isfinite(column[top])])
+            reranked_columns.append(column)
+        return reranked_tops, reranked_columns
+
+    def _float_vectors(
+        self,
+        conn: sqlite3.Connection,
+        row_ids: np.ndarray,
+    ) -> dict[int, np.ndarray]:
+        """Normalized float32 vectors for a set of row ids, read in bounded batches."""
+        ids = [int(i) for i in row_ids]
+        vectors = {}
+        for start in range(0, len(ids), self.HYDRATE_BATCH):
+            batch = ids[start:start + self.HYDRATE_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for row_id, blob in conn.execute(
+                f"SELECT id, {self.vector_column} FROM {self.table} "
+                f"WHERE id IN ({placeholders})",
+                batch,
+            ).fetchall():
+                vec = np.frombuffer(blob, dtype=np.float32)
+                if len(vec) != self.dimensions:
+                    continue
+                norm = np.linalg.norm(vec)
+                vectors[row_id] = vec / norm if norm else vec
+        return vectors
+
+    def _row_mask(self, filters: dict[str, Any]) -> np.ndarray:
+        """Boolean mask over loaded rows for ``filters``; caller holds the lock."""
+        unknown = set(filters) - set(self.FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported filter fields: {sorted(unknown)}")
+        key = self._mask_key(filters)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = self._mask_cache[key] = self._build_mask(key)
+        return mask
+
+    @staticmethod
+    def _filter_values(value: Any) -> tuple | None:
+        """Normalize a filter value (one value or a list of them) to a sorted tuple."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return (value,)
+        return tuple(sorted(value))
+
+    def _mask_key(self, filters: dict[str, Any]) -> tuple:
+        """Hashable, normalized form of ``filters`` for the mask cache."""
+        return tuple(self._filter_values(filters.get(name)) for name in self.FILTER_FIELDS)
+
+    def _build_mask(self, key: tuple) -> np.ndarray:
+        """Boolean mask over loaded rows for a :meth:`_mask_key` key."""
+        raise NotImplementedError
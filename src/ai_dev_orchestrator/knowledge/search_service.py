@@ -1,7 +1,7 @@
 """Search Service - Full-text, vector, and hybrid search.
 
 Provides:
-- FTS5 full-text search
+- FTS5 full-text search with bm25 ranking
 - Vector similarity search with cosine similarity
 - Hybrid search with Reciprocal Rank Fusion (RRF)
 """
@@ -9,7 +9,11 @@ Provides:
 import sqlite3
 from dataclasses import dataclass
 
+import numpy as np
+
 from ai_dev_orchestrator.knowledge.database import get_connection
+from ai_dev_orchestrator.knowledge.fanout import database_path, fan_out, thread_connection
+from ai_dev_orchestrator.knowledge.fts import search_chunks, search_documents
 
 
 @dataclass
@@ -22,12 +26,14 @@ class SearchHit:
         snippet: Content snippet.
         score: Relevance score.
         doc_type: Document type (adr, spec, discussion, etc.).
+        chunk_id: Matched chunk, for chunk-level results.
     """
     doc_id: str
     title: str
     snippet: str
     score: float
     doc_type: str
+    chunk_id: int | None = None
 
 
 class SearchService:
@@ -42,7 +48,10 @@ class SearchService:
         self.conn = conn or get_connection()
 
     def fts_search(self, query: str, top_k: int = 10) -> list[SearchHit]:
-        """Full-text search using FTS5.
+        """Full-text search using FTS5, ranked by bm25.
+
+        Words are OR-ed terms, ``"quoted text"`` is a phrase and ``term*``
+        a prefix; FTS5 syntax in the query is matched literally.
         
         Args:
             query: Search query string.
@@ -51,50 +60,59 @@ class SearchService:
         Returns:
             List of SearchHit results.
         """
-        rows = self.conn.execute("""
-            SELECT
-                id as doc_id,
-                title,
-                substr(content, 1, 200) as snippet,
-                type as doc_type
-            FROM documents
-            WHERE archived_at IS NULL
-              AND (title LIKE ? OR content LIKE ?)
-            LIMIT ?
-        """, (f'%{query}%', f'%{query}%', top_k)).fetchall()
+        return [
+            SearchHit(doc_id=doc_id, title=title, snippet=snippet, score=score, doc_type=doc_type)
+            for doc_id, title, snippet, doc_type, score in search_documents(
+                self.conn, query, top_k
+            )
+        ]
+
+    def chunk_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        doc_types: list[str] | None = None,
+    ) -> list[SearchHit]:
+        """Full-text search over chunks, ranked by bm25.
 
+        Returns the same unit as vector search, so the two can be fused
+        by chunk id.
+        
+        Args:
+            query: Search query string (same syntax as ``fts_search``).
+            top_k: Maximum results to return.
+            doc_types: Only return chunks of these document types.
+            
+        Returns:
+            List of SearchHit results with ``chunk_id`` set.
+        """
         return [
             SearchHit(
-                doc_id=r['doc_id'],
-                title=r['title'],
-                snippet=r['snippet'],
-                score=1.0,
-                doc_type=r['doc_type']
+                doc_id=m.doc_id,
+                title=m.title,
+                snippet=m.snippet,
+                score=m.score,
+                doc_type=m.doc_type,
+                chunk_id=m.chunk_id,
             )
-            for r in rows
+            for m in search_chunks(self.conn, query, top_k, doc_types)
         ]
 
-    def _blob_to_vector(self, blob: bytes) -> list[float]:
-        """Deserialize vector from BLOB."""
-        import struct
-        count = len(blob) // 4
-        return list(struct.unpack(f'{count}f', blob))
-
-    def _cosine_similarity(self, v1: list[float], v2: list[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        dot = sum(a * b for a, b in zip(v1, v2))
-        norm1 = sum(a * a for a in v1) ** 0.5
-        norm2 = sum(b * b for b in v2) ** 0.5
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        return dot / (norm1 * norm2)
-
-    def vector_search(self, query_vector: list[float], top_k: int = 10) -> list[SearchHit]:
+    def vector_search(
+        self,
+        query_vector: np.ndarray | list[float],
+        top_k: int = 10,
+        model: str | None = None,
+    ) -> list[SearchHit]:
         """Vector similarity search.
         
+        Stored BLOBs are viewed as one float32 matrix and scored with a single
+        matrix-vector product; only the top-k rows become SearchHits.
+        
         Args:
             query_vector: Query embedding vector.
             top_k: Maximum results to return.
+            model: Only score embeddings from this backend identity.
             
         Returns:
             List of SearchHit results sorted by similarity.
@@ -102,6 +120,7 @@ class SearchService:
         rows = self.conn.execute("""
             SELECT
                 e.vector,
+                c.id as chunk_id,
                 c.doc_id,
                 c.content as snippet,
                 d.title,
@@ -110,35 +129,48 @@ class SearchService:
             JOIN chunks c ON e.chunk_id = c.id
             JOIN documents d ON c.doc_id = d.id
             WHERE d.archived_at IS NULL
-        """).fetchall()
-
-        scored = []
-        for r in rows:
-            vec = self._blob_to_vector(r['vector'])
-            sim = self._cosine_similarity(query_vector, vec)
-            scored.append(SearchHit(
-                doc_id=r['doc_id'],
-                title=r['title'],
-                snippet=r['snippet'][:200],
-                score=sim,
-                doc_type=r['doc_type']
-            ))
-
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:top_k]
+              AND (:model IS NULL OR e.model = :model)
+        """, {"model": model}).fetchall()
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        # Rows of another dimension come from a different model
+        rows = [r for r in rows if len(r['vector']) == query.nbytes]
+        if not rows:
+            return []
+
+        matrix = np.frombuffer(b"".join(r['vector'] for r in rows), dtype=np.float32)
+        matrix = matrix.reshape(len(rows), len(query))
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = np.inf
+        scores = matrix @ query / norms
+
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            SearchHit(
+                doc_id=rows[i]['doc_id'],
+                title=rows[i]['title'],
+                snippet=rows[i]['snippet'][:200],
+                score=float(scores[i]),
+                doc_type=rows[i]['doc_type'],
+                chunk_id=rows[i]['chunk_id'],
+            )
+            for i in top
+        ]
 
     def hybrid_search(
         self,
         query: str,
-        query_vector: list[float] | None = None,
+        query_vector: np.ndarray | list[float] | None = None,
         top_k: int = 10,
         fts_weight: float = 0.5,
-        vec_weight: float = 0.5
+        vec_weight: float = 0.5,
+        model: str | None = None,
     ) -> list[SearchHit]:
         """Hybrid search with Reciprocal Rank Fusion (RRF).
 
-        Combines FTS and vector search results using RRF formula:
-        score = sum(1 / (k + rank)) where k=60
+        Combines chunk-level FTS and vector search results using RRF formula:
+        score = sum(1 / (k + rank)) where k=60. Both legs rank chunks, so
+        hits are fused by chunk id and each result carries its own chunk.
         
         Args:
             query: Text query for FTS.
@@ -146,38 +178,65 @@ class SearchService:
             top_k: Maximum results to return.
             fts_weight: Weight for FTS results.
             vec_weight: Weight for vector results.
+            model: Backend identity that produced ``query_vector``.
             
         Returns:
-            List of SearchHit results with combined scores.
+            List of chunk-level SearchHit results with combined scores.
         """
         k = 60  # RRF constant
-        rrf_scores: dict[str, float] = {}
-        doc_data: dict[str, SearchHit] = {}
+        rrf_scores: dict[int, float] = {}
+        chunk_data: dict[int, SearchHit] = {}
+
+        fts_results, vec_results = self._hybrid_legs(query, query_vector, top_k * 2, model)
 
         # FTS results
-        fts_results = self.fts_search(query, top_k * 2)
         for rank, hit in enumerate(fts_results):
-            rrf_scores[hit.doc_id] = rrf_scores.get(hit.doc_id, 0) + fts_weight / (k + rank + 1)
-            doc_data[hit.doc_id] = hit
+            rrf_scores[hit.chunk_id] = rrf_scores.get(hit.chunk_id, 0) + fts_weight / (k + rank + 1)
+            chunk_data[hit.chunk_id] = hit
 
         # Vector results (if vector provided)
-        if query_vector:
-            vec_results = self.vector_search(query_vector, top_k * 2)
-            for rank, hit in enumerate(vec_results):
-                rrf_scores[hit.doc_id] = rrf_scores.get(hit.doc_id, 0) + vec_weight / (k + rank + 1)
-                if hit.doc_id not in doc_data:
-                    doc_data[hit.doc_id] = hit
+        for rank, hit in enumerate(vec_results):
+            rrf_scores[hit.chunk_id] = rrf_scores.get(hit.chunk_id, 0) + vec_weight / (k + rank + 1)
+            if hit.chunk_id not in chunk_data:
+                chunk_data[hit.chunk_id] = hit
 
         # Sort by RRF score
         sorted_ids = sorted(rrf_scores.keys(), key=lambda x: rrf_scores[x], reverse=True)
 
         return [
             SearchHit(
-                doc_id=doc_data[doc_id].doc_id,
-                title=doc_data[doc_id].title,
-                snippet=doc_data[doc_id].snippet,
-                score=rrf_scores[doc_id],
-                doc_type=doc_data[doc_id].doc_type
+                doc_id=chunk_data[chunk_id].doc_id,
+                title=chunk_data[chunk_id].title,
+                snippet=chunk_data[chunk_id].snippet,
+                score=rrf_scores[chunk_id],
+                doc_type=chunk_data[chunk_id].doc_type,
+                chunk_id=chunk_id,
             )
-            for doc_id in sorted_ids[:top_k]
+            for chunk_id in sorted_ids[:top_k]
         ]
+
+    def _hybrid_legs(
+        self,
+        query: str,
+        query_vector: np.ndarray | list[float] | None,
+        top_k: int,
+        model: str | None,
+    ) -> tuple[list[SearchHit], list[SearchHit]]:
+        """Chunk FTS and vector results, run concurrently on file databases.
+
+        The vector leg stays on this thread and connection; the FTS leg
+        runs on the retrieval pool with that worker's own connection.
+        """
+        def vector_leg() -> list[SearchHit]:
+            if query_vector is None:
+                return []
+            return self.vector_search(query_vector, top_k, model=model)
+
+        db_path = database_path(self.conn)
+        if query_vector is None or db_path is None:
+            return self.chunk_search(query, top_k), vector_leg()
+        vec_results, fts_results = fan_out(
+            vector_leg,
+            lambda: SearchService(thread_connection(db_path)).chunk_search(query, top_k),
+        )
+        return fts_results, vec_results
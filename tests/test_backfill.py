@@ -0,0 +1,120 @@
+"""Tests for the streaming embedding backfill engine."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.backfill import (
+    backfill_embeddings,
+    get_checkpoint,
+    length_batches,
+)
+
+SELECT_SQL = """
+    SELECT c.id, c.content FROM chunks c
+    LEFT JOIN embeddings e ON e.chunk_id = c.id
+    WHERE e.chunk_id IS NULL AND c.id > :after
+    ORDER BY c.id LIMIT :limit
+"""
+INSERT_SQL = "INSERT INTO embeddings (chunk_id, vector) VALUES (?, ?)"
+
+
+@pytest.fixture
+def conn():
+    """Database with 25 chunks of varying length and no embeddings."""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE chunks (id INTEGER PRIMARY KEY, content TEXT);
+        CREATE TABLE embeddings (chunk_id INTEGER PRIMARY KEY, vector BLOB);
+    """)
+    conn.executemany(
+        "INSERT INTO chunks (id, content) VALUES (?, ?)",
+        [(i, "x" * (i * 7 % 23 + 1)) for i in range(1, 26)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _encoder(calls, fail_on_call=None):
+    """Encoder recording batches; raises on the ``fail_on_call``-th call."""
+    def encode(texts):
+        calls.append(list(texts))
+        if len(calls) == fail_on_call:
+            raise RuntimeError("interrupted")
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+    return encode
+
+
+def _run(conn, encode, **kwargs):
+    return backfill_embeddings(
+        conn, "test", SELECT_SQL, INSERT_SQL, encode,
+        row_params=lambda row, vec: (row[0], vec.tobytes()),
+        batch_size=4, window=10, **kwargs,
+    )
+
+
+class TestBackfill:
+    """Tests for backfill_embeddings."""
+
+    def test_embeds_every_row_in_windows(self, conn):
+        """All pending rows are written, reading at most one window at a time."""
+        calls = []
+        progress = []
+        stats = _run(conn, _encoder(calls), total=25,
+                     progress_callback=lambda done, total: progress.append(done))
+
+        assert stats.embedded == 25
+        assert stats.windows == 3
+        assert max(len(batch) for batch in calls) == 4
+        assert progress[-1] == 25
+        rows = conn.execute("SELECT chunk_id, vector FROM embeddings").fetchall()
+        assert len(rows) == 25
+        lengths = dict(conn.execute("SELECT id, LENGTH(content) FROM chunks").fetchall())
+        for chunk_id, blob in rows:
+            assert np.frombuffer(blob, dtype=np.float32)[0] == lengths[chunk_id]
+
+    def test_resumes_after_interruption(self, conn):
+        """A failed run keeps finished windows and the next run continues after them."""
+        calls = []
+        with pytest.raises(RuntimeError):
+            _run(conn, _encoder(calls, fail_on_call=5))  # Second window, second batch
+
+        # First window and the first batch of the second were committed
+        assert conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 14
+        assert get_checkpoint(conn, "test") == (10, 10)
+
+        calls = []
+        stats = _run(conn, _encoder(calls))
+
+        assert stats.resumed_from == 10
+        assert stats.embedded == 11
+        assert conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 25
+        assert get_checkpoint(conn, "test") is None
+
+    def test_nothing_pending(self, conn):
+        """A second run finds no work."""
+        _run(conn, _encoder([]))
+        calls = []
+        stats = _run(conn, _encoder(calls))
+
+        assert stats.embedded == 0
+        assert calls == []
+
+
+def test_get_checkpoint_keeps_caller_transaction(conn):
+    """Reading a checkpoint neither commits nor ends the caller's transaction."""
+    conn.execute("DELETE FROM chunks WHERE id = 1")
+
+    assert get_checkpoint(conn, "job") is None
+    assert conn.in_transaction
+    conn.rollback()
+    assert conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 25
+
+
+def test_length_batches_groups_similar_lengths():
+    """Rows are sorted by text length before batching."""
+    rows = [(1, "ccc"), (2, "a"), (3, "bbbb"), (4, "dd"), (5, None)]
+    batches = length_batches(rows, 2)
+
+    assert [[r[0] for r in b] for b in batches] == [[5, 2], [4, 1], [3]]
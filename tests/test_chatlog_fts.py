@@ -0,0 +1,102 @@
+"""Tests for the trigger-maintained chat log FTS index."""
+
+import sqlite3
+
+import pytest
+from ai_dev_orchestrator.knowledge import chatlog_database as db
+
+
+@pytest.fixture
+def chatlog_db(tmp_path, monkeypatch):
+    """Empty chat logs database at a temporary path."""
+    path = tmp_path / "chatlogs.db"
+    monkeypatch.setenv("CHATLOG_DB_PATH", str(path))
+    db.init_database()
+    return path
+
+
+def _ingest(file_path, title, *turns):
+    """Insert (or re-ingest) a chat log with the given turn texts."""
+    log_id = db.insert_chat_log(file_path, file_path, title, 1, None, len(turns), 1)
+    for i, text in enumerate(turns):
+        db.insert_chat_turn(log_id, i, "user", text, len(text.split()))
+    return log_id
+
+
+def _ids(query):
+    return [r["id"] for r in db.search_chatlogs(query)]
+
+
+class TestChatFts:
+    """Tests for incremental chat_fts maintenance."""
+
+    def test_new_turns_are_searchable_without_rebuild(self, chatlog_db):
+        """Each insert is indexed by triggers as it happens."""
+        first = _ingest("a.md", "Docker setup", "compose file for postgres")
+        assert _ids("postgres") == [first]
+
+        second = _ingest("b.md", "Other", "migrating postgres schemas")
+
+        assert set(_ids("postgres")) == {first, second}
+        assert _ids("docker") == [first]  # Title row
+        assert _ids("schema") == [second]  # Porter stemming
+
+    def test_reingest_replaces_turns_and_title(self, chatlog_db):
+        """Re-ingesting a log drops its old turns and retitles it."""
+        log_id = _ingest("a.md", "Old title", "talking about redis")
+        assert _ingest("a.md", "New title", "talking about kafka") == log_id
+
+        assert _ids("redis") == []
+        assert _ids("kafka") == [log_id]
+        assert _ids("old") == [] and _ids("new") == [log_id]
+
+    def test_one_result_per_log(self, chatlog_db):
+        """Logs with several matching turns appear once."""
+        log_id = _ingest("a.md", "Pytest", "pytest fixtures", "more pytest", "pytest again")
+
+        assert _ids("pytest") == [log_id]
+
+
+def test_legacy_index_is_migrated(tmp_path, monkeypatch):
+    """A database indexed by the old full-rebuild scheme gets triggers and keeps its rows."""
+    path = tmp_path / "chatlogs.db"
+    monkeypatch.setenv("CHATLOG_DB_PATH", str(path))
+    db.init_database()
+    log_id = _ingest("a.md", "Legacy", "grpc streaming")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TRIGGER chat_logs_fts_ai; DROP TRIGGER chat_logs_fts_au;
+        DROP TRIGGER chat_logs_fts_ad; DROP TRIGGER chat_turns_fts_ai;
+        DROP TRIGGER chat_turns_fts_au; DROP TRIGGER chat_turns_fts_ad;
+        DROP TABLE chat_fts;
+        CREATE VIRTUAL TABLE chat_fts USING fts5(chat_log_id, title, content, tokenize='porter');
+    """)
+    conn.close()
+
+    db.init_database()
+
+    assert _ids("grpc") == [log_id]
+    assert _ids("legacy") == [log_id]
+
+
+def test_external_content_index_is_replaced(tmp_path, monkeypatch):
+    """An old external-content chat_fts is rebuilt even when the new triggers exist."""
+    path = tmp_path / "chatlogs.db"
+    monkeypatch.setenv("CHATLOG_DB_PATH", str(path))
+    db.init_database()
+    log_id = _ingest("a.md", "Legacy", "grpc streaming")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TABLE chat_fts;
+        CREATE VIRTUAL TABLE chat_fts USING fts5(
+            content, filename, title, content='chat_turns', content_rowid='id',
+            tokenize='porter'
+        );
+    """)
+    conn.close()
+
+    db.init_database()
+    other = _ingest("b.md", "Other", "grpc deadlines")
+
+    assert set(_ids("grpc")) == {log_id, other}
+    assert _ids("legacy") == [log_id]
@@ -0,0 +1,104 @@
+"""Tests for the version-aware RAG context cache."""
+
+import sqlite3
+
+import pytest
+from backend.services.knowledge.archive_service import ArchiveService
+from backend.services.knowledge.chunking import ChunkingService
+from backend.services.knowledge.context_builder import (
+    ContextBuilder,
+    ContextCache,
+    ContextResult,
+    context_cache,
+)
+from backend.services.knowledge.database import SCHEMA
+from backend.services.knowledge.search_service import SearchService
+from contracts.knowledge.archive import Document, DocumentType
+
+
+def _doc(doc_id, content, file_hash):
+    return Document(
+        id=doc_id, type=DocumentType.ADR, title=doc_id, content=content,
+        file_path=f"/tmp/{doc_id}.md", file_hash=file_hash,
+    )
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Archive with two chunked documents; the shared cache starts empty."""
+    conn = sqlite3.connect(tmp_path / "knowledge.db")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    archive = ArchiveService(conn)
+    chunker = ChunkingService()
+    for doc in (_doc("ADR-1", "faiss index tuning", "h1"), _doc("ADR-2", "wal checkpoints", "h2")):
+        archive.upsert_document(doc)
+        chunker.chunk_and_store(conn, doc.id, doc.content, doc.file_path)
+    context_cache.clear()
+    yield archive
+    context_cache.clear()
+    conn.close()
+
+
+class TestContextCache:
+    """Tests for ContextCache bounds and invalidation."""
+
+    def test_lru_eviction(self):
+        """The oldest unused entry goes once the cache is full."""
+        cache = ContextCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.set(key, ContextResult(key), key, {}, cache.generation)
+        cache.get("a")
+        cache.set("c", ContextResult("c"), "c", {}, cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+
+    def test_invalidation_by_version_and_text(self):
+        """Only entries built from an older version or matching new text go."""
+        cache = ContextCache()
+        cache.set("faiss", ContextResult("1"), "faiss index", {"ADR-1": "h1"}, cache.generation)
+        cache.set("wal", ContextResult("2"), "wal", {"ADR-2": "h2"}, cache.generation)
+
+        assert cache.invalidate_document("ADR-1", "h1") == 0  # Already current
+        assert cache.invalidate_document("ADR-3", "h3", "indexing notes") == 1  # Prefix match
+        assert cache.get("faiss") is None and cache.get("wal")
+        assert cache.invalidate_document("ADR-2", "h2b") == 1
+
+    def test_racing_write_is_not_cached(self):
+        """A result built before an invalidation is not stored."""
+        cache = ContextCache()
+        generation = cache.generation
+        cache.invalidate_document("ADR-1")
+
+        assert not cache.set("k", ContextResult("x"), "k", {}, generation)
+
+
+class TestBuilderInvalidation:
+    """ContextBuilder entries follow archive and chunk writes."""
+
+    def test_cached_until_source_document_changes(self, archive):
+        """Edits to a used document rebuild; unrelated edits do not."""
+        builder = ContextBuilder(SearchService(archive.conn))
+
+        assert not builder.build_context("faiss").cached
+        assert builder.build_context("faiss").cached
+
+        archive.upsert_document(_doc("ADR-2", "wal checkpoints again", "h2b"))
+        assert builder.build_context("faiss").cached
+
+        archive.upsert_document(_doc("ADR-1", "faiss graph tuning", "h1b"))
+        ChunkingService().rechunk_document(archive.conn, "ADR-1")
+        rebuilt = builder.build_context("faiss")
+        assert not rebuilt.cached and "graph" in rebuilt.context
+
+    def test_new_matching_document_and_archive(self, archive):
+        """A new document with the query's terms, or an archived source, rebuilds."""
+        builder = ContextBuilder(SearchService(archive.conn))
+        builder.build_context("checkpoints")
+
+        archive.upsert_document(_doc("ADR-3", "checkpoints in postgres", "h3"))
+        assert not builder.build_context("checkpoints").cached
+
+        archive.archive_document("ADR-2")
+        assert not builder.build_context("checkpoints").cached
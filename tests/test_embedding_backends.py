@@ -0,0 +1,163 @@
+"""Tests for pluggable embedding backends."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.embedding_backends import (
+    HashingBackend,
+    SentenceTransformerBackend,
+    create_backend,
+)
+from ai_dev_orchestrator.knowledge.database import SCHEMA as SRC_SCHEMA
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+from ai_dev_orchestrator.knowledge.search_service import SearchService
+from backend.services.knowledge.database import SCHEMA
+from backend.services.knowledge.embedding_matrix import get_embedding_matrix
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Knowledge database with three single-chunk documents."""
+    conn = sqlite3.connect(tmp_path / "knowledge.db")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    texts = ["vector search with faiss", "sqlite full text search", "gpu embedding batches"]
+    for i, text in enumerate(texts):
+        conn.execute(
+            "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+            "VALUES (?, 'adr', ?, ?, ?, 'h')",
+            (f"doc-{i}", f"Doc {i}", text, f"/tmp/doc-{i}.md"),
+        )
+        conn.execute(
+            "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, 0, ?)",
+            (f"doc-{i}", text),
+        )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+class TestHashingBackend:
+    """Tests for the deterministic hashing vectorizer."""
+
+    def test_deterministic_and_normalized(self):
+        """Same text gives the same unit vector across instances."""
+        first = HashingBackend(64).encode(["Hello world", ""])
+        second = HashingBackend(64).encode(["hello  WORLD", ""])
+
+        assert first.shape == (2, 64) and first.dtype == np.float32
+        assert np.array_equal(first[0], second[0])
+        assert np.linalg.norm(first[0]) == pytest.approx(1.0)
+        assert not first[1].any()
+
+    def test_shared_words_score_higher(self):
+        """Texts sharing words are closer than unrelated texts."""
+        query, near, far = HashingBackend(256).encode(
+            ["vector search", "fast vector search index", "chat log parser"]
+        )
+
+        assert query @ near > query @ far
+
+
+class TestCreateBackend:
+    """Tests for backend specs."""
+
+    def test_specs(self):
+        """Specs select the backend and its identity."""
+        assert create_backend("hashing:128").name == "hashing-128"
+        assert create_backend("hashing").dimensions == 384
+        onnx = create_backend("onnx:all-MiniLM-L6-v2")
+        assert isinstance(onnx, SentenceTransformerBackend)
+        assert onnx.inference_backend == "onnx"
+        default = create_backend("sentence-transformers")
+        assert default.fallback == EmbeddingService.FALLBACK_MODEL
+
+    def test_unknown_backend(self):
+        """Unknown kinds are rejected."""
+        with pytest.raises(ValueError):
+            create_backend("word2vec")
+
+
+class TestServiceBackends:
+    """EmbeddingService with a configured backend."""
+
+    def test_embed_reports_backend_identity(self, monkeypatch):
+        """The configured backend is used without touching callers."""
+        monkeypatch.setenv("AIKH_EMBEDDING_BACKEND", "hashing:32")
+        result = EmbeddingService().embed("some text")
+
+        assert result.model == "hashing-32"
+        assert result.dimensions == 32
+
+    def test_backends_are_not_mixed(self, conn):
+        """Each backend embeds every chunk and searches only its own rows."""
+        small = EmbeddingService(backend="hashing:64")
+        other = EmbeddingService(backend=HashingBackend(64))  # Same identity
+        large = EmbeddingService(backend="hashing:128")
+
+        assert small.embed_all_chunks(conn) == 3
+        assert other.embed_all_chunks(conn) == 0
+        assert large.embed_all_chunks(conn) == 3
+        models = conn.execute(
+            "SELECT model, COUNT(*) FROM embeddings GROUP BY model ORDER BY model"
+        ).fetchall()
+        assert [tuple(r) for r in models] == [("hashing-128", 3), ("hashing-64", 3)]
+
+        matrix = get_embedding_matrix(conn, small.model_name)
+        assert len(matrix) == 3 and matrix.dimensions == 64
+        hits = matrix.top_k(small.embed("faiss vector search").vector, k=1)
+        assert hits[0].chunk_id == 1
+
+
+class TestArrayPipeline:
+    """Vectors stay float32 arrays from encoding through storage and scoring."""
+
+    def test_results_are_float32_arrays(self):
+        """embed, embed_batch and encode return arrays, not lists."""
+        service = EmbeddingService(backend="hashing:16")
+        single = service.embed("alpha beta").vector
+        batch = service.embed_batch(["alpha beta", "gamma"])
+        matrix = service.encode(["alpha beta", "gamma"])
+
+        assert isinstance(single, np.ndarray) and single.dtype == np.float32
+        assert np.array_equal(batch[0].vector, single)
+        assert matrix.shape == (2, 16) and np.array_equal(matrix[0], single)
+
+    def test_blob_round_trip(self):
+        """BLOB helpers are tobytes/frombuffer and accept lists."""
+        vector = np.array([0.5, -1.0, 2.0], dtype=np.float32)
+        blob = EmbeddingService.vector_to_blob(vector)
+
+        assert blob == vector.tobytes()
+        assert EmbeddingService.vector_to_blob([0.5, -1.0, 2.0]) == blob
+        assert np.array_equal(EmbeddingService.blob_to_vector(blob), vector)
+
+    def test_vector_search_scores_matrix(self, tmp_path):
+        """SearchService.vector_search ranks stored vectors by cosine."""
+        conn = sqlite3.connect(tmp_path / "src.db")
+        conn.row_factory = sqlite3.Row
+        conn.executescript(SRC_SCHEMA)
+        for i, vector in enumerate([[1, 0], [0, 1], [0.6, 0.8]]):
+            conn.execute(
+                "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+                "VALUES (?, 'adr', ?, '', ?, 'h')",
+                (f"doc-{i}", f"Doc {i}", f"/tmp/{i}.md"),
+            )
+            chunk_id = conn.execute(
+                "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, 0, 'x')",
+                (f"doc-{i}",),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO embeddings (chunk_id, vector, model, dimensions) "
+                "VALUES (?, ?, 'm', 2)",
+                (chunk_id, np.asarray(vector, dtype=np.float32).tobytes()),
+            )
+        conn.commit()
+
+        hits = SearchService(conn).vector_search(np.array([1.0, 0.0], dtype=np.float32), top_k=2)
+
+        assert [h.doc_id for h in hits] == ["doc-0", "doc-2"]
+        assert hits[1].score == pytest.approx(0.6)
+        assert SearchService(conn).vector_search([1.0, 0.0], model="other") == []
+        conn.close()
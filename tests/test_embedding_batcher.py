@@ -0,0 +1,61 @@
+"""Tests for the micro-batching embedding worker."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.embedding_batcher import EmbeddingBatcher
+
+
+class TestEmbeddingBatcher:
+    """Tests for EmbeddingBatcher."""
+
+    def test_concurrent_requests_share_batches(self):
+        """Requests queued together are encoded in one call, each getting its row."""
+        release = threading.Event()
+        sizes = []
+
+        def encode(texts):
+            release.wait(5)  # Hold the first batch so the rest pile up
+            sizes.append(len(texts))
+            return np.array([[len(t)] for t in texts], dtype=np.float32)
+
+        batcher = EmbeddingBatcher(encode, max_batch=16, max_wait_ms=1)
+        futures = [batcher.submit("x" * i) for i in range(1, 11)]
+        release.set()
+
+        assert [f.result(5)[0] for f in futures] == list(range(1, 11))
+        assert sum(sizes) == 10 and len(sizes) < 10
+        metrics = batcher.metrics()
+        assert metrics["requests"] == 10
+        assert metrics["batches"] == len(sizes)
+        assert metrics["queue_depth"] == 0
+
+    def test_errors_reach_every_caller(self):
+        """An encode failure is raised from each waiting future."""
+        def encode(texts):
+            raise RuntimeError("model unavailable")
+
+        batcher = EmbeddingBatcher(encode)
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            batcher.embed("q")
+
+    def test_short_encode_fails_every_caller(self):
+        """Too few rows back from encode fails the batch instead of leaving futures pending."""
+        batcher = EmbeddingBatcher(lambda texts: np.ones((len(texts) - 1, 2)), max_wait_ms=50)
+
+        futures = [batcher.submit(f"q{i}") for i in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError, match="returned shape"):
+                future.result(timeout=2)
+
+    async def test_embed_async(self):
+        """Awaiting callers are batched without blocking the loop."""
+        batcher = EmbeddingBatcher(lambda texts: np.ones((len(texts), 2)), max_wait_ms=20)
+
+        vectors = await asyncio.gather(*(batcher.embed_async(f"q{i}") for i in range(5)))
+
+        assert all(v.tolist() == [1.0, 1.0] for v in vectors)
+        assert batcher.metrics()["max_batch_size"] > 1
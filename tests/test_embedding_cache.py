@@ -0,0 +1,101 @@
+"""Tests for the content-addressed embedding cache."""
+
+import numpy as np
+from ai_dev_orchestrator.knowledge import embedding_cache
+from ai_dev_orchestrator.knowledge.embedding_backends import HashingBackend
+from ai_dev_orchestrator.knowledge.embedding_cache import EmbeddingCache, text_hash
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+
+
+def _encoder(calls):
+    """Deterministic encoder that records the texts it was asked to encode."""
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+    return encode
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache.encode."""
+
+    def test_encodes_each_text_once(self, tmp_path):
+        """Repeats within a call and across calls come from the cache."""
+        cache = EmbeddingCache(tmp_path / "cache.db")
+        calls = []
+
+        first = cache.encode("m", ["alpha", "beta", "alpha"], _encoder(calls))
+        second = cache.encode("m", ["beta", "gamma"], _encoder(calls))
+
+        assert calls == [["alpha", "beta"], ["gamma"]]
+        assert np.array_equal(first[0], first[2])
+        assert np.array_equal(first[1], second[0])
+        assert cache.stats() == {
+            "hits": 2, "misses": 3, "evictions": 0, "entries": 3, "max_entries": cache.max_entries
+        }
+
+    def test_key_includes_model_and_normalizes_whitespace(self, tmp_path):
+        """Same text under another model is a miss; whitespace variants hit."""
+        cache = EmbeddingCache(tmp_path / "cache.db")
+        calls = []
+        cache.encode("m1", ["some  text\n"], _encoder(calls))
+        cache.encode("m1", ["some text"], _encoder(calls))
+        cache.encode("m2", ["some text"], _encoder(calls))
+
+        assert calls == [["some  text\n"], ["some text"]]
+        assert text_hash("some  text\n") == text_hash("some text")
+
+    def test_persists_across_instances(self, tmp_path):
+        """Vectors survive reopening the cache database."""
+        EmbeddingCache(tmp_path / "cache.db").encode("m", ["alpha"], _encoder([]))
+        calls = []
+        vectors = EmbeddingCache(tmp_path / "cache.db").encode("m", ["alpha"], _encoder(calls))
+
+        assert calls == []
+        assert vectors.tolist() == [[5.0, 2.0, 1.0]]
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Past max_entries the oldest-used tenth goes; recent hits survive."""
+        clock = iter(range(1000))
+        monkeypatch.setattr(embedding_cache.time, "time", lambda: next(clock))
+        cache = EmbeddingCache(tmp_path / "cache.db", max_entries=10)
+        texts = [f"text {i}" for i in range(10)]
+        for text in texts:
+            cache.encode("m", [text], _encoder([]))
+        cache.encode("m", ["text 0"], _encoder([]))  # Now most recently used
+
+        cache.encode("m", ["text 10"], _encoder([]))
+
+        assert cache.stats()["entries"] == 9 and cache.evictions == 2
+        calls = []
+        cache.encode("m", ["text 0", "text 1", "text 2", "text 3"], _encoder(calls))
+        assert calls == [["text 1", "text 2"]]
+
+
+def test_cached_encode_can_be_disabled(monkeypatch):
+    """With the cache off every call reaches the encoder."""
+    monkeypatch.setenv("AIKH_EMBEDDING_CACHE", "off")
+    calls = []
+    embedding_cache.cached_encode("m", ["x"], _encoder(calls))
+    embedding_cache.cached_encode("m", ["x"], _encoder(calls))
+
+    assert calls == [["x"], ["x"]]
+
+
+def test_query_embeds_bypass_cache(tmp_path, monkeypatch):
+    """Single-text (query) embeds never grow the cache; batch encodes do."""
+    class CachedHashing(HashingBackend):
+        cacheable = True
+
+        @property
+        def name(self) -> str:
+            return "cached-hashing"
+
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    monkeypatch.setenv("AIKH_EMBEDDING_CACHE", "on")
+    monkeypatch.setattr(embedding_cache, "_cache", cache)
+    service = EmbeddingService(backend=CachedHashing(8))
+
+    service.embed("what changed in the sync service?")
+    assert cache.stats()["entries"] == 0
+    service.encode(["a document chunk"])
+    assert cache.stats()["entries"] == 1
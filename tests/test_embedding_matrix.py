@@ -0,0 +1,233 @@
+"""Tests for the resident knowledge embedding matrix."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge import backfill
+from backend.services.knowledge.database import SCHEMA
+from backend.services.knowledge import embedding_matrix
+from backend.services.knowledge.embedding_matrix import EmbeddingMatrix, get_embedding_matrix
+from backend.services.knowledge.embedding_service import EmbeddingService
+from backend.services.knowledge.search_service import SearchService
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Knowledge database with three documents and one chunk each."""
+    conn = sqlite3.connect(tmp_path / "knowledge.db")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    for i in range(3):
+        conn.execute(
+            "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+            "VALUES (?, 'adr', ?, ?, ?, 'h')",
+            (f"doc-{i}", f"Doc {i}", f"content {i}", f"/tmp/doc-{i}.md"),
+        )
+        conn.execute(
+            "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, 0, ?)",
+            (f"doc-{i}", f"chunk {i}"),
+        )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _add_embedding(conn, chunk_id: int, vector: list[float]):
+    vec = np.asarray(vector, dtype=np.float32)
+    conn.execute(
+        "INSERT INTO embeddings (chunk_id, vector, model, dimensions) VALUES (?, ?, 'test', ?)",
+        (chunk_id, vec.tobytes(), len(vec)),
+    )
+    conn.commit()
+
+
+class TestEmbeddingMatrix:
+    """Tests for EmbeddingMatrix refresh and top-k."""
+
+    def test_top_k_orders_by_cosine(self, conn):
+        """Best-matching chunk comes first."""
+        _add_embedding(conn, 1, [1, 0, 0])
+        _add_embedding(conn, 2, [0, 1, 0])
+        _add_embedding(conn, 3, [0.7, 0.7, 0])
+
+        matrix = EmbeddingMatrix()
+        matrix.refresh(conn)
+        hits = matrix.top_k([1, 0, 0], k=2)
+
+        assert [h.chunk_id for h in hits] == [1, 3]
+        assert hits[0].score == pytest.approx(1.0)
+
+    def test_refresh_is_incremental(self, conn):
+        """Only rows above the high-water mark are loaded again."""
+        _add_embedding(conn, 1, [1, 0, 0])
+        matrix = EmbeddingMatrix()
+        assert matrix.refresh(conn) == 1
+        assert matrix.refresh(conn) == 0
+
+        _add_embedding(conn, 2, [0, 1, 0])
+        assert matrix.refresh(conn) == 1
+        assert len(matrix) == 2
+
+    def test_refresh_reloads_after_delete(self, conn):
+        """Deleted embeddings disappear from the matrix."""
+        _add_embedding(conn, 1, [1, 0, 0])
+        _add_embedding(conn, 2, [0, 1, 0])
+        matrix = EmbeddingMatrix()
+        matrix.refresh(conn)
+
+        conn.execute("DELETE FROM embeddings WHERE chunk_id = 1")
+        conn.commit()
+        matrix.refresh(conn)
+
+        assert len(matrix) == 1
+        assert [h.chunk_id for h in matrix.top_k([1, 0, 0], k=5)] == [2]
+
+    def test_unchanged_database_is_not_scanned(self, conn, tmp_path):
+        """Refreshes without commits run no queries beyond data_version."""
+        _add_embedding(conn, 1, [1, 0, 0])
+        matrix = EmbeddingMatrix()
+        matrix.refresh(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        assert matrix.refresh(conn) == 0
+        assert statements == ["PRAGMA data_version"]
+
+        other = sqlite3.connect(tmp_path / "knowledge.db")
+        other.execute(
+            "INSERT INTO embeddings (chunk_id, vector, model, dimensions) VALUES (2, ?, 'test', 3)",
+            (np.array([0, 1, 0], dtype=np.float32).tobytes(),),
+        )
+        other.commit()
+        other.close()
+        assert matrix.refresh(conn) == 1
+
+    def test_search_chunks_skips_archived(self, conn):
+        """Archived documents are filtered during hydration."""
+        _add_embedding(conn, 1, [1, 0, 0])
+        _add_embedding(conn, 2, [0.9, 0.1, 0])
+        conn.execute("UPDATE documents SET archived_at = datetime('now') WHERE id = 'doc-0'")
+        conn.commit()
+
+        matrix = EmbeddingMatrix()
+        matrix.refresh(conn)
+        results = matrix.search_chunks(conn, [1, 0, 0], k=1)
+
+        assert [row['doc_id'] for _, row in results] == ["doc-1"]
+
+
+def test_vector_search_uses_matrix(conn):
+    """SearchService.vector_search returns hydrated hits."""
+    _add_embedding(conn, 1, [0, 0, 1])
+    _add_embedding(conn, 2, [0, 1, 0])
+
+    hits = SearchService(conn).vector_search([0, 1, 0], top_k=1)
+
+    assert len(hits) == 1
+    assert hits[0].doc_id == "doc-1"
+    assert hits[0].snippet == "chunk 1"
+
+
+def test_in_memory_databases_are_not_cached():
+    """Matrices over private in-memory databases never enter the registry."""
+    memory = sqlite3.connect(":memory:")
+    memory.executescript(SCHEMA)
+    before = dict(embedding_matrix._matrices)
+
+    first = get_embedding_matrix(memory)
+
+    assert get_embedding_matrix(memory) is not first
+    assert embedding_matrix._matrices == before
+    memory.close()
+
+
+class TestQuantizedMatrix:
+    """Tests for the int8 matrix mode."""
+
+    def test_matches_float_ranking(self, conn):
+        """int8 scoring plus float rerank keeps the exact ranking."""
+        rng = np.random.default_rng(0)
+        for chunk_id in (1, 2, 3):
+            _add_embedding(conn, chunk_id, rng.standard_normal(64))
+        query = rng.standard_normal(64)
+
+        exact = EmbeddingMatrix(quantized=False)
+        exact.refresh(conn)
+        quantized = EmbeddingMatrix(quantized=True)
+        quantized.refresh(conn)
+
+        expected = exact.top_k(query, k=3)
+        hits = quantized.top_k(query, k=3, conn=conn)
+        assert [h.chunk_id for h in hits] == [h.chunk_id for h in expected]
+        assert hits[0].score == pytest.approx(expected[0].score, abs=1e-5)
+
+    def test_codes_written_at_embedding_time(self, conn, monkeypatch):
+        """Embedding writes the codes; refresh only reads them."""
+        monkeypatch.setattr(backfill, "quantization_enabled", lambda: True)
+        EmbeddingService(backend="hashing:64").embed_all_chunks(conn)
+        assert conn.execute("SELECT COUNT(*) FROM embeddings_q8").fetchone()[0] == 3
+
+        matrix = EmbeddingMatrix(quantized=True)
+        changes = conn.total_changes
+        matrix.refresh(conn)
+        assert conn.total_changes == changes
+        assert len(matrix) == 3
+
+        conn.execute("DELETE FROM embeddings WHERE chunk_id = 1")
+        conn.commit()
+        assert conn.execute("SELECT COUNT(*) FROM embeddings_q8").fetchone()[0] == 2
+
+
+def test_search_chunks_batch_matches_single(conn):
+    """Batched search returns the per-query results in order."""
+    _add_embedding(conn, 1, [1, 0, 0])
+    _add_embedding(conn, 2, [0, 1, 0])
+    _add_embedding(conn, 3, [0, 0, 1])
+    matrix = EmbeddingMatrix()
+    matrix.refresh(conn)
+    queries = [[0, 1, 0.1], [0.9, 0, 0.2], [0, 0, 0]]
+
+    batch = matrix.search_chunks_batch(conn, queries, k=2)
+
+    assert [[row['chunk_id'] for _, row in hits] for hits in batch] == [
+        [row['chunk_id'] for _, row in matrix.search_chunks(conn, q, k=2)] for q in queries
+    ]
+    assert batch[2] == []
+
+
+class TestMatrixFilters:
+    """Tests for doc_type/archived row masks."""
+
+    def test_doc_type_and_archived_filters(self, conn):
+        """Filtered rows are never scored, so k matches still come back."""
+        conn.execute("UPDATE documents SET type = 'plan' WHERE id = 'doc-2'")
+        conn.execute("UPDATE documents SET archived_at = datetime('now') WHERE id = 'doc-0'")
+        conn.commit()
+        _add_embedding(conn, 1, [1, 0, 0])
+        _add_embedding(conn, 2, [0.9, 0.1, 0])
+        _add_embedding(conn, 3, [0.5, 0.5, 0])
+        matrix = EmbeddingMatrix()
+        matrix.refresh(conn)
+
+        plans = matrix.top_k([1, 0, 0], k=1, filters={"doc_type": "plan"})
+        assert [h.chunk_id for h in plans] == [3]
+        archived = matrix.top_k([1, 0, 0], k=3, filters={"archived": True})
+        assert [h.chunk_id for h in archived] == [1]
+        results = matrix.search_chunks(conn, [1, 0, 0], k=5, doc_types=["adr"])
+        assert [row['doc_id'] for _, row in results] == ["doc-1"]
+
+        conn.execute("UPDATE documents SET archived_at = NULL WHERE id = 'doc-0'")
+        conn.commit()
+        matrix.refresh(conn)
+        results = matrix.search_chunks(conn, [1, 0, 0], k=5, doc_types=["adr"])
+        assert [row['doc_id'] for _, row in results] == ["doc-0", "doc-1"]
+
+        conn.execute("UPDATE documents SET type = 'adr' WHERE id = 'doc-2'")
+        conn.commit()
+        matrix.refresh(conn)
+        assert matrix.top_k([1, 0, 0], k=1, filters={"doc_type": "plan"}) == []
+
+        with pytest.raises(ValueError):
+            matrix.top_k([1, 0, 0], k=1, filters={"status": "draft"})
@@ -0,0 +1,140 @@
+"""Tests for concurrent retrieval fan-out."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from ai_dev_orchestrator.knowledge import fanout
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+from backend.services.knowledge.database import SCHEMA
+from backend.services.knowledge.search_service import SearchService
+
+CHUNKS = [
+    ("ADR-1", "faiss vector index tuning"),
+    ("ADR-1", "gpu batch sizes for encoders"),
+    ("ADR-2", "faiss on disk with mmap"),
+    ("ADR-2", "vector columns in sqlite"),
+]
+
+
+def _populate(conn):
+    conn.executescript(SCHEMA)
+    for doc_id in ("ADR-1", "ADR-2"):
+        conn.execute(
+            "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+            "VALUES (?, 'adr', ?, '', ?, 'h')",
+            (doc_id, doc_id, f"/tmp/{doc_id}.md"),
+        )
+    for i, (doc_id, text) in enumerate(CHUNKS):
+        conn.execute(
+            "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)",
+            (doc_id, i, text),
+        )
+    conn.commit()
+    EmbeddingService(backend="hashing:64").embed_all_chunks(conn)
+
+
+class TestFanOut:
+    """Tests for fan_out and per-thread connections."""
+
+    def test_results_in_order_and_legs_overlap(self):
+        """Legs run concurrently; results keep argument order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def leg(value):
+            def run():
+                barrier.wait()  # Deadlocks unless all three run at once
+                return value
+            return run
+
+        assert fanout.fan_out(leg("a"), leg("b"), leg("c")) == ["a", "b", "c"]
+
+    def test_exceptions_propagate(self):
+        """A failing pooled leg raises in the caller."""
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            fanout.fan_out(lambda: 1, fail)
+
+    def test_nested_legs_run_inline(self):
+        """A leg that fans out again runs its sub-legs on its own thread."""
+        def outer():
+            return fanout.fan_out(threading.current_thread, threading.current_thread)
+
+        first, second = fanout.submit(outer).result()
+
+        assert first is second
+
+    def test_database_path(self, tmp_path):
+        """File databases report their path; in-memory ones report None."""
+        path = tmp_path / "k.db"
+        assert fanout.database_path(sqlite3.connect(path)) == str(path)
+        assert fanout.database_path(sqlite3.connect(":memory:")) is None
+
+    def test_thread_connection_is_per_thread(self, tmp_path):
+        """Each worker keeps its own cached connection."""
+        path = str(tmp_path / "k.db")
+        here = fanout.thread_connection(path)
+        there = fanout.submit(fanout.thread_connection, path).result()
+
+        assert fanout.thread_connection(path) is here
+        assert there is not here
+
+
+class TestGather:
+    """Tests for deadline-bounded gather."""
+
+    def test_late_and_failing_legs_are_dropped(self):
+        """Only legs done by their deadline are returned."""
+        def fail():
+            raise RuntimeError("store unavailable")
+
+        start = time.monotonic()
+        results = fanout.gather(
+            {"fast": lambda: 1, "slow": lambda: time.sleep(1.0), "broken": fail},
+            timeouts={"slow": 0.05},
+        )
+
+        assert results == {"fast": 1}
+        assert time.monotonic() - start < 0.5
+
+    def test_budget_caps_timeouts(self):
+        """The overall budget bounds legs with longer or no timeouts."""
+        start = time.monotonic()
+        results = fanout.gather(
+            {"a": lambda: time.sleep(1.0), "b": lambda: "b"},
+            timeouts={"a": 5.0},
+            budget=0.05,
+        )
+
+        assert results == {"b": "b"}
+        assert time.monotonic() - start < 0.5
+
+
+class TestConcurrentHybrid:
+    """Hybrid search gives the same ranking concurrently and sequentially."""
+
+    def test_file_and_memory_databases_agree(self, tmp_path):
+        """The pooled FTS leg ranks exactly like the in-thread one."""
+        file_conn = sqlite3.connect(tmp_path / "knowledge.db")
+        memory_conn = sqlite3.connect(":memory:")
+        for conn in (file_conn, memory_conn):
+            conn.row_factory = sqlite3.Row
+            _populate(conn)
+        service = EmbeddingService(backend="hashing:64")
+        query = "faiss vector"
+        vector = service.embed(query).vector
+
+        concurrent = SearchService(file_conn).hybrid_search(
+            query, vector, top_k=4, model=service.model_name
+        )
+        sequential = SearchService(memory_conn).hybrid_search(
+            query, vector, top_k=4, model=service.model_name
+        )
+
+        assert [(h.chunk_id, h.score) for h in concurrent] == [
+            (h.chunk_id, h.score) for h in sequential
+        ]
+        assert concurrent[0].snippet == "**faiss** **vector** index tuning"
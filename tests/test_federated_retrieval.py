@@ -0,0 +1,70 @@
+"""Tests for federated retrieval across stores."""
+
+import time
+
+from ai_dev_orchestrator.knowledge import chatlog_database
+from backend.services.federated_retrieval import (
+    FederatedHit,
+    FederatedRetriever,
+    Source,
+    search_chatlogs,
+)
+
+
+def _source(name, ids, delay=0.0, timeout=1.0):
+    """Source returning ``ids`` in order after ``delay`` seconds."""
+    def search(query, limit):
+        time.sleep(delay)
+        return [FederatedHit(name, i, i, f"{name} {i}") for i in ids[:limit]]
+    return Source(name, search, timeout=timeout)
+
+
+class TestFederatedRetriever:
+    """Tests for FederatedRetriever fan-out and fusion."""
+
+    def test_rank_fusion_across_sources(self):
+        """Top results of every source interleave by reciprocal rank."""
+        retriever = FederatedRetriever([
+            _source("knowledge", ["k1", "k2", "k3"]),
+            _source("memory", ["m1", "m2"]),
+        ])
+
+        hits = retriever.search("q", limit=4)
+
+        assert [h.source_id for h in hits] == ["k1", "m1", "k2", "m2"]
+        assert hits[0].score == hits[1].score > hits[2].score
+
+    def test_weights_and_source_selection(self):
+        """Weights tilt ties; unselected sources are not queried."""
+        heavy = _source("research", ["r1"])
+        heavy.weight = 2.0
+        retriever = FederatedRetriever([heavy, _source("chatlogs", ["c1"])])
+
+        assert [h.source_id for h in retriever.search("q")] == ["r1", "c1"]
+        assert [h.source_id for h in retriever.search("q", sources=["chatlogs"])] == ["c1"]
+
+    def test_slow_source_is_cut_off(self):
+        """A source past its timeout is left out instead of stalling the search."""
+        retriever = FederatedRetriever([
+            _source("knowledge", ["k1"]),
+            _source("research", ["r1"], delay=1.0, timeout=0.05),
+        ])
+
+        start = time.monotonic()
+        hits = retriever.search("q")
+
+        assert [h.source_id for h in hits] == ["k1"]
+        assert time.monotonic() - start < 0.5
+
+
+def test_chatlog_source_returns_turn_excerpts(tmp_path, monkeypatch):
+    """The chat leg returns matching turns with their log's title."""
+    monkeypatch.setenv("CHATLOG_DB_PATH", str(tmp_path / "chatlogs.db"))
+    chatlog_database.init_database()
+    log_id = chatlog_database.insert_chat_log("a.md", "a.md", "Queues", 1, None, 1, 1)
+    chatlog_database.insert_chat_turn(log_id, 0, "user", "kafka consumer lag alerts", 4)
+
+    hits = search_chatlogs("consumer lag", 5)
+
+    assert [(h.title, h.metadata["chat_log_id"]) for h in hits] == [("Queues", log_id)]
+    assert hits[0].content == "kafka consumer lag alerts"
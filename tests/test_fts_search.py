@@ -0,0 +1,220 @@
+"""Tests for ranked FTS5 search over the knowledge archive."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.database import SCHEMA as SRC_SCHEMA
+from ai_dev_orchestrator.knowledge.database import init_database
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+from ai_dev_orchestrator.knowledge.fts import build_match_query, search_chunks
+from ai_dev_orchestrator.knowledge.search_service import SearchService as SrcSearchService
+from backend.services.knowledge.database import SCHEMA
+from backend.services.knowledge.retrieval import KnowledgeRetriever, RetrievalResult
+from backend.services.knowledge.search_service import SearchService
+
+DOCUMENTS = [
+    ("ADR-1", "Vector search", "We use faiss for vector search over chunk embeddings."),
+    ("ADR-2", "Storage", "SQLite stores documents; vector columns hold embeddings."),
+    ("ADR-3", "Chat logs", "Chat turns are parsed and indexed for search later."),
+    ("ADR-4", "Embedding cache", "Embeddings are cached by content hash."),
+]
+
+LEGACY_FTS = """
+CREATE VIRTUAL TABLE content_fts USING fts5(
+    title, content, doc_id UNINDEXED, content='documents', content_rowid='rowid'
+);
+CREATE TRIGGER documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO content_fts(rowid, title, content, doc_id)
+    VALUES (new.rowid, new.title, new.content, new.id);
+END;
+"""
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Knowledge database with a handful of documents."""
+    conn = sqlite3.connect(tmp_path / "knowledge.db")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    for doc_id, title, content in DOCUMENTS:
+        conn.execute(
+            "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+            "VALUES (?, 'adr', ?, ?, ?, 'h')",
+            (doc_id, title, content, f"/tmp/{doc_id}.md"),
+        )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _add_chunks(conn, doc_id, *texts):
+    """Insert chunks for ``doc_id``; returns their ids."""
+    return [
+        conn.execute(
+            "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)",
+            (doc_id, i, text),
+        ).lastrowid
+        for i, text in enumerate(texts)
+    ]
+
+
+class TestBuildMatchQuery:
+    """Tests for the safe query parser."""
+
+    def test_terms_phrases_and_prefixes(self):
+        """Words, quoted phrases and trailing stars map to FTS5 syntax."""
+        query = build_match_query('sqlite "vector  search" embed* sqlite')
+
+        assert query == '"sqlite" OR "vector search" OR "embed"*'
+
+    @pytest.mark.parametrize("text", [
+        "NEAR(a b)", "title:foo", "^start", "a AND OR NOT", '"unterminated', "(x) - y",
+    ])
+    def test_operators_are_literal(self, text, conn):
+        """FTS5 syntax in user input never reaches the parser unquoted."""
+        query = build_match_query(text)
+
+        assert query
+        conn.execute("SELECT rowid FROM content_fts WHERE content_fts MATCH ?", (query,))
+
+    def test_no_words(self):
+        """Punctuation-only input yields no query."""
+        assert build_match_query('*** "" ()') == ""
+
+
+class TestFtsSearch:
+    """Tests for SearchService.fts_search."""
+
+    def test_ranked_by_bm25(self, conn):
+        """Title matches outrank body matches and scores are distinct."""
+        hits = SearchService(conn).fts_search("vector")
+
+        assert [h.doc_id for h in hits] == ["ADR-1", "ADR-2"]
+        assert hits[0].score > hits[1].score > 0
+        assert "**vector**" in hits[0].snippet.lower()
+
+    def test_phrase_and_prefix(self, conn):
+        """Phrases require adjacency; prefixes match word stems."""
+        service = SearchService(conn)
+
+        assert [h.doc_id for h in service.fts_search('"vector search"')] == ["ADR-1"]
+        assert {h.doc_id for h in service.fts_search("embed*")} == {"ADR-1", "ADR-2", "ADR-4"}
+
+    def test_archived_and_updated_documents(self, conn):
+        """Archived documents drop out and edits are searchable at once."""
+        conn.execute("UPDATE documents SET archived_at = datetime('now') WHERE id = 'ADR-1'")
+        conn.execute("UPDATE documents SET content = 'faiss notes' WHERE id = 'ADR-3'")
+        conn.commit()
+        service = SearchService(conn)
+
+        assert [h.doc_id for h in service.fts_search("faiss")] == ["ADR-3"]
+        assert service.fts_search("parsed") == []
+
+    def test_src_service_matches_backend(self, tmp_path):
+        """The src SearchService uses the same ranked query."""
+        conn = sqlite3.connect(tmp_path / "src.db")
+        conn.executescript(SRC_SCHEMA)
+        for doc_id, title, content in DOCUMENTS:
+            conn.execute(
+                "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+                "VALUES (?, 'adr', ?, ?, ?, 'h')",
+                (doc_id, title, content, f"/tmp/{doc_id}.md"),
+            )
+        conn.commit()
+
+        hits = SrcSearchService(conn).fts_search("vector")
+
+        assert [h.doc_id for h in hits] == ["ADR-1", "ADR-2"]
+        conn.close()
+
+
+class TestChunkIndex:
+    """Tests for the trigger-maintained chunks_fts index."""
+
+    def test_triggers_track_chunk_changes(self, conn):
+        """Inserts, edits and deletes are visible to the next query."""
+        first, second = _add_chunks(conn, "ADR-1", "faiss index notes", "sqlite wal mode")
+        conn.commit()
+
+        assert [m.chunk_id for m in search_chunks(conn, "faiss")] == [first]
+
+        conn.execute("UPDATE chunks SET content = 'hnsw graphs' WHERE id = ?", (first,))
+        conn.execute("DELETE FROM chunks WHERE id = ?", (second,))
+        conn.commit()
+
+        assert search_chunks(conn, "faiss") == []
+        assert search_chunks(conn, "wal") == []
+        assert search_chunks(conn, "hnsw")[0].chunk_index == 0
+
+    def test_doc_type_and_archive_filters(self, conn):
+        """Chunks of archived or excluded document types are skipped."""
+        _add_chunks(conn, "ADR-1", "shared term")
+        _add_chunks(conn, "ADR-2", "shared term")
+        conn.execute("UPDATE documents SET type = 'spec' WHERE id = 'ADR-2'")
+        conn.commit()
+
+        assert {m.doc_id for m in search_chunks(conn, "shared")} == {"ADR-1", "ADR-2"}
+        assert [m.doc_id for m in search_chunks(conn, "shared", doc_types=["spec"])] == ["ADR-2"]
+        conn.execute("UPDATE documents SET archived_at = datetime('now') WHERE id = 'ADR-2'")
+        conn.commit()
+        assert [m.doc_id for m in search_chunks(conn, "shared")] == ["ADR-1"]
+
+    def test_hybrid_fuses_chunks(self, conn):
+        """Both legs rank chunks, so a chunk found by both comes first."""
+        _add_chunks(conn, "ADR-1", "gpu batch sizes for encoders", "faiss vector index tuning")
+        _add_chunks(conn, "ADR-2", "faiss on disk", "wal checkpoints")
+        conn.commit()
+        service = EmbeddingService(backend="hashing:64")
+        service.embed_all_chunks(conn)
+        query = "faiss vector index"
+
+        hits = SearchService(conn).hybrid_search(
+            query, service.embed(query).vector, top_k=3, model=service.model_name
+        )
+
+        assert hits[0].doc_id == "ADR-1"
+        assert hits[0].snippet == "**faiss** **vector** **index** tuning"
+        assert len({h.chunk_id for h in hits}) == len(hits) == 3
+        assert hits[0].score > hits[1].score
+
+    def test_retriever_hybrid_fuses_by_rank(self, monkeypatch):
+        """BM25 magnitudes cannot drown out the semantic leg."""
+        retriever = KnowledgeRetriever()
+        semantic = [RetrievalResult("ADR-1", "adr", "A", "a", 0.9, 0),
+                    RetrievalResult("ADR-2", "adr", "B", "b", 0.8, 0)]
+        fulltext = [RetrievalResult("ADR-3", "adr", "C", "c", 26.0, 0),
+                    RetrievalResult("ADR-2", "adr", "B", "b", 20.0, 0)]
+        monkeypatch.setattr(retriever, "search_semantic", lambda q, limit, query_vector: semantic)
+        monkeypatch.setattr(retriever, "search_fulltext", lambda q, limit: fulltext)
+
+        hits = retriever.search_hybrid("q", limit=3, query_vector=np.zeros(3))
+
+        assert [h.doc_id for h in hits] == ["ADR-2", "ADR-1", "ADR-3"]
+        assert all(h.score < 1 for h in hits)
+
+
+class TestLegacyIndex:
+    """Databases created with the old ``doc_id`` FTS column."""
+
+    def test_init_database_rebuilds_index(self, tmp_path):
+        """init_database replaces the legacy index and indexes existing chunks."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(SRC_SCHEMA.split("-- FTS5")[0] + LEGACY_FTS)
+        conn.execute(
+            "INSERT INTO documents (id, type, title, content, file_path, file_hash) "
+            "VALUES ('ADR-1', 'adr', 'Vector search', 'faiss', '/tmp/a.md', 'h')"
+        )
+        _add_chunks(conn, "ADR-1", "faiss")
+        conn.commit()
+        conn.close()
+
+        conn = init_database(path)
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(content_fts)")]
+        hits = SrcSearchService(conn).fts_search("faiss")
+
+        assert "doc_id" not in columns
+        assert [h.doc_id for h in hits] == ["ADR-1"] and hits[0].score > 0
+        assert [h.doc_id for h in SrcSearchService(conn).chunk_search("faiss")] == ["ADR-1"]
+        conn.close()
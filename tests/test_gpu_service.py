@@ -0,0 +1,206 @@
+"""Tests for the resident paper matrix behind GPUSearchService."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.paper_matrix import PaperMatrix
+from ai_dev_orchestrator.knowledge.quantization import sync_quantized
+from ai_dev_orchestrator.knowledge.research_database import RESEARCH_SCHEMA
+from backend.services import gpu_service
+from backend.services.gpu_service import (
+    GPU_EMBEDDINGS_SCHEMA,
+    GPUSearchService,
+    gpu_source,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Research database with three papers, one chunk each, and GPU embeddings."""
+    path = tmp_path / "research.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(RESEARCH_SCHEMA)
+    conn.executescript(GPU_EMBEDDINGS_SCHEMA)
+    vectors = [[1, 0, 0], [0, 1, 0], [0.7, 0.7, 0]]
+    for i, vec in enumerate(vectors):
+        blob = np.asarray(vec, dtype=np.float32).tobytes()
+        conn.execute(
+            "INSERT INTO research_papers (id, title, authors, abstract, source_path, content_hash) "
+            "VALUES (?, ?, '[]', ?, ?, ?)",
+            (f"p{i}", f"Paper {i}", f"abstract {i}", f"/tmp/p{i}.pdf", f"h{i}"),
+        )
+        chunk_id = conn.execute(
+            "INSERT INTO paper_chunks (paper_id, chunk_index, content) VALUES (?, 0, ?)",
+            (f"p{i}", "x" * 600),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO paper_embeddings_gpu "
+            "(paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim) "
+            "VALUES (?, NULL, 'paper', 'test', ?, 3)",
+            (f"p{i}", blob),
+        )
+        conn.execute(
+            "INSERT INTO paper_embeddings_gpu "
+            "(paper_id, chunk_id, embedding_type, model_name, embedding, embedding_dim) "
+            "VALUES (?, ?, 'chunk', 'test', ?, 3)",
+            (f"p{i}", chunk_id, blob),
+        )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def service(db_path, monkeypatch):
+    """GPUSearchService on the test database with a fixed query vector."""
+    service = GPUSearchService(db_path=db_path)
+    monkeypatch.setattr(service, "encode_query", lambda q: np.array([1, 0, 0], dtype=np.float32))
+    return service
+
+
+class TestGPUPaperMatrix:
+    """Tests for PaperMatrix refresh and top-k over paper_embeddings_gpu."""
+
+    def test_refresh_and_top_k(self, db_path):
+        """Rows load incrementally and reload after a replace."""
+        conn = sqlite3.connect(db_path)
+        matrix = PaperMatrix(gpu_source("paper"))
+        assert matrix.refresh(conn) == 3
+        assert matrix.refresh(conn) == 0
+        assert [h[0] for h in matrix.top_k([1, 0, 0], k=2)] == ["p0", "p2"]
+
+        conn.execute(
+            "DELETE FROM paper_embeddings_gpu WHERE paper_id = 'p0' AND embedding_type = 'paper'"
+        )
+        conn.commit()
+        matrix.refresh(conn)
+        assert len(matrix) == 2
+        assert [h[0] for h in matrix.top_k([1, 0, 0], k=5)] == ["p2", "p1"]
+        conn.close()
+
+    def test_quantized_matches_float(self, db_path):
+        """int8 codes plus a float rerank keep exact similarities, read-only."""
+        conn = sqlite3.connect(db_path)
+        sync_quantized(conn, "paper_embeddings_gpu", "embedding")
+        exact = PaperMatrix(gpu_source("paper"), quantized=False)
+        exact.refresh(conn)
+        quantized = PaperMatrix(gpu_source("paper"), quantized=True)
+        changes = conn.total_changes
+        quantized.refresh(conn)
+
+        assert conn.total_changes == changes
+        hits = quantized.top_k([1, 0.2, 0], k=3, conn=conn)
+        expected = exact.top_k([1, 0.2, 0], k=3)
+        assert [h[0] for h in hits] == [h[0] for h in expected] == ["p0", "p2", "p1"]
+        assert [h[2] for h in hits] == pytest.approx([h[2] for h in expected])
+        conn.close()
+
+    def test_rerank_reads_in_batches(self, db_path):
+        """A shortlist longer than HYDRATE_BATCH is re-ranked across several reads."""
+        conn = sqlite3.connect(db_path)
+        matrix = PaperMatrix(gpu_source("paper"), quantized=True)
+        matrix.HYDRATE_BATCH = 2
+        matrix.refresh(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        hits = matrix.top_k([1, 0.2, 0], k=3, conn=conn)
+
+        assert [h[0] for h in hits] == ["p0", "p2", "p1"]
+        assert sum("WHERE id IN" in s for s in statements) == 2
+        conn.close()
+
+    def test_category_and_chunk_type_masks(self, db_path):
+        """Filtered rows are never scored; category changes are picked up."""
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE paper_chunks SET chunk_type = 'abstract' WHERE paper_id = 'p1'")
+        conn.executemany(
+            "INSERT INTO paper_categories (paper_id, category) VALUES (?, 'ml')", [("p1",), ("p2",)]
+        )
+        conn.commit()
+        matrix = PaperMatrix(gpu_source("chunk"))
+        matrix.refresh(conn)
+
+        assert [h[0] for h in matrix.top_k([1, 0, 0], k=1, filters={"category": "ml"})] == ["p2"]
+        abstracts = matrix.top_k([1, 0, 0], k=3, filters={"chunk_type": ["abstract"]})
+        assert [h[0] for h in abstracts] == ["p1"]
+        both = matrix.top_k([1, 0, 0], k=3, filters={"category": "ml", "chunk_type": "text"})
+        assert [h[0] for h in both] == ["p2"]
+
+        conn.execute("DELETE FROM paper_categories WHERE paper_id = 'p2'")
+        conn.commit()
+        matrix.refresh(conn)
+        assert [h[0] for h in matrix.top_k([1, 0, 0], k=3, filters={"category": "ml"})] == ["p1"]
+
+        with pytest.raises(ValueError):
+            matrix.top_k([1, 0, 0], k=1, filters={"venue": "x"})
+        conn.close()
+
+
+class TestGPUSearchService:
+    """Tests for late-materialized GPU searches."""
+
+    def test_search_papers_hydrates_top_k(self, service):
+        """Only winners are returned, with title and abstract."""
+        results = service.semantic_search_papers("q", top_k=2)
+
+        assert [r.paper_id for r in results] == ["p0", "p2"]
+        assert results[0].abstract == "abstract 0"
+        assert results[0].similarity == pytest.approx(1.0)
+
+    def test_search_chunks_truncates_content(self, service):
+        """Chunk text is cut to 500 characters and threshold applies."""
+        results = service.semantic_search_chunks("q", top_k=5, min_similarity=0.5)
+
+        assert [r.paper_id for r in results] == ["p0", "p2"]
+        assert len(results[0].chunk_content) == 500
+
+    def test_search_filters(self, service, db_path):
+        """Category and chunk type filters still return hits below the unfiltered top-k."""
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE paper_chunks SET chunk_type = 'abstract' WHERE paper_id = 'p1'")
+        conn.execute("INSERT INTO paper_categories (paper_id, category) VALUES ('p1', 'ml')")
+        conn.commit()
+        conn.close()
+
+        papers = service.semantic_search_papers("q", top_k=1, min_similarity=-1, category="ml")
+        chunks = service.semantic_search_chunks(
+            "q", top_k=1, min_similarity=-1, chunk_type="abstract"
+        )
+
+        assert [r.paper_id for r in papers] == ["p1"]
+        assert [r.paper_id for r in chunks] == ["p1"]
+
+    def test_hybrid_encodes_once(self, service, monkeypatch):
+        """Hybrid search reuses one query embedding for both legs."""
+        calls = []
+        monkeypatch.setattr(
+            service, "encode_query",
+            lambda q: calls.append(q) or np.array([1, 0, 0], dtype=np.float32),
+        )
+
+        results = service.hybrid_search("q", top_k=2)
+
+        assert calls == ["q"]
+        assert results[0].paper_id == "p0"
+
+    def test_embed_new_paper_stores_codes(self, service, db_path, monkeypatch):
+        """The embedding and its int8 codes land in one commit."""
+        monkeypatch.setattr(gpu_service, "quantization_enabled", lambda: True)
+        monkeypatch.setattr(GPUSearchService, "_embedding_dim", 3)
+        conn = sqlite3.connect(db_path)
+        # embed_new_paper reads full_text, which RESEARCH_SCHEMA does not define
+        conn.execute("ALTER TABLE research_papers ADD COLUMN full_text TEXT")
+        conn.commit()
+
+        assert service.embed_new_paper("p1")
+
+        (codes,) = conn.execute("""
+            SELECT q.codes FROM paper_embeddings_gpu t
+            LEFT JOIN paper_embeddings_gpu_q8 q ON q.id = t.id
+            WHERE t.paper_id = 'p1' AND t.embedding_type = 'paper'
+            ORDER BY t.id DESC LIMIT 1
+        """).fetchone()
+        conn.close()
+        assert codes is not None
@@ -0,0 +1,52 @@
+"""Tests for the /api/knowledge/search file scan cache."""
+
+import sqlite3
+
+import pytest
+from backend import main
+from backend.services.cache_service import query_cache
+from backend.services.knowledge.archive_service import ArchiveService
+from backend.services.knowledge.database import SCHEMA
+from contracts.knowledge.archive import Document, DocumentType
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Record file scans instead of reading the workspace."""
+    calls = []
+
+    def scan(q):
+        calls.append(q)
+        return [{"file": f".adrs/{q}.md", "snippet": q}]
+
+    monkeypatch.setattr(main, "_scan_knowledge_files", scan)
+    query_cache.invalidate_prefix("knowledge:files:")
+    yield calls
+    query_cache.invalidate_prefix("knowledge:files:")
+
+
+async def test_scan_cached_by_exact_query(scans):
+    """Repeats (in any case) reuse the scan; other queries never see its files."""
+    first = await main.search_knowledge("Sync")
+    again = await main.search_knowledge("sync")
+    other = await main.search_knowledge("syncing")
+
+    assert scans == ["Sync", "syncing"]
+    assert again["results"] == first["results"]
+    assert other["results"] == [{"file": ".adrs/syncing.md", "snippet": "syncing"}]
+
+
+async def test_document_sync_invalidates(scans, tmp_path):
+    """Upserting a document drops cached scans."""
+    conn = sqlite3.connect(tmp_path / "knowledge.db")
+    conn.executescript(SCHEMA)
+
+    await main.search_knowledge("sync")
+    ArchiveService(conn).upsert_document(Document(
+        id="ADR-1", type=DocumentType.ADR, title="Sync", content="sync",
+        file_path="/tmp/ADR-1.md", file_hash="h",
+    ))
+    await main.search_knowledge("sync")
+
+    assert scans == ["sync", "sync"]
+    conn.close()
@@ -0,0 +1,98 @@
+"""Tests for batched, cached and budgeted LLM re-ranking."""
+
+import threading
+import time
+
+import pytest
+from backend.services import llm_service
+from backend.services.cache_service import SQLiteCache
+from backend.services.knowledge import enhanced_rag
+from backend.services.knowledge.enhanced_rag import rerank_with_llm
+from backend.services.knowledge.search_service import SearchHit
+
+
+def _hits(n):
+    return [SearchHit(f"ADR-{i}", f"Doc {i}", f"chunk {i}", 1.0 - i / 100, "adr") for i in range(n)]
+
+
+class FakeLLM:
+    """Scores each document by its number; records calls."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+        self.threads = set()
+
+    def __call__(self, prompt, schema, system_prompt=None):
+        self.prompts.append(prompt)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        lines = [line for line in prompt.splitlines() if line.startswith("[")]
+        rankings = [
+            {"index": i, "score": float(line.split("Doc ")[1].split(":")[0]), "reason": "r"}
+            for i, line in enumerate(lines)
+        ]
+        return llm_service.LLMResponse(success=True, data={"rankings": rankings})
+
+
+@pytest.fixture
+def llm(monkeypatch, tmp_path):
+    """Fake LLM and a throwaway persistent cache."""
+    fake = FakeLLM()
+    monkeypatch.setattr(llm_service, "generate_structured", fake)
+    monkeypatch.setattr(llm_service, "is_available", lambda: True)
+    monkeypatch.setattr(enhanced_rag, "persistent_cache", SQLiteCache(tmp_path / "cache.db"))
+    return fake
+
+
+class TestRerankWithLLM:
+    """Tests for rerank_with_llm."""
+
+    def test_batches_scored_in_parallel(self, llm):
+        """Candidates are split into batches, each its own concurrent call."""
+        llm.delay = 0.1
+        start = time.monotonic()
+        ranked = rerank_with_llm("sync", _hits(12), top_k=3, batch_size=4)
+
+        assert len(llm.prompts) == 3 and len(llm.threads) == 3
+        assert all(name.startswith("rerank") for name in llm.threads)
+        assert time.monotonic() - start < 0.25
+        assert [r.hit.doc_id for r in ranked] == ["ADR-11", "ADR-10", "ADR-9"]
+
+    def test_cached_scores_skip_the_llm(self, llm, monkeypatch):
+        """Only unseen candidates are sent again; a new model re-scores."""
+        rerank_with_llm("sync", _hits(5))
+        ranked = rerank_with_llm("sync", _hits(7))
+
+        assert len(llm.prompts) == 2 and "Doc 0" not in llm.prompts[1]
+        assert ranked[0].hit.doc_id == "ADR-6" and ranked[0].relevance_reason == "r"
+
+        monkeypatch.setattr(llm_service, "get_current_model", lambda: "other-model")
+        rerank_with_llm("sync", _hits(5))
+        assert len(llm.prompts) == 3
+
+    def test_budget_exceeded_keeps_first_stage_order(self, llm):
+        """A slow LLM falls back to the original ranking."""
+        llm.delay = 0.5
+        start = time.monotonic()
+        ranked = rerank_with_llm("sync", _hits(6), top_k=3, budget=0.05)
+
+        assert time.monotonic() - start < 0.3
+        assert [r.relevance_reason for r in ranked] == ["Original score"] * 3
+        assert [r.hit.doc_id for r in ranked] == ["ADR-0", "ADR-1", "ADR-2"]
+
+
+def test_cache_batch_reads_do_not_write(tmp_path):
+    """get_many hits are counted in memory and written with the next write."""
+    cache = SQLiteCache(tmp_path / "cache.db")
+    cache.set_many({"a": 1, "b": 2})
+    observer = cache._get_conn()
+    version = observer.execute("PRAGMA data_version").fetchone()[0]
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    cache.get_many(["a"])
+
+    # data_version moves when another connection commits
+    assert observer.execute("PRAGMA data_version").fetchone()[0] == version
+    observer.close()
+    assert cache.stats()["total_hits"] == 3
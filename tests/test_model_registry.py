@@ -0,0 +1,65 @@
+"""Tests for the process-wide embedding model registry."""
+
+import sys
+import threading
+import types
+
+import pytest
+from ai_dev_orchestrator.knowledge import model_registry
+
+
+@pytest.fixture
+def fake_sbert(monkeypatch):
+    """sentence_transformers stand-in that counts constructions."""
+    created = []
+
+    class SentenceTransformer:
+        def __init__(self, name, device=None):
+            created.append((name, device))
+
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = SentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setattr(model_registry, "_models", {})
+    monkeypatch.setattr(model_registry, "_load_locks", {})
+    monkeypatch.setattr(model_registry, "default_device", lambda: "cpu")
+    return created
+
+
+class TestModelRegistry:
+    """Tests for get_model and warmup."""
+
+    def test_concurrent_callers_share_one_load(self, fake_sbert):
+        """Many threads asking for one model construct it once."""
+        models = []
+        threads = [
+            threading.Thread(target=lambda: models.append(model_registry.get_model("m")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert fake_sbert == [("m", "cpu")]
+        assert all(m is models[0] for m in models)
+        assert model_registry.get_model("m", device="cpu") is models[0]
+
+    def test_warmup_loads_in_background(self, fake_sbert):
+        """Warmup loads the requested models on its own thread."""
+        model_registry.warmup(["a", "b"]).join()
+
+        assert model_registry.is_loaded("a") and model_registry.is_loaded("b")
+        assert sorted(model_registry.loaded_models()) == [("a", "cpu"), ("b", "cpu")]
+
+    def test_services_share_registry_model(self, fake_sbert):
+        """Separate EmbeddingService instances get the same model object."""
+        from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+
+        first = EmbeddingService(backend="sentence-transformers")
+        second = EmbeddingService(backend="sentence-transformers")
+        first.backend.load()
+        second.backend.load()
+
+        assert first.backend.model is second.backend.model
+        assert len(fake_sbert) == 1
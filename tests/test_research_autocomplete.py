@@ -0,0 +1,150 @@
+"""Tests for the in-memory research autocomplete index."""
+
+import sqlite3
+
+import pytest
+from backend.services.research_autocomplete import AutocompleteIndex, split_authors
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """research.db with two papers and a few concepts."""
+    path = tmp_path / "research.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE research_papers (
+            id TEXT PRIMARY KEY, title TEXT, authors TEXT, arxiv_id TEXT
+        );
+        CREATE TABLE extracted_concepts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            paper_id TEXT NOT NULL, concept TEXT NOT NULL, concept_type TEXT NOT NULL,
+            normalized_concept TEXT, frequency INTEGER DEFAULT 1,
+            UNIQUE(paper_id, concept, concept_type)
+        );
+        INSERT INTO research_papers VALUES
+            ('p1', 'Attention Is All You Need', 'Ashish Vaswani, Noam Shazeer', '1706.03762'),
+            ('p2', 'Retrieval-Augmented Generation', '["Patrick Lewis", "Ethan Perez"]', NULL);
+        INSERT INTO extracted_concepts
+            (paper_id, concept, concept_type, normalized_concept, frequency)
+        VALUES ('p1', 'Transformer', 'architecture', 'transformer', 3),
+               ('p2', 'Transformer', 'architecture', 'transformer', 2),
+               ('p2', 'Tree search', 'method', 'tree search', 9);
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _index(path):
+    def connect():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        return conn
+    return AutocompleteIndex(connect, refresh_interval=3600)
+
+
+def _values(results):
+    return [r["value"] for r in results]
+
+
+class TestAutocompleteIndex:
+    """Tests for AutocompleteIndex lookups and refreshes."""
+
+    def test_word_start_prefixes(self, db_path):
+        """Prefixes match the start of any word, case-insensitively."""
+        index = _index(db_path)
+
+        assert _values(index.search("att", "paper")) == ["p1"]
+        assert _values(index.search("ALL Y", "paper")) == ["p1"]
+        assert _values(index.search("aug", "paper")) == ["p2"]
+        assert index.search("ttention", "paper") == []
+
+    def test_concepts_rank_by_frequency_and_authors_split(self, db_path):
+        """Concepts are ordered by total frequency; authors are individual names."""
+        index = _index(db_path)
+
+        concepts = index.search("tr", "concept")
+        assert _values(concepts) == ["tree search", "transformer"]
+        assert concepts[1]["metadata"] == {"frequency": 5, "concept_type": "architecture"}
+        assert _values(index.search("per", "author")) == ["Ethan Perez"]
+        assert _values(index.search("noam", "author")) == ["Noam Shazeer"]
+
+    def test_incremental_refresh(self, db_path):
+        """New papers and replaced concept rows appear after a refresh."""
+        index = _index(db_path)
+        assert index.search("diffusion") == []
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT INTO research_papers VALUES ('p3', 'Diffusion Models', 'Jonathan Ho', NULL)"
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO extracted_concepts "
+            "(paper_id, concept, concept_type, normalized_concept, frequency) "
+            "VALUES ('p1', 'Transformer', 'architecture', 'transformer', 10)"
+        )
+        conn.commit()
+        conn.close()
+
+        assert index.search("diffusion") == []  # Throttled
+        index.refresh(force=True)
+
+        assert _values(index.search("diffusion")) == ["p3"]
+        assert _values(index.search("ho", "author")) == ["Jonathan Ho"]
+        assert index.search("transformer", "concept")[0]["metadata"]["frequency"] == 12
+
+    def test_deletes_trigger_rebuild(self, db_path):
+        """Removed papers disappear after the next refresh."""
+        index = _index(db_path)
+        assert _values(index.search("attention")) == ["p1"]
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM research_papers WHERE id = 'p1'")
+        conn.commit()
+        conn.close()
+        index.refresh(force=True)
+
+        assert index.search("attention", "paper") == []
+        assert index.search("vaswani", "author") == []
+
+    def test_reingested_paper_is_rekeyed(self, db_path):
+        """A paper replaced under a new rowid is found by its new title and authors only."""
+        index = _index(db_path)
+        assert _values(index.search("attention", "paper")) == ["p1"]
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO research_papers VALUES "
+            "('p1', 'Transformers Revisited', 'Ashish Vaswani, Jakob Uszkoreit', NULL)"
+        )
+        conn.commit()
+        conn.close()
+        index.refresh(force=True)
+
+        assert index.search("attention", "paper") == []
+        assert _values(index.search("revis", "paper")) == ["p1"]
+        assert index.search("noam", "author") == []
+        assert index.search("vaswani", "author")[0]["metadata"] == {"papers": 1}
+        assert _values(index.search("jakob", "author")) == ["Jakob Uszkoreit"]
+
+    def test_concept_deletes_and_frequency_drops(self, db_path):
+        """Concept changes that add no rows are picked up by re-aggregation."""
+        index = _index(db_path)
+        assert _values(index.search("tree", "concept")) == ["tree search"]
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM extracted_concepts WHERE normalized_concept = 'tree search'")
+        conn.execute("UPDATE extracted_concepts SET frequency = 1 WHERE paper_id = 'p1'")
+        conn.commit()
+        conn.close()
+        index.refresh(force=True)
+
+        assert index.search("tree", "concept") == []
+        assert index.search("transformer", "concept")[0]["metadata"]["frequency"] == 3
+
+
+def test_split_authors():
+    """JSON arrays and separated strings are both accepted."""
+    assert split_authors('["A B", "C D"]') == ["A B", "C D"]
+    assert split_authors("A B, C D and E F") == ["A B", "C D", "E F"]
+    assert split_authors(None) == []
@@ -0,0 +1,59 @@
+"""Tests for semantic search over research papers."""
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+from ai_dev_orchestrator.knowledge.research_database import init_research_database
+from ai_dev_orchestrator.knowledge.research_rag import ResearchRAGService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Research RAG service over two papers with one embedded chunk each."""
+    db_path = tmp_path / "research.db"
+    conn = init_research_database(db_path)
+    embedder = EmbeddingService(backend="hashing:64")
+    for i, text in enumerate(["vector search with int8 codes", "vector search on gpus"]):
+        conn.execute(
+            "INSERT INTO research_papers (id, title, authors, source_path, content_hash) "
+            "VALUES (?, ?, '[]', ?, ?)",
+            (f"p{i}", f"Paper {i}", f"/tmp/p{i}.pdf", f"h{i}"),
+        )
+        chunk_id = conn.execute(
+            "INSERT INTO paper_chunks (paper_id, chunk_index, content) VALUES (?, 0, ?)",
+            (f"p{i}", text),
+        ).lastrowid
+        vector = np.asarray(embedder.embed(text).vector, dtype=np.float32)
+        conn.execute(
+            "INSERT INTO paper_embeddings (chunk_id, vector, model, dimensions) "
+            "VALUES (?, ?, ?, ?)",
+            (chunk_id, vector.tobytes(), embedder.model_name, len(vector)),
+        )
+    conn.execute("INSERT INTO paper_categories (paper_id, category) VALUES ('p1', 'systems')")
+    conn.commit()
+    conn.close()
+
+    service = ResearchRAGService(db_path)
+    service.embedding_service = embedder
+    yield service
+    service.close()
+
+
+class TestSearchPapersSemantic:
+    """Tests for ResearchRAGService.search_papers_semantic."""
+
+    def test_ranks_and_hydrates_chunks(self, service):
+        """The closest chunk comes first, with its paper's metadata."""
+        hits = service.search_papers_semantic("vector search with int8 codes", min_score=-1)
+
+        assert [h.paper_id for h in hits] == ["p0", "p1"]
+        assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+        assert hits[1].categories == ["systems"]
+
+    def test_category_filter_masks_rows(self, service):
+        """A category filter still fills the limit from matching papers only."""
+        hits = service.search_papers_semantic(
+            "vector search with int8 codes", limit=1, category_filter="systems", min_score=-1
+        )
+
+        assert [h.paper_id for h in hits] == ["p1"]
@@ -0,0 +1,83 @@
+"""Tests for the embedding-keyed semantic query cache."""
+
+import time
+
+import numpy as np
+import pytest
+from ai_dev_orchestrator.knowledge.embedding_service import EmbeddingService
+from backend.services.cache_service import SemanticCache, semantic_query_cache
+from backend.services.knowledge.retrieval import KnowledgeRetriever, RetrievalResult
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache lookups and bounds."""
+
+    def test_near_duplicates_share_an_entry(self):
+        """A query within the threshold hits; a distant one misses."""
+        cache = SemanticCache(threshold=0.95)
+        cache.set("ns", _unit(1, 0, 0), ["a"])
+
+        assert cache.get("ns", _unit(1, 0.1, 0)) == ["a"]
+        assert cache.get("ns", _unit(1, 1, 0)) is None
+        assert cache.get("other", _unit(1, 0, 0)) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_eviction_and_replacement(self):
+        """Full caches drop the oldest entry; near-duplicates replace."""
+        cache = SemanticCache(max_items=2, threshold=0.95)
+        cache.set("ns", _unit(1, 0, 0), ["x"])
+        cache.set("ns", _unit(0, 1, 0), ["y"])
+        cache.get("ns", _unit(1, 0, 0))
+        cache.set("ns", _unit(0, 0, 1), ["z"])
+
+        assert cache.get("ns", _unit(0, 1, 0)) is None
+        cache.set("ns", _unit(1, 0.05, 0), ["x2"])
+        assert cache.get("ns", _unit(1, 0, 0)) == ["x2"]
+        assert cache.stats()["items"] == 2
+
+    def test_ttl_and_prefix_invalidation(self):
+        """Expired entries miss; namespaces can be dropped by prefix."""
+        cache = SemanticCache(ttl_seconds=0.01)
+        cache.set("knowledge:a", _unit(1, 0), [1])
+        time.sleep(0.02)
+        assert cache.get("knowledge:a", _unit(1, 0)) is None
+
+        cache = SemanticCache()
+        cache.set("knowledge:a", _unit(1, 0), [1])
+        cache.set("files:a", _unit(1, 0), [2])
+        assert cache.invalidate_prefix("knowledge:") == 1
+        assert cache.get("files:a", _unit(1, 0)) == [2]
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    """Retriever with a hashing embedder and a recording search_hybrid."""
+    semantic_query_cache.clear()
+    retriever = KnowledgeRetriever()
+    retriever._embedding_service = EmbeddingService(backend="hashing:64")
+    calls = []
+
+    def search_hybrid(query, limit=5, query_vector=None):
+        calls.append((query, query_vector))
+        return [RetrievalResult("ADR-1", "adr", "Sync", query, 1.0)]
+
+    monkeypatch.setattr(retriever, "search_hybrid", search_hybrid)
+    retriever.calls = calls
+    yield retriever
+    semantic_query_cache.clear()
+
+
+def test_hybrid_results_reused_for_near_duplicate_query(retriever):
+    """A retry differing only in case and punctuation skips retrieval."""
+    first = retriever.search_hybrid_cached("How does document sync work?")
+    again = retriever.search_hybrid_cached("how does document sync work")
+    other = retriever.search_hybrid_cached("gpu batch sizes")
+
+    assert [q for q, _ in retriever.calls] == ["How does document sync work?", "gpu batch sizes"]
+    assert retriever.calls[0][1] is not None  # Embedded once, passed through
+    assert again == first and other != first
@@ -0,0 +1,322 @@
+"""Tests for the in-memory vector index."""
+
+import json
+
+import numpy as np
+import pytest
+
+from backend.services import vector_search
+from backend.services.vector_search import VectorIndex
+
+BACKENDS = ["numpy"] + (["faiss"] if vector_search.FAISS_AVAILABLE else [])
+
+
+@pytest.fixture(params=BACKENDS, autouse=True)
+def backend(request, monkeypatch):
+    """Run every test against NumPy and, when installed, FAISS."""
+    monkeypatch.setattr(vector_search, "FAISS_AVAILABLE", request.param == "faiss")
+    return request.param
+
+
+@pytest.fixture
+def vectors():
+    """Small random corpus."""
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((50, 16)).astype(np.float32)
+
+
+def _build(vectors, ids, metadata=None, **kwargs) -> VectorIndex:
+    index = VectorIndex(dimension=vectors.shape[1], use_gpu=False, **kwargs)
+    index.add_batch(ids, vectors, metadata)
+    index.build()
+    return index
+
+
+class TestPersistence:
+    """Tests for VectorIndex.save / load."""
+
+    def test_roundtrip_is_memory_mapped(self, tmp_path, vectors, backend):
+        """Loaded vectors are a read-only memmap and search identically."""
+        ids = [f"doc-{i}" for i in range(len(vectors))]
+        index = _build(vectors, ids, model_version="all-mpnet-base-v2")
+        index.save(tmp_path / "papers.index")
+
+        loaded = VectorIndex(dimension=16, use_gpu=False)
+        assert loaded.load(tmp_path / "papers.index")
+        if backend == "numpy":
+            assert isinstance(loaded._numpy_vectors, np.memmap)
+        assert loaded.model_version == "all-mpnet-base-v2"
+
+        expected = [r.id for r in index.search(vectors[3], k=5)]
+        assert [r.id for r in loaded.search(vectors[3], k=5)] == expected
+        assert expected[0] == "doc-3"
+
+    def test_integer_ids_roundtrip(self, tmp_path, vectors):
+        """Integer IDs come back as ints."""
+        index = _build(vectors, list(range(100, 150)))
+        index.save(tmp_path / "chunks.index")
+
+        loaded = VectorIndex(dimension=16, use_gpu=False)
+        loaded.load(tmp_path / "chunks.index")
+        assert loaded.search(vectors[7], k=1)[0].id == 107
+
+    def test_model_mismatch_refuses_load(self, tmp_path, vectors):
+        """An index built by another model is not mixed in."""
+        _build(vectors, list(range(50)), model_version="model-a").save(tmp_path / "x.index")
+
+        other = VectorIndex(dimension=16, use_gpu=False, model_version="model-b")
+        assert other.load(tmp_path / "x.index") is False
+
+    def test_legacy_layout_still_loads(self, tmp_path, vectors):
+        """JSON id_map + .npy indices written before .vec remain readable."""
+        path = tmp_path / "old.index"
+        np.save(path.with_suffix(".npy"), vectors)
+        path.with_suffix(".json").write_text(json.dumps({"0": "a", "1": "b"}))
+
+        index = VectorIndex(dimension=16, use_gpu=False)
+        assert index.load(path)
+        assert index.search(vectors[1], k=1)[0].id == "b"
+
+
+class TestDeltaSegment:
+    """Tests for incremental inserts, deletes and compaction."""
+
+    def test_add_after_build_does_not_rebuild(self, vectors):
+        """New vectors land in the delta and are searchable immediately."""
+        index = _build(vectors[:40], list(range(40)))
+        main = index.index, index._numpy_vectors
+
+        index.add(40, vectors[40])
+
+        assert (index.index, index._numpy_vectors) == main
+        assert index.delta_size == 1
+        assert index.search(vectors[40], k=1)[0].id == 40
+        assert len(index) == 41
+
+    def test_delete_hides_main_and_delta_rows(self, vectors):
+        """Deleted IDs never come back from search."""
+        index = _build(vectors[:40], list(range(40)))
+        index.add(40, vectors[40])
+
+        assert index.delete(3)
+        assert index.delete(40)
+        assert not index.delete(999)
+
+        assert 3 not in [r.id for r in index.search(vectors[3], k=5)]
+        assert 40 not in [r.id for r in index.search(vectors[40], k=5)]
+        assert len(index) == 39
+
+    def test_re_adding_an_id_replaces_it(self, vectors):
+        """Adding an existing ID shadows the old vector."""
+        index = _build(vectors[:10], list(range(10)))
+        index.add(0, vectors[20])
+
+        hits = index.search(vectors[20], k=10)
+        assert [r.id for r in hits].count(0) == 1
+        assert hits[0].id == 0
+
+    def test_compaction_folds_delta(self, vectors):
+        """Compaction merges delta and tombstones into the main segment."""
+        index = _build(vectors[:30], list(range(30)))
+        index.add_batch(list(range(30, 50)), vectors[30:])
+        index.delete(5)
+        before = [r.id for r in index.search(vectors[35], k=5)]
+
+        index.compact()
+
+        assert index.delta_size == 0
+        assert not index._tombstones
+        assert index._main_size == 49
+        assert len(index) == 49
+        assert [r.id for r in index.search(vectors[35], k=5)] == before
+
+    def test_background_compaction_on_threshold(self, vectors):
+        """Crossing delta_threshold compacts on a worker thread."""
+        index = _build(vectors[:10], list(range(10)), delta_threshold=5)
+        index.add_batch(list(range(10, 20)), vectors[10:20])
+        if index._compaction is not None:
+            index._compaction.join()
+
+        assert index.delta_size == 0
+        assert index.search(vectors[15], k=1)[0].id == 15
+
+    def test_background_compaction_on_tombstones(self, vectors):
+        """Delete-heavy use compacts once tombstones cross their threshold."""
+        index = _build(vectors[:20], list(range(20)), tombstone_threshold=3)
+        for id_ in range(3):
+            index.delete(id_)
+        if index._compaction is not None:
+            index._compaction.join()
+
+        assert not index._tombstones
+        assert index._main_size == 17
+        assert index.search(vectors[0], k=1)[0].id != 0
+
+
+def _clustered_corpus(n: int, dim: int, clusters: int, seed: int = 1) -> np.ndarray:
+    """Synthetic corpus of Gaussian blobs, like topic-clustered embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centers[labels] + 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def _recall_at_k(index: VectorIndex, exact: VectorIndex, queries: np.ndarray, k: int) -> float:
+    found = 0
+    for q in queries:
+        truth = {r.id for r in exact.search(q, k=k)}
+        found += len(truth & {r.id for r in index.search(q, k=k)})
+    return found / (k * len(queries))
+
+
+class TestIVF:
+    """Tests for the inverted-file index type."""
+
+    @pytest.fixture
+    def corpus(self):
+        return _clustered_corpus(4000, 32, clusters=40)
+
+    def test_recall_grows_with_nprobe(self, corpus):
+        """Scanning more lists trades latency for recall."""
+        ids = list(range(len(corpus)))
+        exact = _build(corpus, ids)
+        ivf = _build(corpus, ids, index_type="ivf")
+        queries = corpus[::100] + 0.05
+
+        recalls = []
+        for nprobe in (1, 4, 16):
+            ivf.nprobe = nprobe
+            if ivf.index is not None:
+                ivf.index.nprobe = nprobe
+            recalls.append(_recall_at_k(ivf, exact, queries, k=10))
+
+        assert recalls == sorted(recalls)
+        assert recalls[-1] >= 0.9
+
+    def test_numpy_ivf_scans_subset(self, corpus, backend):
+        """Without FAISS, IVF lists partition the main segment."""
+        if backend != "numpy":
+            pytest.skip("NumPy IVF only")
+        index = _build(corpus, list(range(len(corpus))), index_type="ivf", nprobe=2)
+
+        assert index._ivf is not None
+        assert index._ivf.offsets[-1] == len(corpus)
+        assert index.search(corpus[123], k=1)[0].id == 123
+
+    def test_ivf_lists_persist(self, tmp_path, corpus, backend):
+        """IVF centroids and offsets survive save/load."""
+        if backend != "numpy":
+            pytest.skip("NumPy IVF only")
+        index = _build(corpus, list(range(len(corpus))), index_type="ivf")
+        index.save(tmp_path / "ivf.index")
+
+        loaded = VectorIndex(dimension=32, use_gpu=False, nprobe=4)
+        loaded.load(tmp_path / "ivf.index")
+
+        assert loaded._ivf is not None
+        assert loaded._ivf.nlist == index._ivf.nlist
+        assert loaded.search(corpus[7], k=1)[0].id == 7
+
+
+class TestQuantizedIndex:
+    """Tests for int8 scoring with float32 rerank."""
+
+    def test_quantized_matches_exact(self, vectors, backend):
+        """The reranked shortlist returns the exact top-k."""
+        if backend != "numpy":
+            pytest.skip("NumPy quantization only")
+        ids = list(range(len(vectors)))
+        exact = _build(vectors, ids)
+        quantized = _build(vectors, ids, quantize=True)
+
+        assert quantized._q8[0].dtype == np.int8
+        for q in vectors[:10]:
+            assert [r.id for r in quantized.search(q, k=5)] == [r.id for r in exact.search(q, k=5)]
+
+    def test_quantized_codes_persist(self, tmp_path, vectors, backend):
+        """Codes are memory-mapped on load and dropped when no longer used."""
+        if backend != "numpy":
+            pytest.skip("NumPy quantization only")
+        path = tmp_path / "q.index"
+        _build(vectors, list(range(len(vectors))), quantize=True).save(path)
+
+        loaded = VectorIndex(dimension=16, use_gpu=False)
+        loaded.load(path)
+        assert loaded.quantize and isinstance(loaded._q8[0], np.memmap)
+        assert loaded.search(vectors[9], k=1)[0].id == 9
+
+        _build(vectors, list(range(len(vectors)))).save(path)
+        assert not path.with_suffix(".q8").exists()
+
+
+class TestSearchBatch:
+    """Tests for multi-query search."""
+
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    def test_batch_matches_single_queries(self, vectors, metric):
+        """Each batch row equals the single-query result, delta included."""
+        index = _build(vectors[:40], list(range(40)), metric=metric)
+        index.add_batch(list(range(40, 50)), vectors[40:])
+        index.delete(2)
+        queries = vectors[::7]
+
+        batch = index.search_batch(queries, k=5)
+
+        assert len(batch) == len(queries)
+        for q, hits in zip(queries, batch):
+            single = index.search(q, k=5)
+            assert [r.id for r in hits] == [r.id for r in single]
+            assert [r.score for r in hits] == pytest.approx([r.score for r in single], abs=1e-5)
+
+    def test_empty_batch(self, vectors):
+        """No queries, no result lists."""
+        assert _build(vectors, list(range(50))).search_batch([], k=3) == []
+
+
+def _doc_meta(i: int) -> dict:
+    return {"doc_type": ["adr", "spec", "plan"][i % 3], "category": ["cs.IR", f"c{i % 2}"]}
+
+
+class TestMetadataFilters:
+    """Tests for mask-based filtered search."""
+
+    def test_filters_main_and_delta(self, vectors):
+        """Only matching rows come back, from either segment."""
+        index = _build(vectors[:40], list(range(40)), [_doc_meta(i) for i in range(40)])
+        index.add_batch(list(range(40, 50)), vectors[40:], [_doc_meta(i) for i in range(40, 50)])
+
+        hits = index.search(vectors[0], k=50, min_score=-1, filters={"doc_type": "spec"})
+        assert {r.id for r in hits} == {i for i in range(50) if i % 3 == 1}
+
+        hits = index.search(
+            vectors[0], k=50, min_score=-1, filters={"doc_type": ["adr", "plan"], "category": "c1"}
+        )
+        assert {r.id for r in hits} == {i for i in range(50) if i % 3 != 1 and i % 2 == 1}
+
+    def test_selective_filter_still_returns_k(self, vectors):
+        """A selective filter returns k matches instead of post-filtering a short list."""
+        meta = [{"doc_type": "rare" if i in (7, 31) else "common"} for i in range(50)]
+        index = _build(vectors, list(range(50)), meta)
+
+        hits = index.search(vectors[0], k=2, min_score=-1, filters={"doc_type": "rare"})
+        assert sorted(r.id for r in hits) == [7, 31]
+        assert index.search(vectors[0], k=2, filters={"doc_type": "missing"}) == []
+
+    def test_masks_follow_compaction_and_persist(self, tmp_path, vectors):
+        """Masks survive compaction, deletes, IVF reordering and save/load."""
+        corpus = _clustered_corpus(2000, 16, clusters=20)
+        index = _build(
+            corpus, list(range(2000)), [_doc_meta(i) for i in range(2000)],
+            index_type="ivf", nprobe=20,
+        )
+        index.delete(3)
+        index.add(2000, corpus[5], {"doc_type": "adr"})
+        index.save(tmp_path / "f.index")
+
+        loaded = VectorIndex(dimension=16, use_gpu=False, nprobe=20)
+        loaded.load(tmp_path / "f.index")
+        hits = loaded.search(corpus[5], k=20, filters={"doc_type": "adr"})
+
+        ids = {r.id for r in hits}
+        assert len(hits) == 20 and 2000 in ids and 3 not in ids
+        assert all(i == 2000 or i % 3 == 0 for i in ids)